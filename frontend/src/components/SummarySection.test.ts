@@ -10,9 +10,10 @@ vi.mock('../lib/api', () => ({
     put: vi.fn(),
     del: vi.fn(),
   },
+  generateSummaryStream: vi.fn(() => ({ cancel: vi.fn() })),
 }));
 
-import { api } from '../lib/api';
+import { api, generateSummaryStream } from '../lib/api';
 
 async function flush() {
   await tick();
@@ -144,24 +145,47 @@ describe('SummarySection', () => {
     expect(generateBtn).toBeDisabled();
   });
 
-  it('calls api.post when Generate Summary is clicked', async () => {
+  it('streams a summary when Generate Summary is clicked', async () => {
     setupMocks();
-    vi.mocked(api.post).mockResolvedValue({});
     render(SummarySection, { props: { sessionId: 1 } });
     await flush();
     await fireEvent.click(screen.getByText('Generate Summary'));
     await flush();
-    expect(api.post).toHaveBeenCalledWith('/sessions/1/generate-summary', { type: 'full' });
+    expect(generateSummaryStream).toHaveBeenCalledWith(1, 'full', expect.any(Object), false);
   });
 
-  it('calls api.post when Generate POV Summaries is clicked', async () => {
+  it('streams POV summaries when Generate POV Summaries is clicked', async () => {
     setupMocks();
-    vi.mocked(api.post).mockResolvedValue({});
     render(SummarySection, { props: { sessionId: 1 } });
     await flush();
     await fireEvent.click(screen.getByText('Generate POV Summaries'));
     await flush();
-    expect(api.post).toHaveBeenCalledWith('/sessions/1/generate-summary', { type: 'pov' });
+    expect(generateSummaryStream).toHaveBeenCalledWith(1, 'pov', expect.any(Object), false);
+  });
+
+  it('shows streamed text as it arrives', async () => {
+    setupMocks();
+    vi.mocked(generateSummaryStream).mockImplementationOnce((_id, _type, handlers) => {
+      handlers.onSummary?.({ summary_id: 7, type: 'full', speaker_id: null, character_name: null });
+      handlers.onDelta(7, 'The heroes ');
+      handlers.onDelta(7, 'set out.');
+      return { cancel: vi.fn() };
+    });
+    render(SummarySection, { props: { sessionId: 1 } });
+    await flush();
+    await fireEvent.click(screen.getByText('Generate Summary'));
+    await flush();
+    expect(screen.getByText('The heroes set out.')).toBeInTheDocument();
+    expect(screen.getByText('Writing...')).toBeInTheDocument();
+  });
+
+  it('marks incomplete summaries', async () => {
+    setupMocks([
+      { id: 1, type: 'full', content: 'The heroes', model_used: 'llama3', generated_at: '2025-01-01', is_partial: 1 },
+    ]);
+    render(SummarySection, { props: { sessionId: 1 } });
+    await flush();
+    expect(screen.getByText(/Incomplete/)).toBeInTheDocument();
   });
 
   it('enters edit mode when Edit button is clicked', async () => {
@@ -43,13 +43,58 @@ export type AudioPart = {
   original_name: string;
   sort_order: number;
   created_at: string;
+  duration?: number | null;
+  content_hash?: string | null;
 };
 
 export async function getAudioParts(sessionId: number): Promise<AudioPart[]> {
   return api.get<AudioPart[]>(`/sessions/${sessionId}/audio-parts`);
 }
 
+// Files larger than this are sent in resumable chunks instead of one multipart body
+const RESUMABLE_UPLOAD_THRESHOLD = 64 * 1024 * 1024;
+const UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024;
+const UPLOAD_MAX_RETRIES = 5;
+
+type ResumableUploadResult = { duplicate: boolean; part?: AudioPart; audio_path?: string };
+
+async function resumableUpload(
+  sessionId: number,
+  file: File,
+  target: 'audio' | 'part',
+): Promise<ResumableUploadResult> {
+  const created = await api.post<{ upload_id?: string; offset?: number } & ResumableUploadResult>(
+    `/sessions/${sessionId}/uploads`,
+    { filename: file.name, content_type: file.type, size: file.size, target },
+  );
+  if (!created.upload_id) return created;
+  const uploadId = created.upload_id;
+
+  let offset = 0;
+  let failures = 0;
+  while (offset < file.size) {
+    try {
+      const res = await fetch(`${BASE}/uploads/${uploadId}`, {
+        method: 'PATCH',
+        headers: { 'Upload-Offset': String(offset) },
+        body: file.slice(offset, offset + UPLOAD_CHUNK_SIZE),
+      });
+      if (!res.ok && res.status !== 409) throw new Error(res.statusText);
+      // The server's offset is authoritative: resume from whatever it has
+      offset = (await api.get<{ offset: number }>(`/uploads/${uploadId}`)).offset;
+      failures = 0;
+    } catch (e) {
+      if (++failures > UPLOAD_MAX_RETRIES) throw e;
+      await new Promise((resolve) => setTimeout(resolve, 1000 * failures));
+    }
+  }
+  return api.post<ResumableUploadResult>(`/uploads/${uploadId}/complete`);
+}
+
 export async function uploadAudioPart(sessionId: number, file: File): Promise<AudioPart> {
+  if (file.size > RESUMABLE_UPLOAD_THRESHOLD) {
+    return (await resumableUpload(sessionId, file, 'part')).part as AudioPart;
+  }
   const form = new FormData();
   form.append('file', file);
   const res = await fetch(`${BASE}/sessions/${sessionId}/audio-parts`, {
@@ -166,6 +211,9 @@ export async function importTranscriptPdf(
 }
 
 export async function uploadAudio(sessionId: number, file: File): Promise<{ audio_path: string }> {
+  if (file.size > RESUMABLE_UPLOAD_THRESHOLD) {
+    return { audio_path: (await resumableUpload(sessionId, file, 'audio')).audio_path as string };
+  }
   const form = new FormData();
   form.append('file', file);
   const res = await fetch(`${BASE}/sessions/${sessionId}/upload-audio`, {
@@ -262,6 +310,90 @@ export function generateImageStream(
   };
 }
 
+export type SummaryStreamHandlers = {
+  onPhase?: (phase: string) => void;
+  onSummary?: (summary: { summary_id: number; type: string; speaker_id: number | null; character_name: string | null }) => void;
+  onDelta: (summaryId: number, text: string) => void;
+  onSummaryDone?: (summaryId: number, content: string) => void;
+  onDone: (summaryIds: number[]) => void;
+  onError: (message: string) => void;
+};
+
+export function generateSummaryStream(
+  sessionId: number,
+  type: 'full' | 'pov',
+  handlers: SummaryStreamHandlers,
+  regenerate = false,
+): { cancel: () => void } {
+  let cancelled = false;
+  let reader: ReadableStreamDefaultReader<Uint8Array> | null = null;
+
+  (async () => {
+    try {
+      const query = regenerate ? '?regenerate=true' : '';
+      const res = await fetch(`${BASE}/sessions/${sessionId}/generate-summary/stream${query}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ type }),
+      });
+
+      if (!res.ok) {
+        const err = await res.json().catch(() => ({ detail: res.statusText }));
+        handlers.onError(typeof err.detail === 'string' ? err.detail : res.statusText);
+        return;
+      }
+
+      reader = res.body?.getReader() ?? null;
+      if (!reader) { handlers.onError('No response body'); return; }
+
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let currentEvent = '';
+
+      function processLines(lines: string[]) {
+        for (const line of lines) {
+          if (line.startsWith('event: ')) {
+            currentEvent = line.slice(7).trim();
+          } else if (line.startsWith('data: ') && currentEvent) {
+            const data = JSON.parse(line.slice(6));
+            if (currentEvent === 'phase') handlers.onPhase?.(data.phase);
+            else if (currentEvent === 'summary') handlers.onSummary?.(data);
+            else if (currentEvent === 'delta') handlers.onDelta(data.summary_id, data.text);
+            else if (currentEvent === 'summary_done') handlers.onSummaryDone?.(data.summary_id, data.content);
+            else if (currentEvent === 'done') handlers.onDone(data.summary_ids);
+            else if (currentEvent === 'error') handlers.onError(data.message || 'Summary generation failed');
+            currentEvent = '';
+          } else if (line.trim() === '') {
+            currentEvent = '';
+          }
+        }
+      }
+
+      while (!cancelled) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop() ?? '';
+        processLines(lines);
+      }
+
+      if (buffer.trim()) {
+        processLines(buffer.split('\n'));
+      }
+    } catch (e) {
+      if (!cancelled) handlers.onError(e instanceof Error ? e.message : 'Summary generation failed');
+    }
+  })();
+
+  return {
+    cancel() {
+      cancelled = true;
+      reader?.cancel();
+    },
+  };
+}
+
 export function reDiarize(
   sessionId: number,
   numSpeakers: number,
@@ -0,0 +1,125 @@
+"""
+Measure summary throughput against a local stand-in OpenAI server.
+
+Starts a tiny OpenAI-compatible server that answers every chat completion
+after a fixed delay, then takes notes on a synthetic transcript and reduces
+them to a full summary and one POV summary per character, at several
+concurrency limits. Prints wall time, LLM calls and the peak number of
+requests the server saw at once.
+
+Usage:
+    .venv/bin/python scripts/bench_summaries.py [--latency 0.5] [--chunks 8] [--characters 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import socket
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from talekeeper.services import llm_client
+from talekeeper.services.summarization import (
+    CHARS_PER_TOKEN,
+    NOTES_RESPONSE_TOKENS,
+    extract_notes,
+    generate_full_summary,
+    generate_pov_summaries,
+)
+
+
+class StandInServer:
+    """OpenAI-compatible chat completions endpoint with a fixed response delay."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.app = FastAPI()
+        self.app.post("/v1/chat/completions")(self._complete)
+
+    async def _complete(self, request: Request) -> JSONResponse:
+        body = await request.json()
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return JSONResponse({
+            "id": f"cmpl-{self.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "A summary."},
+                "finish_reason": "stop",
+            }],
+        })
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.peak = 0
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _synthetic_transcript(chunks: int) -> str:
+    line = "[00:00:00] Eldrin: We follow the tunnel down into the dark.\n"
+    # The stand-in server is not Ollama, so chunks are sized for the default context
+    chunk_tokens = llm_client.DEFAULT_CONTEXT_TOKENS - NOTES_RESPONSE_TOKENS
+    target_chars = int(chunk_tokens * CHARS_PER_TOKEN * (chunks - 0.5))
+    return line * (target_chars // len(line))
+
+
+async def _run(args: argparse.Namespace) -> None:
+    server = StandInServer(args.latency)
+    port = _free_port()
+    config = uvicorn.Config(server.app, host="127.0.0.1", port=port, log_level="warning")
+    uv = uvicorn.Server(config)
+    serve_task = asyncio.create_task(uv.serve())
+    while not uv.started:
+        await asyncio.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{port}/v1"
+    transcript = _synthetic_transcript(args.chunks)
+    characters = [f"Character {i + 1}" for i in range(args.characters)]
+
+    print(f"{'limit':>5} {'calls':>6} {'peak':>5} {'seconds':>8}")
+    try:
+        for limit in args.limits:
+            llm_client.set_max_concurrency(base_url, limit)
+            server.reset()
+            started = time.perf_counter()
+            notes = await extract_notes(transcript, characters, base_url, None, "stand-in")
+            await generate_full_summary(transcript, base_url, None, "stand-in", notes=notes)
+            await generate_pov_summaries(transcript, characters, base_url, None, "stand-in", notes=notes)
+            elapsed = time.perf_counter() - started
+            print(f"{limit:>5} {server.calls:>6} {server.peak:>5} {elapsed:>8.2f}")
+    finally:
+        uv.should_exit = True
+        await serve_task
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per completion")
+    parser.add_argument("--chunks", type=int, default=8, help="transcript length in chunks")
+    parser.add_argument("--characters", type=int, default=5, help="number of POV summaries")
+    parser.add_argument("--limits", type=int, nargs="+", default=[1, 2, 4, 8], help="concurrency limits to compare")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,7 @@ from pathlib import Path
 
 from talekeeper.db import init_db
 from talekeeper.paths import get_audio_dir, set_user_data_dir
-from talekeeper.routers import campaigns, sessions, roster, recording, transcripts, speakers, summaries, exports, settings, voice_signatures, images
+from talekeeper.routers import campaigns, sessions, roster, recording, transcripts, speakers, summaries, exports, settings, voice_signatures, images, jobs
 
 
 def _cleanup_orphaned_chunk_dirs() -> None:
@@ -46,7 +46,15 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         if rows and rows[0]["value"]:
             set_user_data_dir(rows[0]["value"])
     _cleanup_orphaned_chunk_dirs()
+    from talekeeper.services.uploads import cleanup_orphaned_upload_files, expire_stale_uploads
+    await expire_stale_uploads()
+    await cleanup_orphaned_upload_files()
+    # Resume pipelines that were interrupted by a shutdown or crash
+    from talekeeper.services.jobs import requeue_interrupted_jobs
+    await requeue_interrupted_jobs()
     yield
+    from talekeeper.services import llm_client
+    await llm_client.close_clients()
 
 
 app = FastAPI(title="TaleKeeper", version="0.1.0", lifespan=lifespan)
@@ -75,6 +83,7 @@ app.include_router(exports.router)
 app.include_router(settings.router)
 app.include_router(voice_signatures.router)
 app.include_router(images.router)
+app.include_router(jobs.router)
 
 STATIC_DIR = Path(__file__).parent / "static"
 
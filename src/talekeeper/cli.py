@@ -50,6 +50,69 @@ def cmd_serve(args: argparse.Namespace) -> None:
     server.run()
 
 
+def _print_batch(batch: dict) -> None:
+    jobs = ", ".join(f"{status}: {n}" for status, n in sorted(batch["jobs"].items())) or "no jobs"
+    rate = batch["audio_hours_per_wall_hour"]
+    throughput = f"{rate:.2f} audio-h/wall-h" if rate is not None else "throughput n/a"
+    print(
+        f"Batch {batch['id']}: {jobs} | {batch['audio_hours']:.2f} audio-h "
+        f"in {batch['wall_hours']:.2f} h | {throughput}"
+    )
+
+
+def _watch_batch(client: "httpx.Client", batch_id: int, interval: float) -> None:
+    import time
+
+    while True:
+        resp = client.get(f"/api/batches/{batch_id}")
+        resp.raise_for_status()
+        batch = resp.json()
+        _print_batch(batch)
+        if batch["finished"]:
+            return
+        time.sleep(interval)
+
+
+def cmd_backlog(args: argparse.Namespace) -> None:
+    """Queue a campaign's unprocessed sessions on a running server."""
+    import httpx
+
+    with httpx.Client(base_url=args.server, timeout=30.0) as client:
+        try:
+            resp = client.post(
+                f"/api/campaigns/{args.campaign_id}/backlog",
+                json={"kind": args.kind, "num_speakers": args.num_speakers, "priority": args.priority},
+            )
+        except httpx.ConnectError:
+            print(f"Could not reach TaleKeeper at {args.server}. Is `talekeeper serve` running?")
+            sys.exit(1)
+        if resp.status_code != 200:
+            print(f"Error: {resp.json().get('detail', resp.text)}")
+            sys.exit(1)
+        result = resp.json()
+        print(
+            f"Batch {result['batch_id']}: queued {len(result['queued'])} session(s), "
+            f"skipped {len(result['skipped'])} already in progress"
+        )
+        if args.watch and result["queued"]:
+            _watch_batch(client, result["batch_id"], args.interval)
+
+
+def cmd_batch(args: argparse.Namespace) -> None:
+    """Show progress and throughput of a batch."""
+    import httpx
+
+    with httpx.Client(base_url=args.server, timeout=30.0) as client:
+        if args.watch:
+            _watch_batch(client, args.batch_id, args.interval)
+            return
+        resp = client.get(f"/api/batches/{args.batch_id}")
+        if resp.status_code != 200:
+            print(f"Error: {resp.json().get('detail', resp.text)}")
+            sys.exit(1)
+        _print_batch(resp.json())
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         prog="talekeeper",
@@ -63,6 +126,21 @@ def main() -> None:
     serve.add_argument("--reload", action="store_true", help="Enable auto-reload for development")
     serve.add_argument("--no-browser", action="store_true", help="Don't open browser on startup")
 
+    backlog = sub.add_parser("backlog", help="Process every unprocessed session of a campaign")
+    backlog.add_argument("campaign_id", type=int)
+    backlog.add_argument("--kind", choices=["process_all", "process_audio"], default="process_all")
+    backlog.add_argument("--num-speakers", type=int, default=None)
+    backlog.add_argument("--priority", type=int, default=0, help="Higher runs first; UI requests use 10")
+    backlog.add_argument("--watch", action="store_true", help="Follow progress until the batch finishes")
+
+    batch = sub.add_parser("batch", help="Show progress and throughput of a backlog batch")
+    batch.add_argument("batch_id", type=int)
+    batch.add_argument("--watch", action="store_true", help="Follow progress until the batch finishes")
+
+    for p in (backlog, batch):
+        p.add_argument("--server", default="http://127.0.0.1:8000", help="URL of a running TaleKeeper server")
+        p.add_argument("--interval", type=float, default=10.0, help="Seconds between progress updates")
+
     args = parser.parse_args()
 
     if args.command is None:
@@ -71,3 +149,7 @@ def main() -> None:
 
     if args.command == "serve":
         cmd_serve(args)
+    elif args.command == "backlog":
+        cmd_backlog(args)
+    elif args.command == "batch":
+        cmd_batch(args)
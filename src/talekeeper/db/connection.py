@@ -39,6 +39,19 @@ async def _apply_schema(db: aiosqlite.Connection) -> None:
     await _migrate_add_parent_segment_id_column(db)
     await _migrate_add_campaign_party_images_table(db)
     await _migrate_add_session_audio_files_table(db)
+    await _migrate_add_audio_part_cache_table(db)
+    await _migrate_add_segment_revision_columns(db)
+    await _migrate_add_transcript_timing_columns(db)
+    await _migrate_add_jobs_tables(db)
+    await _migrate_add_job_priority_columns(db)
+    await _migrate_add_audio_preprocessing_table(db)
+    await _migrate_add_audio_metadata_columns(db)
+    await _migrate_add_uploads_table(db)
+    await _migrate_add_summary_notes_table(db)
+    await _migrate_add_llm_cache_table(db)
+    await _migrate_add_summary_partial_column(db)
+    await _migrate_add_campaign_summaries_table(db)
+    await _migrate_add_summary_notes_end_stamp_column(db)
 
 
 async def _migrate_add_session_number_column(db: aiosqlite.Connection) -> None:
@@ -217,6 +230,156 @@ async def _migrate_add_parent_segment_id_column(db: aiosqlite.Connection) -> Non
         )
 
 
+async def _migrate_add_segment_revision_columns(db: aiosqlite.Connection) -> None:
+    """Add revision and model_name to transcript_segments to track draft vs refined text."""
+    cols = await db.execute_fetchall("PRAGMA table_info(transcript_segments)")
+    col_names = [c["name"] for c in cols]
+    if "revision" not in col_names:
+        await db.execute(
+            "ALTER TABLE transcript_segments ADD COLUMN revision INTEGER NOT NULL DEFAULT 0"
+        )
+    if "model_name" not in col_names:
+        await db.execute(
+            "ALTER TABLE transcript_segments ADD COLUMN model_name TEXT"
+        )
+
+
+async def _migrate_add_transcript_timing_columns(db: aiosqlite.Connection) -> None:
+    """Add time-to-first and time-to-final transcript timings to sessions if missing."""
+    cols = await db.execute_fetchall("PRAGMA table_info(sessions)")
+    col_names = [c["name"] for c in cols]
+    for col in ("time_to_draft_seconds", "time_to_final_seconds"):
+        if col not in col_names:
+            await db.execute(f"ALTER TABLE sessions ADD COLUMN {col} REAL")
+
+
+async def _migrate_add_audio_metadata_columns(db: aiosqlite.Connection) -> None:
+    """Add probed audio metadata and content hash to sessions and audio parts if missing."""
+    columns = {
+        "sessions": (
+            ("audio_duration", "REAL"),
+            ("audio_codec", "TEXT"),
+            ("audio_sample_rate", "INTEGER"),
+            ("audio_channels", "INTEGER"),
+            ("audio_hash", "TEXT"),
+        ),
+        "session_audio_files": (
+            ("duration", "REAL"),
+            ("codec", "TEXT"),
+            ("sample_rate", "INTEGER"),
+            ("channels", "INTEGER"),
+            ("content_hash", "TEXT"),
+        ),
+    }
+    for table, table_columns in columns.items():
+        cols = await db.execute_fetchall(f"PRAGMA table_info({table})")
+        col_names = [c["name"] for c in cols]
+        for col, col_type in table_columns:
+            if col not in col_names:
+                await db.execute(f"ALTER TABLE {table} ADD COLUMN {col} {col_type}")
+
+
+async def _migrate_add_uploads_table(db: aiosqlite.Connection) -> None:
+    """Create uploads table if it doesn't exist (for pre-existing databases)."""
+    tables = await db.execute_fetchall(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='uploads'"
+    )
+    if not tables:
+        await db.execute("""
+            CREATE TABLE uploads (
+                id TEXT PRIMARY KEY,
+                session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+                target TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                content_type TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                received INTEGER NOT NULL DEFAULT 0,
+                temp_path TEXT NOT NULL,
+                expected_hash TEXT,
+                status TEXT NOT NULL DEFAULT 'uploading',
+                created_at TEXT NOT NULL DEFAULT (datetime('now')),
+                updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+        """)
+
+
+async def _migrate_add_summary_notes_table(db: aiosqlite.Connection) -> None:
+    """Create summary_notes table if it doesn't exist (for pre-existing databases)."""
+    tables = await db.execute_fetchall(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='summary_notes'"
+    )
+    if not tables:
+        await db.execute("""
+            CREATE TABLE summary_notes (
+                session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+                chunk_index INTEGER NOT NULL,
+                input_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                notes TEXT NOT NULL,
+                created_at TEXT NOT NULL DEFAULT (datetime('now')),
+                PRIMARY KEY (session_id, chunk_index)
+            )
+        """)
+
+
+async def _migrate_add_llm_cache_table(db: aiosqlite.Connection) -> None:
+    """Create llm_cache table if it doesn't exist (for pre-existing databases)."""
+    tables = await db.execute_fetchall(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='llm_cache'"
+    )
+    if not tables:
+        await db.execute("""
+            CREATE TABLE llm_cache (
+                key TEXT PRIMARY KEY,
+                base_url TEXT NOT NULL,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL DEFAULT (datetime('now')),
+                last_used_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+        """)
+
+
+async def _migrate_add_summary_notes_end_stamp_column(db: aiosqlite.Connection) -> None:
+    """Add end_stamp to summary_notes so the next run can keep the chunk boundaries."""
+    cols = await db.execute_fetchall("PRAGMA table_info(summary_notes)")
+    col_names = [c["name"] for c in cols]
+    if "end_stamp" not in col_names:
+        await db.execute("ALTER TABLE summary_notes ADD COLUMN end_stamp TEXT")
+
+
+async def _migrate_add_summary_partial_column(db: aiosqlite.Connection) -> None:
+    """Add is_partial to summaries to mark text that is still streaming or was cut off."""
+    cols = await db.execute_fetchall("PRAGMA table_info(summaries)")
+    col_names = [c["name"] for c in cols]
+    if "is_partial" not in col_names:
+        await db.execute(
+            "ALTER TABLE summaries ADD COLUMN is_partial INTEGER NOT NULL DEFAULT 0"
+        )
+
+
+async def _migrate_add_campaign_summaries_table(db: aiosqlite.Connection) -> None:
+    """Create campaign_summaries table if it doesn't exist (for pre-existing databases)."""
+    tables = await db.execute_fetchall(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='campaign_summaries'"
+    )
+    if not tables:
+        await db.execute("""
+            CREATE TABLE campaign_summaries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                campaign_id INTEGER NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
+                version INTEGER NOT NULL,
+                content TEXT NOT NULL,
+                sessions TEXT NOT NULL,
+                method TEXT NOT NULL,
+                model_used TEXT,
+                created_at TEXT NOT NULL DEFAULT (datetime('now')),
+                UNIQUE (campaign_id, version)
+            )
+        """)
+
+
 async def _migrate_add_session_audio_files_table(db: aiosqlite.Connection) -> None:
     """Create session_audio_files table if it doesn't exist (for pre-existing databases)."""
     tables = await db.execute_fetchall(
@@ -235,6 +398,107 @@ async def _migrate_add_session_audio_files_table(db: aiosqlite.Connection) -> No
         """)
 
 
+async def _migrate_add_audio_part_cache_table(db: aiosqlite.Connection) -> None:
+    """Create audio_part_cache table if it doesn't exist (for pre-existing databases)."""
+    tables = await db.execute_fetchall(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='audio_part_cache'"
+    )
+    if not tables:
+        await db.execute("""
+            CREATE TABLE audio_part_cache (
+                audio_file_id INTEGER PRIMARY KEY REFERENCES session_audio_files(id) ON DELETE CASCADE,
+                duration REAL NOT NULL,
+                model_name TEXT,
+                language TEXT,
+                segments TEXT,
+                embeddings_path TEXT,
+                updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+        """)
+
+
+async def _migrate_add_jobs_tables(db: aiosqlite.Connection) -> None:
+    """Create jobs and job_events tables if they don't exist (for pre-existing databases)."""
+    tables = await db.execute_fetchall(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='jobs'"
+    )
+    if not tables:
+        await db.execute("""
+            CREATE TABLE jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+                kind TEXT NOT NULL,
+                params TEXT NOT NULL DEFAULT '{}',
+                status TEXT NOT NULL DEFAULT 'queued',
+                checkpoint TEXT NOT NULL DEFAULT '{}',
+                previous_status TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL DEFAULT (datetime('now')),
+                started_at TEXT,
+                finished_at TEXT
+            )
+        """)
+        await db.execute("""
+            CREATE TABLE job_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+                event TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+        """)
+
+
+async def _migrate_add_job_priority_columns(db: aiosqlite.Connection) -> None:
+    """Add priority and batch_id to jobs, and the job_batches table, if missing."""
+    tables = await db.execute_fetchall(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='job_batches'"
+    )
+    if not tables:
+        await db.execute("""
+            CREATE TABLE job_batches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                campaign_id INTEGER NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
+                kind TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+        """)
+    cols = await db.execute_fetchall("PRAGMA table_info(jobs)")
+    col_names = [c["name"] for c in cols]
+    if "priority" not in col_names:
+        await db.execute("ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+    if "batch_id" not in col_names:
+        await db.execute(
+            "ALTER TABLE jobs ADD COLUMN batch_id INTEGER REFERENCES job_batches(id) ON DELETE SET NULL"
+        )
+
+
+async def _migrate_add_audio_preprocessing_table(db: aiosqlite.Connection) -> None:
+    """Create audio_preprocessing table if it doesn't exist (for pre-existing databases)."""
+    tables = await db.execute_fetchall(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='audio_preprocessing'"
+    )
+    if not tables:
+        await db.execute("""
+            CREATE TABLE audio_preprocessing (
+                source_path TEXT PRIMARY KEY,
+                source_size INTEGER NOT NULL,
+                source_mtime REAL NOT NULL,
+                wav_path TEXT,
+                duration REAL,
+                codec TEXT,
+                sample_rate INTEGER,
+                channels INTEGER,
+                embeddings_path TEXT,
+                status TEXT NOT NULL DEFAULT 'running',
+                error TEXT,
+                updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+        """)
+
+
 async def _migrate_add_campaign_party_images_table(db: aiosqlite.Connection) -> None:
     """Create campaign_party_images table if it doesn't exist (for pre-existing databases)."""
     tables = await db.execute_fetchall(
@@ -387,6 +651,112 @@ CREATE TABLE IF NOT EXISTS session_audio_files (
     created_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
+CREATE TABLE IF NOT EXISTS audio_part_cache (
+    audio_file_id INTEGER PRIMARY KEY REFERENCES session_audio_files(id) ON DELETE CASCADE,
+    duration REAL NOT NULL,
+    model_name TEXT,
+    language TEXT,
+    segments TEXT,
+    embeddings_path TEXT,
+    updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'queued',
+    checkpoint TEXT NOT NULL DEFAULT '{}',
+    previous_status TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT (datetime('now')),
+    started_at TEXT,
+    finished_at TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    batch_id INTEGER REFERENCES job_batches(id) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS job_batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    campaign_id INTEGER NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TABLE IF NOT EXISTS uploads (
+    id TEXT PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    target TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    received INTEGER NOT NULL DEFAULT 0,
+    temp_path TEXT NOT NULL,
+    expected_hash TEXT,
+    status TEXT NOT NULL DEFAULT 'uploading',
+    created_at TEXT NOT NULL DEFAULT (datetime('now')),
+    updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TABLE IF NOT EXISTS summary_notes (
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    chunk_index INTEGER NOT NULL,
+    input_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    end_stamp TEXT,
+    created_at TEXT NOT NULL DEFAULT (datetime('now')),
+    PRIMARY KEY (session_id, chunk_index)
+);
+
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    base_url TEXT NOT NULL,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT (datetime('now')),
+    last_used_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TABLE IF NOT EXISTS campaign_summaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    campaign_id INTEGER NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    sessions TEXT NOT NULL,
+    method TEXT NOT NULL,
+    model_used TEXT,
+    created_at TEXT NOT NULL DEFAULT (datetime('now')),
+    UNIQUE (campaign_id, version)
+);
+
+CREATE TABLE IF NOT EXISTS audio_preprocessing (
+    source_path TEXT PRIMARY KEY,
+    source_size INTEGER NOT NULL,
+    source_mtime REAL NOT NULL,
+    wav_path TEXT,
+    duration REAL,
+    codec TEXT,
+    sample_rate INTEGER,
+    channels INTEGER,
+    embeddings_path TEXT,
+    status TEXT NOT NULL DEFAULT 'running',
+    error TEXT,
+    updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TABLE IF NOT EXISTS job_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    event TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
 CREATE TABLE IF NOT EXISTS settings (
     key TEXT PRIMARY KEY,
     value TEXT
@@ -69,6 +69,14 @@ def get_session_audio_parts_dir(campaign_id: int, session_id: int) -> Path:
     return get_campaign_audio_dir(campaign_id) / "parts" / str(session_id)
 
 
+def get_session_audio_cache_dir(campaign_id: int, session_id: int) -> Path:
+    return get_session_audio_parts_dir(campaign_id, session_id) / "cache"
+
+
+def get_session_preprocess_dir(campaign_id: int, session_id: int) -> Path:
+    return get_campaign_audio_dir(campaign_id) / "preprocessed" / str(session_id)
+
+
 def get_images_dir() -> Path:
     return get_user_data_dir() / "images"
 
@@ -5,6 +5,9 @@ from pydantic import BaseModel, Field, field_validator
 
 from talekeeper.db import get_db
 from talekeeper.paths import get_campaign_audio_dir
+from talekeeper.services import llm_client
+from talekeeper.services.campaign_summary import list_versions, story_so_far, update_campaign_summary
+from talekeeper.services.jobs import interactive_request
 from talekeeper.services.transcription import SUPPORTED_LANGUAGES
 
 router = APIRouter(prefix="/api/campaigns", tags=["campaigns"])
@@ -228,3 +231,35 @@ async def campaign_dashboard(campaign_id: int) -> dict:
         "total_recorded_time": total_time[0]["total"],
         "most_recent_session_date": most_recent[0]["date"] if most_recent else None,
     }
+
+
+async def _require_campaign(campaign_id: int) -> None:
+    async with get_db() as db:
+        existing = await db.execute_fetchall(
+            "SELECT id FROM campaigns WHERE id = ?", (campaign_id,)
+        )
+    if not existing:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+
+@router.get("/{campaign_id}/story-so-far")
+async def get_story_so_far(campaign_id: int) -> dict:
+    """The stored campaign summary, without calling the LLM; ``stale`` if sessions changed since."""
+    await _require_campaign(campaign_id)
+    return await story_so_far(campaign_id)
+
+
+@router.get("/{campaign_id}/story-so-far/versions")
+async def list_story_so_far_versions(campaign_id: int) -> list[dict]:
+    await _require_campaign(campaign_id)
+    return await list_versions(campaign_id)
+
+
+@router.post("/{campaign_id}/story-so-far")
+async def update_story_so_far(campaign_id: int) -> dict:
+    """Bring the campaign summary up to date with its sessions' full summaries."""
+    await _require_campaign(campaign_id)
+    config = await llm_client.resolve_config()
+    with interactive_request():
+        await update_campaign_summary(campaign_id, config["base_url"], config["api_key"], config["model"])
+    return await story_so_far(campaign_id)
@@ -69,6 +69,7 @@ def _build_pdf_html(
         summary.get("session_name") or "",
         summary.get("campaign_name") or "",
         summary.get("session_date") or "",
+        "Incomplete" if summary.get("is_partial") else "",
     ]
     subtitle = " &middot; ".join(p for p in subtitle_parts if p)
 
@@ -265,6 +266,7 @@ def _build_meta(summary: dict) -> str:
         summary.get("session_name") or "",
         summary.get("campaign_name") or "",
         summary.get("session_date") or "",
+        "Incomplete" if summary.get("is_partial") else "",
     ]
     return " · ".join(p for p in parts if p)
 
@@ -317,7 +319,7 @@ async def export_all_summaries(session_id: int, printable: bool = False) -> Stre
                JOIN sessions s ON s.id = su.session_id
                JOIN campaigns c ON c.id = s.campaign_id
                LEFT JOIN speakers sp ON sp.id = su.speaker_id
-               WHERE su.session_id = ?""",
+               WHERE su.session_id = ? AND su.is_partial = 0""",
             (session_id,),
         )
 
@@ -1,28 +1,35 @@
 """Image generation and management API endpoints."""
 
 import json
-import traceback
+from contextlib import nullcontext
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import FileResponse, StreamingResponse
 from pathlib import Path
 from pydantic import BaseModel
-from typing import AsyncGenerator
+from typing import AsyncIterator
 
 from talekeeper.db import get_db
-from talekeeper.services import llm_client
-from talekeeper.services.image_generation import craft_scene_description, generate_session_image, health_check as image_health_check
-from talekeeper.services.summarization import format_transcript
+from talekeeper.routers.jobs import job_response
+from talekeeper.services.jobs import Job, register_runner
+from talekeeper.services import llm_cache, llm_client
+from talekeeper.services.image_generation import (
+    craft_scene_description,
+    generate_session_image,
+    health_check as image_health_check,
+    stream_scene_description,
+)
+from talekeeper.services.transcript_compaction import compact_transcript
 
 router = APIRouter(tags=["images"])
 
 
+# Appended to each event to defeat output buffering
 _SSE_PADDING = ":" + " " * 2048 + "\n"
 
 
 def _sse_event(event: str, data: dict) -> str:
-    """Format a server-sent event with padding to defeat output buffering."""
-    return f"event: {event}\ndata: {json.dumps(data)}\n\n{_SSE_PADDING}"
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 
 class GenerateImageRequest(BaseModel):
@@ -64,43 +71,43 @@ async def generate_image(session_id: int, body: GenerateImageRequest):
     if img_health["status"] != "ok":
         raise HTTPException(status_code=503, detail=f"Image provider unavailable: {img_health.get('message', 'unknown error')}")
 
-    # --- SSE generator (slow work happens here) ---
-    async def _stream() -> AsyncGenerator[str, None]:
-        try:
-            from talekeeper.services.resource_orchestration import cleanup_image_generation
+    # --- Slow work happens in a background job; the response streams its events ---
+    return await job_response(session_id, "generate_image", body.model_dump(), padding=_SSE_PADDING)
 
-            prompt = body.prompt.strip() if body.prompt else ""
-            scene_description = None
 
-            if needs_crafting:
-                yield _sse_event("phase", {"phase": "crafting_scene"})
-                scene_description = await craft_scene_description(
-                    content,
-                    base_url=llm_config["base_url"],
-                    api_key=llm_config["api_key"],
-                    model=llm_config["model"],
-                    session_id=session_id,
-                )
-                prompt = scene_description
+@register_runner("generate_image", model="image_generation")
+async def _run_generate_image(job: Job) -> AsyncIterator[tuple[str, dict]]:
+    """Craft a scene (if no prompt was given) and generate a session image as a background job."""
+    from talekeeper.services.resource_orchestration import cleanup_image_generation
 
-            yield _sse_event("phase", {"phase": "generating_image"})
-            result = await generate_session_image(session_id, prompt, scene_description)
-            cleanup_image_generation()
-            yield _sse_event("done", {"image": result})
-        except Exception as exc:
-            traceback.print_exc()
-            yield _sse_event("error", {"message": str(exc)})
+    session_id = job.session_id
+    body = GenerateImageRequest(**job.params)
+    needs_crafting = body.prompt is None or body.prompt.strip() == ""
+    llm_config = await llm_client.resolve_config() if needs_crafting else None
+    content = await _get_session_content(session_id) if needs_crafting else None
 
-    return StreamingResponse(
-        _stream(),
-        media_type="text/event-stream",
-        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
-    )
+    prompt = body.prompt.strip() if body.prompt else ""
+    scene_description = None
 
+    if needs_crafting:
+        yield ("phase", {"phase": "crafting_scene"})
+        scene_description = await craft_scene_description(
+            content,
+            base_url=llm_config["base_url"],
+            api_key=llm_config["api_key"],
+            model=llm_config["model"],
+            session_id=session_id,
+        )
+        prompt = scene_description
 
-@router.post("/api/sessions/{session_id}/craft-scene")
-async def craft_scene(session_id: int) -> dict:
-    """Craft a scene description from session content using the text LLM."""
+    yield ("phase", {"phase": "generating_image"})
+    result = await generate_session_image(session_id, prompt, scene_description)
+    cleanup_image_generation()
+    yield ("done", {"image": result})
+
+
+async def _scene_inputs(session_id: int) -> tuple[dict, str]:
+    """Check the session and the text LLM; return the LLM config and the session content."""
     async with get_db() as db:
         rows = await db.execute_fetchall("SELECT * FROM sessions WHERE id = ?", (session_id,))
     if not rows:
@@ -114,17 +121,60 @@ async def craft_scene(session_id: int) -> dict:
     content = await _get_session_content(session_id)
     if not content:
         raise HTTPException(status_code=400, detail="No transcript or summary available for this session")
+    return llm_config, content
 
-    scene_description = await craft_scene_description(
-        content,
-        base_url=llm_config["base_url"],
-        api_key=llm_config["api_key"],
-        model=llm_config["model"],
-        session_id=session_id,
-    )
+
+@router.post("/api/sessions/{session_id}/craft-scene")
+async def craft_scene(session_id: int, regenerate: bool = False) -> dict:
+    """Craft a scene description from session content using the text LLM.
+
+    With ``regenerate`` a new description is requested instead of a cached one.
+    """
+    llm_config, content = await _scene_inputs(session_id)
+    with llm_cache.bypass() if regenerate else nullcontext():
+        scene_description = await craft_scene_description(
+            content,
+            base_url=llm_config["base_url"],
+            api_key=llm_config["api_key"],
+            model=llm_config["model"],
+            session_id=session_id,
+        )
     return {"scene_description": scene_description}
 
 
+@router.post("/api/sessions/{session_id}/craft-scene/stream")
+async def craft_scene_stream(session_id: int, regenerate: bool = False) -> StreamingResponse:
+    """Craft a scene description, streaming it over SSE as the LLM writes it.
+
+    Sends ``delta`` events with new text, then ``done`` with the whole
+    description, or ``error``.
+    """
+    llm_config, content = await _scene_inputs(session_id)
+
+    async def sse_generator() -> AsyncIterator[str]:
+        parts: list[str] = []
+        with llm_cache.bypass() if regenerate else nullcontext():
+            try:
+                async for piece in stream_scene_description(
+                    content,
+                    base_url=llm_config["base_url"],
+                    api_key=llm_config["api_key"],
+                    model=llm_config["model"],
+                    session_id=session_id,
+                ):
+                    parts.append(piece)
+                    yield _sse_event("delta", {"text": piece})
+                yield _sse_event("done", {"scene_description": "".join(parts)})
+            except Exception as exc:
+                yield _sse_event("error", {"message": str(exc)})
+
+    return StreamingResponse(
+        sse_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/api/sessions/{session_id}/images")
 async def list_images(session_id: int) -> list[dict]:
     """List all images for a session, ordered by most recent first."""
@@ -215,12 +265,13 @@ async def image_health() -> dict:
 async def _get_session_content(session_id: int) -> str | None:
     """Get session content for scene description generation.
 
-    Prefers existing full summary; falls back to raw transcript.
+    Prefers the latest complete full summary; falls back to raw transcript.
     """
     async with get_db() as db:
         # Try existing full summary first
         summaries = await db.execute_fetchall(
-            "SELECT content FROM summaries WHERE session_id = ? AND type = 'full' ORDER BY id DESC LIMIT 1",
+            "SELECT content FROM summaries WHERE session_id = ? AND type = 'full' AND is_partial = 0 "
+            "ORDER BY id DESC LIMIT 1",
             (session_id,),
         )
         if summaries and summaries[0]["content"]:
@@ -240,4 +291,4 @@ async def _get_session_content(session_id: int) -> str | None:
     if not segments:
         return None
 
-    return format_transcript([dict(s) for s in segments])
+    return await compact_transcript([dict(s) for s in segments], session_id)
@@ -0,0 +1,126 @@
+"""Background job API endpoints."""
+
+from typing import Literal
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from talekeeper.db import get_db
+from talekeeper.services.jobs import (
+    PRIORITY_BACKLOG,
+    PRIORITY_INTERACTIVE,
+    TERMINAL_STATUSES,
+    JobConflictError,
+    cancel_job,
+    cancel_session_job,
+    enqueue_campaign_backlog,
+    enqueue_job,
+    get_batch,
+    get_job,
+    job_event_stream,
+    list_session_jobs,
+)
+
+router = APIRouter(tags=["jobs"])
+
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+class BacklogRequest(BaseModel):
+    kind: Literal["process_all", "process_audio"] = "process_all"
+    num_speakers: int | None = Field(default=None, ge=1, le=10)
+    # Backlog work stays below interactive priority so it can always be preempted
+    priority: int = Field(default=PRIORITY_BACKLOG, ge=0, lt=PRIORITY_INTERACTIVE)
+
+
+async def job_response(
+    session_id: int, kind: str, params: dict | None = None, padding: str = ""
+) -> StreamingResponse:
+    """Queue a pipeline job and stream its events; the job outlives the response."""
+    try:
+        job_id = await enqueue_job(session_id, kind, params)
+    except JobConflictError as exc:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Session is currently being processed (job {exc.job_id})",
+        )
+    return StreamingResponse(
+        job_event_stream(job_id, padding=padding),
+        media_type="text/event-stream",
+        headers={**_SSE_HEADERS, "X-Job-Id": str(job_id)},
+    )
+
+
+@router.get("/api/jobs/{job_id}")
+async def get_job_status(job_id: int) -> dict:
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/api/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: int,
+    after: int = Query(default=0, ge=0),
+    last_event_id: int | None = Header(default=None),
+) -> StreamingResponse:
+    """(Re)subscribe to a job's events, replaying everything after the cursor."""
+    if await get_job(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    cursor = max(after, last_event_id or 0)
+    return StreamingResponse(
+        job_event_stream(job_id, after=cursor),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
+@router.post("/api/jobs/{job_id}/cancel")
+async def cancel_job_endpoint(job_id: int) -> dict:
+    """Cancel a job. A running job stops at its next checkpoint and rolls back its partial work."""
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] in TERMINAL_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job already {job['status']}")
+    return await cancel_job(job_id)
+
+
+@router.post("/api/sessions/{session_id}/cancel")
+async def cancel_session_processing(session_id: int) -> dict:
+    """Cancel whatever job is processing a session."""
+    job = await cancel_session_job(session_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="No active job for this session")
+    return job
+
+
+@router.get("/api/sessions/{session_id}/jobs")
+async def get_session_jobs(session_id: int) -> list[dict]:
+    async with get_db() as db:
+        rows = await db.execute_fetchall("SELECT id FROM sessions WHERE id = ?", (session_id,))
+    if not rows:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return await list_session_jobs(session_id)
+
+
+@router.post("/api/campaigns/{campaign_id}/backlog")
+async def process_campaign_backlog(campaign_id: int, body: BacklogRequest) -> dict:
+    """Queue every unprocessed session of a campaign below interactive work."""
+    try:
+        result = await enqueue_campaign_backlog(
+            campaign_id, body.kind, {"num_speakers": body.num_speakers}, body.priority
+        )
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return result
+
+
+@router.get("/api/batches/{batch_id}")
+async def get_batch_status(batch_id: int) -> dict:
+    batch = await get_batch(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
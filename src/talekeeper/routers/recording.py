@@ -1,32 +1,58 @@
 """WebSocket recording endpoint and audio management."""
 
 import asyncio
+import hashlib
 import json
 import mimetypes
+import shutil
+import time
 from pathlib import Path
-from typing import AsyncIterator
+from typing import TYPE_CHECKING, AsyncIterator, Literal
 
-from fastapi import APIRouter, Query, UploadFile, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import APIRouter, Header, Query, Request, UploadFile, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.responses import FileResponse, StreamingResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from talekeeper.db import get_db
-from talekeeper.paths import get_campaign_audio_dir, get_session_audio_parts_dir
+from talekeeper.routers.jobs import job_response
+from talekeeper.paths import (
+    get_campaign_audio_dir,
+    get_session_audio_cache_dir,
+    get_session_audio_parts_dir,
+    get_session_preprocess_dir,
+)
+from talekeeper.services.recording_registry import (
+    RecordingInProgressError,
+    RecordingLimitError,
+    registry,
+    resolve_max_concurrent_recordings,
+)
+from talekeeper.services.audio_catalog import (
+    catalog_audio_part,
+    catalog_session_audio,
+    session_audio_metadata,
+)
+from talekeeper.services.jobs import (
+    Job,
+    cancel_superseded_jobs,
+    register_runner,
+    rollback_diarization,
+    rollback_transcript,
+)
+from talekeeper.services.preprocessing import invalidate_preprocessing, schedule_preprocessing
+
+if TYPE_CHECKING:
+    from talekeeper.services.diarization import EmbeddingPrefetch
 
 router = APIRouter(tags=["recording"])
 
-# Track active recording session (in-process lock)
-_active_recording_session: int | None = None
-
 
 @router.websocket("/ws/recording/{session_id}")
 async def recording_ws(websocket: WebSocket, session_id: int) -> None:
-    global _active_recording_session
-
     await websocket.accept()
 
-    if _active_recording_session is not None and _active_recording_session != session_id:
-        await websocket.send_json({"type": "error", "message": "Another session is recording"})
+    if registry.is_recording(session_id):
+        await websocket.send_json({"type": "error", "message": "Session is already recording"})
         await websocket.close()
         return
 
@@ -43,24 +69,34 @@ async def recording_ws(websocket: WebSocket, session_id: int) -> None:
         session = dict(rows[0])
         campaign_id = session["campaign_id"]
 
-        # Update session status to recording
-        await db.execute(
-            "UPDATE sessions SET status = 'recording', updated_at = datetime('now') WHERE id = ?",
-            (session_id,),
-        )
-
-    _active_recording_session = session_id
+    # A new recording replaces the audio a pending refinement would read
+    await cancel_superseded_jobs(session_id)
+    max_concurrent = await resolve_max_concurrent_recordings()
 
     # Prepare audio paths
     audio_dir = get_campaign_audio_dir(campaign_id)
     audio_dir.mkdir(parents=True, exist_ok=True)
     audio_path = audio_dir / f"{session_id}.webm"
 
-    # Disk-based chunk storage
+    # Disk-based chunk storage, one directory per recording
     chunk_dir = audio_dir / f"tmp_{session_id}"
+
+    try:
+        recording = registry.start(session_id, campaign_id, chunk_dir, max_concurrent)
+    except (RecordingInProgressError, RecordingLimitError) as exc:
+        await websocket.send_json({"type": "error", "message": str(exc)})
+        await websocket.close()
+        return
+
     chunk_dir.mkdir(parents=True, exist_ok=True)
 
-    chunk_count = 0
+    async with get_db() as db:
+        # Update session status to recording
+        await db.execute(
+            "UPDATE sessions SET status = 'recording', updated_at = datetime('now') WHERE id = ?",
+            (session_id,),
+        )
+
     num_speakers_override: int | None = None
 
     try:
@@ -68,9 +104,7 @@ async def recording_ws(websocket: WebSocket, session_id: int) -> None:
             data = await websocket.receive()
 
             if "bytes" in data:
-                chunk_file = chunk_dir / f"chunk_{chunk_count:03d}.webm"
-                chunk_file.write_bytes(data["bytes"])
-                chunk_count += 1
+                await recording.write_chunk(data["bytes"])
             elif "text" in data:
                 msg = json.loads(data["text"])
                 if msg.get("type") == "stop":
@@ -80,22 +114,27 @@ async def recording_ws(websocket: WebSocket, session_id: int) -> None:
                         if not (1 <= num_speakers_override <= 10):
                             num_speakers_override = None
                     break
+            elif data.get("type") == "websocket.disconnect":
+                break
     except WebSocketDisconnect:
         pass
     finally:
-        _active_recording_session = None
+        registry.stop(session_id)
 
         # Merge chunk files into the final .webm
         chunk_files = sorted(chunk_dir.glob("chunk_*.webm"))
         if chunk_files:
             from talekeeper.services.audio import merge_chunk_files
-            merge_chunk_files(chunk_dir, audio_path)
+            await asyncio.to_thread(merge_chunk_files, chunk_dir, audio_path)
 
             async with get_db() as db:
                 await db.execute(
                     "UPDATE sessions SET audio_path = ?, status = 'audio_ready', updated_at = datetime('now') WHERE id = ?",
                     (str(audio_path.resolve()), session_id),
                 )
+            await catalog_session_audio(session_id, audio_path)
+            # Decode and embed now so Process has less left to do
+            await schedule_preprocessing(audio_path, get_session_preprocess_dir(campaign_id, session_id))
         else:
             # No audio recorded, revert to draft and clean up
             if chunk_dir.exists():
@@ -109,6 +148,14 @@ async def recording_ws(websocket: WebSocket, session_id: int) -> None:
                 )
 
 
+@router.get("/api/recordings/active")
+async def list_active_recordings() -> dict:
+    """Report in-progress recordings with per-session resource accounting."""
+    stats = registry.stats()
+    stats["max_concurrent"] = await resolve_max_concurrent_recordings()
+    return stats
+
+
 @router.get("/api/sessions/{session_id}/audio")
 async def get_session_audio(session_id: int) -> FileResponse:
     async with get_db() as db:
@@ -139,31 +186,45 @@ async def upload_audio(session_id: int, file: UploadFile) -> dict:
     if not content_type.startswith("audio/"):
         raise HTTPException(status_code=400, detail="Only audio files are accepted")
 
-    # Look up session
-    async with get_db() as db:
-        rows = await db.execute_fetchall(
-            "SELECT id, campaign_id, audio_path FROM sessions WHERE id = ?",
-            (session_id,),
-        )
-    if not rows:
-        raise HTTPException(status_code=404, detail="Session not found")
+    session = await _get_session_campaign(session_id)
+    audio_path = await _replace_session_audio(session, _upload_extension(file.filename, content_type))
+    content_hash = await _save_upload_file(file, audio_path)
+    await _store_session_audio(session, audio_path, content_hash)
+
+    return {"audio_path": str(audio_path)}
 
-    session = dict(rows[0])
-    campaign_id = session["campaign_id"]
 
-    # Derive extension from uploaded filename
-    original_name = file.filename or ""
+def _upload_extension(filename: str | None, content_type: str) -> str:
+    """Derive the stored file's extension from the uploaded filename or content type."""
+    original_name = filename or ""
     ext = Path(original_name).suffix if "." in original_name else ""
     if not ext:
         # Fallback: guess from content type
         ext = mimetypes.guess_extension(content_type) or ""
-    if not ext:
-        ext = ".bin"
+    return ext or ".bin"
+
+
+async def _save_upload_file(file: UploadFile, path: Path) -> str:
+    """Stream an uploaded file to *path*, returning its SHA-256 hash."""
+    digest = hashlib.sha256()
+    with open(path, "wb") as f:
+        while chunk := await file.read(1024 * 1024):  # 1MB chunks
+            f.write(chunk)
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def _replace_session_audio(session: dict, ext: str) -> Path:
+    """Clear a session's previous audio and results; return where the new file goes."""
+    session_id = session["id"]
+    campaign_id = session["campaign_id"]
 
     # If session already has audio, delete old file and clear transcript/speakers
     old_audio_path = session.get("audio_path")
     if old_audio_path:
+        await cancel_superseded_jobs(session_id)
         old_path = Path(old_audio_path)
+        await invalidate_preprocessing(old_path)
         if old_path.exists():
             old_path.unlink()
         async with get_db() as db:
@@ -177,20 +238,22 @@ async def upload_audio(session_id: int, file: UploadFile) -> dict:
     # Save file to audio_dir/{campaign_id}/{session_id}.{ext}
     audio_dir = get_campaign_audio_dir(campaign_id)
     audio_dir.mkdir(parents=True, exist_ok=True)
-    audio_path = audio_dir / f"{session_id}{ext}"
+    return audio_dir / f"{session_id}{ext}"
 
-    with open(audio_path, "wb") as f:
-        while chunk := await file.read(1024 * 1024):  # 1MB chunks
-            f.write(chunk)
 
-    # Update session audio_path
+async def _store_session_audio(session: dict, audio_path: Path, content_hash: str) -> None:
+    """Record a newly written session audio file, then catalog and pre-process it."""
+    session_id = session["id"]
     async with get_db() as db:
         await db.execute(
             "UPDATE sessions SET audio_path = ?, updated_at = datetime('now') WHERE id = ?",
             (str(audio_path), session_id),
         )
 
-    return {"audio_path": str(audio_path)}
+    await catalog_session_audio(session_id, audio_path, content_hash)
+    await schedule_preprocessing(
+        audio_path, get_session_preprocess_dir(session["campaign_id"], session_id)
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -204,6 +267,11 @@ class AudioPartResponse(BaseModel):
     original_name: str
     sort_order: int
     created_at: str
+    duration: float | None = None
+    codec: str | None = None
+    sample_rate: int | None = None
+    channels: int | None = None
+    content_hash: str | None = None
 
 
 class ReorderRequest(BaseModel):
@@ -218,13 +286,159 @@ async def _get_session_campaign(session_id: int) -> dict:
     """Fetch session row; raise 404 if not found."""
     async with get_db() as db:
         rows = await db.execute_fetchall(
-            "SELECT id, campaign_id FROM sessions WHERE id = ?", (session_id,)
+            "SELECT id, campaign_id, audio_path FROM sessions WHERE id = ?", (session_id,)
         )
     if not rows:
         raise HTTPException(status_code=404, detail="Session not found")
     return dict(rows[0])
 
 
+async def _load_audio_inputs(
+    session_id: int, require_audio: bool = True
+) -> tuple[Path | None, str, str | None]:
+    """Re-read a job's inputs: audio path, language and Whisper model setting.
+
+    Jobs may start long after they were queued (or after a restart), so they
+    read the current session row instead of values captured by the request.
+    """
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT audio_path, language FROM sessions WHERE id = ?", (session_id,)
+        )
+        model_rows = await db.execute_fetchall(
+            "SELECT value FROM settings WHERE key = 'whisper_model'"
+        )
+    if not rows:
+        raise RuntimeError("Session not found")
+
+    audio_path = Path(rows[0]["audio_path"]) if rows[0]["audio_path"] else None
+    if require_audio and (audio_path is None or not audio_path.exists()):
+        raise RuntimeError("Audio file not found")
+    language = rows[0]["language"] or "en"
+    model_name = model_rows[0]["value"] if model_rows and model_rows[0]["value"] else None
+    return audio_path, language, model_name
+
+
+async def _reset_diarization(session_id: int) -> None:
+    """Undo a partial diarization so it can be re-run on the stored transcript."""
+    async with get_db() as db:
+        await db.execute(
+            "DELETE FROM transcript_segments WHERE session_id = ? AND parent_segment_id IS NOT NULL",
+            (session_id,),
+        )
+        await db.execute(
+            "UPDATE transcript_segments SET speaker_id = NULL, is_overlap = 0 WHERE session_id = ?",
+            (session_id,),
+        )
+        await db.execute("DELETE FROM speakers WHERE session_id = ?", (session_id,))
+
+
+async def _keep_transcribed_segments(session_id: int, count: int) -> None:
+    """Drop segments stored after the last transcription checkpoint.
+
+    A run that stopped mid-chunk may have stored part of that chunk; the
+    resumed run transcribes the whole chunk again.
+    """
+    async with get_db() as db:
+        await db.execute(
+            """DELETE FROM transcript_segments WHERE session_id = ? AND id NOT IN (
+                 SELECT id FROM transcript_segments WHERE session_id = ? ORDER BY id LIMIT ?
+               )""",
+            (session_id, session_id, count),
+        )
+
+
+async def _summary_content(summary_id: int | None) -> str | None:
+    if summary_id is None:
+        return None
+    async with get_db() as db:
+        rows = await db.execute_fetchall("SELECT content FROM summaries WHERE id = ?", (summary_id,))
+    return rows[0]["content"] if rows else None
+
+
+async def _pipeline_inputs(
+    audio_path: Path, pipeline_mode: str, progress_callback
+) -> tuple[Path, "EmbeddingPrefetch | None"]:
+    """Pick the ASR input and start embedding extraction, reusing eager pre-processing.
+
+    Whisper reads the pre-decoded WAV when one is ready. Embeddings are only
+    extracted alongside ASR when pre-processing has not produced (and is not
+    producing) them already.
+    """
+    from talekeeper.services.diarization import start_embedding_prefetch
+    from talekeeper.services.preprocessing import load_preprocessed, preprocessing_pending
+
+    preprocessed = await load_preprocessed(audio_path, wait=False)
+    asr_input = preprocessed.wav_path if preprocessed and preprocessed.wav_path else audio_path
+    embeddings_ready = preprocessing_pending(audio_path) or (
+        preprocessed is not None and preprocessed.speech_embeddings is not None
+    )
+    prefetch = None
+    if pipeline_mode == "concurrent" and not embeddings_ready:
+        prefetch = start_embedding_prefetch(audio_path, progress_callback)
+    return asr_input, prefetch
+
+
+async def _diarize_session_audio(
+    session_id: int,
+    audio_path: Path,
+    prefetch: "EmbeddingPrefetch | None",
+    num_speakers: int | None,
+    progress_callback,
+) -> None:
+    """Diarize from prefetched or pre-processed embeddings, else decode and run it all."""
+    from talekeeper.services.audio import audio_to_wav
+    from talekeeper.services.diarization import run_final_diarization
+    from talekeeper.services.preprocessing import discard_preprocessed_wav, preprocessed_embeddings
+
+    embeddings = await prefetch if prefetch is not None else await preprocessed_embeddings(audio_path)
+    if embeddings is not None:
+        # Only clustering and alignment remain
+        await run_final_diarization(
+            session_id, None,
+            num_speakers_override=num_speakers,
+            progress_callback=progress_callback,
+            part_embeddings=[embeddings],
+        )
+    else:
+        wav_path = audio_to_wav(audio_path)
+        try:
+            await run_final_diarization(session_id, wav_path, num_speakers_override=num_speakers, progress_callback=progress_callback)
+        finally:
+            if wav_path.exists():
+                wav_path.unlink()
+    await discard_preprocessed_wav(audio_path)
+
+
+class _PrefetchGuard:
+    """Settle a runner's embedding prefetch when the runner stops before using it.
+
+    A preempted job hands the extraction to pre-processing, which caches the
+    embeddings for the resumed run; a failed or cancelled job stops it.
+    """
+
+    def __init__(self, job: Job, audio_path: Path, cache_dir: Path) -> None:
+        self.job = job
+        self.audio_path = audio_path
+        self.cache_dir = cache_dir
+        self.prefetch: "EmbeddingPrefetch | None" = None
+
+    def __enter__(self) -> "_PrefetchGuard":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        from talekeeper.services.preprocessing import adopt_embedding_prefetch
+
+        prefetch = self.prefetch
+        if prefetch is None or prefetch.done():
+            return
+        if self.job.status == "queued":
+            # Preempted: the queue put the job back and it resumes from its checkpoint
+            adopt_embedding_prefetch(self.audio_path, self.cache_dir, prefetch)
+        else:
+            prefetch.cancel()
+
+
 @router.post("/api/sessions/{session_id}/audio-parts", response_model=AudioPartResponse)
 async def upload_audio_part(session_id: int, file: UploadFile) -> dict:
     """Upload one audio file as a new part for the session."""
@@ -233,9 +447,15 @@ async def upload_audio_part(session_id: int, file: UploadFile) -> dict:
         raise HTTPException(status_code=400, detail="Only audio files are accepted")
 
     session = await _get_session_campaign(session_id)
-    campaign_id = session["campaign_id"]
-
     original_name = file.filename or "audio"
+    file_path, next_order = await _next_part_path(session, original_name, content_type)
+    content_hash = await _save_upload_file(file, file_path)
+    return await _store_audio_part(session, file_path, original_name, next_order, content_hash)
+
+
+async def _next_part_path(session: dict, original_name: str, content_type: str) -> tuple[Path, int]:
+    """Where the session's next audio part is stored, and its sort_order."""
+    session_id = session["id"]
     ext = Path(original_name).suffix or (mimetypes.guess_extension(content_type) or ".bin")
 
     # Determine next sort_order
@@ -246,15 +466,28 @@ async def upload_audio_part(session_id: int, file: UploadFile) -> dict:
         )
     next_order = (rows[0]["max_order"] if rows else 0) + 1
 
-    # Save file
-    parts_dir = get_session_audio_parts_dir(campaign_id, session_id)
+    parts_dir = get_session_audio_parts_dir(session["campaign_id"], session_id)
     parts_dir.mkdir(parents=True, exist_ok=True)
     safe_name = f"{next_order}_{Path(original_name).stem}{ext}"
-    file_path = parts_dir / safe_name
+    return parts_dir / safe_name, next_order
 
-    with open(file_path, "wb") as f:
-        while chunk := await file.read(1024 * 1024):
-            f.write(chunk)
+
+async def _store_audio_part(
+    session: dict, file_path: Path, original_name: str, next_order: int, content_hash: str
+) -> dict:
+    """Record a newly written audio part, unless the session already has identical audio.
+
+    A duplicate is deleted again and the existing part is returned instead.
+    """
+    session_id = session["id"]
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT * FROM session_audio_files WHERE session_id = ? AND content_hash = ?",
+            (session_id, content_hash),
+        )
+    if rows:
+        file_path.unlink(missing_ok=True)
+        return dict(rows[0])
 
     async with get_db() as db:
         cursor = await db.execute(
@@ -262,10 +495,16 @@ async def upload_audio_part(session_id: int, file: UploadFile) -> dict:
             (session_id, str(file_path), original_name, next_order),
         )
         row_id = cursor.lastrowid
+    await catalog_audio_part(row_id, file_path, content_hash)
+    async with get_db() as db:
         rows = await db.execute_fetchall(
             "SELECT * FROM session_audio_files WHERE id = ?", (row_id,)
         )
 
+    await schedule_preprocessing(
+        file_path, get_session_audio_cache_dir(session["campaign_id"], session_id), audio_file_id=row_id
+    )
+
     return dict(rows[0])
 
 
@@ -299,6 +538,10 @@ async def delete_audio_part(session_id: int, part_id: int) -> dict:
         if file_path.exists():
             file_path.unlink()
 
+        from talekeeper.services.audio_parts import invalidate_part_cache
+        await invalidate_part_cache(part_id)
+        await invalidate_preprocessing(file_path)
+
         await db.execute(
             "DELETE FROM session_audio_files WHERE id = ?", (part_id,)
         )
@@ -332,23 +575,153 @@ async def reorder_audio_parts(session_id: int, body: ReorderRequest) -> dict:
     return {"reordered": True}
 
 
-def _sse_event(event: str, data: dict) -> str:
-    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+# ---------------------------------------------------------------------------
+# Resumable uploads
+# ---------------------------------------------------------------------------
 
+class UploadCreate(BaseModel):
+    filename: str
+    content_type: str
+    size: int = Field(ge=0)
+    target: Literal["audio", "part"] = "part"
+    sha256: str | None = None
 
-@router.post("/api/sessions/{session_id}/process-audio")
-async def process_audio(session_id: int, num_speakers: int | None = Query(default=None, ge=1, le=10)) -> StreamingResponse:
-    """Run transcription + diarization on uploaded audio, streaming progress via SSE."""
-    from talekeeper.services.transcription import (
-        transcribe_chunked,
-        TranscriptSegment,
-        ChunkProgress,
+
+async def _find_duplicate_audio(session: dict, target: str, content_hash: str) -> dict | None:
+    """The session's existing audio or audio part with this content hash, if any."""
+    async with get_db() as db:
+        if target == "part":
+            rows = await db.execute_fetchall(
+                "SELECT * FROM session_audio_files WHERE session_id = ? AND content_hash = ?",
+                (session["id"], content_hash),
+            )
+            return {"duplicate": True, "part": dict(rows[0])} if rows else None
+        rows = await db.execute_fetchall(
+            "SELECT audio_path FROM sessions WHERE id = ? AND audio_hash = ?",
+            (session["id"], content_hash),
+        )
+    if rows and rows[0]["audio_path"] and Path(rows[0]["audio_path"]).exists():
+        return {"duplicate": True, "audio_path": rows[0]["audio_path"]}
+    return None
+
+
+@router.post("/api/sessions/{session_id}/uploads")
+async def create_upload(session_id: int, body: UploadCreate) -> dict:
+    """Start a resumable upload of session audio or an audio part.
+
+    With a ``sha256`` that matches audio the session already has, nothing needs
+    to be sent and the existing audio is returned.
+    """
+    from talekeeper.services.uploads import create_upload as create
+
+    if not body.content_type.startswith("audio/"):
+        raise HTTPException(status_code=400, detail="Only audio files are accepted")
+    session = await _get_session_campaign(session_id)
+    if body.sha256:
+        duplicate = await _find_duplicate_audio(session, body.target, body.sha256.lower())
+        if duplicate is not None:
+            return duplicate
+
+    upload = await create(
+        session_id, session["campaign_id"], body.target, body.filename,
+        body.content_type, body.size, body.sha256,
     )
-    from talekeeper.services.resource_orchestration import (
-        cleanup_transcription,
-        cleanup_diarization,
+    return upload.to_dict()
+
+
+@router.get("/api/uploads/{upload_id}")
+async def get_upload(upload_id: str) -> dict:
+    """Report how many bytes of an upload the server has, to resume from there."""
+    from talekeeper.services.uploads import get_upload as get
+
+    upload = await get(upload_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload.to_dict()
+
+
+@router.patch("/api/uploads/{upload_id}")
+async def append_upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(ge=0),
+) -> dict:
+    """Append the request body at ``Upload-Offset``; 409 reports the offset to resume from."""
+    from talekeeper.services.uploads import UploadOffsetError, append_chunk
+
+    try:
+        upload = await append_chunk(upload_id, upload_offset, request.stream())
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    except UploadOffsetError as exc:
+        raise HTTPException(status_code=409, detail={"message": str(exc), "offset": exc.offset})
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return upload.to_dict()
+
+
+@router.post("/api/uploads/{upload_id}/complete")
+async def complete_upload(upload_id: str) -> dict:
+    """Verify a fully sent upload and store it like a regular upload.
+
+    An audio part identical to one the session already has is not stored again.
+    """
+    from talekeeper.services.uploads import (
+        UploadHashMismatchError,
+        UploadIncompleteError,
+        complete_upload as complete,
+        discard_upload,
     )
 
+    try:
+        upload, content_hash = await complete(upload_id)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    except UploadIncompleteError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except UploadHashMismatchError as exc:
+        await discard_upload(upload_id)
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    try:
+        session = await _get_session_campaign(upload.session_id)
+        duplicate = await _find_duplicate_audio(session, upload.target, content_hash)
+        if duplicate is not None:
+            return duplicate
+
+        if upload.target == "audio":
+            audio_path = await _replace_session_audio(
+                session, _upload_extension(upload.filename, upload.content_type)
+            )
+            await asyncio.to_thread(shutil.move, upload.temp_path, audio_path)
+            await _store_session_audio(session, audio_path, content_hash)
+            return {"duplicate": False, "audio_path": str(audio_path)}
+
+        file_path, next_order = await _next_part_path(session, upload.filename, upload.content_type)
+        await asyncio.to_thread(shutil.move, upload.temp_path, file_path)
+        part = await _store_audio_part(session, file_path, upload.filename, next_order, content_hash)
+        return {"duplicate": False, "part": part}
+    finally:
+        await discard_upload(upload_id)
+
+
+@router.delete("/api/uploads/{upload_id}")
+async def abort_upload(upload_id: str) -> dict:
+    """Abandon an upload and delete what was received."""
+    from talekeeper.services.uploads import discard_upload, get_upload as get
+
+    if await get(upload_id) is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    await discard_upload(upload_id)
+    return {"deleted": upload_id}
+
+
+@router.post("/api/sessions/{session_id}/process-audio")
+async def process_audio(session_id: int, num_speakers: int | None = Query(default=None, ge=1, le=10)) -> StreamingResponse:
+    """Queue transcription + diarization of uploaded audio and stream its progress via SSE.
+
+    The work runs as a background job; the stream can be resumed via /api/jobs.
+    """
     async with get_db() as db:
         rows = await db.execute_fetchall(
             "SELECT * FROM sessions WHERE id = ?", (session_id,)
@@ -364,137 +737,195 @@ async def process_audio(session_id: int, num_speakers: int | None = Query(defaul
         if not audio_path.exists():
             raise HTTPException(status_code=404, detail="Audio file not found")
 
-        language = session.get("language", "en")
+    return await job_response(session_id, "process_audio", {"num_speakers": num_speakers})
 
-        model_rows = await db.execute_fetchall(
-            "SELECT value FROM settings WHERE key = 'whisper_model'"
-        )
-        model_name = model_rows[0]["value"] if model_rows and model_rows[0]["value"] else None
 
-    async def sse_generator() -> AsyncIterator[str]:
-        segments_count = 0
-        try:
-            # Clear existing transcript/speakers and set status
-            async with get_db() as db:
-                await db.execute(
-                    "DELETE FROM transcript_segments WHERE session_id = ?", (session_id,)
-                )
-                await db.execute(
-                    "DELETE FROM speakers WHERE session_id = ?", (session_id,)
-                )
-                await db.execute(
-                    "UPDATE sessions SET status = 'transcribing', updated_at = datetime('now') WHERE id = ?",
-                    (session_id,),
-                )
+async def _rollback_process_audio(job: Job) -> None:
+    """A stored transcript is kept; only the diarization in progress is undone."""
+    if job.checkpoint.get("phase") == "diarization":
+        await rollback_diarization(job)
+    else:
+        await rollback_transcript(job)
+
+
+@register_runner("process_audio", model="transcription", rollback=_rollback_process_audio)
+async def _run_process_audio(job: Job) -> AsyncIterator[tuple[str, dict]]:
+    """Transcribe and diarize a session's audio as a background job."""
+    from talekeeper.services.transcription import (
+        transcribe_chunked,
+        TranscriptSegment,
+        ChunkProgress,
+        DEFAULT_MODEL,
+    )
+    from talekeeper.services.refinement import (
+        queue_refinement,
+        record_draft_ready,
+        resolve_two_pass_config,
+    )
+    from talekeeper.services.resource_orchestration import (
+        cleanup_transcription,
+        cleanup_diarization,
+    )
+    from talekeeper.services.diarization import resolve_pipeline_mode
+
+    session_id = job.session_id
+    num_speakers = job.params.get("num_speakers")
+    audio_path, language, model_name = await _load_audio_inputs(session_id)
+
+    segments_count = 0
+    started_at = time.monotonic()
+    two_pass = await resolve_two_pass_config()
+    final_model = model_name or DEFAULT_MODEL
+    first_model = two_pass.draft_model if two_pass.enabled else final_model
+
+    progress_events: list[tuple[str, dict]] = []
+
+    def _diarization_progress(stage: str, detail: dict) -> None:
+        if stage == "vad_start":
+            progress_events.append(("progress", {"detail": "Detecting speech activity..."}))
+        elif stage == "vad_done":
+            n = detail["num_segments"]
+            secs = int(detail["total_speech_seconds"])
+            progress_events.append(("progress", {"detail": f"Found {n} speech segments ({secs}s of speech)"}))
+        elif stage == "change_detection_start":
+            progress_events.append(("progress", {"detail": "Detecting speaker changes..."}))
+        elif stage == "change_detection_done":
+            n = detail["num_segments_processed"]
+            c = detail["num_changes_found"]
+            progress_events.append(("progress", {"detail": f"Found {c} speaker changes in {n} segments"}))
+        elif stage == "embeddings":
+            cur, total = detail["current"], detail["total"]
+            if cur % max(1, total // 20) == 0 or cur == total:
+                progress_events.append(("progress", {"detail": f"Extracting speaker embeddings ({cur}/{total})..."}))
+        elif stage == "clustering_done":
+            ns = detail["num_speakers"]
+            nseg = detail["num_segments"]
+            progress_events.append(("progress", {"detail": f"Found {ns} speakers, {nseg} segments"}))
+
+    pipeline_mode = await resolve_pipeline_mode()
+    prefetch = None
+    campaign_id = (await _get_session_campaign(session_id))["campaign_id"]
+    preprocess_dir = get_session_preprocess_dir(campaign_id, session_id)
+
+    with _PrefetchGuard(job, audio_path, preprocess_dir) as guard:
+        phase = job.checkpoint.get("phase")
+        if phase == "diarization":
+            # Resumed after the transcript was stored: only diarization is redone
+            segments_count = job.checkpoint.get("segments_count", 0)
+            await _reset_diarization(session_id)
+        else:
+            start_chunk = 0
+            if phase == "transcription":
+                # Resumed mid-transcription: the chunks before the checkpoint are stored
+                segments_count = job.checkpoint["segments_count"]
+                start_chunk = job.checkpoint["chunk"]
+                first_model = job.checkpoint["model_name"]
+                await _keep_transcribed_segments(session_id, segments_count)
+            else:
+                # Clear existing transcript/speakers and set status
+                async with get_db() as db:
+                    await db.execute(
+                        "DELETE FROM transcript_segments WHERE session_id = ?", (session_id,)
+                    )
+                    await db.execute(
+                        "DELETE FROM speakers WHERE session_id = ?", (session_id,)
+                    )
+                    await db.execute(
+                        "UPDATE sessions SET status = 'transcribing', updated_at = datetime('now') WHERE id = ?",
+                        (session_id,),
+                    )
+
+            # Speaker embeddings do not depend on the transcript: extract them alongside ASR
+            asr_input, prefetch = await _pipeline_inputs(audio_path, pipeline_mode, _diarization_progress)
+            guard.prefetch = prefetch
 
             from talekeeper.services.thread_utils import iterate_in_thread
-            kwargs = {"language": language}
-            if model_name:
-                kwargs["model_name"] = model_name
-            async for item in iterate_in_thread(transcribe_chunked(audio_path, **kwargs)):
+            # In two-pass mode the first pass uses the fast draft model
+            metadata = await session_audio_metadata(session_id)
+            kwargs = {
+                "language": language,
+                "model_name": first_model,
+                "duration": metadata.duration if metadata else None,
+                "start_chunk": start_chunk,
+            }
+            async for item in iterate_in_thread(
+                transcribe_chunked(asr_input, **kwargs), on_cancel=cleanup_transcription,
+            ):
                 if isinstance(item, ChunkProgress):
-                    yield _sse_event("progress", {
+                    if item.chunk > start_chunk + 1:
+                        # Every earlier chunk is stored; a resumed run starts at this one
+                        await job.save_checkpoint(
+                            phase="transcription", chunk=item.chunk - 1,
+                            segments_count=segments_count, model_name=first_model,
+                        )
+                    yield ("progress", {
                         "chunk": item.chunk,
                         "total_chunks": item.total_chunks,
                     })
                 elif isinstance(item, TranscriptSegment):
                     async with get_db() as db:
                         await db.execute(
-                            "INSERT INTO transcript_segments (session_id, text, start_time, end_time) VALUES (?, ?, ?, ?)",
-                            (session_id, item.text, item.start_time, item.end_time),
+                            "INSERT INTO transcript_segments (session_id, text, start_time, end_time, model_name) VALUES (?, ?, ?, ?, ?)",
+                            (session_id, item.text, item.start_time, item.end_time, first_model),
                         )
 
-                    yield _sse_event("segment", {
+                    yield ("segment", {
                         "text": item.text,
                         "start_time": item.start_time,
                         "end_time": item.end_time,
                     })
                     segments_count += 1
 
-            cleanup_transcription()
+            await job.save_checkpoint(phase="diarization", segments_count=segments_count)
 
-            # Signal phase change to frontend
-            yield _sse_event("phase", {"phase": "diarization"})
-
-            # Run speaker diarization with progress reporting
-            from talekeeper.services.diarization import run_final_diarization
-            from talekeeper.services.audio import audio_to_wav
-
-            progress_events: list[str] = []
-
-            def _diarization_progress(stage: str, detail: dict) -> None:
-                if stage == "vad_start":
-                    progress_events.append(_sse_event("progress", {"detail": "Detecting speech activity..."}))
-                elif stage == "vad_done":
-                    n = detail["num_segments"]
-                    secs = int(detail["total_speech_seconds"])
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {n} speech segments ({secs}s of speech)"}))
-                elif stage == "change_detection_start":
-                    progress_events.append(_sse_event("progress", {"detail": "Detecting speaker changes..."}))
-                elif stage == "change_detection_done":
-                    n = detail["num_segments_processed"]
-                    c = detail["num_changes_found"]
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {c} speaker changes in {n} segments"}))
-                elif stage == "embeddings":
-                    cur, total = detail["current"], detail["total"]
-                    if cur % max(1, total // 20) == 0 or cur == total:
-                        progress_events.append(_sse_event("progress", {"detail": f"Extracting speaker embeddings ({cur}/{total})..."}))
-                elif stage == "clustering_done":
-                    ns = detail["num_speakers"]
-                    nseg = detail["num_segments"]
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {ns} speakers, {nseg} segments"}))
-
-            wav_path = audio_to_wav(audio_path)
-            try:
-                await run_final_diarization(session_id, wav_path, num_speakers_override=num_speakers, progress_callback=_diarization_progress)
-            finally:
-                if wav_path.exists():
-                    wav_path.unlink()
+        cleanup_transcription()
 
-            for evt in progress_events:
-                yield evt
+        # Signal phase change to frontend
+        yield ("phase", {"phase": "diarization"})
 
-            cleanup_diarization()
+        # Run speaker diarization with progress reporting
+        await _diarize_session_audio(session_id, audio_path, prefetch, num_speakers, _diarization_progress)
 
-            # Mark session as completed
-            async with get_db() as db:
-                await db.execute(
-                    "UPDATE sessions SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
-                    (session_id,),
-                )
+        for evt in progress_events:
+            yield evt
 
-            yield _sse_event("done", {"segments_count": segments_count})
+        cleanup_diarization()
 
-            # Fire-and-forget: generate session name from transcript
-            from talekeeper.services.session_naming import maybe_generate_and_update_name
-            asyncio.create_task(maybe_generate_and_update_name(session_id))
+        # Mark session as completed
+        async with get_db() as db:
+            await db.execute(
+                "UPDATE sessions SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
+                (session_id,),
+            )
 
-        except Exception as exc:
-            yield _sse_event("error", {"message": str(exc)})
-            async with get_db() as db:
-                await db.execute(
-                    "UPDATE sessions SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
-                    (session_id,),
-                )
+        draft_seconds = time.monotonic() - started_at
+        await record_draft_ready(session_id, draft_seconds, final=not two_pass.enabled)
+
+        yield ("done", {
+            "segments_count": segments_count,
+            "time_to_first_seconds": draft_seconds,
+            "refining": two_pass.enabled,
+        })
 
-    return StreamingResponse(sse_generator(), media_type="text/event-stream")
+        if two_pass.enabled:
+            queue_refinement(job, final_model, language, started_at)
+
+        # Fire-and-forget: generate session name from transcript
+        from talekeeper.services.session_naming import maybe_generate_and_update_name
+        asyncio.create_task(maybe_generate_and_update_name(session_id))
 
 
 @router.post("/api/sessions/{session_id}/merge-audio")
 async def merge_audio(session_id: int, num_speakers: int | None = Query(default=None, ge=1, le=10)) -> StreamingResponse:
-    """Merge audio parts, then run transcription + diarization, streaming progress via SSE."""
-    from talekeeper.services.transcription import (
-        transcribe_chunked,
-        TranscriptSegment,
-        ChunkProgress,
-    )
-    from talekeeper.services.resource_orchestration import (
-        cleanup_transcription,
-        cleanup_diarization,
-    )
-
-    session = await _get_session_campaign(session_id)
-    campaign_id = session["campaign_id"]
+    """Queue merging of audio parts, then transcription + diarization, streaming progress via SSE.
+
+    Parts are transcribed and embedded independently and cached, so after a
+    part is appended or the parts are reordered only new parts are processed.
+    Cached results are shifted onto the session timeline; speakers are
+    clustered per part and linked across parts before a single alignment pass.
+    The merged playback file is built in the background after processing.
+    """
+    await _get_session_campaign(session_id)
 
     # Check that there are audio parts
     async with get_db() as db:
@@ -504,152 +935,238 @@ async def merge_audio(session_id: int, num_speakers: int | None = Query(default=
         if not parts:
             raise HTTPException(status_code=400, detail="No audio parts for this session")
 
-        rows = await db.execute_fetchall("SELECT * FROM sessions WHERE id = ?", (session_id,))
-        session_row = dict(rows[0])
-        language = session_row.get("language", "en")
+    return await job_response(session_id, "merge_audio", {"num_speakers": num_speakers})
 
-        model_rows = await db.execute_fetchall(
-            "SELECT value FROM settings WHERE key = 'whisper_model'"
-        )
-        model_name = model_rows[0]["value"] if model_rows and model_rows[0]["value"] else None
 
-    async def sse_generator() -> AsyncIterator[str]:
-        segments_count = 0
-        try:
-            # Phase 1: Merge audio parts
-            yield _sse_event("phase", {"phase": "merging"})
-
-            from talekeeper.services.audio_merge import merge_audio_parts
-            audio_dir = get_campaign_audio_dir(campaign_id)
-            audio_dir.mkdir(parents=True, exist_ok=True)
-            merged_path = audio_dir / f"{session_id}_merged.wav"
+@register_runner("merge_audio", model="transcription", rollback=rollback_transcript)
+async def _run_merge_audio(job: Job) -> AsyncIterator[tuple[str, dict]]:
+    """Merge, transcribe and diarize a session's audio parts as a background job."""
+    from talekeeper.services.transcription import (
+        transcribe_chunked,
+        TranscriptSegment,
+        ChunkProgress,
+        DEFAULT_MODEL,
+    )
+    from talekeeper.services.resource_orchestration import (
+        cleanup_transcription,
+        cleanup_diarization,
+    )
 
-            await merge_audio_parts(session_id, merged_path)
+    session_id = job.session_id
+    num_speakers = job.params.get("num_speakers")
+    campaign_id = (await _get_session_campaign(session_id))["campaign_id"]
+    _, language, model_name = await _load_audio_inputs(session_id, require_audio=False)
 
-            async with get_db() as db:
-                await db.execute(
-                    "UPDATE sessions SET audio_path = ?, updated_at = datetime('now') WHERE id = ?",
-                    (str(merged_path), session_id),
-                )
+    async def _insert_segments(segments: list) -> None:
+        async with get_db() as db:
+            await db.executemany(
+                "INSERT INTO transcript_segments (session_id, text, start_time, end_time) VALUES (?, ?, ?, ?)",
+                [(session_id, seg.text, seg.start_time, seg.end_time) for seg in segments],
+            )
 
-            # Clear existing transcript/speakers and set status to transcribing
-            async with get_db() as db:
-                await db.execute(
-                    "DELETE FROM transcript_segments WHERE session_id = ?", (session_id,)
-                )
-                await db.execute(
-                    "DELETE FROM speakers WHERE session_id = ?", (session_id,)
-                )
-                await db.execute(
-                    "UPDATE sessions SET status = 'transcribing', updated_at = datetime('now') WHERE id = ?",
-                    (session_id,),
-                )
+    segments_count = 0
+    # Per job: the background archive build may still be reading it when the next job starts
+    work_dir = get_session_audio_parts_dir(campaign_id, session_id) / f"_processing_{job.id}"
+    archive_scheduled = False
+    try:
+        # Phase 1: Prepare the parts that have no cached results
+        yield ("phase", {"phase": "merging"})
+
+        from talekeeper.services.audio_merge import decode_to_processing_wav, schedule_session_archive
+        from talekeeper.services.audio_parts import (
+            load_session_parts,
+            save_part_transcript,
+            save_part_embeddings,
+            part_offsets,
+            shift_segments,
+            shifted_part_embeddings,
+            extract_part_embeddings,
+            wav_duration,
+        )
+        audio_dir = get_campaign_audio_dir(campaign_id)
+        audio_dir.mkdir(parents=True, exist_ok=True)
+
+        cache_key_model = model_name or DEFAULT_MODEL
+        audio_parts = await load_session_parts(session_id, cache_key_model, language)
+        total_parts = len(audio_parts)
+
+        # Decode only the parts that are missing cached results, in parallel, reusing
+        # eager pre-processing (and waiting for it if it is still running)
+        from talekeeper.services.preprocessing import discard_preprocessed_wav, load_preprocessed
+
+        work_dir.mkdir(parents=True, exist_ok=True)
+        part_wavs: dict[int, Path] = {}
+
+        async def _processing_wav(part) -> None:
+            preprocessed = await load_preprocessed(part.file_path)
+            if preprocessed is not None and part.needs_embeddings and preprocessed.speech_embeddings:
+                part.embeddings, part.subsegments = preprocessed.speech_embeddings
+            if preprocessed is not None and preprocessed.wav_path is not None:
+                wav = preprocessed.wav_path
+                part.duration = preprocessed.duration
+            else:
+                wav = work_dir / f"part_{part.audio_file_id}.wav"
+                await asyncio.to_thread(decode_to_processing_wav, part.file_path, wav)
+                part.duration = await asyncio.to_thread(wav_duration, wav)
+            part_wavs[part.audio_file_id] = wav
+
+        await asyncio.gather(*(_processing_wav(part) for part in audio_parts if part.needs_processing))
+
+        # Clear existing transcript/speakers and set status to transcribing
+        async with get_db() as db:
+            await db.execute(
+                "DELETE FROM transcript_segments WHERE session_id = ?", (session_id,)
+            )
+            await db.execute(
+                "DELETE FROM speakers WHERE session_id = ?", (session_id,)
+            )
+            await db.execute(
+                "UPDATE sessions SET status = 'transcribing', updated_at = datetime('now') WHERE id = ?",
+                (session_id,),
+            )
 
-            # Phase 2: Transcription
-            from talekeeper.services.thread_utils import iterate_in_thread
-            kwargs = {"language": language}
-            if model_name:
-                kwargs["model_name"] = model_name
-            async for item in iterate_in_thread(transcribe_chunked(merged_path, **kwargs)):
+        # Phase 2: Transcription (new parts only; cached parts are shifted into place)
+        from talekeeper.services.thread_utils import iterate_in_thread
+        kwargs = {"language": language}
+        if model_name:
+            kwargs["model_name"] = model_name
+        offsets = part_offsets(audio_parts)
+        for part_index, (part, offset) in enumerate(zip(audio_parts, offsets), start=1):
+            if not part.needs_transcription:
+                shifted = shift_segments(part.segments, offset)
+                await _insert_segments(shifted)
+                yield ("progress", {
+                    "part": part_index,
+                    "total_parts": total_parts,
+                    "cached": True,
+                })
+                for seg in shifted:
+                    yield ("segment", {
+                        "text": seg.text,
+                        "start_time": seg.start_time,
+                        "end_time": seg.end_time,
+                    })
+                segments_count += len(shifted)
+                continue
+
+            part.segments = []
+            wav = part_wavs[part.audio_file_id]
+            async for item in iterate_in_thread(
+                transcribe_chunked(wav, duration=part.duration, **kwargs),
+                on_cancel=cleanup_transcription,
+            ):
                 if isinstance(item, ChunkProgress):
-                    yield _sse_event("progress", {
+                    yield ("progress", {
                         "chunk": item.chunk,
                         "total_chunks": item.total_chunks,
+                        "part": part_index,
+                        "total_parts": total_parts,
                     })
                 elif isinstance(item, TranscriptSegment):
-                    async with get_db() as db:
-                        await db.execute(
-                            "INSERT INTO transcript_segments (session_id, text, start_time, end_time) VALUES (?, ?, ?, ?)",
-                            (session_id, item.text, item.start_time, item.end_time),
-                        )
-                    yield _sse_event("segment", {
-                        "text": item.text,
-                        "start_time": item.start_time,
-                        "end_time": item.end_time,
+                    part.segments.append(item)
+                    seg = shift_segments([item], offset)[0]
+                    await _insert_segments([seg])
+                    yield ("segment", {
+                        "text": seg.text,
+                        "start_time": seg.start_time,
+                        "end_time": seg.end_time,
                     })
                     segments_count += 1
+            await save_part_transcript(part, cache_key_model, language)
+
+        cleanup_transcription()
+
+        # Phase 3: Diarization — embed new parts, cluster per part, link speakers across parts
+        yield ("phase", {"phase": "diarization"})
+
+        from talekeeper.services.diarization import run_final_diarization
+
+        progress_events: list[tuple[str, dict]] = []
+
+        def _diarization_progress(stage: str, detail: dict) -> None:
+            if stage == "vad_start":
+                progress_events.append(("progress", {"detail": "Detecting speech activity..."}))
+            elif stage == "vad_done":
+                n = detail["num_segments"]
+                secs = int(detail["total_speech_seconds"])
+                progress_events.append(("progress", {"detail": f"Found {n} speech segments ({secs}s of speech)"}))
+            elif stage == "change_detection_start":
+                progress_events.append(("progress", {"detail": "Detecting speaker changes..."}))
+            elif stage == "change_detection_done":
+                n = detail["num_segments_processed"]
+                c = detail["num_changes_found"]
+                progress_events.append(("progress", {"detail": f"Found {c} speaker changes in {n} segments"}))
+            elif stage == "embeddings":
+                cur, total = detail["current"], detail["total"]
+                if cur % max(1, total // 20) == 0 or cur == total:
+                    progress_events.append(("progress", {"detail": f"Extracting speaker embeddings ({cur}/{total})..."}))
+            elif stage == "clustering_done":
+                ns = detail["num_speakers"]
+                nseg = detail["num_segments"]
+                progress_events.append(("progress", {"detail": f"Found {ns} speakers, {nseg} segments"}))
+
+        # Embed new parts in parallel workers, streaming progress while they run
+        embed_task = asyncio.create_task(extract_part_embeddings(
+            audio_parts,
+            part_wavs,
+            get_session_audio_cache_dir(campaign_id, session_id),
+            progress_callback=_diarization_progress,
+        ))
+        while not embed_task.done():
+            await asyncio.wait({embed_task}, timeout=0.5)
+            while progress_events:
+                yield progress_events.pop(0)
+        await embed_task
+
+        # Micro-clusters per part, linked across parts into session speakers
+        await run_final_diarization(
+            session_id, None,
+            num_speakers_override=num_speakers,
+            progress_callback=_diarization_progress,
+            part_embeddings=shifted_part_embeddings(audio_parts),
+        )
 
-            cleanup_transcription()
-
-            # Phase 3: Diarization
-            yield _sse_event("phase", {"phase": "diarization"})
-
-            from talekeeper.services.diarization import run_final_diarization
-            from talekeeper.services.audio import audio_to_wav
-
-            progress_events: list[str] = []
-
-            def _diarization_progress(stage: str, detail: dict) -> None:
-                if stage == "vad_start":
-                    progress_events.append(_sse_event("progress", {"detail": "Detecting speech activity..."}))
-                elif stage == "vad_done":
-                    n = detail["num_segments"]
-                    secs = int(detail["total_speech_seconds"])
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {n} speech segments ({secs}s of speech)"}))
-                elif stage == "change_detection_start":
-                    progress_events.append(_sse_event("progress", {"detail": "Detecting speaker changes..."}))
-                elif stage == "change_detection_done":
-                    n = detail["num_segments_processed"]
-                    c = detail["num_changes_found"]
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {c} speaker changes in {n} segments"}))
-                elif stage == "embeddings":
-                    cur, total = detail["current"], detail["total"]
-                    if cur % max(1, total // 20) == 0 or cur == total:
-                        progress_events.append(_sse_event("progress", {"detail": f"Extracting speaker embeddings ({cur}/{total})..."}))
-                elif stage == "clustering_done":
-                    ns = detail["num_speakers"]
-                    nseg = detail["num_segments"]
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {ns} speakers, {nseg} segments"}))
-
-            wav_path = audio_to_wav(merged_path)
-            try:
-                await run_final_diarization(session_id, wav_path, num_speakers_override=num_speakers, progress_callback=_diarization_progress)
-            finally:
-                if wav_path.exists():
-                    wav_path.unlink()
-
-            for evt in progress_events:
-                yield evt
+        for evt in progress_events:
+            yield evt
 
-            cleanup_diarization()
+        cleanup_diarization()
 
-            async with get_db() as db:
-                await db.execute(
-                    "UPDATE sessions SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
-                    (session_id,),
-                )
+        async with get_db() as db:
+            await db.execute(
+                "UPDATE sessions SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
+                (session_id,),
+            )
 
-            yield _sse_event("done", {"segments_count": segments_count})
+        async def _release_part_wavs() -> None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            for part in audio_parts:
+                await discard_preprocessed_wav(part.file_path)
+
+        # The playback/export archive is off the critical path: it is built in the
+        # background, reusing the new parts' decodes, and then releases them
+        schedule_session_archive(
+            session_id,
+            audio_dir / f"{session_id}_merged",
+            decoded={part.file_path: part_wavs[part.audio_file_id] for part in audio_parts
+                     if part.audio_file_id in part_wavs},
+            cleanup=_release_part_wavs,
+        )
+        archive_scheduled = True
 
-            from talekeeper.services.session_naming import maybe_generate_and_update_name
-            asyncio.create_task(maybe_generate_and_update_name(session_id))
+        yield ("done", {"segments_count": segments_count})
 
-        except Exception as exc:
-            yield _sse_event("error", {"message": str(exc)})
-            async with get_db() as db:
-                await db.execute(
-                    "UPDATE sessions SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
-                    (session_id,),
-                )
+        from talekeeper.services.session_naming import maybe_generate_and_update_name
+        asyncio.create_task(maybe_generate_and_update_name(session_id))
 
-    return StreamingResponse(sse_generator(), media_type="text/event-stream")
+    finally:
+        # Decoded part WAVs are derived data; cached results remain
+        if not archive_scheduled:
+            shutil.rmtree(work_dir, ignore_errors=True)
 
 
 @router.post("/api/sessions/{session_id}/process-all")
 async def process_all(session_id: int, num_speakers: int | None = Query(default=None, ge=1, le=10)) -> StreamingResponse:
-    """Run the full pipeline: transcription → diarization → summaries → image, with cleanup between phases."""
-    from talekeeper.services.transcription import (
-        transcribe_chunked,
-        TranscriptSegment,
-        ChunkProgress,
-    )
-    from talekeeper.services.resource_orchestration import (
-        cleanup_transcription,
-        cleanup_diarization,
-        cleanup_llm,
-        cleanup_image_generation,
-    )
-
+    """Queue the full pipeline: transcription → diarization → summaries → image, with cleanup between phases."""
     async with get_db() as db:
         rows = await db.execute_fetchall(
             "SELECT * FROM sessions WHERE id = ?", (session_id,)
@@ -665,90 +1182,168 @@ async def process_all(session_id: int, num_speakers: int | None = Query(default=
         if not audio_path.exists():
             raise HTTPException(status_code=404, detail="Audio file not found")
 
-        language = session.get("language", "en")
+    return await job_response(session_id, "process_all", {"num_speakers": num_speakers})
 
-        model_rows = await db.execute_fetchall(
-            "SELECT value FROM settings WHERE key = 'whisper_model'"
+
+async def _rollback_process_all(job: Job) -> None:
+    """Keep a finished transcript; drop the summaries and images this job generated."""
+    if job.checkpoint.get("phase") not in ("summaries", "image_generation"):
+        await rollback_transcript(job)
+        return
+    async with get_db() as db:
+        started = await db.execute_fetchall("SELECT started_at FROM jobs WHERE id = ?", (job.id,))
+        started_at = started[0]["started_at"]
+        images = await db.execute_fetchall(
+            "SELECT file_path FROM session_images WHERE session_id = ? AND generated_at >= ?",
+            (job.session_id, started_at),
+        )
+        await db.execute(
+            "DELETE FROM session_images WHERE session_id = ? AND generated_at >= ?",
+            (job.session_id, started_at),
         )
-        model_name = model_rows[0]["value"] if model_rows and model_rows[0]["value"] else None
+        await db.execute(
+            "DELETE FROM summaries WHERE session_id = ? AND generated_at >= ?",
+            (job.session_id, started_at),
+        )
+    for image in images:
+        Path(image["file_path"]).unlink(missing_ok=True)
 
-    async def sse_generator() -> AsyncIterator[str]:
-        segments_count = 0
-        summaries_count = 0
-        image_result = None
 
-        try:
+@register_runner("process_all", model="transcription", rollback=_rollback_process_all)
+async def _run_process_all(job: Job) -> AsyncIterator[tuple[str, dict]]:
+    """Run transcription, diarization, summaries and image generation as a background job."""
+    from talekeeper.services.transcription import (
+        transcribe_chunked,
+        TranscriptSegment,
+        ChunkProgress,
+        DEFAULT_MODEL,
+    )
+    from talekeeper.services.refinement import (
+        queue_refinement,
+        record_draft_ready,
+        resolve_two_pass_config,
+    )
+    from talekeeper.services.resource_orchestration import (
+        cleanup_transcription,
+        cleanup_diarization,
+        cleanup_llm,
+        cleanup_image_generation,
+    )
+    from talekeeper.services.diarization import resolve_pipeline_mode
+
+    session_id = job.session_id
+    num_speakers = job.params.get("num_speakers")
+    audio_path, language, model_name = await _load_audio_inputs(session_id)
+
+    segments_count = 0
+    summaries_count = 0
+    image_result = None
+
+    started_at = time.monotonic()
+    two_pass = await resolve_two_pass_config()
+    final_model = model_name or DEFAULT_MODEL
+    first_model = two_pass.draft_model if two_pass.enabled else final_model
+
+    progress_events: list[tuple[str, dict]] = []
+
+    def _diarization_progress(stage: str, detail: dict) -> None:
+        if stage == "vad_start":
+            progress_events.append(("progress", {"detail": "Detecting speech activity..."}))
+        elif stage == "vad_done":
+            n = detail["num_segments"]
+            secs = int(detail["total_speech_seconds"])
+            progress_events.append(("progress", {"detail": f"Found {n} speech segments ({secs}s of speech)"}))
+        elif stage == "change_detection_start":
+            progress_events.append(("progress", {"detail": "Detecting speaker changes..."}))
+        elif stage == "change_detection_done":
+            n = detail["num_segments_processed"]
+            c = detail["num_changes_found"]
+            progress_events.append(("progress", {"detail": f"Found {c} speaker changes in {n} segments"}))
+        elif stage == "embeddings":
+            cur, total = detail["current"], detail["total"]
+            if cur % max(1, total // 20) == 0 or cur == total:
+                progress_events.append(("progress", {"detail": f"Extracting speaker embeddings ({cur}/{total})..."}))
+        elif stage == "clustering_done":
+            ns = detail["num_speakers"]
+            nseg = detail["num_segments"]
+            progress_events.append(("progress", {"detail": f"Found {ns} speakers, {nseg} segments"}))
+
+    pipeline_mode = await resolve_pipeline_mode()
+    prefetch = None
+    campaign_id = (await _get_session_campaign(session_id))["campaign_id"]
+    preprocess_dir = get_session_preprocess_dir(campaign_id, session_id)
+
+    with _PrefetchGuard(job, audio_path, preprocess_dir) as guard:
+        phase = job.checkpoint.get("phase")
+        if phase in ("summaries", "image_generation"):
+            # Resumed after transcription and diarization had finished
+            segments_count = job.checkpoint.get("segments_count", 0)
+            draft_seconds = None
+        else:
             # ---- Phase 1: Transcription ----
-            yield _sse_event("phase", {"phase": "transcription"})
+            yield ("phase", {"phase": "transcription"})
+
+            start_chunk = 0
+            if phase == "transcription":
+                # Resumed mid-transcription: the chunks before the checkpoint are stored
+                segments_count = job.checkpoint["segments_count"]
+                start_chunk = job.checkpoint["chunk"]
+                first_model = job.checkpoint["model_name"]
+                await _keep_transcribed_segments(session_id, segments_count)
+            else:
+                async with get_db() as db:
+                    await db.execute(
+                        "DELETE FROM transcript_segments WHERE session_id = ?", (session_id,)
+                    )
+                    await db.execute(
+                        "DELETE FROM speakers WHERE session_id = ?", (session_id,)
+                    )
+                    await db.execute(
+                        "UPDATE sessions SET status = 'transcribing', updated_at = datetime('now') WHERE id = ?",
+                        (session_id,),
+                    )
 
-            async with get_db() as db:
-                await db.execute(
-                    "DELETE FROM transcript_segments WHERE session_id = ?", (session_id,)
-                )
-                await db.execute(
-                    "DELETE FROM speakers WHERE session_id = ?", (session_id,)
-                )
-                await db.execute(
-                    "UPDATE sessions SET status = 'transcribing', updated_at = datetime('now') WHERE id = ?",
-                    (session_id,),
-                )
+            # Speaker embeddings do not depend on the transcript: extract them alongside ASR
+            asr_input, prefetch = await _pipeline_inputs(audio_path, pipeline_mode, _diarization_progress)
+            guard.prefetch = prefetch
 
             from talekeeper.services.thread_utils import iterate_in_thread
-            kwargs = {"language": language}
-            if model_name:
-                kwargs["model_name"] = model_name
-            async for item in iterate_in_thread(transcribe_chunked(audio_path, **kwargs)):
+            # In two-pass mode the first pass uses the fast draft model
+            metadata = await session_audio_metadata(session_id)
+            kwargs = {
+                "language": language,
+                "model_name": first_model,
+                "duration": metadata.duration if metadata else None,
+                "start_chunk": start_chunk,
+            }
+            async for item in iterate_in_thread(
+                transcribe_chunked(asr_input, **kwargs), on_cancel=cleanup_transcription,
+            ):
                 if isinstance(item, ChunkProgress):
-                    yield _sse_event("progress", {
+                    if item.chunk > start_chunk + 1:
+                        # Every earlier chunk is stored; a resumed run starts at this one
+                        await job.save_checkpoint(
+                            phase="transcription", chunk=item.chunk - 1,
+                            segments_count=segments_count, model_name=first_model,
+                        )
+                    yield ("progress", {
                         "chunk": item.chunk,
                         "total_chunks": item.total_chunks,
                     })
                 elif isinstance(item, TranscriptSegment):
                     async with get_db() as db:
                         await db.execute(
-                            "INSERT INTO transcript_segments (session_id, text, start_time, end_time) VALUES (?, ?, ?, ?)",
-                            (session_id, item.text, item.start_time, item.end_time),
+                            "INSERT INTO transcript_segments (session_id, text, start_time, end_time, model_name) VALUES (?, ?, ?, ?, ?)",
+                            (session_id, item.text, item.start_time, item.end_time, first_model),
                         )
                     segments_count += 1
 
             cleanup_transcription()
 
             # ---- Phase 2: Diarization ----
-            yield _sse_event("phase", {"phase": "diarization"})
-
-            from talekeeper.services.diarization import run_final_diarization
-            from talekeeper.services.audio import audio_to_wav
-
-            progress_events: list[str] = []
-
-            def _diarization_progress(stage: str, detail: dict) -> None:
-                if stage == "vad_start":
-                    progress_events.append(_sse_event("progress", {"detail": "Detecting speech activity..."}))
-                elif stage == "vad_done":
-                    n = detail["num_segments"]
-                    secs = int(detail["total_speech_seconds"])
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {n} speech segments ({secs}s of speech)"}))
-                elif stage == "change_detection_start":
-                    progress_events.append(_sse_event("progress", {"detail": "Detecting speaker changes..."}))
-                elif stage == "change_detection_done":
-                    n = detail["num_segments_processed"]
-                    c = detail["num_changes_found"]
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {c} speaker changes in {n} segments"}))
-                elif stage == "embeddings":
-                    cur, total = detail["current"], detail["total"]
-                    if cur % max(1, total // 20) == 0 or cur == total:
-                        progress_events.append(_sse_event("progress", {"detail": f"Extracting speaker embeddings ({cur}/{total})..."}))
-                elif stage == "clustering_done":
-                    ns = detail["num_speakers"]
-                    nseg = detail["num_segments"]
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {ns} speakers, {nseg} segments"}))
-
-            wav_path = audio_to_wav(audio_path)
-            try:
-                await run_final_diarization(session_id, wav_path, num_speakers_override=num_speakers, progress_callback=_diarization_progress)
-            finally:
-                if wav_path.exists():
-                    wav_path.unlink()
+            yield ("phase", {"phase": "diarization"})
+
+            await _diarize_session_audio(session_id, audio_path, prefetch, num_speakers, _diarization_progress)
 
             for evt in progress_events:
                 yield evt
@@ -762,20 +1357,29 @@ async def process_all(session_id: int, num_speakers: int | None = Query(default=
                     (session_id,),
                 )
 
-            # ---- Phase 3: Summaries ----
-            yield _sse_event("phase", {"phase": "summaries"})
+            draft_seconds = time.monotonic() - started_at
+            await record_draft_ready(session_id, draft_seconds, final=not two_pass.enabled)
+            await job.save_checkpoint(phase="summaries", segments_count=segments_count)
+
+        from talekeeper.services import llm_client
+
+        llm_config = await llm_client.resolve_config()
+        base_url = llm_config["base_url"]
+        api_key = llm_config["api_key"]
+        llm_model = llm_config["model"]
+
+        # ---- Phase 3: Summaries ----
+        # Each stage saves a checkpoint: a resumed run skips the summaries already
+        # stored, and the notes pass reuses the chunk notes stored for the session
+        if job.checkpoint.get("phase") == "summaries":
+            yield ("phase", {"phase": "summaries"})
 
-            from talekeeper.services import llm_client
             from talekeeper.services.summarization import (
-                format_transcript,
+                extract_notes,
                 generate_full_summary,
-                generate_pov_summary,
+                generate_pov_summaries,
             )
-
-            llm_config = await llm_client.resolve_config()
-            base_url = llm_config["base_url"]
-            api_key = llm_config["api_key"]
-            llm_model = llm_config["model"]
+            from talekeeper.services.transcript_compaction import compact_transcript
 
             async with get_db() as db:
                 segments = await db.execute_fetchall(
@@ -789,85 +1393,103 @@ async def process_all(session_id: int, num_speakers: int | None = Query(default=
                 )
 
             if segments:
-                transcript_text = format_transcript([dict(s) for s in segments])
+                transcript_text = await compact_transcript([dict(s) for s in segments], session_id)
 
-                # Generate full summary
-                full_content = await generate_full_summary(
-                    transcript_text, base_url=base_url, api_key=api_key, model=llm_model,
-                )
-                async with get_db() as db:
-                    await db.execute(
-                        "INSERT INTO summaries (session_id, type, content, model_used) VALUES (?, 'full', ?, ?)",
-                        (session_id, full_content, llm_model),
-                    )
-                summaries_count += 1
-
-                # Generate POV summaries for named speakers
                 async with get_db() as db:
                     speakers = await db.execute_fetchall(
                         "SELECT * FROM speakers WHERE session_id = ? AND character_name IS NOT NULL",
                         (session_id,),
                     )
+                character_names = [sp["character_name"] for sp in speakers]
+
+                # One notes pass over the transcript feeds the full summary and every POV
+                notes = await extract_notes(
+                    transcript_text, character_names,
+                    base_url=base_url, api_key=api_key, model=llm_model, session_id=session_id,
+                )
 
-                for speaker in speakers:
-                    sp = dict(speaker)
-                    pov_content = await generate_pov_summary(
-                        transcript_text,
-                        character_name=sp["character_name"],
-                        base_url=base_url,
-                        api_key=api_key,
-                        model=llm_model,
+                if job.checkpoint.get("full_summary_id") is None:
+                    await job.save_checkpoint(stage="full_summary")
+                    yield ("progress", {"detail": "Writing the session summary..."})
+
+                    full_content = await generate_full_summary(
+                        transcript_text, base_url=base_url, api_key=api_key, model=llm_model, notes=notes,
                     )
                     async with get_db() as db:
+                        cursor = await db.execute(
+                            "INSERT INTO summaries (session_id, type, content, model_used) VALUES (?, 'full', ?, ?)",
+                            (session_id, full_content, llm_model),
+                        )
+                    await job.save_checkpoint(
+                        stage="pov_summaries", full_summary_id=cursor.lastrowid, summaries_count=1,
+                    )
+                    yield ("progress", {"detail": "Writing character summaries..."})
+                summaries_count = job.checkpoint["summaries_count"]
+
+                # Generate POV summaries for named speakers
+                pov_contents = await generate_pov_summaries(
+                    transcript_text,
+                    character_names,
+                    base_url=base_url,
+                    api_key=api_key,
+                    model=llm_model,
+                    notes=notes,
+                )
+                # Stored together, so a resumed run never finds half of them
+                async with get_db() as db:
+                    for sp, pov_content in zip(speakers, pov_contents):
                         await db.execute(
                             "INSERT INTO summaries (session_id, type, speaker_id, content, model_used) VALUES (?, 'pov', ?, ?, ?)",
                             (session_id, sp["id"], pov_content, llm_model),
                         )
-                    summaries_count += 1
+                        summaries_count += 1
 
-            await cleanup_llm(base_url, api_key, llm_model)
+                from talekeeper.services.campaign_summary import schedule_update
 
-            # ---- Phase 4: Image Generation ----
-            yield _sse_event("phase", {"phase": "image_generation"})
+                schedule_update(session_id, base_url, api_key, llm_model)
 
-            from talekeeper.services.image_generation import (
-                craft_scene_description,
-                generate_session_image,
-            )
+            await cleanup_llm(base_url, api_key, llm_model)
+            await job.save_checkpoint(phase="image_generation", stage=None, summaries_count=summaries_count)
+        else:
+            summaries_count = job.checkpoint.get("summaries_count", 0)
 
-            # Use the full summary for scene crafting if available
-            scene_content = full_content if segments else None
-            if scene_content:
-                scene_desc = await craft_scene_description(
-                    scene_content,
-                    base_url=base_url,
-                    api_key=api_key,
-                    model=llm_model,
-                    session_id=session_id,
-                )
-                image_result = await generate_session_image(
-                    session_id, scene_desc, scene_desc,
-                )
+        # ---- Phase 4: Image Generation ----
+        yield ("phase", {"phase": "image_generation"})
 
-            cleanup_image_generation()
+        from talekeeper.services.image_generation import (
+            craft_scene_description,
+            generate_session_image,
+        )
 
-            # ---- Done ----
-            yield _sse_event("done", {
-                "segments_count": segments_count,
-                "summaries_count": summaries_count,
-                "image": image_result,
-            })
+        # Use the full summary for scene crafting if available
+        scene_content = await _summary_content(job.checkpoint.get("full_summary_id"))
+        if scene_content:
+            scene_desc = await craft_scene_description(
+                scene_content,
+                base_url=base_url,
+                api_key=api_key,
+                model=llm_model,
+                session_id=session_id,
+            )
+            image_result = await generate_session_image(
+                session_id, scene_desc, scene_desc,
+            )
 
-            # Fire-and-forget: generate session name
-            from talekeeper.services.session_naming import maybe_generate_and_update_name
-            asyncio.create_task(maybe_generate_and_update_name(session_id))
+        cleanup_image_generation()
 
-        except Exception as exc:
-            yield _sse_event("error", {"message": str(exc)})
-            async with get_db() as db:
-                await db.execute(
-                    "UPDATE sessions SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
-                    (session_id,),
-                )
+        # ---- Done ----
+        yield ("done", {
+            "segments_count": segments_count,
+            "summaries_count": summaries_count,
+            "image": image_result,
+            "time_to_first_seconds": draft_seconds,
+            "refining": two_pass.enabled,
+        })
+
+        # Summaries are written from the draft; refinement only improves the transcript
+        if two_pass.enabled:
+            queue_refinement(job, final_model, language, started_at)
 
-    return StreamingResponse(sse_generator(), media_type="text/event-stream")
+        # Fire-and-forget: generate session name
+        from talekeeper.services.session_naming import maybe_generate_and_update_name
+        asyncio.create_task(maybe_generate_and_update_name(session_id))
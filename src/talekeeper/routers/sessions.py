@@ -1,9 +1,12 @@
 """Session CRUD API endpoints."""
 
+from contextlib import nullcontext
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, field_validator
 
 from talekeeper.db import get_db
+from talekeeper.services.jobs import cancel_superseded_jobs
 from talekeeper.services.transcription import SUPPORTED_LANGUAGES
 
 router = APIRouter(tags=["sessions"])
@@ -139,6 +142,8 @@ async def update_session(session_id: int, body: SessionUpdate) -> dict:
 
 @router.delete("/api/sessions/{session_id}")
 async def delete_session(session_id: int) -> dict:
+    # A refinement still queued or running would write to the deleted session
+    await cancel_superseded_jobs(session_id)
     async with get_db() as db:
         existing = await db.execute_fetchall(
             "SELECT * FROM sessions WHERE id = ?", (session_id,)
@@ -163,10 +168,14 @@ async def delete_session(session_id: int) -> dict:
 
 
 @router.post("/api/sessions/{session_id}/generate-name")
-async def generate_name(session_id: int) -> dict:
-    """Trigger LLM-based session name generation. Prefers summary over transcript."""
+async def generate_name(session_id: int, regenerate: bool = False) -> dict:
+    """Trigger LLM-based session name generation. Prefers summary over transcript.
+
+    With ``regenerate`` a new name is requested instead of a cached one.
+    """
+    from talekeeper.services import llm_cache
     from talekeeper.services.session_naming import generate_session_name, _get_summary_text
-    from talekeeper.services.summarization import format_transcript
+    from talekeeper.services.transcript_compaction import compact_transcript
 
     async with get_db() as db:
         rows = await db.execute_fetchall(
@@ -194,11 +203,12 @@ async def generate_name(session_id: int) -> dict:
                 detail="Session has no transcript segments",
             )
 
-    if summary_text:
-        title = await generate_session_name(summary_text, from_summary=True)
-    else:
-        transcript_text = format_transcript([dict(s) for s in segments])
-        title = await generate_session_name(transcript_text)
+    with llm_cache.bypass() if regenerate else nullcontext():
+        if summary_text:
+            title = await generate_session_name(summary_text, from_summary=True)
+        else:
+            transcript_text = await compact_transcript([dict(s) for s in segments], session_id)
+            title = await generate_session_name(transcript_text)
 
     session_number = session["session_number"]
     new_name = f"Session {session_number}: {title}" if session_number is not None else title
@@ -83,6 +83,38 @@ async def update_settings(body: SettingsUpdate) -> dict:
     return {"updated": True}
 
 
+@router.get("/models")
+async def get_model_residency() -> dict:
+    """Report which models are resident, the memory budget, and load/evict counts."""
+    from talekeeper.services.model_residency import refresh_memory_budget, residency
+
+    await refresh_memory_budget()
+    return residency.stats()
+
+
+@router.get("/llm-cache")
+async def get_llm_cache_stats() -> dict:
+    """Report LLM response cache hits, misses, evictions and size."""
+    from talekeeper.services import llm_cache
+
+    return await llm_cache.stats()
+
+
+@router.delete("/llm-cache")
+async def clear_llm_cache() -> dict:
+    from talekeeper.services import llm_cache
+
+    return {"deleted": await llm_cache.clear()}
+
+
+@router.get("/llm-metrics")
+async def get_llm_metrics() -> dict:
+    """Report LLM call counts, latency, token counts and tokens per second, per model."""
+    from talekeeper.services import llm_metrics
+
+    return llm_metrics.stats()
+
+
 @router.post("/reset")
 async def reset_settings() -> dict:
     """Reset all settings to defaults, preserving sensitive keys."""
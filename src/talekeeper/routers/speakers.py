@@ -1,6 +1,5 @@
 """Speaker management API endpoints."""
 
-import json
 from pathlib import Path
 from typing import AsyncIterator
 
@@ -9,15 +8,13 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from talekeeper.db import get_db
+from talekeeper.routers.jobs import job_response
+from talekeeper.services.jobs import Job, register_runner, rollback_diarization
 from talekeeper.services.diarization import enroll_speaker_voice
 
 router = APIRouter(tags=["speakers"])
 
 
-def _sse_event(event: str, data: dict) -> str:
-    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
-
-
 class SpeakerUpdate(BaseModel):
     player_name: str | None = None
     character_name: str | None = None
@@ -255,109 +252,113 @@ async def re_diarize(session_id: int, body: ReDiarizeRequest) -> StreamingRespon
         if not audio_path.exists():
             raise HTTPException(status_code=404, detail="Audio file not found")
 
-    async def sse_generator() -> AsyncIterator[str]:
-        try:
-            # Set status to diarizing
-            async with get_db() as db:
-                await db.execute(
-                    "UPDATE sessions SET status = 'diarizing', updated_at = datetime('now') WHERE id = ?",
-                    (session_id,),
-                )
+    return await job_response(session_id, "re_diarize", body.model_dump())
 
-            yield _sse_event("phase", {"phase": "diarization"})
 
-            # Cleanup: delete diarization-split children so original rows are restored,
-            # then reset speaker assignments on the originals
-            async with get_db() as db:
-                await db.execute(
-                    "DELETE FROM transcript_segments WHERE session_id = ? AND parent_segment_id IS NOT NULL",
-                    (session_id,),
-                )
-                await db.execute(
-                    "UPDATE transcript_segments SET speaker_id = NULL, is_overlap = 0 WHERE session_id = ?",
-                    (session_id,),
-                )
+@register_runner("re_diarize", model="diarization", rollback=rollback_diarization)
+async def _run_re_diarize(job: Job) -> AsyncIterator[tuple[str, dict]]:
+    """Re-run speaker diarization for a session as a background job."""
+    session_id = job.session_id
+    body = ReDiarizeRequest(**job.params)
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT audio_path FROM sessions WHERE id = ?", (session_id,)
+        )
+    if not rows or not rows[0]["audio_path"]:
+        raise RuntimeError("No audio recorded for this session")
+    audio_path = Path(rows[0]["audio_path"])
 
-            # Cleanup: delete voice signatures sourced from this session
-            async with get_db() as db:
-                await db.execute(
-                    "DELETE FROM voice_signatures WHERE source_session_id = ?",
-                    (session_id,),
-                )
+    # Set status to diarizing
+    async with get_db() as db:
+        await db.execute(
+            "UPDATE sessions SET status = 'diarizing', updated_at = datetime('now') WHERE id = ?",
+            (session_id,),
+        )
 
-            # Cleanup: delete all speakers for the session
-            async with get_db() as db:
-                await db.execute(
-                    "DELETE FROM speakers WHERE session_id = ?",
-                    (session_id,),
-                )
+    yield ("phase", {"phase": "diarization"})
 
-            # Convert audio to WAV and run diarization with progress
-            from talekeeper.services.audio import audio_to_wav
-            from talekeeper.services.diarization import run_final_diarization
-
-            progress_events: list[str] = []
-
-            def _diarization_progress(stage: str, detail: dict) -> None:
-                if stage == "vad_start":
-                    progress_events.append(_sse_event("progress", {"detail": "Detecting speech activity..."}))
-                elif stage == "vad_done":
-                    n = detail["num_segments"]
-                    secs = int(detail["total_speech_seconds"])
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {n} speech segments ({secs}s of speech)"}))
-                elif stage == "change_detection_start":
-                    progress_events.append(_sse_event("progress", {"detail": "Detecting speaker changes..."}))
-                elif stage == "change_detection_done":
-                    n = detail["num_segments_processed"]
-                    c = detail["num_changes_found"]
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {c} speaker changes in {n} segments"}))
-                elif stage == "embeddings":
-                    cur, total = detail["current"], detail["total"]
-                    if cur % max(1, total // 20) == 0 or cur == total:
-                        progress_events.append(_sse_event("progress", {"detail": f"Extracting speaker embeddings ({cur}/{total})..."}))
-                elif stage == "clustering_done":
-                    ns = detail["num_speakers"]
-                    nseg = detail["num_segments"]
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {ns} speakers, {nseg} segments"}))
-
-            wav_path = audio_to_wav(audio_path)
-            try:
-                await run_final_diarization(
-                    session_id,
-                    wav_path,
-                    num_speakers_override=body.num_speakers,
-                    progress_callback=_diarization_progress,
-                )
-            finally:
-                if wav_path.exists():
-                    wav_path.unlink()
-
-            for evt in progress_events:
-                yield evt
-
-            # Count segments for the done event
-            async with get_db() as db:
-                count_rows = await db.execute_fetchall(
-                    "SELECT COUNT(*) as count FROM transcript_segments WHERE session_id = ?",
-                    (session_id,),
-                )
-                segments_count = count_rows[0]["count"]
+    # Cleanup: delete diarization-split children so original rows are restored,
+    # then reset speaker assignments on the originals
+    async with get_db() as db:
+        await db.execute(
+            "DELETE FROM transcript_segments WHERE session_id = ? AND parent_segment_id IS NOT NULL",
+            (session_id,),
+        )
+        await db.execute(
+            "UPDATE transcript_segments SET speaker_id = NULL, is_overlap = 0 WHERE session_id = ?",
+            (session_id,),
+        )
 
-            # Mark session as completed
-            async with get_db() as db:
-                await db.execute(
-                    "UPDATE sessions SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
-                    (session_id,),
-                )
+    # Cleanup: delete voice signatures sourced from this session
+    async with get_db() as db:
+        await db.execute(
+            "DELETE FROM voice_signatures WHERE source_session_id = ?",
+            (session_id,),
+        )
 
-            yield _sse_event("done", {"segments_count": segments_count})
+    # Cleanup: delete all speakers for the session
+    async with get_db() as db:
+        await db.execute(
+            "DELETE FROM speakers WHERE session_id = ?",
+            (session_id,),
+        )
 
-        except Exception as exc:
-            yield _sse_event("error", {"message": str(exc)})
-            async with get_db() as db:
-                await db.execute(
-                    "UPDATE sessions SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
-                    (session_id,),
-                )
+    # Convert audio to WAV and run diarization with progress
+    from talekeeper.services.audio import audio_to_wav
+    from talekeeper.services.diarization import run_final_diarization
+
+    progress_events: list[tuple[str, dict]] = []
+
+    def _diarization_progress(stage: str, detail: dict) -> None:
+        if stage == "vad_start":
+            progress_events.append(("progress", {"detail": "Detecting speech activity..."}))
+        elif stage == "vad_done":
+            n = detail["num_segments"]
+            secs = int(detail["total_speech_seconds"])
+            progress_events.append(("progress", {"detail": f"Found {n} speech segments ({secs}s of speech)"}))
+        elif stage == "change_detection_start":
+            progress_events.append(("progress", {"detail": "Detecting speaker changes..."}))
+        elif stage == "change_detection_done":
+            n = detail["num_segments_processed"]
+            c = detail["num_changes_found"]
+            progress_events.append(("progress", {"detail": f"Found {c} speaker changes in {n} segments"}))
+        elif stage == "embeddings":
+            cur, total = detail["current"], detail["total"]
+            if cur % max(1, total // 20) == 0 or cur == total:
+                progress_events.append(("progress", {"detail": f"Extracting speaker embeddings ({cur}/{total})..."}))
+        elif stage == "clustering_done":
+            ns = detail["num_speakers"]
+            nseg = detail["num_segments"]
+            progress_events.append(("progress", {"detail": f"Found {ns} speakers, {nseg} segments"}))
+
+    wav_path = audio_to_wav(audio_path)
+    try:
+        await run_final_diarization(
+            session_id,
+            wav_path,
+            num_speakers_override=body.num_speakers,
+            progress_callback=_diarization_progress,
+        )
+    finally:
+        if wav_path.exists():
+            wav_path.unlink()
+
+    for evt in progress_events:
+        yield evt
+
+    # Count segments for the done event
+    async with get_db() as db:
+        count_rows = await db.execute_fetchall(
+            "SELECT COUNT(*) as count FROM transcript_segments WHERE session_id = ?",
+            (session_id,),
+        )
+        segments_count = count_rows[0]["count"]
+
+    # Mark session as completed
+    async with get_db() as db:
+        await db.execute(
+            "UPDATE sessions SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
+            (session_id,),
+        )
 
-    return StreamingResponse(sse_generator(), media_type="text/event-stream")
+    yield ("done", {"segments_count": segments_count})
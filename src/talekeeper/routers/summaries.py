@@ -1,18 +1,32 @@
 """Summary generation and management API endpoints."""
 
+import asyncio
+import json
+import time
+from contextlib import nullcontext
+from typing import AsyncIterator
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from talekeeper.db import get_db
-from talekeeper.services import llm_client
+from talekeeper.services import campaign_summary, llm_cache, llm_client
+from talekeeper.services.jobs import interactive_request
 from talekeeper.services.summarization import (
-    format_transcript,
+    extract_notes,
     generate_full_summary,
-    generate_pov_summary,
+    generate_pov_summaries,
+    stream_full_summary,
+    stream_pov_summary,
 )
+from talekeeper.services.transcript_compaction import compact_transcript
 
 router = APIRouter(tags=["summaries"])
 
+# How often a streaming summary's text is written to the database
+SAVE_INTERVAL_SECONDS = 1.0
+
 
 class GenerateSummaryRequest(BaseModel):
     type: str = "full"  # "full" or "pov"
@@ -38,6 +52,13 @@ async def list_summaries(session_id: int) -> list[dict]:
 
 @router.post("/api/sessions/{session_id}/generate-summary")
 async def generate_summary(session_id: int, body: GenerateSummaryRequest) -> dict:
+    # Backlog jobs pause at their next checkpoint while the user waits on this
+    with interactive_request():
+        return await _generate_summary(session_id, body)
+
+
+async def _summary_inputs(session_id: int, summary_type: str) -> tuple[dict, str, list]:
+    """Check the LLM and the session; return the LLM config, transcript text and named speakers."""
     # Resolve LLM config
     config = await llm_client.resolve_config()
     base_url, api_key, model = config["base_url"], config["api_key"], config["model"]
@@ -62,10 +83,42 @@ async def generate_summary(session_id: int, body: GenerateSummaryRequest) -> dic
     if not segments:
         raise HTTPException(status_code=400, detail="No transcript available for this session")
 
-    transcript_text = format_transcript([dict(s) for s in segments])
+    transcript_text = await compact_transcript([dict(s) for s in segments], session_id)
+
+    async with get_db() as db:
+        speakers = await db.execute_fetchall(
+            "SELECT * FROM speakers WHERE session_id = ? AND character_name IS NOT NULL",
+            (session_id,),
+        )
+
+    if summary_type not in ("full", "pov"):
+        raise HTTPException(status_code=400, detail="Invalid summary type. Use 'full' or 'pov'.")
+    if summary_type == "pov" and not speakers:
+        raise HTTPException(
+            status_code=400,
+            detail="No speakers have been assigned character names. Assign names first.",
+        )
+    return config, transcript_text, speakers
+
+
+async def _generate_summary(session_id: int, body: GenerateSummaryRequest) -> dict:
+    config, transcript_text, speakers = await _summary_inputs(session_id, body.type)
+    base_url, api_key, model = config["base_url"], config["api_key"], config["model"]
+
+    # One notes pass serves the full summary and every POV journal; stored notes are reused
+    notes = await extract_notes(
+        transcript_text,
+        [sp["character_name"] for sp in speakers],
+        base_url=base_url,
+        api_key=api_key,
+        model=model,
+        session_id=session_id,
+    )
 
     if body.type == "full":
-        content = await generate_full_summary(transcript_text, base_url=base_url, api_key=api_key, model=model)
+        content = await generate_full_summary(
+            transcript_text, base_url=base_url, api_key=api_key, model=model, notes=notes,
+        )
 
         async with get_db() as db:
             cursor = await db.execute(
@@ -75,33 +128,22 @@ async def generate_summary(session_id: int, body: GenerateSummaryRequest) -> dic
             rows = await db.execute_fetchall(
                 "SELECT * FROM summaries WHERE id = ?", (cursor.lastrowid,)
             )
+        campaign_summary.schedule_update(session_id, base_url, api_key, model)
         return dict(rows[0])
 
-    elif body.type == "pov":
-        # Generate one POV per named speaker
-        async with get_db() as db:
-            speakers = await db.execute_fetchall(
-                "SELECT * FROM speakers WHERE session_id = ? AND character_name IS NOT NULL",
-                (session_id,),
-            )
-
-        if not speakers:
-            raise HTTPException(
-                status_code=400,
-                detail="No speakers have been assigned character names. Assign names first.",
-            )
+    else:
+        # All characters are summarized concurrently; results keep speaker order
+        contents = await generate_pov_summaries(
+            transcript_text,
+            [sp["character_name"] for sp in speakers],
+            base_url=base_url,
+            api_key=api_key,
+            model=model,
+            notes=notes,
+        )
 
         results = []
-        for speaker in speakers:
-            sp = dict(speaker)
-            content = await generate_pov_summary(
-                transcript_text,
-                character_name=sp["character_name"],
-                base_url=base_url,
-                api_key=api_key,
-                model=model,
-            )
-
+        for sp, content in zip(speakers, contents):
             async with get_db() as db:
                 cursor = await db.execute(
                     "INSERT INTO summaries (session_id, type, speaker_id, content, model_used) VALUES (?, 'pov', ?, ?, ?)",
@@ -114,7 +156,147 @@ async def generate_summary(session_id: int, body: GenerateSummaryRequest) -> dic
 
         return {"summaries": results}
 
-    raise HTTPException(status_code=400, detail="Invalid summary type. Use 'full' or 'pov'.")
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _save_summary_text(summary_id: int, content: str, partial: bool) -> None:
+    async with get_db() as db:
+        await db.execute(
+            "UPDATE summaries SET content = ?, is_partial = ? WHERE id = ?",
+            (content, int(partial), summary_id),
+        )
+
+
+async def _stream_into_summaries(
+    session_id: int,
+    summary_type: str,
+    model: str,
+    targets: list[tuple[dict | None, AsyncIterator[str]]],
+) -> AsyncIterator[tuple[str, dict]]:
+    """Write each (speaker, text stream) target into a new summary row, yielding SSE events.
+
+    The streams run concurrently; their events interleave and carry the
+    summary id. Rows are saved every SAVE_INTERVAL_SECONDS and flagged
+    ``is_partial`` until their stream completes, so text written before a
+    failure or disconnect is kept.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def _write(speaker: dict | None, pieces: AsyncIterator[str]) -> None:
+        async with get_db() as db:
+            cursor = await db.execute(
+                """INSERT INTO summaries (session_id, type, speaker_id, content, model_used, is_partial)
+                   VALUES (?, ?, ?, '', ?, 1)""",
+                (session_id, summary_type, speaker["id"] if speaker else None, model),
+            )
+        summary_id = cursor.lastrowid
+        await queue.put(("summary", {
+            "summary_id": summary_id,
+            "type": summary_type,
+            "speaker_id": speaker["id"] if speaker else None,
+            "character_name": speaker["character_name"] if speaker else None,
+        }))
+        text, complete = "", False
+        saved_at = time.monotonic()
+        try:
+            async for piece in pieces:
+                text += piece
+                await queue.put(("delta", {"summary_id": summary_id, "text": piece}))
+                if time.monotonic() - saved_at >= SAVE_INTERVAL_SECONDS:
+                    await _save_summary_text(summary_id, text, partial=True)
+                    saved_at = time.monotonic()
+            complete = True
+        finally:
+            await _save_summary_text(summary_id, text, partial=not complete)
+        await queue.put(("summary_done", {"summary_id": summary_id, "content": text}))
+
+    finished = object()
+    tasks = []
+    for speaker, pieces in targets:
+        task = asyncio.create_task(_write(speaker, pieces))
+        task.add_done_callback(lambda _: queue.put_nowait(finished))
+        tasks.append(task)
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if item is finished:
+                remaining -= 1
+                for task in tasks:
+                    if task.done() and not task.cancelled() and task.exception():
+                        raise task.exception()
+                continue
+            yield item
+    finally:
+        # A disconnect or failure stops the other streams; each saves what it has
+        for task in tasks:
+            task.cancel()
+        try:
+            await asyncio.shield(asyncio.gather(*tasks, return_exceptions=True))
+        except asyncio.CancelledError:
+            pass
+
+
+@router.post("/api/sessions/{session_id}/generate-summary/stream")
+async def generate_summary_stream(
+    session_id: int, body: GenerateSummaryRequest, regenerate: bool = False
+) -> StreamingResponse:
+    """Generate summaries and stream their text over SSE as the LLM writes it.
+
+    Events: ``phase`` (``notes``, then ``writing``), ``summary`` when a row is
+    created, ``delta`` with new text for a summary, ``summary_done``, and
+    finally ``done`` or ``error``. A full summary is then folded into the
+    campaign's story so far in the background. With ``regenerate`` existing summaries of
+    the type are replaced and the LLM cache is bypassed.
+    """
+    config, transcript_text, speakers = await _summary_inputs(session_id, body.type)
+    base_url, api_key, model = config["base_url"], config["api_key"], config["model"]
+
+    async def sse_generator() -> AsyncIterator[str]:
+        with interactive_request(), llm_cache.bypass() if regenerate else nullcontext():
+            try:
+                if regenerate:
+                    async with get_db() as db:
+                        await db.execute(
+                            "DELETE FROM summaries WHERE session_id = ? AND type = ?",
+                            (session_id, body.type),
+                        )
+                yield _sse_event("phase", {"phase": "notes"})
+                notes = await extract_notes(
+                    transcript_text,
+                    [sp["character_name"] for sp in speakers],
+                    base_url=base_url,
+                    api_key=api_key,
+                    model=model,
+                    session_id=session_id,
+                )
+                yield _sse_event("phase", {"phase": "writing"})
+
+                if body.type == "full":
+                    targets = [(None, stream_full_summary(notes, base_url, api_key, model))]
+                else:
+                    targets = [
+                        (dict(sp), stream_pov_summary(notes, sp["character_name"], base_url, api_key, model))
+                        for sp in speakers
+                    ]
+                summary_ids = []
+                async for event, data in _stream_into_summaries(session_id, body.type, model, targets):
+                    if event == "summary":
+                        summary_ids.append(data["summary_id"])
+                    yield _sse_event(event, data)
+                if body.type == "full":
+                    campaign_summary.schedule_update(session_id, base_url, api_key, model)
+                yield _sse_event("done", {"summary_ids": summary_ids})
+            except Exception as exc:
+                yield _sse_event("error", {"message": str(exc)})
+
+    return StreamingResponse(
+        sse_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/api/summaries/{summary_id}")
@@ -172,17 +354,18 @@ async def delete_all_summaries(session_id: int) -> dict:
 
 @router.post("/api/sessions/{session_id}/regenerate-summary")
 async def regenerate_summary(session_id: int, body: GenerateSummaryRequest) -> dict:
-    """Delete existing summaries of the given type and regenerate."""
+    """Delete existing summaries of the given type and regenerate, bypassing the LLM cache."""
     async with get_db() as db:
         await db.execute(
             "DELETE FROM summaries WHERE session_id = ? AND type = ?",
             (session_id, body.type),
         )
 
-    return await generate_summary(session_id, body)
+    with llm_cache.bypass():
+        return await generate_summary(session_id, body)
 
 
 @router.get("/api/llm/status")
-async def llm_status() -> dict:
+async def llm_status(fresh: bool = False) -> dict:
     config = await llm_client.resolve_config()
-    return await llm_client.health_check(config["base_url"], config["api_key"], config["model"])
+    return await llm_client.health_check(config["base_url"], config["api_key"], config["model"], fresh=fresh)
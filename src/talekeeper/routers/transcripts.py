@@ -7,9 +7,16 @@ from typing import AsyncIterator
 
 from fastapi import APIRouter, File, HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from talekeeper.db import get_db
+from talekeeper.routers.jobs import job_response
+from talekeeper.services.jobs import Job, register_runner, rollback_transcript
+from talekeeper.services.refinement import (
+    REFINE_JOB_KIND,
+    keep_refined_windows,
+    refine_session_transcript,
+)
 from talekeeper.services.transcription import SUPPORTED_LANGUAGES
 
 router = APIRouter(tags=["transcripts"])
@@ -28,12 +35,33 @@ class RetranscribeRequest(BaseModel):
         return v
 
 
+class RetranscribeRangeRequest(BaseModel):
+    start_time: float = Field(ge=0)
+    end_time: float = Field(gt=0)
+    model_name: str | None = None
+    language: str | None = None
+
+    @field_validator("language")
+    @classmethod
+    def validate_language(cls, v: str | None) -> str | None:
+        if v is not None and v not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"Unsupported language: {v}")
+        return v
+
+    @model_validator(mode="after")
+    def validate_range(self) -> "RetranscribeRangeRequest":
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time must be after start_time")
+        return self
+
+
 @router.get("/api/sessions/{session_id}/transcript")
 async def get_transcript(session_id: int) -> list[dict]:
     async with get_db() as db:
         rows = await db.execute_fetchall(
             """SELECT ts.id, ts.session_id, ts.speaker_id, ts.text, ts.start_time, ts.end_time,
-                      ts.is_overlap, s.diarization_label, s.player_name, s.character_name
+                      ts.is_overlap, ts.revision, ts.model_name,
+                      s.diarization_label, s.player_name, s.character_name
                FROM transcript_segments ts
                LEFT JOIN speakers s ON s.id = ts.speaker_id
                WHERE ts.session_id = ?
@@ -56,12 +84,152 @@ def _sse_event(event: str, data: dict) -> str:
 
 @router.post("/api/sessions/{session_id}/retranscribe")
 async def retranscribe(session_id: int, body: RetranscribeRequest) -> StreamingResponse:
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT * FROM sessions WHERE id = ?", (session_id,)
+        )
+        if not rows:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+        session = dict(rows[0])
+        if not session.get("audio_path"):
+            raise HTTPException(status_code=400, detail="No audio recorded for this session")
+
+        audio_path = Path(session["audio_path"])
+        if not audio_path.exists():
+            raise HTTPException(status_code=404, detail="Audio file not found")
+
+    return await job_response(session_id, "retranscribe", body.model_dump())
+
+
+@register_runner("retranscribe", model="transcription", rollback=rollback_transcript)
+async def _run_retranscribe(job: Job) -> AsyncIterator[tuple[str, dict]]:
+    """Re-transcribe and re-diarize a session as a background job."""
     from talekeeper.services.transcription import (
         transcribe_chunked,
         TranscriptSegment,
         ChunkProgress,
     )
 
+    session_id = job.session_id
+    body = RetranscribeRequest(**job.params)
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT audio_path, language FROM sessions WHERE id = ?", (session_id,)
+        )
+    if not rows or not rows[0]["audio_path"]:
+        raise RuntimeError("No audio recorded for this session")
+    audio_path = Path(rows[0]["audio_path"])
+    language = body.language if body.language is not None else rows[0]["language"] or "en"
+    num_speakers_override = body.num_speakers
+
+    segments_count = 0
+    # Delete existing segments and speakers, set status to transcribing
+    async with get_db() as db:
+        await db.execute(
+            "DELETE FROM transcript_segments WHERE session_id = ?", (session_id,)
+        )
+        await db.execute(
+            "DELETE FROM speakers WHERE session_id = ?", (session_id,)
+        )
+        await db.execute(
+            "UPDATE sessions SET status = 'transcribing', updated_at = datetime('now') WHERE id = ?",
+            (session_id,),
+        )
+
+    from talekeeper.services.thread_utils import iterate_in_thread
+    from talekeeper.services.resource_orchestration import cleanup_transcription
+    from talekeeper.services.audio_catalog import session_audio_metadata
+    metadata = await session_audio_metadata(session_id)
+    kwargs = {"language": language, "duration": metadata.duration if metadata else None}
+    if body.model_name:
+        kwargs["model_name"] = body.model_name
+    async for item in iterate_in_thread(
+        transcribe_chunked(audio_path, **kwargs), on_cancel=cleanup_transcription,
+    ):
+        if isinstance(item, ChunkProgress):
+            yield ("progress", {
+                "chunk": item.chunk,
+                "total_chunks": item.total_chunks,
+            })
+        elif isinstance(item, TranscriptSegment):
+            # Persist segment before emitting SSE event
+            async with get_db() as db:
+                await db.execute(
+                    "INSERT INTO transcript_segments (session_id, text, start_time, end_time) VALUES (?, ?, ?, ?)",
+                    (session_id, item.text, item.start_time, item.end_time),
+                )
+
+            yield ("segment", {
+                "text": item.text,
+                "start_time": item.start_time,
+                "end_time": item.end_time,
+            })
+            segments_count += 1
+
+    cleanup_transcription()
+
+    # Run speaker diarization with progress before marking complete
+    from talekeeper.services.diarization import run_final_diarization
+    from talekeeper.services.audio import webm_to_wav
+
+    yield ("phase", {"phase": "diarization"})
+
+    progress_events: list[tuple[str, dict]] = []
+
+    def _diarization_progress(stage: str, detail: dict) -> None:
+        if stage == "vad_start":
+            progress_events.append(("progress", {"detail": "Detecting speech activity..."}))
+        elif stage == "vad_done":
+            n = detail["num_segments"]
+            secs = int(detail["total_speech_seconds"])
+            progress_events.append(("progress", {"detail": f"Found {n} speech segments ({secs}s of speech)"}))
+        elif stage == "change_detection_start":
+            progress_events.append(("progress", {"detail": "Detecting speaker changes..."}))
+        elif stage == "change_detection_done":
+            n = detail["num_segments_processed"]
+            c = detail["num_changes_found"]
+            progress_events.append(("progress", {"detail": f"Found {c} speaker changes in {n} segments"}))
+        elif stage == "embeddings":
+            cur, total = detail["current"], detail["total"]
+            if cur % max(1, total // 20) == 0 or cur == total:
+                progress_events.append(("progress", {"detail": f"Extracting speaker embeddings ({cur}/{total})..."}))
+        elif stage == "clustering_done":
+            ns = detail["num_speakers"]
+            nseg = detail["num_segments"]
+            progress_events.append(("progress", {"detail": f"Found {ns} speakers, {nseg} segments"}))
+
+    wav_path = webm_to_wav(audio_path)
+    try:
+        await run_final_diarization(session_id, wav_path, num_speakers_override=num_speakers_override, progress_callback=_diarization_progress)
+    finally:
+        if wav_path.exists():
+            wav_path.unlink()
+
+    for evt in progress_events:
+        yield evt
+
+    # Mark session as completed
+    async with get_db() as db:
+        await db.execute(
+            "UPDATE sessions SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
+            (session_id,),
+        )
+
+    yield ("done", {"segments_count": segments_count})
+
+    # Fire-and-forget: generate session name from transcript
+    from talekeeper.services.session_naming import maybe_generate_and_update_name
+    asyncio.create_task(maybe_generate_and_update_name(session_id))
+
+
+@router.post("/api/sessions/{session_id}/retranscribe-range")
+async def retranscribe_range(session_id: int, body: RetranscribeRangeRequest) -> StreamingResponse:
+    """Re-transcribe one time window and replace only the segments it overlaps.
+
+    Runs as a session job, so it cannot overlap other processing of the same
+    session and takes precedence over backlog work.
+    """
     async with get_db() as db:
         rows = await db.execute_fetchall(
             "SELECT * FROM sessions WHERE id = ?", (session_id,)
@@ -77,113 +245,107 @@ async def retranscribe(session_id: int, body: RetranscribeRequest) -> StreamingR
         if not audio_path.exists():
             raise HTTPException(status_code=404, detail="Audio file not found")
 
-        language = body.language if body.language is not None else session.get("language", "en")
-        num_speakers_override = body.num_speakers
+    return await job_response(session_id, "retranscribe_range", body.model_dump())
 
-    async def sse_generator() -> AsyncIterator[str]:
-        segments_count = 0
-        try:
-            # Delete existing segments and speakers, set status to transcribing
-            async with get_db() as db:
-                await db.execute(
-                    "DELETE FROM transcript_segments WHERE session_id = ?", (session_id,)
-                )
-                await db.execute(
-                    "DELETE FROM speakers WHERE session_id = ?", (session_id,)
-                )
-                await db.execute(
-                    "UPDATE sessions SET status = 'transcribing', updated_at = datetime('now') WHERE id = ?",
-                    (session_id,),
-                )
 
-            from talekeeper.services.thread_utils import iterate_in_thread
-            kwargs = {"language": language}
-            if body.model_name:
-                kwargs["model_name"] = body.model_name
-            async for item in iterate_in_thread(transcribe_chunked(audio_path, **kwargs)):
-                if isinstance(item, ChunkProgress):
-                    yield _sse_event("progress", {
-                        "chunk": item.chunk,
-                        "total_chunks": item.total_chunks,
-                    })
-                elif isinstance(item, TranscriptSegment):
-                    # Persist segment before emitting SSE event
-                    async with get_db() as db:
-                        await db.execute(
-                            "INSERT INTO transcript_segments (session_id, text, start_time, end_time) VALUES (?, ?, ?, ?)",
-                            (session_id, item.text, item.start_time, item.end_time),
-                        )
-
-                    yield _sse_event("segment", {
-                        "text": item.text,
-                        "start_time": item.start_time,
-                        "end_time": item.end_time,
-                    })
-                    segments_count += 1
-
-            # Run speaker diarization with progress before marking complete
-            from talekeeper.services.diarization import run_final_diarization
-            from talekeeper.services.audio import webm_to_wav
-
-            yield _sse_event("phase", {"phase": "diarization"})
-
-            progress_events: list[str] = []
-
-            def _diarization_progress(stage: str, detail: dict) -> None:
-                if stage == "vad_start":
-                    progress_events.append(_sse_event("progress", {"detail": "Detecting speech activity..."}))
-                elif stage == "vad_done":
-                    n = detail["num_segments"]
-                    secs = int(detail["total_speech_seconds"])
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {n} speech segments ({secs}s of speech)"}))
-                elif stage == "change_detection_start":
-                    progress_events.append(_sse_event("progress", {"detail": "Detecting speaker changes..."}))
-                elif stage == "change_detection_done":
-                    n = detail["num_segments_processed"]
-                    c = detail["num_changes_found"]
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {c} speaker changes in {n} segments"}))
-                elif stage == "embeddings":
-                    cur, total = detail["current"], detail["total"]
-                    if cur % max(1, total // 20) == 0 or cur == total:
-                        progress_events.append(_sse_event("progress", {"detail": f"Extracting speaker embeddings ({cur}/{total})..."}))
-                elif stage == "clustering_done":
-                    ns = detail["num_speakers"]
-                    nseg = detail["num_segments"]
-                    progress_events.append(_sse_event("progress", {"detail": f"Found {ns} speakers, {nseg} segments"}))
-
-            wav_path = webm_to_wav(audio_path)
-            try:
-                await run_final_diarization(session_id, wav_path, num_speakers_override=num_speakers_override, progress_callback=_diarization_progress)
-            finally:
-                if wav_path.exists():
-                    wav_path.unlink()
-
-            for evt in progress_events:
-                yield evt
-
-            # Mark session as completed
-            async with get_db() as db:
-                await db.execute(
-                    "UPDATE sessions SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
-                    (session_id,),
-                )
+@register_runner("retranscribe_range", model="transcription")
+async def _run_retranscribe_range(job: Job) -> AsyncIterator[tuple[str, dict]]:
+    """Re-transcribe one window as a background job.
+
+    Only the window is decoded and transcribed; speakers for the new segments
+    come from the segments they replace, so the rest of the session is untouched.
+    """
+    from talekeeper.services.transcription import (
+        transcribe_range,
+        TranscriptSegment,
+        ChunkProgress,
+        DEFAULT_MODEL,
+    )
+    from talekeeper.services.transcript_ranges import (
+        expand_range_to_segments,
+        replace_transcript_range,
+    )
+    from talekeeper.services.thread_utils import iterate_in_thread
+    from talekeeper.services.resource_orchestration import cleanup_transcription
 
-            yield _sse_event("done", {"segments_count": segments_count})
+    session_id = job.session_id
+    body = RetranscribeRangeRequest(**job.params)
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT audio_path, language FROM sessions WHERE id = ?", (session_id,)
+        )
+    if not rows or not rows[0]["audio_path"]:
+        raise RuntimeError("No audio recorded for this session")
+    audio_path = Path(rows[0]["audio_path"])
+    language = body.language if body.language is not None else rows[0]["language"] or "en"
+    model_name = body.model_name or DEFAULT_MODEL
+
+    start_time, end_time = await expand_range_to_segments(
+        session_id, body.start_time, body.end_time
+    )
+    yield ("range", {"start_time": start_time, "end_time": end_time})
+
+    # Buffer the new segments so the old ones stay intact if transcription fails
+    new_segments: list[TranscriptSegment] = []
+    async for item in iterate_in_thread(
+        transcribe_range(audio_path, start_time, end_time, language=language, model_name=model_name),
+        on_cancel=cleanup_transcription,
+    ):
+        if isinstance(item, ChunkProgress):
+            yield ("progress", {
+                "chunk": item.chunk,
+                "total_chunks": item.total_chunks,
+            })
+        elif isinstance(item, TranscriptSegment):
+            new_segments.append(item)
+            yield ("segment", {
+                "text": item.text,
+                "start_time": item.start_time,
+                "end_time": item.end_time,
+            })
+    cleanup_transcription()
+
+    result = await replace_transcript_range(
+        session_id, start_time, end_time, new_segments, model_name=model_name,
+    )
+    yield ("done", {
+        "segments_count": result["inserted"],
+        "replaced_count": result["replaced"],
+    })
 
-            # Fire-and-forget: generate session name from transcript
-            from talekeeper.services.session_naming import maybe_generate_and_update_name
-            asyncio.create_task(maybe_generate_and_update_name(session_id))
 
-        except Exception as exc:
-            # Emit error event and recover session status
-            yield _sse_event("error", {"message": str(exc)})
-            async with get_db() as db:
-                await db.execute(
-                    "UPDATE sessions SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
-                    (session_id,),
-                )
+@register_runner(REFINE_JOB_KIND, model="transcription", rollback=keep_refined_windows, supersedable=True)
+async def _run_refine_transcript(job: Job) -> AsyncIterator[tuple[str, dict]]:
+    """Refine a two-pass session's draft transcript as an idle-priority job."""
+    async for event in refine_session_transcript(job):
+        yield event
+
+
+@router.get("/api/sessions/{session_id}/refinement")
+async def get_refinement(session_id: int) -> dict:
+    """Report background refinement progress and time to draft/final transcript."""
+    from talekeeper.services.refinement import get_refinement_status
+
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT time_to_draft_seconds, time_to_final_seconds FROM sessions WHERE id = ?",
+            (session_id,),
+        )
+        if not rows:
+            raise HTTPException(status_code=404, detail="Session not found")
+        revisions = await db.execute_fetchall(
+            """SELECT revision, model_name, COUNT(*) AS segments
+               FROM transcript_segments WHERE session_id = ?
+               GROUP BY revision, model_name ORDER BY revision""",
+            (session_id,),
+        )
 
-    return StreamingResponse(sse_generator(), media_type="text/event-stream")
+    return {
+        **(await get_refinement_status(session_id) or {"state": "idle"}),
+        "time_to_draft_seconds": rows[0]["time_to_draft_seconds"],
+        "time_to_final_seconds": rows[0]["time_to_final_seconds"],
+        "revisions": [dict(r) for r in revisions],
+    }
 
 
 @router.post("/api/sessions/{session_id}/import-transcript")
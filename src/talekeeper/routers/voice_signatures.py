@@ -78,13 +78,12 @@ async def upload_voice_sample(entry_id: int, file: UploadFile) -> dict:
 
     campaign_id: int = rows[0]["campaign_id"]
 
-    audio_bytes = await file.read()
-
-    # Write upload to a temp file, convert to 16kHz mono WAV (truncated to max duration)
+    # Stream upload to a temp file, convert to 16kHz mono WAV (truncated to max duration)
     tmp_input = tempfile.NamedTemporaryFile(delete=False)
     tmp_wav = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
     try:
-        tmp_input.write(audio_bytes)
+        while chunk := await file.read(1024 * 1024):  # 1MB chunks
+            tmp_input.write(chunk)
         tmp_input.flush()
         tmp_input.close()
         tmp_wav.close()
@@ -0,0 +1,20 @@
+"""Helpers for running coroutines concurrently."""
+
+import asyncio
+from typing import Awaitable, TypeVar
+
+T = TypeVar("T")
+
+
+async def gather_ordered(calls: list[Awaitable[T]]) -> list[T]:
+    """Run *calls* concurrently and return their results in input order.
+
+    If one fails the others are cancelled rather than left running.
+    """
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
@@ -1,7 +1,10 @@
 """Audio conversion utilities."""
 
+import json
 import shutil
+import subprocess
 import tempfile
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterator
 
@@ -12,6 +15,85 @@ DEFAULT_CHUNK_DURATION_MS = 5 * 60 * 1000  # 5 minutes
 DEFAULT_OVERLAP_MS = 30 * 1000  # 30 seconds
 
 
+@dataclass
+class AudioInfo:
+    duration: float  # seconds
+    codec: str | None
+    sample_rate: int | None
+    channels: int | None
+    format_name: str | None
+
+
+def probe_audio(audio_path: Path) -> AudioInfo:
+    """Read duration and codec parameters of the first audio stream via ffprobe.
+
+    Only container headers are read; the audio is not decoded.
+    Raises RuntimeError if ffprobe fails.
+    """
+    result = subprocess.run(
+        [
+            "ffprobe", "-v", "error",
+            "-select_streams", "a:0",
+            "-show_entries", "stream=codec_name,sample_rate,channels,duration:format=duration,format_name",
+            "-of", "json",
+            str(audio_path),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe failed: {result.stderr}")
+
+    data = json.loads(result.stdout or "{}")
+    stream = (data.get("streams") or [{}])[0]
+    fmt = data.get("format") or {}
+    duration = fmt.get("duration") or stream.get("duration") or 0.0
+    return AudioInfo(
+        duration=float(duration),
+        codec=stream.get("codec_name"),
+        sample_rate=int(stream["sample_rate"]) if stream.get("sample_rate") else None,
+        channels=int(stream["channels"]) if stream.get("channels") else None,
+        format_name=fmt.get("format_name"),
+    )
+
+
+def extract_wav_window(
+    audio_path: Path,
+    start_time: float,
+    end_time: float,
+    wav_path: Path | None = None,
+) -> Path:
+    """Decode only [start_time, end_time) of an audio file to 16kHz mono WAV.
+
+    ffmpeg seeks in the input before decoding, so the cost is proportional to
+    the window length rather than the whole recording.
+    Raises RuntimeError if ffmpeg fails.
+    """
+    if wav_path is None:
+        tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+        wav_path = Path(tmp.name)
+        tmp.close()
+
+    result = subprocess.run(
+        [
+            "ffmpeg", "-y", "-v", "error",
+            "-ss", f"{start_time:.3f}",
+            "-to", f"{end_time:.3f}",
+            "-i", str(audio_path),
+            "-ac", "1",
+            "-ar", "16000",
+            "-c:a", "pcm_s16le",
+            str(wav_path),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        wav_path.unlink(missing_ok=True)
+        raise RuntimeError(f"ffmpeg failed: {result.stderr}")
+    return wav_path
+
+
 def audio_to_wav(audio_path: Path, wav_path: Path | None = None) -> Path:
     """Convert any audio file to 16kHz mono WAV for ML model input.
 
@@ -54,54 +136,78 @@ def webm_bytes_to_wav(data: bytes, wav_path: Path) -> Path:
     return wav_path
 
 
+def plan_chunks(
+    total_ms: int,
+    chunk_duration_ms: int = DEFAULT_CHUNK_DURATION_MS,
+    overlap_ms: int = DEFAULT_OVERLAP_MS,
+) -> list[tuple[int, int]]:
+    """Compute the (start_ms, end_ms) windows split_audio_to_chunks() cuts for *total_ms* of audio."""
+    if total_ms <= chunk_duration_ms:
+        return [(0, total_ms)]
+
+    windows: list[tuple[int, int]] = []
+    start_ms = 0
+    while start_ms < total_ms:
+        windows.append((start_ms, min(start_ms + chunk_duration_ms, total_ms)))
+        start_ms += chunk_duration_ms - overlap_ms
+        # Avoid creating a tiny trailing chunk
+        if start_ms < total_ms and (total_ms - start_ms) < overlap_ms:
+            break
+    return windows
+
+
 def split_audio_to_chunks(
     audio_path: Path,
     chunk_duration_ms: int = DEFAULT_CHUNK_DURATION_MS,
     overlap_ms: int = DEFAULT_OVERLAP_MS,
+    plan: list[tuple[int, int]] | None = None,
+    start_index: int = 0,
 ) -> Iterator[tuple[int, Path, int, int]]:
     """Split an audio file into overlapping chunks for transcription.
 
     Yields (chunk_index, wav_path, start_ms, end_ms) tuples.
     Each slice is exported as a temp WAV (16kHz mono) and the temp file
     is cleaned up after the caller is done with it (after yield).
+
+    *plan* is a precomputed plan_chunks() result, typically from the stored
+    duration; the last window is stretched to the decoded length so no audio
+    is lost if the header duration was slightly off. Chunks before
+    *start_index* are skipped without being exported.
     """
     audio = AudioSegment.from_file(str(audio_path))
     total_ms = len(audio)
-
-    if total_ms <= chunk_duration_ms:
-        # Short file — single chunk, no splitting needed
-        tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-        wav_path = Path(tmp.name)
-        tmp.close()
-        try:
-            chunk = audio.set_channels(1).set_frame_rate(16000)
-            chunk.export(str(wav_path), format="wav")
-            yield (0, wav_path, 0, total_ms)
-        finally:
-            if wav_path.exists():
-                wav_path.unlink()
-        return
-
-    chunk_index = 0
-    start_ms = 0
-    while start_ms < total_ms:
-        end_ms = min(start_ms + chunk_duration_ms, total_ms)
+    if plan is None:
+        plan = plan_chunks(total_ms, chunk_duration_ms, overlap_ms)
+
+    for chunk_index, (start_ms, end_ms) in enumerate(plan):
+        if chunk_index < start_index:
+            continue
+        last = chunk_index == len(plan) - 1
+        if last:
+            end_ms = max(end_ms, total_ms)
         tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
         wav_path = Path(tmp.name)
         tmp.close()
         try:
-            chunk = audio[start_ms:end_ms].set_channels(1).set_frame_rate(16000)
+            # Short file — single chunk, no slicing needed
+            chunk = audio if len(plan) == 1 else audio[start_ms:end_ms]
+            chunk = chunk.set_channels(1).set_frame_rate(16000)
             chunk.export(str(wav_path), format="wav")
             yield (chunk_index, wav_path, start_ms, end_ms)
         finally:
             if wav_path.exists():
                 wav_path.unlink()
 
-        chunk_index += 1
-        start_ms += chunk_duration_ms - overlap_ms
-        # Avoid creating a tiny trailing chunk
-        if start_ms < total_ms and (total_ms - start_ms) < overlap_ms:
-            break
+
+def audio_duration_ms(audio_path: Path) -> int:
+    """Length of an audio file in ms, from its headers when ffprobe can tell, else by decoding."""
+    try:
+        duration = probe_audio(audio_path).duration
+    except (RuntimeError, OSError, ValueError):
+        duration = 0.0
+    if duration > 0:
+        return int(duration * 1000)
+    return len(AudioSegment.from_file(str(audio_path)))
 
 
 def merge_chunk_files(chunk_dir: Path, output_path: Path) -> None:
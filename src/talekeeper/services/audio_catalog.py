@@ -0,0 +1,129 @@
+"""Audio metadata captured once at ingest.
+
+Every stored recording and audio part is probed when it arrives: duration,
+codec, sample rate and channels come from the container headers (ffprobe, no
+decode) and a SHA-256 content hash is computed in a single streaming read.
+The values live on the ``sessions`` row (``audio_*`` columns) and on the
+``session_audio_files`` row, so chunk planning, progress totals, batch
+statistics and the merge strategy can use them without touching the audio.
+"""
+
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+from talekeeper.db import get_db
+from talekeeper.services.audio import AudioInfo, probe_audio
+
+logger = logging.getLogger(__name__)
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+@dataclass
+class AudioMetadata:
+    duration: float | None  # seconds
+    codec: str | None
+    sample_rate: int | None
+    channels: int | None
+    content_hash: str | None
+
+    @property
+    def info(self) -> AudioInfo | None:
+        """The stored values as an AudioInfo, or None if the file was never probed."""
+        if self.codec is None and self.duration is None:
+            return None
+        return AudioInfo(
+            duration=self.duration or 0.0,
+            codec=self.codec,
+            sample_rate=self.sample_rate,
+            channels=self.channels,
+            format_name=None,
+        )
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's contents, read in fixed-size blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_audio_metadata(path: Path, content_hash: str | None = None) -> AudioMetadata:
+    """Probe *path* and hash it, unless the hash is already known.
+
+    A file ffprobe cannot read still gets its hash; the other fields stay None.
+    """
+    try:
+        info = probe_audio(path)
+    except (RuntimeError, OSError, ValueError) as e:
+        logger.warning("Could not probe %s: %s", path.name, e)
+        info = None
+    return AudioMetadata(
+        duration=info.duration if info and info.duration > 0 else None,
+        codec=info.codec if info else None,
+        sample_rate=info.sample_rate if info else None,
+        channels=info.channels if info else None,
+        content_hash=content_hash or hash_file(path),
+    )
+
+
+async def catalog_session_audio(
+    session_id: int, path: Path, content_hash: str | None = None
+) -> AudioMetadata:
+    """Probe and hash a session's audio file and store the result on the session."""
+    metadata = await asyncio.to_thread(read_audio_metadata, path, content_hash)
+    async with get_db() as db:
+        await db.execute(
+            """UPDATE sessions
+               SET audio_duration = ?, audio_codec = ?, audio_sample_rate = ?,
+                   audio_channels = ?, audio_hash = ?
+               WHERE id = ?""",
+            (
+                metadata.duration, metadata.codec, metadata.sample_rate,
+                metadata.channels, metadata.content_hash, session_id,
+            ),
+        )
+    return metadata
+
+
+async def catalog_audio_part(
+    audio_file_id: int, path: Path, content_hash: str | None = None
+) -> AudioMetadata:
+    """Probe and hash an audio part and store the result on its row."""
+    metadata = await asyncio.to_thread(read_audio_metadata, path, content_hash)
+    async with get_db() as db:
+        await db.execute(
+            """UPDATE session_audio_files
+               SET duration = ?, codec = ?, sample_rate = ?, channels = ?, content_hash = ?
+               WHERE id = ?""",
+            (
+                metadata.duration, metadata.codec, metadata.sample_rate,
+                metadata.channels, metadata.content_hash, audio_file_id,
+            ),
+        )
+    return metadata
+
+
+async def session_audio_metadata(session_id: int) -> AudioMetadata | None:
+    """Stored metadata for a session's audio, or None if it was never catalogued."""
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            """SELECT audio_duration, audio_codec, audio_sample_rate, audio_channels, audio_hash
+               FROM sessions WHERE id = ?""",
+            (session_id,),
+        )
+    if not rows or rows[0]["audio_hash"] is None:
+        return None
+    row = rows[0]
+    return AudioMetadata(
+        duration=row["audio_duration"],
+        codec=row["audio_codec"],
+        sample_rate=row["audio_sample_rate"],
+        channels=row["audio_channels"],
+        content_hash=row["audio_hash"],
+    )
@@ -1,25 +1,127 @@
-"""Audio merging service: concatenate multiple audio parts into a single file."""
+"""Audio merging service: concatenate multiple audio parts into a single file.
+
+The merged file is the session's archive for playback and export. Processing
+works on the parts themselves, so merge jobs build the archive in the
+background with ``schedule_session_archive`` once the new parts are done.
+"""
 
 import asyncio
+import logging
+import os
 import shutil
 import subprocess
+import tempfile
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Awaitable, Callable
 
 from talekeeper.db import get_db
+from talekeeper.services.audio import AudioInfo, probe_audio
+
+logger = logging.getLogger(__name__)
+
+PROCESSING_SAMPLE_RATE = 16000
+ARCHIVE_SUFFIX = ".flac"
+
+# Background archive builds per session
+_archive_tasks: dict[int, asyncio.Task] = {}
+
+
+@dataclass
+class MergedAudio:
+    archive_path: Path  # compressed file kept as the session's audio
+
+
+def _run_ffmpeg(args: list[str]) -> None:
+    result = subprocess.run(
+        ["ffmpeg", "-y", "-v", "error", *args],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr}")
+
+
+def _stored_info(row) -> AudioInfo:
+    return AudioInfo(
+        duration=row["duration"] or 0.0,
+        codec=row["codec"],
+        sample_rate=row["sample_rate"],
+        channels=row["channels"],
+        format_name=None,
+    )
+
+
+def _codec_key(info: AudioInfo) -> tuple:
+    return (info.codec, info.sample_rate, info.channels)
+
+
+def _can_stream_copy(parts: list[Path], infos: list[AudioInfo]) -> bool:
+    """Parts can be concatenated without re-encoding if codec parameters and container match."""
+    if not infos or infos[0].codec is None:
+        return False
+    first_key = _codec_key(infos[0])
+    first_suffix = parts[0].suffix.lower()
+    return all(
+        _codec_key(info) == first_key and part.suffix.lower() == first_suffix
+        for part, info in zip(parts, infos)
+    )
+
+
+def _write_concat_list(filelist_path: Path, files: list[Path]) -> None:
+    with open(filelist_path, "w") as f:
+        for p in files:
+            f.write(f"file '{str(p.resolve())}'\n")
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Hard-link when possible so the session audio does not duplicate the part on disk."""
+    if dst.exists():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def decode_to_processing_wav(src: Path, dst: Path) -> None:
+    """Decode any audio file to 16 kHz mono PCM WAV with ffmpeg."""
+    _run_ffmpeg([
+        "-i", str(src),
+        "-ac", "1",
+        "-ar", str(PROCESSING_SAMPLE_RATE),
+        "-c:a", "pcm_s16le",
+        str(dst),
+    ])
 
 
-async def merge_audio_parts(session_id: int, output_path: Path) -> Path:
-    """Fetch ordered audio parts from DB, merge via ffmpeg concat, return output path.
+async def merge_audio_parts(
+    session_id: int,
+    output_path: Path,
+    decoded: dict[Path, Path] | None = None,
+) -> MergedAudio:
+    """Fetch ordered audio parts from DB and merge them with as little work as possible.
 
-    Single-part case: copy file directly without invoking ffmpeg.
-    Multi-part case: use ffmpeg concat demuxer with re-encoding to WAV.
+    - Single part: hard-link (or copy) the file, keeping its original format.
+    - Parts sharing codec, sample rate, channels and container: stream-copy via
+      the ffmpeg concat demuxer, with no decoding at all.
+    - Otherwise: decode every part in parallel straight to 16 kHz mono PCM and
+      archive their concatenation as FLAC. Parts in *decoded* (part file ->
+      16 kHz WAV already made for processing) are not decoded again; those
+      WAVs are left in place for the caller.
+
+    The archive is built in a scratch directory and moved into place, so an
+    archive already at the same path stays intact until the new one is
+    complete. Its suffix is chosen from the strategy used; only the stem and
+    directory of *output_path* are honoured.
 
     Raises ValueError if session has no audio parts.
     Raises RuntimeError if ffmpeg fails.
     """
     async with get_db() as db:
         rows = await db.execute_fetchall(
-            "SELECT file_path FROM session_audio_files WHERE session_id = ? ORDER BY sort_order",
+            """SELECT file_path, duration, codec, sample_rate, channels
+               FROM session_audio_files WHERE session_id = ? ORDER BY sort_order""",
             (session_id,),
         )
 
@@ -28,40 +130,123 @@ async def merge_audio_parts(session_id: int, output_path: Path) -> Path:
 
     parts = [Path(row["file_path"]) for row in rows]
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    work_dir = Path(tempfile.mkdtemp(prefix=f"_merge_{session_id}_", dir=output_path.parent))
+    try:
+        # Single-part fast path: no ffmpeg at all
+        if len(parts) == 1:
+            archive_path = output_path.with_suffix(parts[0].suffix)
+            staged = work_dir / archive_path.name
+            await asyncio.to_thread(_link_or_copy, parts[0], staged)
+            os.replace(staged, archive_path)
+            return MergedAudio(archive_path=archive_path)
 
-    # Single-part fast path: copy directly without invoking ffmpeg concat
-    if len(parts) == 1:
-        shutil.copy2(parts[0], output_path)
-        return output_path
+        # Codec parameters were stored at ingest; only parts never catalogued are probed
+        probed = iter(await asyncio.gather(*(
+            asyncio.to_thread(probe_audio, part)
+            for row, part in zip(rows, parts)
+            if row["codec"] is None
+        )))
+        infos = [_stored_info(row) if row["codec"] is not None else next(probed) for row in rows]
+        filelist_path = work_dir / "concat.txt"
 
-    # Multi-part: use ffmpeg concat demuxer
-    filelist_path = output_path.parent / f"_concat_{session_id}.txt"
-    try:
-        with open(filelist_path, "w") as f:
-            for p in parts:
-                f.write(f"file '{str(p.resolve())}'\n")
-
-        def _run_ffmpeg() -> None:
-            import subprocess as _subprocess
-            result = _subprocess.run(
-                [
-                    "ffmpeg", "-y",
+        if _can_stream_copy(parts, infos):
+            archive_path = output_path.with_suffix(parts[0].suffix)
+            staged = work_dir / archive_path.name
+            try:
+                _write_concat_list(filelist_path, parts)
+                await asyncio.to_thread(_run_ffmpeg, [
                     "-f", "concat",
                     "-safe", "0",
                     "-i", str(filelist_path),
-                    "-ar", "44100",
-                    "-ac", "1",
-                    str(output_path),
-                ],
-                capture_output=True,
-                text=True,
-            )
-            if result.returncode != 0:
-                raise RuntimeError(f"ffmpeg failed: {result.stderr}")
+                    "-c", "copy",
+                    str(staged),
+                ])
+                os.replace(staged, archive_path)
+                logger.info("Stream-copied %d audio parts for session %d", len(parts), session_id)
+                return MergedAudio(archive_path=archive_path)
+            except RuntimeError:
+                logger.warning(
+                    "Stream copy failed for session %d, falling back to decoding", session_id,
+                    exc_info=True,
+                )
+                staged.unlink(missing_ok=True)
 
-        await asyncio.to_thread(_run_ffmpeg)
+        # Mixed formats: decode each part not already decoded, in parallel, to 16 kHz mono PCM
+        decoded = decoded or {}
+        archive_path = output_path.with_suffix(ARCHIVE_SUFFIX)
+        staged = work_dir / archive_path.name
+        wavs = [decoded.get(part) or work_dir / f"{i:03d}.wav" for i, part in enumerate(parts)]
+        await asyncio.gather(*(
+            asyncio.to_thread(decode_to_processing_wav, src, dst)
+            for src, dst in zip(parts, wavs)
+            if src not in decoded
+        ))
+
+        # Identical PCM parameters now, so the parts concatenate straight into the FLAC archive
+        _write_concat_list(filelist_path, wavs)
+        await asyncio.to_thread(_run_ffmpeg, [
+            "-f", "concat",
+            "-safe", "0",
+            "-i", str(filelist_path),
+            "-c:a", "flac",
+            str(staged),
+        ])
+        os.replace(staged, archive_path)
     finally:
-        if filelist_path.exists():
-            filelist_path.unlink()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    reused = sum(part in decoded for part in parts)
+    logger.info(
+        "Merged %d audio parts for session %d (%d decoded, %d reused)",
+        len(parts), session_id, len(parts) - reused, reused,
+    )
+    return MergedAudio(archive_path=archive_path)
 
-    return output_path
+
+def schedule_session_archive(
+    session_id: int,
+    output_path: Path,
+    decoded: dict[Path, Path] | None = None,
+    cleanup: Callable[[], Awaitable[None]] | None = None,
+) -> asyncio.Task:
+    """Merge a session's parts into its archive in the background and point the session at it.
+
+    The archive is only used for playback and export; processing reads the
+    parts themselves, so a merge job does not wait for it. A newer build for
+    the same session replaces one still running. *cleanup* runs once the
+    build no longer needs the files in *decoded*.
+    """
+    running = _archive_tasks.get(session_id)
+    if running is not None and not running.done():
+        running.cancel()
+    task = asyncio.create_task(_build_session_archive(session_id, output_path, decoded, cleanup))
+    _archive_tasks[session_id] = task
+    task.add_done_callback(
+        lambda t: _archive_tasks.pop(session_id, None) if _archive_tasks.get(session_id) is t else None
+    )
+    return task
+
+
+async def _build_session_archive(
+    session_id: int,
+    output_path: Path,
+    decoded: dict[Path, Path] | None,
+    cleanup: Callable[[], Awaitable[None]] | None,
+) -> None:
+    from talekeeper.services.audio_catalog import catalog_session_audio
+
+    try:
+        merged = await merge_audio_parts(session_id, output_path, decoded)
+        async with get_db() as db:
+            await db.execute(
+                "UPDATE sessions SET audio_path = ?, updated_at = datetime('now') WHERE id = ?",
+                (str(merged.archive_path), session_id),
+            )
+        await catalog_session_audio(session_id, merged.archive_path)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.exception("Building the audio archive for session %d failed", session_id)
+    finally:
+        if cleanup is not None:
+            await cleanup()
@@ -0,0 +1,223 @@
+"""Per-part processing cache for multi-part sessions.
+
+Each audio part is transcribed and embedded on its own, with timestamps
+relative to the start of that part. Results are cached per part, so
+appending or reordering parts only processes parts that have never been
+seen. The session timeline is rebuilt by shifting each part's results by
+the summed durations of the parts before it.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from talekeeper.db import get_db
+from talekeeper.services.transcription import TranscriptSegment
+
+logger = logging.getLogger(__name__)
+
+# Parts embedded concurrently; workers share one ONNX speaker model (loaded once under a lock)
+PART_EMBEDDING_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+
+
+@dataclass
+class AudioPart:
+    """One session audio part and whatever cached results are still valid for it."""
+
+    audio_file_id: int
+    file_path: Path
+    duration: float | None = None
+    segments: list[TranscriptSegment] | None = None  # part-relative timestamps
+    embeddings: np.ndarray | None = None
+    subsegments: list[tuple[float, float, int]] | None = None  # part-relative timestamps
+
+    @property
+    def needs_transcription(self) -> bool:
+        return self.segments is None
+
+    @property
+    def needs_embeddings(self) -> bool:
+        return self.embeddings is None
+
+    @property
+    def needs_processing(self) -> bool:
+        return self.duration is None or self.needs_transcription or self.needs_embeddings
+
+
+def wav_duration(wav_path: Path) -> float:
+    """Duration in seconds of a WAV file, read from its header."""
+    import soundfile as sf
+
+    return float(sf.info(str(wav_path)).duration)
+
+
+async def load_session_parts(
+    session_id: int, model_name: str, language: str
+) -> list[AudioPart]:
+    """Return the session's parts in sort order with their valid cached results.
+
+    A cached transcript is only reused when it was produced with the same
+    Whisper model and language; cached embeddings are model-independent.
+    """
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            """SELECT f.id, f.file_path, c.duration, c.model_name, c.language,
+                      c.segments, c.embeddings_path
+               FROM session_audio_files f
+               LEFT JOIN audio_part_cache c ON c.audio_file_id = f.id
+               WHERE f.session_id = ?
+               ORDER BY f.sort_order""",
+            (session_id,),
+        )
+
+    parts: list[AudioPart] = []
+    for row in rows:
+        part = AudioPart(audio_file_id=row["id"], file_path=Path(row["file_path"]))
+        if row["duration"] is not None:
+            part.duration = row["duration"]
+            if (
+                row["segments"] is not None
+                and row["model_name"] == model_name
+                and row["language"] == language
+            ):
+                part.segments = [TranscriptSegment(**s) for s in json.loads(row["segments"])]
+            if row["embeddings_path"] and Path(row["embeddings_path"]).exists():
+                with np.load(row["embeddings_path"]) as data:
+                    part.embeddings = data["embeddings"]
+                    part.subsegments = [
+                        (float(s), float(e), int(i)) for s, e, i in data["subsegments"]
+                    ]
+        parts.append(part)
+    return parts
+
+
+async def save_part_transcript(
+    part: AudioPart, model_name: str, language: str
+) -> None:
+    """Persist a part's duration and transcript to the cache."""
+    segments_json = json.dumps([
+        {"text": s.text, "start_time": s.start_time, "end_time": s.end_time}
+        for s in part.segments or []
+    ])
+    async with get_db() as db:
+        await db.execute(
+            """INSERT INTO audio_part_cache (audio_file_id, duration, model_name, language, segments)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(audio_file_id) DO UPDATE SET
+                   duration = excluded.duration,
+                   model_name = excluded.model_name,
+                   language = excluded.language,
+                   segments = excluded.segments,
+                   updated_at = datetime('now')""",
+            (part.audio_file_id, part.duration, model_name, language, segments_json),
+        )
+
+
+async def save_part_embeddings(part: AudioPart, cache_dir: Path) -> None:
+    """Write a part's speaker embeddings to disk and record them in the cache."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    embeddings_path = cache_dir / f"part_{part.audio_file_id}.npz"
+    subsegments = np.array(part.subsegments or [], dtype=np.float64).reshape(-1, 3)
+    np.savez(embeddings_path, embeddings=part.embeddings, subsegments=subsegments)
+
+    async with get_db() as db:
+        await db.execute(
+            """INSERT INTO audio_part_cache (audio_file_id, duration, embeddings_path)
+               VALUES (?, ?, ?)
+               ON CONFLICT(audio_file_id) DO UPDATE SET
+                   duration = excluded.duration,
+                   embeddings_path = excluded.embeddings_path,
+                   updated_at = datetime('now')""",
+            (part.audio_file_id, part.duration, str(embeddings_path)),
+        )
+
+
+async def invalidate_part_cache(audio_file_id: int) -> None:
+    """Drop a part's cached results, including its embeddings file."""
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT embeddings_path FROM audio_part_cache WHERE audio_file_id = ?",
+            (audio_file_id,),
+        )
+        if rows and rows[0]["embeddings_path"]:
+            Path(rows[0]["embeddings_path"]).unlink(missing_ok=True)
+        await db.execute(
+            "DELETE FROM audio_part_cache WHERE audio_file_id = ?", (audio_file_id,)
+        )
+
+
+def part_offsets(parts: list[AudioPart]) -> list[float]:
+    """Start time of each part on the session timeline."""
+    offsets: list[float] = []
+    total = 0.0
+    for part in parts:
+        offsets.append(total)
+        total += part.duration or 0.0
+    return offsets
+
+
+def shift_segments(
+    segments: list[TranscriptSegment], offset: float
+) -> list[TranscriptSegment]:
+    return [
+        TranscriptSegment(
+            text=s.text,
+            start_time=s.start_time + offset,
+            end_time=s.end_time + offset,
+        )
+        for s in segments
+    ]
+
+
+def shifted_part_embeddings(
+    parts: list[AudioPart],
+) -> list[tuple[np.ndarray, list[tuple[float, float, int]]]]:
+    """Per-part embeddings with subsegments moved onto the session timeline."""
+    offsets = part_offsets(parts)
+    shifted: list[tuple[np.ndarray, list[tuple[float, float, int]]]] = []
+    parent_base = 0
+    for part, offset in zip(parts, offsets):
+        if part.embeddings is None or not part.subsegments:
+            continue
+        shifted.append((
+            part.embeddings,
+            [
+                (start + offset, end + offset, parent_idx + parent_base)
+                for start, end, parent_idx in part.subsegments
+            ],
+        ))
+        parent_base += max(p for _, _, p in part.subsegments) + 1
+    return shifted
+
+
+async def extract_part_embeddings(
+    parts: list[AudioPart],
+    wav_paths: dict[int, Path],
+    cache_dir: Path,
+    progress_callback=None,
+    max_workers: int = PART_EMBEDDING_WORKERS,
+) -> None:
+    """Embed every part that lacks cached embeddings, several parts at a time.
+
+    Worker threads share the single speaker model from
+    ``diarization._get_speaker_model()``, which is loaded once under a lock;
+    ONNX Runtime sessions are safe to run from several threads at once.
+    Results are cached as each part finishes.
+    """
+    from talekeeper.services.diarization import extract_speech_embeddings
+
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def _embed(part: AudioPart) -> None:
+        async with semaphore:
+            part.embeddings, part.subsegments = await asyncio.to_thread(
+                extract_speech_embeddings, wav_paths[part.audio_file_id], progress_callback,
+            )
+        await save_part_embeddings(part, cache_dir)
+
+    await asyncio.gather(*(_embed(part) for part in parts if part.needs_embeddings))
@@ -0,0 +1,247 @@
+"""Campaign-level "story so far" summary, maintained incrementally.
+
+A campaign's story so far is built from the full summaries of its sessions,
+never from transcripts. Each version is stored in ``campaign_summaries``
+with the sessions it covers, in order, and a digest of each session's full
+summary at the time.
+
+When a session's full summary is created, the covered list is compared with
+the campaign's current sessions:
+
+- the sessions covered are unchanged and new ones follow them: each new
+  session is folded into the previous version with one LLM call;
+- an already covered session changed, was removed or a session was added
+  before the last covered one: the story is rebuilt hierarchically, by
+  merging groups of ``ROLLUP_FANIN`` session recaps and then groups of those
+  merges until one text is left. Groups on the same level are merged
+  concurrently.
+
+Updates after a session summary run in the background (``schedule_update``),
+so a rebuild's merge calls do not hold up the summary response. Reading the
+story so far never calls the LLM; it reports whether the stored version is
+behind the sessions' summaries.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+
+from talekeeper.db import get_db
+from talekeeper.services import llm_client
+from talekeeper.services.async_utils import gather_ordered
+
+logger = logging.getLogger(__name__)
+
+# Session recaps (or merged recaps) combined per LLM call in a rebuild
+ROLLUP_FANIN = 6
+ROLLUP_MAX_WORDS = 800
+# Older versions beyond this many are deleted
+KEEP_VERSIONS = 20
+
+ROLLUP_SYSTEM = """You keep the "story so far" of a tabletop RPG campaign.
+Write from an in-world perspective in third person, past tense. Do not reference game
+mechanics, the DM, dice rolls or out-of-character table talk.
+Only include what is in the recaps you are given. Do NOT invent names, events or details.
+Keep recent events detailed and compress older events into the threads that still matter:
+open quests, allies and enemies, promises, and unresolved mysteries.
+Output ONLY the story text, without any preamble or meta-commentary.
+IMPORTANT: Write in the same language as the recaps."""
+
+ROLLUP_UPDATE_PROMPT = """Rewrite the campaign's story so far to include the session that
+follows it. Keep it under {max_words} words.
+
+STORY SO FAR:
+{story}
+
+NEXT SESSION ({title}):
+{recap}"""
+
+ROLLUP_MERGE_PROMPT = """Combine the consecutive session recaps below, in order, into one
+story so far. Keep it under {max_words} words.
+
+{recaps}"""
+
+
+def _digest(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def _title(session: dict) -> str:
+    return session["name"] or f"Session {session['session_number']}"
+
+
+async def _campaign_sessions(campaign_id: int) -> list[dict]:
+    """Sessions of the campaign that have a complete full summary, in session order."""
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            """SELECT s.id, s.name, s.session_number, su.content
+               FROM sessions s
+               JOIN summaries su ON su.id = (
+                 SELECT id FROM summaries
+                 WHERE session_id = s.id AND type = 'full' AND is_partial = 0
+                 ORDER BY id DESC LIMIT 1
+               )
+               WHERE s.campaign_id = ?
+               ORDER BY s.session_number, s.id""",
+            (campaign_id,),
+        )
+    return [{**dict(r), "digest": _digest(r["content"])} for r in rows]
+
+
+def _covered(sessions: list[dict]) -> list[list]:
+    return [[s["id"], s["digest"]] for s in sessions]
+
+
+def _version_to_dict(row) -> dict:
+    version = dict(row)
+    version["sessions"] = json.loads(version["sessions"])
+    return version
+
+
+async def latest_version(campaign_id: int) -> dict | None:
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT * FROM campaign_summaries WHERE campaign_id = ? ORDER BY version DESC LIMIT 1",
+            (campaign_id,),
+        )
+    return _version_to_dict(rows[0]) if rows else None
+
+
+async def list_versions(campaign_id: int) -> list[dict]:
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT * FROM campaign_summaries WHERE campaign_id = ? ORDER BY version DESC",
+            (campaign_id,),
+        )
+    return [_version_to_dict(r) for r in rows]
+
+
+async def story_so_far(campaign_id: int) -> dict:
+    """The latest stored version and whether it is behind the sessions' summaries."""
+    latest = await latest_version(campaign_id)
+    sessions = await _campaign_sessions(campaign_id)
+    covered = latest["sessions"] if latest else []
+    return {
+        "summary": latest,
+        "stale": covered != _covered(sessions),
+        "sessions_covered": len(covered),
+        "sessions_summarized": len(sessions),
+    }
+
+
+async def _save_version(
+    campaign_id: int, content: str, sessions: list[dict], method: str, model: str
+) -> dict:
+    async with get_db() as db:
+        cursor = await db.execute(
+            """INSERT INTO campaign_summaries (campaign_id, version, content, sessions, method, model_used)
+               SELECT ?, COALESCE(MAX(version), 0) + 1, ?, ?, ?, ?
+               FROM campaign_summaries WHERE campaign_id = ?""",
+            (campaign_id, content, json.dumps(_covered(sessions)), method, model, campaign_id),
+        )
+        await db.execute(
+            """DELETE FROM campaign_summaries WHERE campaign_id = ? AND id NOT IN (
+                 SELECT id FROM campaign_summaries WHERE campaign_id = ?
+                 ORDER BY version DESC LIMIT ?
+               )""",
+            (campaign_id, campaign_id, KEEP_VERSIONS),
+        )
+        rows = await db.execute_fetchall(
+            "SELECT * FROM campaign_summaries WHERE id = ?", (cursor.lastrowid,)
+        )
+    return _version_to_dict(rows[0])
+
+
+async def _merge(texts: list[str], base_url: str, api_key: str | None, model: str) -> str:
+    prompt = ROLLUP_MERGE_PROMPT.format(max_words=ROLLUP_MAX_WORDS, recaps="\n\n".join(texts))
+    return await llm_client.generate(base_url, api_key, model, prompt, system=ROLLUP_SYSTEM)
+
+
+async def _rebuild(sessions: list[dict], base_url: str, api_key: str | None, model: str) -> str:
+    """Merge the session recaps level by level, ROLLUP_FANIN at a time."""
+    texts = [f"{_title(s).upper()}:\n{s['content']}" for s in sessions]
+    while True:
+        groups = [texts[i:i + ROLLUP_FANIN] for i in range(0, len(texts), ROLLUP_FANIN)]
+        texts = await gather_ordered([_merge(g, base_url, api_key, model) for g in groups])
+        if len(texts) == 1:
+            return texts[0]
+        texts = [f"PART {i}:\n{text}" for i, text in enumerate(texts, start=1)]
+
+
+async def _fold(story: str, session: dict, base_url: str, api_key: str | None, model: str) -> str:
+    prompt = ROLLUP_UPDATE_PROMPT.format(
+        max_words=ROLLUP_MAX_WORDS, story=story, title=_title(session), recap=session["content"],
+    )
+    return await llm_client.generate(base_url, api_key, model, prompt, system=ROLLUP_SYSTEM)
+
+
+_locks: dict[int, tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = {}
+
+
+def _campaign_lock(campaign_id: int) -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    cached = _locks.get(campaign_id)
+    if cached is None or cached[0] is not loop:
+        cached = (loop, asyncio.Lock())
+        _locks[campaign_id] = cached
+    return cached[1]
+
+
+async def update_campaign_summary(
+    campaign_id: int, base_url: str, api_key: str | None, model: str
+) -> dict | None:
+    """Bring the campaign's story so far up to date; returns the latest version.
+
+    Appended sessions are folded into the previous version one at a time,
+    each becoming a version of its own. Anything else rebuilds the story.
+    """
+    async with _campaign_lock(campaign_id):
+        sessions = await _campaign_sessions(campaign_id)
+        latest = await latest_version(campaign_id)
+        covered = latest["sessions"] if latest else []
+        current = _covered(sessions)
+        if not sessions or covered == current:
+            return latest
+
+        if covered and current[:len(covered)] == covered:
+            story = latest["content"]
+            for i in range(len(covered), len(sessions)):
+                story = await _fold(story, sessions[i], base_url, api_key, model)
+                latest = await _save_version(campaign_id, story, sessions[:i + 1], "incremental", model)
+            return latest
+
+        logger.info("Rebuilding the story so far of campaign %d from %d sessions", campaign_id, len(sessions))
+        story = await _rebuild(sessions, base_url, api_key, model)
+        return await _save_version(campaign_id, story, sessions, "rebuild", model)
+
+
+async def update_for_session(session_id: int, base_url: str, api_key: str | None, model: str) -> None:
+    """Update the story so far of *session_id*'s campaign after its full summary changed.
+
+    Failures are logged rather than raised, so they never fail the session's
+    own summary; the next update or an explicit refresh catches up.
+    """
+    async with get_db() as db:
+        rows = await db.execute_fetchall("SELECT campaign_id FROM sessions WHERE id = ?", (session_id,))
+    if not rows:
+        return
+    try:
+        await update_campaign_summary(rows[0]["campaign_id"], base_url, api_key, model)
+    except Exception:
+        logger.warning("Could not update the story so far for session %d", session_id, exc_info=True)
+
+
+_tasks: set[asyncio.Task] = set()
+
+
+def schedule_update(session_id: int, base_url: str, api_key: str | None, model: str) -> asyncio.Task:
+    """Run ``update_for_session`` in the background; updates of one campaign take turns."""
+    # A fresh context, so the update is not cancelled along with the job that saved the summary
+    task = asyncio.create_task(
+        update_for_session(session_id, base_url, api_key, model), context=contextvars.Context()
+    )
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
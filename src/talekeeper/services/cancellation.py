@@ -0,0 +1,66 @@
+"""Cooperative cancellation for long-running pipeline work.
+
+A job runs inside a cancellation scope holding a ``CancelToken``. Pipeline
+code calls ``check_cancelled()`` at natural boundaries (between transcription
+chunks, speaker embedding batches, LLM calls and diffusion steps), which
+raises ``OperationCancelled`` once the token is cancelled. The token lives in
+a context variable, so code running in ``asyncio.to_thread`` workers sees the
+scope of the job that started it.
+"""
+
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class OperationCancelled(BaseException):
+    """Raised at a cancellation checkpoint after the work was cancelled.
+
+    Like asyncio.CancelledError it derives from BaseException, so broad
+    ``except Exception`` handlers in pipeline code do not swallow it.
+    """
+
+
+class CancelToken:
+    """A thread-safe cancellation flag shared by a job and its worker threads."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelled()
+
+
+_current: contextvars.ContextVar[CancelToken | None] = contextvars.ContextVar(
+    "talekeeper_cancel_token", default=None
+)
+
+
+@contextmanager
+def cancellation_scope(token: CancelToken) -> Iterator[CancelToken]:
+    """Make *token* the current token for the enclosed work."""
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+
+
+def current_token() -> CancelToken | None:
+    return _current.get()
+
+
+def check_cancelled() -> None:
+    """Raise OperationCancelled if the current work was cancelled; a no-op outside a scope."""
+    token = _current.get()
+    if token is not None:
+        token.raise_if_cancelled()
@@ -1,9 +1,12 @@
 """Speaker diarization service using diarize library (Silero VAD + WeSpeaker + spectral clustering)."""
 
+import asyncio
+import functools
 import gc
 import logging
 import os
 import tempfile
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable
@@ -13,6 +16,7 @@ import soundfile as sf
 from scipy.optimize import linear_sum_assignment
 
 from talekeeper.db import get_db
+from talekeeper.services.cancellation import CancelToken, cancellation_scope, check_cancelled
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +35,15 @@ OVERLAP_RATIO_THRESHOLD = 0.85
 # appearing as two "Player X" labels when their embeddings vary across the session.
 CLUSTER_MERGE_THRESHOLD = 0.75
 
+# Cross-part linking: a part's cluster is linked to an existing session speaker
+# when their centroid cosine similarity is at least this value. Lower than
+# CLUSTER_MERGE_THRESHOLD because separate recordings differ in mic and room.
+CROSS_PART_LINK_THRESHOLD = 0.6
+
+# Minimum embeddings for a part to be clustered on its own; smaller parts are
+# treated as one micro-cluster and left to the linking step.
+MIN_PART_CLUSTER_EMBEDDINGS = 4
+
 # Speaker change detection constants
 MIN_CHANGE_DETECTION_DURATION = 2.0
 CHANGE_DETECTION_WINDOW = 0.4
@@ -48,6 +61,13 @@ class SpeakerSegment:
 
 ProgressCallback = Callable[[str, dict], None]
 
+_speaker_model = None
+_speaker_model_lock = threading.Lock()
+
+# "concurrent" extracts speaker embeddings alongside ASR; "sequential" runs them back to back
+PIPELINE_MODES = ("sequential", "concurrent")
+MIN_CONCURRENT_CPUS = 4
+
 
 async def _resolve_hf_token() -> str:
     """Resolve HuggingFace token: settings table > HF_TOKEN env var.
@@ -77,8 +97,106 @@ async def _resolve_hf_token() -> str:
     )
 
 
+async def resolve_pipeline_mode() -> str:
+    """Resolve pipeline mode: settings > env var > concurrent on multi-core hosts."""
+    mode = None
+    try:
+        async with get_db() as db:
+            rows = await db.execute_fetchall(
+                "SELECT value FROM settings WHERE key = 'pipeline_mode'"
+            )
+            if rows and rows[0]["value"]:
+                mode = rows[0]["value"]
+    except Exception:
+        pass
+    mode = mode or os.environ.get("TALEKEEPER_PIPELINE_MODE")
+    if mode in PIPELINE_MODES:
+        return mode
+    return "concurrent" if (os.cpu_count() or 1) >= MIN_CONCURRENT_CPUS else "sequential"
+
+
+class EmbeddingPrefetch:
+    """Speech embeddings being extracted in a worker thread; await it for the result."""
+
+    def __init__(self, future: asyncio.Future, token: CancelToken) -> None:
+        self._future = future
+        self._token = token
+
+    def __await__(self):
+        return self._future.__await__()
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def cancel(self) -> None:
+        """Stop the worker at its next embedding batch; awaiting then raises OperationCancelled."""
+        self._token.cancel()
+
+
+def start_embedding_prefetch(
+    audio_path: Path,
+    progress_callback: ProgressCallback | None = None,
+) -> EmbeddingPrefetch:
+    """Decode audio and extract speech embeddings in a worker thread while ASR runs.
+
+    Await the returned prefetch for the (embeddings, subsegments) pair to pass to
+    run_final_diarization() as a single part; only clustering and alignment are
+    left once the transcript is done. The worker has its own cancel token, so a
+    job that stops waiting for it can stop it with ``cancel()``.
+    """
+    from talekeeper.services.audio import audio_to_wav
+
+    token = CancelToken()
+
+    def _extract() -> tuple[np.ndarray, list[tuple[float, float, int]]]:
+        with cancellation_scope(token):
+            wav_path = audio_to_wav(audio_path)
+            try:
+                check_cancelled()
+                return extract_speech_embeddings(wav_path, progress_callback)
+            finally:
+                wav_path.unlink(missing_ok=True)
+
+    future = asyncio.ensure_future(asyncio.to_thread(_extract))
+    # An abandoned prefetch (job failed or was cancelled) must not log as unretrieved
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    return EmbeddingPrefetch(future, token)
+
+
+def _get_speaker_model():
+    """Load and cache the WeSpeaker embedding model (shared by extraction threads)."""
+    global _speaker_model
+    import wespeakerruntime
+    from talekeeper.services.model_residency import residency
+
+    with _speaker_model_lock:
+        if _speaker_model is not None:
+            residency.touch("diarization")
+            return _speaker_model
+        with residency.loading("diarization", "wespeaker-en", unload_models):
+            _speaker_model = wespeakerruntime.Speaker(lang="en")
+        return _speaker_model
+
+
+def _releases_speaker_model(fn):
+    """Release the reference that *fn*'s call to _get_speaker_model() took once it returns."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        from talekeeper.services.model_residency import residency
+
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            residency.release("diarization")
+
+    return wrapper
+
+
 def unload_models() -> None:
-    """No-op — diarize library manages its own model lifecycle. Just gc.collect()."""
+    """Drop the cached WeSpeaker model; the diarize library manages its own."""
+    global _speaker_model
+    _speaker_model = None
     gc.collect()
 
 
@@ -174,6 +292,7 @@ def _normalize_segment_audio(
     return np.clip(audio * scale, -1.0, 1.0)
 
 
+@_releases_speaker_model
 def _extract_fine_stride_embeddings(
     audio_data: np.ndarray,
     sr: int,
@@ -192,9 +311,7 @@ def _extract_fine_stride_embeddings(
         (embeddings, timestamps) where embeddings is (N, 256) ndarray and
         timestamps is a list of window center times.
     """
-    import wespeakerruntime
-
-    model = wespeakerruntime.Speaker(lang="en")
+    model = _get_speaker_model()
 
     embeddings: list[np.ndarray] = []
     timestamps: list[float] = []
@@ -366,6 +483,7 @@ def _detect_speaker_changes(
             refined.append(seg)
             continue
 
+        check_cancelled()
         embeddings, timestamps = _extract_fine_stride_embeddings(
             audio_data, sr, seg.start, seg.end
         )
@@ -528,6 +646,7 @@ def _flag_overlap_subsegments(
     return overlap_mask
 
 
+@_releases_speaker_model
 def _extract_embeddings_with_progress(
     audio_path: Path,
     speech_segments: list,
@@ -544,9 +663,7 @@ def _extract_embeddings_with_progress(
         (embeddings, subsegments) where embeddings is (N, 256) ndarray and
         subsegments is list of (start, end, parent_idx) tuples.
     """
-    import wespeakerruntime
-
-    model = wespeakerruntime.Speaker(lang="en")
+    model = _get_speaker_model()
 
     audio_data, sr = sf.read(str(audio_path))
     if audio_data.ndim > 1:
@@ -557,6 +674,7 @@ def _extract_embeddings_with_progress(
     total = len(speech_segments)
 
     for idx, seg in enumerate(speech_segments):
+        check_cancelled()
         seg_duration = seg.end - seg.start
 
         if seg_duration < MIN_SEGMENT_DURATION:
@@ -653,25 +771,24 @@ def _build_segments_from_labels(
     return _merge_segments(raw_segments)
 
 
-def diarize(
+def extract_speech_embeddings(
     wav_path: Path,
-    num_speakers: int | None = None,
     progress_callback: ProgressCallback | None = None,
-) -> list[SpeakerSegment]:
-    """Run diarization pipeline: VAD -> embeddings -> spectral clustering.
+) -> tuple[np.ndarray, list[tuple[float, float, int]]]:
+    """Run the per-recording half of diarization: VAD -> change detection -> embeddings.
+
+    The result depends only on the audio, so it can be computed per audio part,
+    cached, and later time-shifted and concatenated before a single clustering pass.
 
     Args:
         wav_path: Path to WAV file.
-        num_speakers: Exact number of speakers for clustering.
         progress_callback: Optional callback(stage, detail_dict) for progress.
 
     Returns:
-        List of merged SpeakerSegments.
+        (embeddings, subsegments) as returned by _extract_embeddings_with_progress();
+        empty when no speech is found.
     """
     from diarize.vad import run_vad
-    from diarize.clustering import cluster_speakers
-
-    logger.info("Starting diarization on %s", wav_path.name)
 
     # Stage 0: Normalize audio loudness so quiet speakers are detected by VAD
     norm_path = _normalize_audio_file(wav_path)
@@ -689,7 +806,7 @@ def diarize(
             })
 
         if not speech_segments:
-            return []
+            return np.empty((0, 256), dtype=np.float32), []
 
         # Stage 2: Speaker change detection
         speech_segments = _detect_speaker_changes(norm_path, speech_segments, progress_callback)
@@ -698,31 +815,7 @@ def diarize(
         # Use original wav_path, not norm_path: WeSpeaker handles loudness variation
         # internally; running AGC before embedding extraction boosts noise alongside
         # speech, worsening SNR for distant speakers rather than helping them.
-        embeddings, subsegments = _extract_embeddings_with_progress(
-            wav_path, speech_segments, progress_callback
-        )
-
-        if embeddings.shape[0] == 0:
-            return []
-
-        # Stage 4: Spectral clustering
-        if progress_callback:
-            progress_callback("clustering_start", {})
-        cluster_kwargs = {}
-        if num_speakers is not None:
-            cluster_kwargs["num_speakers"] = num_speakers
-        labels, _details = cluster_speakers(embeddings, **cluster_kwargs)
-        labels = _merge_similar_clusters(embeddings, labels)
-        num_found_speakers = len(set(labels))
-        logger.info("Clustering found %d speakers, %d segments", num_found_speakers, len(labels))
-        if progress_callback:
-            progress_callback("clustering_done", {
-                "num_speakers": num_found_speakers,
-                "num_segments": len(labels),
-            })
-
-        overlap_mask = _flag_overlap_subsegments(embeddings, labels)
-        return _build_segments_from_labels(speech_segments, subsegments, labels, overlap_mask)
+        return _extract_embeddings_with_progress(wav_path, speech_segments, progress_callback)
     finally:
         try:
             norm_path.unlink()
@@ -730,6 +823,218 @@ def diarize(
             pass
 
 
+def _cluster_embeddings(
+    embeddings: np.ndarray,
+    num_speakers: int | None = None,
+    progress_callback: ProgressCallback | None = None,
+) -> np.ndarray:
+    """Spectral clustering followed by merging of near-duplicate clusters."""
+    from diarize.clustering import cluster_speakers
+
+    if progress_callback:
+        progress_callback("clustering_start", {})
+    cluster_kwargs = {}
+    if num_speakers is not None:
+        cluster_kwargs["num_speakers"] = num_speakers
+    labels, _details = cluster_speakers(embeddings, **cluster_kwargs)
+    labels = _merge_similar_clusters(embeddings, labels)
+    num_found_speakers = len(set(labels))
+    logger.info("Clustering found %d speakers, %d segments", num_found_speakers, len(labels))
+    if progress_callback:
+        progress_callback("clustering_done", {
+            "num_speakers": num_found_speakers,
+            "num_segments": len(labels),
+        })
+    return labels
+
+
+def cluster_speech_embeddings(
+    embeddings: np.ndarray,
+    subsegments: list[tuple[float, float, int]],
+    num_speakers: int | None = None,
+    progress_callback: ProgressCallback | None = None,
+    labels: np.ndarray | None = None,
+) -> list[SpeakerSegment]:
+    """Cluster precomputed embeddings into merged SpeakerSegments.
+
+    Pass *labels* (e.g. from cluster_part_embeddings()) to skip clustering.
+    """
+    if embeddings.shape[0] == 0:
+        return []
+
+    if labels is None:
+        labels = _cluster_embeddings(embeddings, num_speakers, progress_callback)
+    overlap_mask = _flag_overlap_subsegments(embeddings, labels)
+    return _build_segments_from_labels([], subsegments, labels, overlap_mask)
+
+
+def _cluster_centroids(embeddings: np.ndarray, labels: np.ndarray) -> dict[int, tuple[np.ndarray, int]]:
+    """L2-normalized centroid and member count per cluster label."""
+    centroids: dict[int, tuple[np.ndarray, int]] = {}
+    for lbl in np.unique(labels):
+        mask = labels == lbl
+        c = embeddings[mask].mean(axis=0).astype(np.float64)
+        norm = np.linalg.norm(c)
+        centroids[int(lbl)] = (c / norm if norm > 1e-8 else c, int(mask.sum()))
+    return centroids
+
+
+def _merge_centroids(a: tuple[np.ndarray, int], b: tuple[np.ndarray, int]) -> tuple[np.ndarray, int]:
+    c = a[0] * a[1] + b[0] * b[1]
+    norm = np.linalg.norm(c)
+    return (c / norm if norm > 1e-8 else c, a[1] + b[1])
+
+
+def link_part_clusters(
+    part_embeddings: list[np.ndarray],
+    part_labels: list[np.ndarray],
+    num_speakers: int | None = None,
+    threshold: float = CROSS_PART_LINK_THRESHOLD,
+) -> list[np.ndarray]:
+    """Map per-part cluster labels onto one consistent set of session speakers.
+
+    Parts are linked in order. Each part's cluster centroids are matched to the
+    running session speakers with the Hungarian algorithm (as in
+    diarize_with_signatures()); pairs at or above *threshold* share a speaker and
+    the rest become new speakers. If *num_speakers* is given and more speakers
+    were found, the most similar speakers are merged until the count matches.
+
+    Returns:
+        One array of session-level labels per part, aligned with *part_labels*.
+    """
+    speakers: list[tuple[np.ndarray, int]] = []
+    part_maps: list[dict[int, int]] = []
+
+    for embeddings, labels in zip(part_embeddings, part_labels):
+        if len(labels) == 0:
+            part_maps.append({})
+            continue
+        centroids = _cluster_centroids(embeddings, labels)
+        local_ids = list(centroids.keys())
+        mapping: dict[int, int] = {}
+
+        if speakers:
+            local_matrix = np.stack([centroids[l][0] for l in local_ids])
+            speaker_matrix = np.stack([sp[0] for sp in speakers])
+            sim_matrix = local_matrix @ speaker_matrix.T
+            row_ind, col_ind = linear_sum_assignment(1.0 - sim_matrix)
+            for r, c in zip(row_ind, col_ind):
+                if float(sim_matrix[r, c]) >= threshold:
+                    mapping[local_ids[r]] = int(c)
+
+        for local_id in local_ids:
+            if local_id in mapping:
+                idx = mapping[local_id]
+                speakers[idx] = _merge_centroids(speakers[idx], centroids[local_id])
+            else:
+                mapping[local_id] = len(speakers)
+                speakers.append(centroids[local_id])
+        part_maps.append(mapping)
+
+    # Enforce the requested speaker count by merging the closest speakers
+    speaker_ids = list(range(len(speakers)))
+    remap = {i: i for i in speaker_ids}
+    if num_speakers is not None:
+        active = {i: speakers[i] for i in speaker_ids}
+        while len(active) > max(1, num_speakers):
+            keys = list(active.keys())
+            matrix = np.stack([active[k][0] for k in keys])
+            sims = matrix @ matrix.T
+            np.fill_diagonal(sims, -np.inf)
+            i, j = np.unravel_index(int(np.argmax(sims)), sims.shape)
+            keep, drop = keys[min(i, j)], keys[max(i, j)]
+            active[keep] = _merge_centroids(active[keep], active.pop(drop))
+            for k, v in remap.items():
+                if v == drop:
+                    remap[k] = keep
+
+    # Renumber to consecutive labels in order of first appearance
+    final_ids: dict[int, int] = {}
+    for root in (remap[i] for i in speaker_ids):
+        final_ids.setdefault(root, len(final_ids))
+
+    logger.info(
+        "Cross-part linking: %d part clusters -> %d speakers across %d parts",
+        sum(len(m) for m in part_maps), len(final_ids), len(part_maps),
+    )
+    return [
+        np.array([final_ids[remap[mapping[int(l)]]] for l in labels], dtype=int)
+        for labels, mapping in zip(part_labels, part_maps)
+    ]
+
+
+def cluster_part_embeddings(
+    parts: list[tuple[np.ndarray, list[tuple[float, float, int]]]],
+    num_speakers: int | None = None,
+    progress_callback: ProgressCallback | None = None,
+) -> tuple[np.ndarray, list[tuple[float, float, int]], np.ndarray]:
+    """Cluster each part's embeddings separately, then link speakers across parts.
+
+    Clustering cost grows with the square of the embeddings clustered together,
+    so clustering per part and linking by centroid scales near-linearly in the
+    number of parts. A single part is clustered exactly like diarize() does.
+
+    Args:
+        parts: Per-part (embeddings, subsegments) already shifted onto the session timeline.
+        num_speakers: Exact number of speakers for the whole session.
+        progress_callback: Optional callback(stage, detail_dict) for progress.
+
+    Returns:
+        (embeddings, subsegments, labels) concatenated across parts with session-level labels.
+    """
+    from diarize.clustering import cluster_speakers
+
+    parts = [(emb, subs) for emb, subs in parts if emb.shape[0] > 0]
+    if not parts:
+        return np.empty((0, 256), dtype=np.float32), [], np.empty(0, dtype=int)
+
+    embeddings = np.concatenate([emb for emb, _ in parts])
+    subsegments = [sub for _, subs in parts for sub in subs]
+    if len(parts) == 1:
+        return embeddings, subsegments, _cluster_embeddings(embeddings, num_speakers, progress_callback)
+
+    if progress_callback:
+        progress_callback("clustering_start", {})
+    part_labels: list[np.ndarray] = []
+    for emb, _subs in parts:
+        if emb.shape[0] < MIN_PART_CLUSTER_EMBEDDINGS:
+            part_labels.append(np.zeros(emb.shape[0], dtype=int))
+            continue
+        labels, _details = cluster_speakers(emb)
+        part_labels.append(_merge_similar_clusters(emb, labels))
+
+    linked = link_part_clusters([emb for emb, _ in parts], part_labels, num_speakers)
+    labels = np.concatenate(linked)
+    num_found_speakers = len(set(labels.tolist()))
+    logger.info("Clustering found %d speakers, %d segments", num_found_speakers, len(labels))
+    if progress_callback:
+        progress_callback("clustering_done", {
+            "num_speakers": num_found_speakers,
+            "num_segments": len(labels),
+        })
+    return embeddings, subsegments, labels
+
+
+def diarize(
+    wav_path: Path,
+    num_speakers: int | None = None,
+    progress_callback: ProgressCallback | None = None,
+) -> list[SpeakerSegment]:
+    """Run diarization pipeline: VAD -> embeddings -> spectral clustering.
+
+    Args:
+        wav_path: Path to WAV file.
+        num_speakers: Exact number of speakers for clustering.
+        progress_callback: Optional callback(stage, detail_dict) for progress.
+
+    Returns:
+        List of merged SpeakerSegments.
+    """
+    logger.info("Starting diarization on %s", wav_path.name)
+    embeddings, subsegments = extract_speech_embeddings(wav_path, progress_callback)
+    return cluster_speech_embeddings(embeddings, subsegments, num_speakers, progress_callback)
+
+
 def extract_speaker_embedding(
     wav_path: Path,
     time_ranges: list[tuple[float, float]],
@@ -810,125 +1115,99 @@ def diarize_with_signatures(
     Returns:
         List of SpeakerSegments with labels like "roster_<id>" or "Unknown Speaker".
     """
-    from diarize.vad import run_vad
-    from diarize.clustering import cluster_speakers
-
     logger.info("Starting diarization with signatures on %s", wav_path.name)
+    embeddings, subsegments = extract_speech_embeddings(wav_path, progress_callback)
+    return match_speech_embeddings(
+        embeddings, subsegments, signatures,
+        similarity_threshold=similarity_threshold,
+        num_speakers=num_speakers,
+        progress_callback=progress_callback,
+    )
 
-    # Stage 0: Normalize audio loudness so quiet speakers are detected by VAD
-    norm_path = _normalize_audio_file(wav_path)
-    try:
-        # Stage 1: VAD
-        if progress_callback:
-            progress_callback("vad_start", {})
-        speech_segments = run_vad(str(norm_path))
-        total_speech = sum(s.end - s.start for s in speech_segments)
-        logger.info("VAD found %d speech segments (%.0fs)", len(speech_segments), total_speech)
-        if progress_callback:
-            progress_callback("vad_done", {
-                "num_segments": len(speech_segments),
-                "total_speech_seconds": total_speech,
-            })
-
-        if not speech_segments:
-            return []
-
-        # Stage 2: Speaker change detection
-        speech_segments = _detect_speaker_changes(norm_path, speech_segments, progress_callback)
-
-        # Stage 3: Embedding extraction (original audio — see diarize() for rationale)
-        embeddings, subsegments = _extract_embeddings_with_progress(
-            wav_path, speech_segments, progress_callback
-        )
-
-        if embeddings.shape[0] == 0:
-            return []
 
-        # Stage 4: Clustering
-        if progress_callback:
-            progress_callback("clustering_start", {})
-        cluster_kwargs = {}
-        if num_speakers is not None:
-            cluster_kwargs["num_speakers"] = num_speakers
-        labels, _details = cluster_speakers(embeddings, **cluster_kwargs)
-        labels = _merge_similar_clusters(embeddings, labels)
-        num_found_speakers = len(set(labels))
-        logger.info("Clustering found %d speakers", num_found_speakers)
-        if progress_callback:
-            progress_callback("clustering_done", {
-                "num_speakers": num_found_speakers,
-                "num_segments": len(labels),
-            })
+def match_speech_embeddings(
+    embeddings: np.ndarray,
+    subsegments: list[tuple[float, float, int]],
+    signatures: list[tuple[int, np.ndarray]],
+    similarity_threshold: float = 0.75,
+    num_speakers: int | None = None,
+    progress_callback: ProgressCallback | None = None,
+    labels: np.ndarray | None = None,
+) -> list[SpeakerSegment]:
+    """Cluster precomputed embeddings and match the clusters to voice signatures.
 
-        # Overlap detection: flag ambiguous subsegments before signature matching
-        overlap_mask = _flag_overlap_subsegments(embeddings, labels)
+    Pass *labels* (e.g. from cluster_part_embeddings()) to skip clustering.
+    """
+    if embeddings.shape[0] == 0:
+        return []
 
-        # Stage 5: Match speaker clusters to signatures via Hungarian algorithm
-        # Hungarian guarantees a globally optimal 1:1 cluster→signature assignment.
-        # Greedy argmax can assign two clusters to the same person while leaving
-        # another speaker unmatched — Hungarian prevents that entirely.
-        logger.info("Matching speakers to %d voice signatures", len(signatures))
+    if labels is None:
+        labels = _cluster_embeddings(embeddings, num_speakers, progress_callback)
+
+    # Overlap detection: flag ambiguous subsegments before signature matching
+    overlap_mask = _flag_overlap_subsegments(embeddings, labels)
+
+    # Match speaker clusters to signatures via Hungarian algorithm
+    # Hungarian guarantees a globally optimal 1:1 cluster→signature assignment.
+    # Greedy argmax can assign two clusters to the same person while leaving
+    # another speaker unmatched — Hungarian prevents that entirely.
+    logger.info("Matching speakers to %d voice signatures", len(signatures))
+
+    # Group embeddings by speaker label
+    speaker_embeddings: dict[int, list[np.ndarray]] = {}
+    for i, label in enumerate(labels):
+        label_int = int(label)
+        if label_int not in speaker_embeddings:
+            speaker_embeddings[label_int] = []
+        speaker_embeddings[label_int].append(embeddings[i])
+
+    # Compute L2-normalized centroid per speaker
+    speaker_centroids: dict[int, np.ndarray] = {}
+    for label_int, embs in speaker_embeddings.items():
+        centroid = np.mean(embs, axis=0)
+        norm = np.linalg.norm(centroid)
+        if norm > 0:
+            centroid = centroid / norm
+        speaker_centroids[label_int] = centroid
+
+    # Build similarity matrix: (num_clusters, num_signatures)
+    sig_ids = [s[0] for s in signatures]
+    sig_matrix = np.stack([s[1] for s in signatures])
+    cluster_labels = list(speaker_centroids.keys())
+    centroid_matrix = np.stack([speaker_centroids[l] for l in cluster_labels])
+    sim_matrix = centroid_matrix @ sig_matrix.T  # (num_clusters, num_sigs)
+
+    # Hungarian assignment: minimize cost = maximize similarity
+    row_ind, col_ind = linear_sum_assignment(1.0 - sim_matrix)
+
+    label_map: dict[int, str] = {l: "Unknown Speaker" for l in cluster_labels}
+    for r, c in zip(row_ind, col_ind):
+        best_sim = float(sim_matrix[r, c])
+        if best_sim >= similarity_threshold:
+            label_map[cluster_labels[r]] = f"roster_{sig_ids[c]}"
+    logger.info(
+        "Hungarian matching: %d/%d clusters matched above threshold %.2f",
+        sum(1 for v in label_map.values() if v != "Unknown Speaker"),
+        len(cluster_labels),
+        similarity_threshold,
+    )
 
-        # Group embeddings by speaker label
-        speaker_embeddings: dict[int, list[np.ndarray]] = {}
-        for i, label in enumerate(labels):
+    # Build output segments; flagged subsegments get "[crosstalk]" (skip signature matching)
+    raw_segments = []
+    for i, ((start, end, _parent_idx), label) in enumerate(zip(subsegments, labels)):
+        if overlap_mask[i]:
+            mapped_label = "[crosstalk]"
+        else:
             label_int = int(label)
-            if label_int not in speaker_embeddings:
-                speaker_embeddings[label_int] = []
-            speaker_embeddings[label_int].append(embeddings[i])
-
-        # Compute L2-normalized centroid per speaker
-        speaker_centroids: dict[int, np.ndarray] = {}
-        for label_int, embs in speaker_embeddings.items():
-            centroid = np.mean(embs, axis=0)
-            norm = np.linalg.norm(centroid)
-            if norm > 0:
-                centroid = centroid / norm
-            speaker_centroids[label_int] = centroid
-
-        # Build similarity matrix: (num_clusters, num_signatures)
-        sig_ids = [s[0] for s in signatures]
-        sig_matrix = np.stack([s[1] for s in signatures])
-        cluster_labels = list(speaker_centroids.keys())
-        centroid_matrix = np.stack([speaker_centroids[l] for l in cluster_labels])
-        sim_matrix = centroid_matrix @ sig_matrix.T  # (num_clusters, num_sigs)
-
-        # Hungarian assignment: minimize cost = maximize similarity
-        row_ind, col_ind = linear_sum_assignment(1.0 - sim_matrix)
-
-        label_map: dict[int, str] = {l: "Unknown Speaker" for l in cluster_labels}
-        for r, c in zip(row_ind, col_ind):
-            best_sim = float(sim_matrix[r, c])
-            if best_sim >= similarity_threshold:
-                label_map[cluster_labels[r]] = f"roster_{sig_ids[c]}"
-        logger.info(
-            "Hungarian matching: %d/%d clusters matched above threshold %.2f",
-            sum(1 for v in label_map.values() if v != "Unknown Speaker"),
-            len(cluster_labels),
-            similarity_threshold,
-        )
+            mapped_label = label_map.get(label_int, "Unknown Speaker")
+        raw_segments.append(SpeakerSegment(
+            speaker_label=mapped_label,
+            start_time=start,
+            end_time=end,
+        ))
 
-        # Build output segments; flagged subsegments get "[crosstalk]" (skip signature matching)
-        raw_segments = []
-        for i, ((start, end, _parent_idx), label) in enumerate(zip(subsegments, labels)):
-            if overlap_mask[i]:
-                mapped_label = "[crosstalk]"
-            else:
-                label_int = int(label)
-                mapped_label = label_map.get(label_int, "Unknown Speaker")
-            raw_segments.append(SpeakerSegment(
-                speaker_label=mapped_label,
-                start_time=start,
-                end_time=end,
-            ))
-
-        raw_segments.sort(key=lambda s: s.start_time)
-        return _merge_segments(raw_segments)
-    finally:
-        try:
-            norm_path.unlink()
-        except OSError:
-            pass
+    raw_segments.sort(key=lambda s: s.start_time)
+    return _merge_segments(raw_segments)
 
 
 # Minimum duration (seconds) each child must have after splitting.
@@ -1327,14 +1606,19 @@ async def enroll_speaker_voice(speaker_id: int, session_id: int) -> None:
 
 async def run_final_diarization(
     session_id: int,
-    wav_path: Path,
+    wav_path: Path | None,
     num_speakers_override: int | None = None,
     progress_callback: ProgressCallback | None = None,
+    part_embeddings: list[tuple[np.ndarray, list[tuple[float, float, int]]]] | None = None,
 ) -> None:
     """Run final diarization pass and update all speaker labels in DB.
 
     When voice signatures exist, uses signature-based matching with the campaign's
     similarity_threshold. Otherwise falls back to unsupervised diarization.
+
+    If *part_embeddings* is given (per-part embeddings already shifted onto the
+    session timeline), parts are clustered separately and linked across parts;
+    only clustering and alignment run and *wav_path* is not read.
     """
     import json
 
@@ -1377,12 +1661,26 @@ async def run_final_diarization(
 
     if signatures:
         sig_pairs = [(s[0], s[1]) for s in signatures]
-        segments = diarize_with_signatures(
-            wav_path, sig_pairs,
-            similarity_threshold=similarity_threshold,
-            num_speakers=num_speakers,
-            progress_callback=progress_callback,
-        )
+        if part_embeddings is not None:
+            # Clustering a long session takes a while; keep it off the event loop too
+            embeddings, subsegments, labels = await asyncio.to_thread(
+                cluster_part_embeddings, part_embeddings, num_speakers, progress_callback,
+            )
+            segments = await asyncio.to_thread(
+                match_speech_embeddings,
+                embeddings, subsegments, sig_pairs,
+                similarity_threshold=similarity_threshold,
+                labels=labels,
+            )
+        else:
+            # In a worker thread so the server stays responsive (and can cancel it)
+            segments = await asyncio.to_thread(
+                diarize_with_signatures,
+                wav_path, sig_pairs,
+                similarity_threshold=similarity_threshold,
+                num_speakers=num_speakers,
+                progress_callback=progress_callback,
+            )
 
         roster_info = {s[0]: (s[2], s[3]) for s in signatures}
 
@@ -1453,7 +1751,17 @@ async def run_final_diarization(
                         ),
                     )
     else:
-        segments = diarize(wav_path, num_speakers, progress_callback=progress_callback)
+        if part_embeddings is not None:
+            embeddings, subsegments, labels = await asyncio.to_thread(
+                cluster_part_embeddings, part_embeddings, num_speakers, progress_callback,
+            )
+            segments = await asyncio.to_thread(
+                cluster_speech_embeddings, embeddings, subsegments, labels=labels,
+            )
+        else:
+            segments = await asyncio.to_thread(
+                diarize, wav_path, num_speakers, progress_callback=progress_callback,
+            )
         # Exclude [crosstalk] from speaker creation
         unique_labels = sorted(set(
             s.speaker_label for s in segments if s.speaker_label != "[crosstalk]"
@@ -1,12 +1,15 @@
 """Scene description and in-process image generation pipeline using mflux."""
 
+import asyncio
 import logging
 import os
 import uuid
+from typing import AsyncIterator
 
 from talekeeper.db import get_db
 from talekeeper.paths import get_session_images_dir
 from talekeeper.services import llm_client
+from talekeeper.services.cancellation import check_cancelled
 
 logger = logging.getLogger(__name__)
 
@@ -37,12 +40,13 @@ Guidelines:
 - Ignore out-of-character table talk, game mechanics, dice rolls, and DM instructions.
   Only use the in-world narrative content for the scene."""
 
-SCENE_DESCRIPTION_PROMPT = """Based on the following session content, write a vivid scene description
-suitable for AI image generation. Pick the single most dramatic or memorable moment and describe
-it visually.
-{character_block}
-SESSION CONTENT:
+# The session content comes first so re-crafting a scene for the same session
+# reuses the prompt prefix a local server already processed
+SCENE_DESCRIPTION_PROMPT = """SESSION CONTENT:
 {content}
+{character_block}
+Based on the session content above, write a vivid scene description suitable for AI image
+generation. Pick the single most dramatic or memorable moment and describe it visually.
 
 Write a concise, vivid scene description (2-4 sentences):"""
 
@@ -70,20 +74,35 @@ async def _resolve_image_config() -> dict:
     return {"model": model, "steps": steps, "guidance_scale": guidance_scale}
 
 
+class _CancellationCallback:
+    """mflux in-loop callback: stops generation between diffusion steps once the job is cancelled."""
+
+    def call_in_loop(self, *args, **kwargs) -> None:
+        check_cancelled()
+
+
 def _get_model(model_name: str = DEFAULT_IMAGE_MODEL):
     """Load and cache the FLUX model via mflux."""
     global _model, _model_name
 
+    from talekeeper.services.model_residency import residency
+
     if _model is not None and _model_name == model_name:
+        residency.touch("image_generation")
         return _model
 
     from mflux.models.flux2.variants.txt2img.flux2_klein import Flux2Klein
     from mflux.models.common.config.model_config import ModelConfig
 
     logger.info("Loading FLUX model: %s", model_name)
-    model_config = ModelConfig.from_name(model_name=model_name)
-    _model = Flux2Klein(model_config=model_config)
-    _model_name = model_name
+    with residency.loading("image_generation", model_name, unload_model):
+        model_config = ModelConfig.from_name(model_name=model_name)
+        _model = Flux2Klein(model_config=model_config)
+        _model_name = model_name
+    try:
+        _model.callbacks.register(_CancellationCallback())
+    except Exception:
+        logger.debug("mflux callbacks unavailable; image generation is only cancelled between phases")
     return _model
 
 
@@ -137,11 +156,28 @@ async def craft_scene_description(
     session_id: int | None = None,
 ) -> str:
     """Use the text LLM to craft an image generation prompt from session content."""
+    prompt = await _scene_description_prompt(content, session_id)
+    return await llm_client.generate(base_url, api_key, model, prompt, system=SCENE_DESCRIPTION_SYSTEM)
+
+
+async def stream_scene_description(
+    content: str,
+    base_url: str,
+    api_key: str | None,
+    model: str,
+    session_id: int | None = None,
+) -> AsyncIterator[str]:
+    """Like craft_scene_description(), but yield the description as the LLM writes it."""
+    prompt = await _scene_description_prompt(content, session_id)
+    async for piece in llm_client.generate_stream(base_url, api_key, model, prompt, system=SCENE_DESCRIPTION_SYSTEM):
+        yield piece
+
+
+async def _scene_description_prompt(content: str, session_id: int | None) -> str:
     character_block = ""
     if session_id is not None:
         character_block = await _get_character_descriptions(session_id)
-    prompt = SCENE_DESCRIPTION_PROMPT.format(content=content, character_block=character_block)
-    return await llm_client.generate(base_url, api_key, model, prompt, system=SCENE_DESCRIPTION_SYSTEM)
+    return SCENE_DESCRIPTION_PROMPT.format(content=content, character_block=character_block)
 
 
 async def generate_session_image(
@@ -166,18 +202,26 @@ async def generate_session_image(
     steps = config["steps"]
     guidance_scale = config["guidance_scale"]
 
-    model = _get_model(model_name)
+    # Loading and diffusion run in a worker thread, checking for cancellation per step
+    model = await asyncio.to_thread(_get_model, model_name)
 
     # Generate image
     seed = random.randint(0, 2**32 - 1)
-    generated = model.generate_image(
-        seed=seed,
-        prompt=prompt,
-        width=1024,
-        height=1024,
-        num_inference_steps=steps,
-        guidance=guidance_scale,
-    )
+    try:
+        generated = await asyncio.to_thread(
+            model.generate_image,
+            seed=seed,
+            prompt=prompt,
+            width=1024,
+            height=1024,
+            num_inference_steps=steps,
+            guidance=guidance_scale,
+        )
+    finally:
+        from talekeeper.services.model_residency import residency
+
+        # _get_model() took a reference on the model for this call
+        await asyncio.to_thread(residency.release, "image_generation")
 
     # Save to disk
     images_dir = get_session_images_dir(session_id)
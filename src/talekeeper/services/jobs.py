@@ -0,0 +1,675 @@
+"""Durable job queue for long-running session pipelines.
+
+Transcription, diarization, summary and image pipelines run as jobs in a
+background worker rather than inside an HTTP response, so closing the browser
+tab no longer aborts them. Every progress event a job emits is stored in
+``job_events``; clients subscribe to a job's stream and can resubscribe later,
+replaying everything after the last event id they saw.
+
+Jobs left ``running`` by a crash or restart are re-queued on startup and
+resume from the checkpoint their runner last saved. A failed job restores the
+session status it found when it was queued instead of marking it completed.
+
+Jobs run highest priority first. Requests made from the UI are queued as
+interactive; campaign backlogs are queued below them in a batch, and idle
+work such as transcript refinement below those. A running backlog job yields
+at its next checkpoint when interactive work is waiting (a queued interactive
+job, or an in-flight request wrapped in ``interactive_request()``), an idle
+job when any other work is waiting; either resumes from that checkpoint
+afterwards. A job can queue a follow-up that starts once it has finished.
+
+A session has at most one active job. Jobs of a *supersedable* kind do not
+block the session: queuing another job for it cancels them, as does
+replacing or deleting the session's audio (``cancel_superseded_jobs``).
+
+Among jobs of equal priority the worker prefers those whose first model is
+already resident, so a backlog of sessions is transcribed back to back
+instead of swapping Whisper and the LLM in and out per session. A job is
+passed over at most ``MAX_AFFINITY_BYPASSES`` times before it runs regardless.
+
+A job can be cancelled. A queued job is cancelled at once; a running job
+stops at its next cancellation checkpoint (see ``services.cancellation``).
+Either way the runner's rollback undoes the partial writes made since the
+last completed phase and the loaded models are unloaded.
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Iterator
+
+import aiosqlite
+
+from talekeeper.db import get_db
+from talekeeper.services.cancellation import CancelToken, OperationCancelled, cancellation_scope
+from talekeeper.services.model_residency import refresh_memory_budget, residency
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+TERMINAL_STATUSES = ("done", "failed", "cancelled")
+EVENT_POLL_SECONDS = 1.0
+AFFINITY_WINDOW = 10
+MAX_AFFINITY_BYPASSES = 3
+
+PRIORITY_IDLE = -10
+PRIORITY_BACKLOG = 0
+PRIORITY_INTERACTIVE = 10
+
+
+@dataclass
+class Job:
+    id: int
+    session_id: int
+    kind: str
+    params: dict = field(default_factory=dict)
+    checkpoint: dict = field(default_factory=dict)
+    status: str = "queued"
+    previous_status: str | None = None
+    attempts: int = 0
+    priority: int = PRIORITY_INTERACTIVE
+    # Set when a checkpoint was saved since the last event; the job may yield here
+    at_checkpoint: bool = False
+    # (kind, params, priority) of a job to queue for the session once this one is done
+    follow_up: tuple[str, dict, int] | None = None
+
+    @classmethod
+    def from_row(cls, row) -> "Job":
+        return cls(
+            id=row["id"],
+            session_id=row["session_id"],
+            kind=row["kind"],
+            params=json.loads(row["params"] or "{}"),
+            checkpoint=json.loads(row["checkpoint"] or "{}"),
+            status=row["status"],
+            previous_status=row["previous_status"],
+            attempts=row["attempts"],
+            priority=row["priority"],
+        )
+
+    async def save_checkpoint(self, **values) -> None:
+        """Persist progress so a resumed run can skip finished work."""
+        self.checkpoint.update(values)
+        async with get_db() as db:
+            await db.execute(
+                "UPDATE jobs SET checkpoint = ? WHERE id = ?",
+                (json.dumps(self.checkpoint), self.id),
+            )
+        self.at_checkpoint = True
+
+
+@dataclass
+class JobEvent:
+    id: int
+    event: str
+    data: dict
+
+
+class JobConflictError(RuntimeError):
+    """Raised when a session already has a queued or running job."""
+
+    def __init__(self, job_id: int) -> None:
+        super().__init__(f"Session already has active job {job_id}")
+        self.job_id = job_id
+
+
+# A runner is an async generator yielding (event, data) pairs for the job's stream
+JobRunner = Callable[[Job], AsyncIterator[tuple[str, dict]]]
+# A rollback undoes the partial writes of a cancelled job
+JobRollback = Callable[[Job], Awaitable[None]]
+
+_runners: dict[str, JobRunner] = {}
+_runner_models: dict[str, str] = {}
+_rollbacks: dict[str, JobRollback] = {}
+_supersedable: set[str] = set()
+_cancel_tokens: dict[int, CancelToken] = {}
+_bypassed: dict[int, int] = {}
+_interactive_requests = 0
+_subscribers: dict[int, set[asyncio.Event]] = {}
+_worker_task: asyncio.Task | None = None
+
+
+def register_runner(
+    kind: str,
+    model: str | None = None,
+    rollback: JobRollback | None = None,
+    supersedable: bool = False,
+) -> Callable[[JobRunner], JobRunner]:
+    """Register the pipeline that executes jobs of *kind*.
+
+    *model* is the residency kind of the first model the pipeline loads, used
+    to run jobs that can reuse a warm model first. *rollback* undoes a
+    cancelled job's partial writes; without one the session status is restored.
+    A *supersedable* job is cancelled instead of blocking a new job for its session.
+    """
+    def decorator(runner: JobRunner) -> JobRunner:
+        _runners[kind] = runner
+        if model is not None:
+            _runner_models[kind] = model
+        if rollback is not None:
+            _rollbacks[kind] = rollback
+        if supersedable:
+            _supersedable.add(kind)
+        return runner
+    return decorator
+
+
+def _blocking_kinds_clause() -> tuple[str, tuple[str, ...]]:
+    """SQL condition (and its parameters) excluding supersedable job kinds."""
+    kinds = tuple(sorted(_supersedable))
+    return f"kind NOT IN ({', '.join('?' * len(kinds))})", kinds
+
+
+def _job_to_dict(row) -> dict:
+    job = dict(row)
+    job["params"] = json.loads(job["params"] or "{}")
+    job["checkpoint"] = json.loads(job["checkpoint"] or "{}")
+    return job
+
+
+@contextmanager
+def interactive_request() -> Iterator[None]:
+    """Mark a user-facing request in flight so backlog jobs yield to it."""
+    global _interactive_requests
+    _interactive_requests += 1
+    try:
+        yield
+    finally:
+        _interactive_requests -= 1
+        if _interactive_requests == 0:
+            # Backlog work the worker held back can continue now
+            ensure_worker()
+
+
+async def enqueue_job(
+    session_id: int,
+    kind: str,
+    params: dict | None = None,
+    priority: int = PRIORITY_INTERACTIVE,
+    batch_id: int | None = None,
+) -> int:
+    """Queue a job for a session and make sure the worker is running.
+
+    Raises JobConflictError if the session already has an active job and
+    ValueError if *kind* has no registered runner or the session is missing.
+    Supersedable jobs of the session are cancelled rather than conflicting.
+    """
+    if kind not in _runners:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    await cancel_superseded_jobs(session_id)
+    # A cancelled job may still be winding down; it no longer blocks the session
+    blocking, kinds = _blocking_kinds_clause()
+    async with get_db() as db:
+        # Single statement so two concurrent requests cannot both enqueue
+        cursor = await db.execute(
+            f"""INSERT INTO jobs (session_id, kind, params, previous_status, priority, batch_id)
+               SELECT id, ?, ?, status, ?, ? FROM sessions
+               WHERE id = ? AND NOT EXISTS (
+                 SELECT 1 FROM jobs WHERE session_id = ? AND status IN ('queued', 'running')
+                   AND {blocking}
+               )""",
+            (kind, json.dumps(params or {}), priority, batch_id, session_id, session_id, *kinds),
+        )
+        if cursor.rowcount == 0:
+            active = await db.execute_fetchall(
+                f"""SELECT id FROM jobs WHERE session_id = ? AND status IN ('queued', 'running')
+                      AND {blocking}""",
+                (session_id, *kinds),
+            )
+            if active:
+                raise JobConflictError(active[0]["id"])
+            raise ValueError(f"Session {session_id} not found")
+        job_id = cursor.lastrowid
+
+    ensure_worker()
+    return job_id
+
+
+async def get_job(job_id: int) -> dict | None:
+    async with get_db() as db:
+        rows = await db.execute_fetchall("SELECT * FROM jobs WHERE id = ?", (job_id,))
+    return _job_to_dict(rows[0]) if rows else None
+
+
+async def list_session_jobs(session_id: int) -> list[dict]:
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT * FROM jobs WHERE session_id = ? ORDER BY id DESC", (session_id,)
+        )
+    return [_job_to_dict(r) for r in rows]
+
+
+async def enqueue_campaign_backlog(
+    campaign_id: int,
+    kind: str = "process_all",
+    params: dict | None = None,
+    priority: int = PRIORITY_BACKLOG,
+) -> dict:
+    """Queue *kind* for every unprocessed session of a campaign as one batch.
+
+    Unprocessed sessions have audio but no transcript yet. Sessions that
+    already have an active job are skipped and reported.
+    """
+    if kind not in _runners:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    async with get_db() as db:
+        campaign = await db.execute_fetchall("SELECT id FROM campaigns WHERE id = ?", (campaign_id,))
+        if not campaign:
+            raise ValueError(f"Campaign {campaign_id} not found")
+        sessions = await db.execute_fetchall(
+            """SELECT s.id FROM sessions s
+               WHERE s.campaign_id = ? AND s.audio_path IS NOT NULL
+                 AND s.status IN ('draft', 'audio_ready')
+                 AND NOT EXISTS (SELECT 1 FROM transcript_segments ts WHERE ts.session_id = s.id)
+               ORDER BY s.session_number, s.id""",
+            (campaign_id,),
+        )
+        cursor = await db.execute(
+            "INSERT INTO job_batches (campaign_id, kind, priority) VALUES (?, ?, ?)",
+            (campaign_id, kind, priority),
+        )
+        batch_id = cursor.lastrowid
+
+    queued: list[dict] = []
+    skipped: list[dict] = []
+    for row in sessions:
+        try:
+            job_id = await enqueue_job(row["id"], kind, params, priority=priority, batch_id=batch_id)
+        except JobConflictError as exc:
+            skipped.append({"session_id": row["id"], "job_id": exc.job_id})
+        else:
+            queued.append({"session_id": row["id"], "job_id": job_id})
+    return {"batch_id": batch_id, "queued": queued, "skipped": skipped}
+
+
+async def get_batch(batch_id: int) -> dict | None:
+    """Batch progress plus throughput in audio-hours processed per wall-clock hour.
+
+    Audio length is the duration stored at ingest, or the extent of the
+    transcript for sessions whose audio was never catalogued.
+    """
+    async with get_db() as db:
+        batch_rows = await db.execute_fetchall("SELECT * FROM job_batches WHERE id = ?", (batch_id,))
+        if not batch_rows:
+            return None
+        counts = await db.execute_fetchall(
+            "SELECT status, COUNT(*) AS n FROM jobs WHERE batch_id = ? GROUP BY status",
+            (batch_id,),
+        )
+        timing = await db.execute_fetchall(
+            """SELECT (julianday(COALESCE(MAX(finished_at), datetime('now')))
+                       - julianday(MIN(started_at))) * 86400 AS wall_seconds
+               FROM jobs WHERE batch_id = ? AND started_at IS NOT NULL""",
+            (batch_id,),
+        )
+        audio = await db.execute_fetchall(
+            """SELECT COALESCE(SUM(COALESCE(s.audio_duration, (
+                        SELECT MAX(ts.end_time) FROM transcript_segments ts
+                        WHERE ts.session_id = s.id
+                      ))), 0) AS audio_seconds
+               FROM sessions s
+               WHERE s.id IN (SELECT session_id FROM jobs WHERE batch_id = ? AND status = 'done')""",
+            (batch_id,),
+        )
+
+    jobs_by_status = {r["status"]: r["n"] for r in counts}
+    audio_hours = audio[0]["audio_seconds"] / 3600
+    wall_seconds = timing[0]["wall_seconds"] or 0.0
+    wall_hours = wall_seconds / 3600
+    return {
+        **dict(batch_rows[0]),
+        "jobs": jobs_by_status,
+        "total": sum(jobs_by_status.values()),
+        "finished": all(status in TERMINAL_STATUSES for status in jobs_by_status),
+        "audio_hours": round(audio_hours, 3),
+        "wall_hours": round(wall_hours, 3),
+        "audio_hours_per_wall_hour": round(audio_hours / wall_hours, 2) if wall_hours > 0 else None,
+    }
+
+
+def _notify(job_id: int) -> None:
+    for wakeup in _subscribers.get(job_id, ()):
+        wakeup.set()
+
+
+async def append_event(job_id: int, event: str, data: dict) -> int:
+    """Persist one progress event and wake up subscribers.
+
+    Events of a job deleted along with its session are dropped.
+    """
+    async with get_db() as db:
+        cursor = await db.execute(
+            """INSERT INTO job_events (job_id, event, data)
+               SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM jobs WHERE id = ?)""",
+            (job_id, event, json.dumps(data), job_id),
+        )
+    _notify(job_id)
+    return cursor.lastrowid
+
+
+async def restore_session_status(job: Job) -> None:
+    """Put the session back in the status it had when the job was queued."""
+    if job.previous_status is None:
+        return
+    async with get_db() as db:
+        await db.execute(
+            "UPDATE sessions SET status = ?, updated_at = datetime('now') WHERE id = ?",
+            (job.previous_status, job.session_id),
+        )
+
+
+async def rollback_transcript(job: Job) -> None:
+    """Remove a partially written transcript and its speakers."""
+    async with get_db() as db:
+        await db.execute("DELETE FROM transcript_segments WHERE session_id = ?", (job.session_id,))
+        await db.execute("DELETE FROM speakers WHERE session_id = ?", (job.session_id,))
+        # The transcript the job replaced is gone too; the session is back to its audio
+        await db.execute(
+            """UPDATE sessions
+               SET status = CASE WHEN audio_path IS NULL THEN 'draft' ELSE 'audio_ready' END,
+                   updated_at = datetime('now')
+               WHERE id = ?""",
+            (job.session_id,),
+        )
+
+
+async def rollback_diarization(job: Job) -> None:
+    """Undo a partial diarization, keeping the stored transcript without speakers."""
+    async with get_db() as db:
+        await db.execute(
+            "DELETE FROM transcript_segments WHERE session_id = ? AND parent_segment_id IS NOT NULL",
+            (job.session_id,),
+        )
+        await db.execute(
+            "UPDATE transcript_segments SET speaker_id = NULL, is_overlap = 0 WHERE session_id = ?",
+            (job.session_id,),
+        )
+        await db.execute("DELETE FROM speakers WHERE session_id = ?", (job.session_id,))
+        await db.execute(
+            "UPDATE sessions SET status = 'completed', updated_at = datetime('now') WHERE id = ?",
+            (job.session_id,),
+        )
+
+
+async def _finish(job: Job, status: str, error: str | None = None) -> None:
+    async with get_db() as db:
+        await db.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = datetime('now') WHERE id = ?",
+            (status, error, job.id),
+        )
+        if status == "failed" and job.previous_status is not None:
+            # Leave the session as it was before the job, not falsely "completed"
+            await db.execute(
+                "UPDATE sessions SET status = ?, updated_at = datetime('now') WHERE id = ?",
+                (job.previous_status, job.session_id),
+            )
+    job.status = status
+    _notify(job.id)
+
+
+async def _preempting_work_waiting(priority: int) -> bool:
+    """Whether a job of *priority* should yield: backlog to interactive work, idle to any."""
+    if _interactive_requests:
+        return True
+    threshold = PRIORITY_INTERACTIVE if priority >= PRIORITY_BACKLOG else PRIORITY_BACKLOG
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT 1 FROM jobs WHERE status = 'queued' AND priority >= ? LIMIT 1",
+            (threshold,),
+        )
+    return bool(rows)
+
+
+async def _preempt(job: Job) -> None:
+    """Put a backlog or idle job back in the queue; it resumes from its checkpoint."""
+    await append_event(job.id, "preempted", {"checkpoint": job.checkpoint})
+    async with get_db() as db:
+        await db.execute("UPDATE jobs SET status = 'queued' WHERE id = ?", (job.id,))
+    job.status = "queued"
+    _notify(job.id)
+
+
+async def _free_models() -> None:
+    """Unload every model now rather than keeping it warm for the next job."""
+    from talekeeper.services import llm_client
+    from talekeeper.services.resource_orchestration import cleanup_all
+
+    if residency.is_resident("llm"):
+        llm_config = await llm_client.resolve_config()
+        await cleanup_all(llm_config["base_url"], llm_config["api_key"], llm_config["model"])
+    else:
+        await cleanup_all()
+
+
+async def _rollback(job: Job) -> None:
+    rollback = _rollbacks.get(job.kind, restore_session_status)
+    try:
+        await rollback(job)
+    except Exception:
+        logger.exception("Rolling back cancelled job %d (%s) failed", job.id, job.kind)
+
+
+async def _cancelled(job: Job) -> None:
+    """Roll back a job that stopped at a cancellation checkpoint and free its models."""
+    logger.info("Job %d (%s) cancelled", job.id, job.kind)
+    await _rollback(job)
+    await append_event(job.id, "cancelled", {"checkpoint": job.checkpoint})
+    await _finish(job, "cancelled")
+    await _free_models()
+
+
+async def run_job(job: Job) -> None:
+    """Execute a claimed job, recording its events and final status."""
+    token = _cancel_tokens.setdefault(job.id, CancelToken())
+    try:
+        with cancellation_scope(token):
+            runner = _runners.get(job.kind)
+            if runner is None:
+                raise RuntimeError(f"Unknown job kind: {job.kind}")
+            token.raise_if_cancelled()
+            if job.attempts > 1:
+                await append_event(job.id, "resumed", {"checkpoint": job.checkpoint})
+            events = runner(job)
+            try:
+                async for event, data in events:
+                    await append_event(job.id, event, data)
+                    # Every event is a cancellation checkpoint (chunks, segments, phases)
+                    token.raise_if_cancelled()
+                    if job.at_checkpoint and job.priority < PRIORITY_INTERACTIVE:
+                        job.at_checkpoint = False
+                        if await _preempting_work_waiting(job.priority):
+                            await _preempt(job)
+                            return
+            finally:
+                await events.aclose()
+    except OperationCancelled:
+        await _cancelled(job)
+    except Exception as exc:
+        logger.exception("Job %d (%s) failed", job.id, job.kind)
+        await append_event(job.id, "error", {"message": str(exc)})
+        await _finish(job, "failed", str(exc))
+    else:
+        await _finish(job, "done")
+        if job.follow_up is not None:
+            await _enqueue_follow_up(job)
+    finally:
+        _cancel_tokens.pop(job.id, None)
+
+
+async def _enqueue_follow_up(job: Job) -> None:
+    kind, params, priority = job.follow_up
+    try:
+        await enqueue_job(job.session_id, kind, params, priority=priority)
+    except (JobConflictError, ValueError):
+        logger.warning("Follow-up %s of job %d was not queued", kind, job.id, exc_info=True)
+
+
+async def cancel_job(job_id: int) -> dict | None:
+    """Cancel a queued or running job; returns the job, or None if it does not exist.
+
+    A queued job is cancelled at once, rolling back what an earlier, preempted
+    run left behind. A running job is flagged and stops at its next
+    cancellation checkpoint; its stream ends with a ``cancelled`` event.
+    """
+    async with get_db() as db:
+        rows = await db.execute_fetchall("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        cursor = await db.execute(
+            """UPDATE jobs SET status = 'cancelled', finished_at = datetime('now')
+               WHERE id = ? AND status = 'queued'""",
+            (job_id,),
+        )
+    if cursor.rowcount:
+        job = Job.from_row(rows[0])
+        if job.attempts:
+            await _rollback(job)
+        await append_event(job_id, "cancelled", {"checkpoint": job.checkpoint})
+    elif rows[0]["status"] == "running":
+        _cancel_tokens.setdefault(job_id, CancelToken()).cancel()
+    return await get_job(job_id)
+
+
+async def cancel_superseded_jobs(session_id: int) -> None:
+    """Cancel the session's active supersedable jobs; their work is no longer wanted."""
+    if not _supersedable:
+        return
+    kinds = tuple(sorted(_supersedable))
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            f"""SELECT id FROM jobs WHERE session_id = ? AND status IN ('queued', 'running')
+                  AND kind IN ({', '.join('?' * len(kinds))})""",
+            (session_id, *kinds),
+        )
+    for row in rows:
+        await cancel_job(row["id"])
+
+
+async def cancel_session_job(session_id: int) -> dict | None:
+    """Cancel the session's queued or running job, if it has one."""
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT id FROM jobs WHERE session_id = ? AND status IN ('queued', 'running')",
+            (session_id,),
+        )
+    if not rows:
+        return None
+    return await cancel_job(rows[0]["id"])
+
+
+def _pick_job(rows: list[aiosqlite.Row]) -> aiosqlite.Row:
+    """Oldest top-priority job, unless one of equal priority can reuse a resident model."""
+    rows = [r for r in rows if r["priority"] == rows[0]["priority"]]
+    oldest = rows[0]
+    if _bypassed.get(oldest["id"], 0) >= MAX_AFFINITY_BYPASSES:
+        return oldest
+    resident = residency.resident_kinds()
+    if not resident or _runner_models.get(oldest["kind"]) in resident:
+        return oldest
+    for row in rows[1:]:
+        if _runner_models.get(row["kind"]) in resident:
+            _bypassed[oldest["id"]] = _bypassed.get(oldest["id"], 0) + 1
+            return row
+    return oldest
+
+
+async def _claim_next_job() -> Job | None:
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT * FROM jobs WHERE status = 'queued' ORDER BY priority DESC, id LIMIT ?",
+            (AFFINITY_WINDOW,),
+        )
+        if not rows:
+            return None
+        if _interactive_requests and rows[0]["priority"] < PRIORITY_INTERACTIVE:
+            # Hold backlog work until the interactive request finishes
+            return None
+        row = _pick_job(rows)
+        cursor = await db.execute(
+            """UPDATE jobs SET status = 'running', attempts = attempts + 1,
+                              started_at = COALESCE(started_at, datetime('now'))
+               WHERE id = ? AND status = 'queued'""",
+            (row["id"],),
+        )
+    if cursor.rowcount == 0:
+        # Cancelled while it was being picked
+        return await _claim_next_job()
+    _bypassed.pop(row["id"], None)
+    job = Job.from_row(row)
+    job.status = "running"
+    job.attempts += 1
+    return job
+
+
+async def _worker() -> None:
+    # Jobs run one at a time: each pipeline already saturates CPU/GPU and memory
+    while True:
+        await refresh_memory_budget()
+        job = await _claim_next_job()
+        if job is None:
+            return
+        await run_job(job)
+
+
+def ensure_worker() -> None:
+    """Start the worker on the running loop unless it is already busy."""
+    global _worker_task
+    loop = asyncio.get_running_loop()
+    if _worker_task is None or _worker_task.done() or _worker_task.get_loop() is not loop:
+        _worker_task = loop.create_task(_worker())
+
+
+async def requeue_interrupted_jobs() -> int:
+    """Re-queue jobs that were running when the process stopped and resume them."""
+    async with get_db() as db:
+        cursor = await db.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+        requeued = cursor.rowcount
+        queued = await db.execute_fetchall("SELECT 1 FROM jobs WHERE status = 'queued' LIMIT 1")
+    if queued:
+        ensure_worker()
+    if requeued:
+        logger.info("Re-queued %d interrupted job(s)", requeued)
+    return requeued
+
+
+async def iter_job_events(job_id: int, after: int = 0) -> AsyncIterator[JobEvent]:
+    """Yield a job's events after cursor *after*, following it until it finishes."""
+    wakeup = asyncio.Event()
+    _subscribers.setdefault(job_id, set()).add(wakeup)
+    try:
+        while True:
+            wakeup.clear()
+            async with get_db() as db:
+                # Status first: once it is terminal, every event is already stored
+                status_rows = await db.execute_fetchall(
+                    "SELECT status FROM jobs WHERE id = ?", (job_id,)
+                )
+                rows = await db.execute_fetchall(
+                    "SELECT id, event, data FROM job_events WHERE job_id = ? AND id > ? ORDER BY id",
+                    (job_id, after),
+                )
+            for row in rows:
+                after = row["id"]
+                yield JobEvent(id=row["id"], event=row["event"], data=json.loads(row["data"]))
+            if not status_rows or status_rows[0]["status"] in TERMINAL_STATUSES:
+                return
+            try:
+                await asyncio.wait_for(wakeup.wait(), EVENT_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        waiters = _subscribers.get(job_id)
+        if waiters is not None:
+            waiters.discard(wakeup)
+            if not waiters:
+                _subscribers.pop(job_id, None)
+
+
+async def job_event_stream(job_id: int, after: int = 0, padding: str = "") -> AsyncIterator[str]:
+    """Format a job's events as SSE, with ids usable as a resubscribe cursor."""
+    async for evt in iter_job_events(job_id, after):
+        yield f"id: {evt.id}\nevent: {evt.event}\ndata: {json.dumps(evt.data)}\n\n{padding}"
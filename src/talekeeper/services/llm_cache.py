@@ -0,0 +1,173 @@
+"""Persistent cache of LLM responses.
+
+Regenerating a summary, re-crafting a scene, renaming a session or re-running
+``process_all`` after a late failure repeats prompts the provider has already
+answered. With the cache enabled, ``llm_client.generate`` looks responses up
+in the ``llm_cache`` table by a hash of (base URL, model, system prompt,
+prompt, generation parameters) before calling the provider.
+
+The cache is opt-in: the ``llm_cache_enabled`` setting, then
+``TALEKEEPER_LLM_CACHE``. Entries expire after ``llm_cache_ttl_hours``
+(``TALEKEEPER_LLM_CACHE_TTL_HOURS``) and the least recently used are evicted
+beyond ``llm_cache_max_entries`` (``TALEKEEPER_LLM_CACHE_MAX_ENTRIES``).
+
+Work that asks for a fresh answer ("regenerate") runs inside ``bypass()``:
+the provider is called and its response replaces the cached one.
+"""
+
+import contextvars
+import hashlib
+import json
+import logging
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+from talekeeper.db import get_db
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_HOURS = 24 * 7
+DEFAULT_MAX_ENTRIES = 2000
+
+_TRUE_VALUES = ("1", "true", "yes", "on")
+
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar("talekeeper_llm_cache_bypass", default=False)
+
+# Process-lifetime counters, reported by stats()
+_counters = {"hits": 0, "misses": 0, "bypassed": 0, "stored": 0, "evicted": 0}
+
+
+@dataclass
+class CachePolicy:
+    enabled: bool
+    ttl_hours: float
+    max_entries: int
+
+
+def _parse_number(raw: str | None, default: float, name: str) -> float:
+    if not raw:
+        return default
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        logger.warning("Ignoring invalid %s: %r", name, raw)
+        return default
+
+
+async def resolve_policy() -> CachePolicy:
+    """Resolve the cache settings: settings table > env vars > defaults."""
+    settings: dict[str, str] = {}
+    try:
+        async with get_db() as db:
+            rows = await db.execute_fetchall(
+                "SELECT key, value FROM settings WHERE key IN "
+                "('llm_cache_enabled', 'llm_cache_ttl_hours', 'llm_cache_max_entries')"
+            )
+            settings = {r["key"]: r["value"] for r in rows if r["value"]}
+    except Exception:
+        pass
+
+    enabled = settings.get("llm_cache_enabled") or os.environ.get("TALEKEEPER_LLM_CACHE") or ""
+    ttl = settings.get("llm_cache_ttl_hours") or os.environ.get("TALEKEEPER_LLM_CACHE_TTL_HOURS")
+    size = settings.get("llm_cache_max_entries") or os.environ.get("TALEKEEPER_LLM_CACHE_MAX_ENTRIES")
+    return CachePolicy(
+        enabled=enabled.strip().lower() in _TRUE_VALUES,
+        ttl_hours=_parse_number(ttl, DEFAULT_TTL_HOURS, "LLM cache TTL"),
+        max_entries=int(_parse_number(size, DEFAULT_MAX_ENTRIES, "LLM cache size")),
+    )
+
+
+def cache_key(base_url: str, model: str, system: str, prompt: str, params: dict) -> str:
+    key = json.dumps([base_url.rstrip("/"), model, system, prompt, params], sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+@contextmanager
+def bypass() -> Iterator[None]:
+    """Skip cached responses for the enclosed work; fresh responses are still stored."""
+    reset = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(reset)
+
+
+def bypassed() -> bool:
+    return _bypass.get()
+
+
+async def lookup(key: str, policy: CachePolicy) -> str | None:
+    """Return the cached response for *key*, or None on a miss or bypass."""
+    if bypassed():
+        _counters["bypassed"] += 1
+        return None
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            """SELECT response FROM llm_cache
+               WHERE key = ? AND created_at > datetime('now', ?)""",
+            (key, f"-{policy.ttl_hours} hours"),
+        )
+        if rows:
+            await db.execute(
+                "UPDATE llm_cache SET hits = hits + 1, last_used_at = datetime('now') WHERE key = ?",
+                (key,),
+            )
+    if not rows:
+        _counters["misses"] += 1
+        return None
+    _counters["hits"] += 1
+    return rows[0]["response"]
+
+
+async def store(key: str, base_url: str, model: str, response: str, policy: CachePolicy) -> None:
+    """Cache a response, then drop expired entries and the least recently used beyond the limit."""
+    async with get_db() as db:
+        await db.execute(
+            """INSERT INTO llm_cache (key, base_url, model, response)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT (key) DO UPDATE SET
+                 response = excluded.response, hits = 0,
+                 created_at = datetime('now'), last_used_at = datetime('now')""",
+            (key, base_url, model, response),
+        )
+        expired = await db.execute(
+            "DELETE FROM llm_cache WHERE created_at <= datetime('now', ?)",
+            (f"-{policy.ttl_hours} hours",),
+        )
+        overflow = await db.execute(
+            """DELETE FROM llm_cache WHERE key IN (
+                 SELECT key FROM llm_cache ORDER BY last_used_at DESC, rowid DESC
+                 LIMIT -1 OFFSET ?
+               )""",
+            (policy.max_entries,),
+        )
+    _counters["stored"] += 1
+    _counters["evicted"] += max(0, expired.rowcount) + max(0, overflow.rowcount)
+
+
+async def stats() -> dict:
+    """Hit/miss counters since startup plus the current size of the cache."""
+    policy = await resolve_policy()
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT COUNT(*) AS entries, COALESCE(SUM(LENGTH(response)), 0) AS size FROM llm_cache"
+        )
+    lookups = _counters["hits"] + _counters["misses"]
+    return {
+        "enabled": policy.enabled,
+        "ttl_hours": policy.ttl_hours,
+        "max_entries": policy.max_entries,
+        "entries": rows[0]["entries"],
+        "response_chars": rows[0]["size"],
+        **_counters,
+        "hit_rate": _counters["hits"] / lookups if lookups else 0.0,
+    }
+
+
+async def clear() -> int:
+    """Delete every cached response; returns how many were removed."""
+    async with get_db() as db:
+        cursor = await db.execute("DELETE FROM llm_cache")
+    return cursor.rowcount
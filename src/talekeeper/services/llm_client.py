@@ -1,21 +1,107 @@
-"""Generic OpenAI-compatible LLM client."""
+"""Generic OpenAI-compatible LLM client.
 
+Requests to one provider (base URL) are limited to ``max_concurrency`` in
+flight at a time, so callers can fan out chunk and POV prompts with
+``asyncio.gather`` without flooding a local server. The limit resolves from
+the ``llm_max_concurrency`` setting, then ``TALEKEEPER_LLM_MAX_CONCURRENCY``,
+then ``DEFAULT_MAX_CONCURRENCY``.
+
+``context_window`` reports how many tokens a prompt plus its response may
+use: the ``llm_context_tokens`` setting or ``TALEKEEPER_LLM_CONTEXT_TOKENS``
+if set, otherwise what Ollama reports for the model (capped at the
+``num_ctx`` requested), otherwise ``DEFAULT_CONTEXT_TOKENS``.
+
+Ollama allocates its KV cache for the ``num_ctx`` of each request, so a
+short prompt is sent with the smallest of ``OLLAMA_CTX_BUCKETS`` that fits
+it plus ``OLLAMA_RESPONSE_TOKENS``. Changing ``num_ctx`` reloads the model
+and drops its cached prompt prefix, so while a model is loaded with a larger
+size, requests that fit keep using it. ``OLLAMA_KEEP_ALIVE_SECONDS`` keeps
+the model loaded between the phases of a job; the residency manager still
+unloads it when memory is needed, but never while a call is using it.
+
+When the response cache is enabled (see ``llm_cache``), ``generate`` answers
+repeated prompts from it without loading the model or taking a slot.
+
+One long-lived OpenAI client (and connection pool) is kept per base URL and
+API key, plus one HTTP client for Ollama's native endpoints, so requests
+reuse kept-alive connections. Transient failures (connection errors, rate
+limits, 5xx responses) are retried with exponential backoff. Health checks
+are cached for a short time, and every completion's latency and token
+counts are recorded in ``llm_metrics``.
+"""
+
+import asyncio
 import logging
 import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
 
 import httpx
-from openai import AsyncOpenAI, APIConnectionError, AuthenticationError, NotFoundError
+from openai import (
+    AsyncOpenAI,
+    APIConnectionError,
+    AuthenticationError,
+    InternalServerError,
+    NotFoundError,
+    RateLimitError,
+)
 
 from talekeeper.db import get_db
+from talekeeper.services import llm_cache, llm_metrics, token_counting
+from talekeeper.services.cancellation import check_cancelled
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 DEFAULT_BASE_URL = "http://localhost:11434/v1"
 DEFAULT_MODEL = "llama3.1:8b"
+DEFAULT_MAX_CONCURRENCY = 4
+# Context requested from Ollama, and assumed for providers that cannot report theirs
+OLLAMA_NUM_CTX = 32768
+# Context sizes requested from Ollama, smallest first
+OLLAMA_CTX_BUCKETS = (4096, 8192, 16384, 32768)
+# Room left for the response when picking a context size
+OLLAMA_RESPONSE_TOKENS = 2048
+# Chat template tokens around the system and user messages
+OLLAMA_TEMPLATE_TOKENS = 32
+OLLAMA_KEEP_ALIVE_SECONDS = 1800
+DEFAULT_CONTEXT_TOKENS = 8192
+
+REQUEST_TIMEOUT = 300.0
+HEALTH_TIMEOUT = 10.0
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 0.5
+# A working provider is trusted for a while; a failing one is re-checked sooner
+HEALTH_OK_TTL = 60.0
+HEALTH_ERROR_TTL = 5.0
+
+# Errors worth retrying; APITimeoutError is an APIConnectionError
+_TRANSIENT_ERRORS = (APIConnectionError, RateLimitError, InternalServerError)
 
 # Cache Ollama detection results per base_url
 _ollama_cache: dict[str, bool] = {}
 
+# Context length Ollama reports per (base_url, model)
+_context_cache: dict[tuple[str, str], int | None] = {}
+# (base_url, model) -> (num_ctx it was last loaded with, when keep-alive ends)
+_loaded_ctx: dict[tuple[str, str], tuple[int, float]] = {}
+
+# Pooled clients, rebuilt on a new event loop (their connections belong to the loop)
+_clients: dict[tuple[str, str | None], tuple[asyncio.AbstractEventLoop, AsyncOpenAI]] = {}
+_http: tuple[asyncio.AbstractEventLoop, httpx.AsyncClient] | None = None
+
+# Last health check result per (base_url, api_key, model), with when it expires
+_health_cache: dict[tuple[str, str | None, str], tuple[float, dict]] = {}
+
+# Concurrency limit per base_url, and the semaphore enforcing it on the current loop
+_max_concurrency: dict[str, int] = {}
+_semaphores: dict[str, tuple[asyncio.AbstractEventLoop, int, asyncio.Semaphore]] = {}
+
 
 async def resolve_config() -> dict:
     """Resolve LLM configuration: settings table > env vars > defaults."""
@@ -25,7 +111,8 @@ async def resolve_config() -> dict:
     try:
         async with get_db() as db:
             rows = await db.execute_fetchall(
-                "SELECT key, value FROM settings WHERE key IN ('llm_base_url', 'llm_api_key', 'llm_model')"
+                "SELECT key, value FROM settings WHERE key IN "
+                "('llm_base_url', 'llm_api_key', 'llm_model', 'llm_max_concurrency')"
             )
             for r in rows:
                 if r["value"]:
@@ -53,35 +140,139 @@ async def resolve_config() -> dict:
     api_key = settings.get("llm_api_key") or os.environ.get("LLM_API_KEY") or None
     model = settings.get("llm_model") or os.environ.get("LLM_MODEL") or DEFAULT_MODEL
 
-    return {"base_url": base_url, "api_key": api_key, "model": model}
+    raw_concurrency = settings.get("llm_max_concurrency") or os.environ.get("TALEKEEPER_LLM_MAX_CONCURRENCY")
+    try:
+        max_concurrency = max(1, int(raw_concurrency)) if raw_concurrency else DEFAULT_MAX_CONCURRENCY
+    except ValueError:
+        logger.warning("Invalid LLM concurrency %r; using %d", raw_concurrency, DEFAULT_MAX_CONCURRENCY)
+        max_concurrency = DEFAULT_MAX_CONCURRENCY
+    set_max_concurrency(base_url, max_concurrency)
+
+    return {"base_url": base_url, "api_key": api_key, "model": model, "max_concurrency": max_concurrency}
+
+
+def set_max_concurrency(base_url: str, limit: int) -> None:
+    """Set how many requests may be in flight to *base_url* at once."""
+    _max_concurrency[base_url] = max(1, limit)
+
+
+def _provider_slot(base_url: str) -> asyncio.Semaphore:
+    """The semaphore limiting concurrent requests to *base_url*.
+
+    It is rebuilt when the limit changes or on a new event loop; requests
+    already holding a slot of the old one finish normally.
+    """
+    loop = asyncio.get_running_loop()
+    limit = _max_concurrency.get(base_url, DEFAULT_MAX_CONCURRENCY)
+    cached = _semaphores.get(base_url)
+    if cached is None or cached[0] is not loop or cached[1] != limit:
+        cached = (loop, limit, asyncio.Semaphore(limit))
+        _semaphores[base_url] = cached
+    return cached[2]
 
 
 def _make_client(base_url: str, api_key: str | None) -> AsyncOpenAI:
-    return AsyncOpenAI(
-        base_url=base_url,
-        api_key=api_key or "not-needed",
-        timeout=10.0,
-    )
+    """The pooled client for *base_url* and *api_key* on the running loop."""
+    loop = asyncio.get_running_loop()
+    key = (base_url, api_key)
+    cached = _clients.get(key)
+    if cached is None or cached[0] is not loop:
+        client = AsyncOpenAI(
+            base_url=base_url,
+            api_key=api_key or "not-needed",
+            timeout=REQUEST_TIMEOUT,
+            # Retries are done by _with_retries, which also checks for cancellation
+            max_retries=0,
+        )
+        cached = (loop, client)
+        _clients[key] = cached
+    return cached[1]
+
+
+def _http_client() -> httpx.AsyncClient:
+    """The pooled HTTP client for Ollama's native API on the running loop."""
+    global _http
+    loop = asyncio.get_running_loop()
+    if _http is None or _http[0] is not loop:
+        _http = (loop, httpx.AsyncClient(timeout=10.0))
+    return _http[1]
+
+
+async def close_clients() -> None:
+    """Close the pooled clients of the running loop (on shutdown)."""
+    global _http
+    loop = asyncio.get_running_loop()
+    for key, (client_loop, client) in list(_clients.items()):
+        if client_loop is loop:
+            await client.close()
+            del _clients[key]
+    if _http is not None and _http[0] is loop:
+        await _http[1].aclose()
+        _http = None
 
 
-async def health_check(base_url: str, api_key: str | None, model: str) -> dict:
-    """Verify connectivity to the LLM provider with a minimal completion request."""
+async def health_check(base_url: str, api_key: str | None, model: str, fresh: bool = False) -> dict:
+    """Verify connectivity to the LLM provider with a minimal completion request.
+
+    Results are cached for HEALTH_OK_TTL (HEALTH_ERROR_TTL if the check
+    failed); *fresh* skips the cache.
+    """
+    key = (base_url, api_key, model)
+    cached = _health_cache.get(key)
+    if not fresh and cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
     try:
         client = _make_client(base_url, api_key)
         await client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": "hi"}],
             max_tokens=1,
+            timeout=HEALTH_TIMEOUT,
         )
-        return {"status": "ok"}
+        result = {"status": "ok"}
     except APIConnectionError:
-        return {"status": "error", "message": f"Cannot reach LLM provider at {base_url}"}
+        result = {"status": "error", "message": f"Cannot reach LLM provider at {base_url}"}
     except AuthenticationError:
-        return {"status": "error", "message": "Authentication failed — check your API key"}
+        result = {"status": "error", "message": "Authentication failed — check your API key"}
     except NotFoundError:
-        return {"status": "error", "message": f"Model '{model}' not found on the provider"}
+        result = {"status": "error", "message": f"Model '{model}' not found on the provider"}
     except Exception as e:
-        return {"status": "error", "message": str(e)}
+        result = {"status": "error", "message": str(e)}
+
+    ttl = HEALTH_OK_TTL if result["status"] == "ok" else HEALTH_ERROR_TTL
+    _health_cache[key] = (time.monotonic() + ttl, result)
+    return result
+
+
+def _forget_health(base_url: str) -> None:
+    for key in [k for k in _health_cache if k[0] == base_url]:
+        del _health_cache[key]
+
+
+async def _with_retries(base_url: str, model: str, call: Callable[[], Awaitable[T]]) -> T:
+    """Run one provider request, retrying transient errors with exponential backoff."""
+    attempt = 0
+    while True:
+        check_cancelled()
+        try:
+            return await call()
+        except _TRANSIENT_ERRORS as exc:
+            if attempt == MAX_RETRIES:
+                llm_metrics.record_error(model)
+                _forget_health(base_url)
+                raise
+            attempt += 1
+            delay = RETRY_BASE_DELAY * 2 ** (attempt - 1) * random.uniform(1.0, 1.5)
+            logger.warning(
+                "LLM request to %s failed (%s); retry %d/%d in %.1fs",
+                base_url, type(exc).__name__, attempt, MAX_RETRIES, delay,
+            )
+            llm_metrics.record_retry(model)
+            await asyncio.sleep(delay)
+        except Exception:
+            llm_metrics.record_error(model)
+            raise
 
 
 async def _is_ollama(base_url: str) -> bool:
@@ -98,13 +289,12 @@ async def _is_ollama(base_url: str) -> bool:
         ollama_root = ollama_root[:-3]
 
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(f"{ollama_root}/api/tags")
-            if resp.status_code == 200:
-                data = resp.json()
-                is_ollama = isinstance(data.get("models"), list)
-                _ollama_cache[base_url] = is_ollama
-                return is_ollama
+        resp = await _http_client().get(f"{ollama_root}/api/tags", timeout=5.0)
+        if resp.status_code == 200:
+            data = resp.json()
+            is_ollama = isinstance(data.get("models"), list)
+            _ollama_cache[base_url] = is_ollama
+            return is_ollama
     except Exception:
         pass
 
@@ -112,42 +302,280 @@ async def _is_ollama(base_url: str) -> bool:
     return False
 
 
-async def generate(base_url: str, api_key: str | None, model: str, prompt: str, system: str = "") -> str:
-    """Generate text using the OpenAI Chat Completions API."""
-    client = AsyncOpenAI(
-        base_url=base_url,
-        api_key=api_key or "not-needed",
-        timeout=300.0,
+def _ollama_root(base_url: str) -> str:
+    root = base_url.rstrip("/")
+    return root[:-3] if root.endswith("/v1") else root
+
+
+async def _ollama_context_length(base_url: str, model: str) -> int | None:
+    """The trained context length Ollama reports for *model*, cached per server."""
+    key = (base_url, model)
+    if key in _context_cache:
+        return _context_cache[key]
+    length = None
+    try:
+        resp = await _http_client().post(
+            f"{_ollama_root(base_url)}/api/show", json={"model": model}, timeout=5.0
+        )
+        if resp.status_code == 200:
+            model_info = resp.json().get("model_info") or {}
+            lengths = [v for k, v in model_info.items() if k.endswith(".context_length") and isinstance(v, int)]
+            length = lengths[0] if lengths else None
+    except Exception as e:
+        logger.debug("Could not read context length of %s: %s", model, e)
+    _context_cache[key] = length
+    return length
+
+
+async def context_window(base_url: str, model: str) -> int:
+    """Tokens available to one request (prompt plus response) for *model*."""
+    configured = None
+    try:
+        async with get_db() as db:
+            rows = await db.execute_fetchall(
+                "SELECT value FROM settings WHERE key = 'llm_context_tokens'"
+            )
+        if rows and rows[0]["value"]:
+            configured = rows[0]["value"]
+    except Exception:
+        pass
+    configured = configured or os.environ.get("TALEKEEPER_LLM_CONTEXT_TOKENS")
+    if configured:
+        try:
+            return max(1024, int(configured))
+        except ValueError:
+            logger.warning("Ignoring invalid LLM context size: %r", configured)
+
+    if await _is_ollama(base_url):
+        length = await _ollama_context_length(base_url, model)
+        return min(length, OLLAMA_NUM_CTX) if length else OLLAMA_NUM_CTX
+    return DEFAULT_CONTEXT_TOKENS
+
+
+async def _ollama_options(base_url: str, model: str, prompt_text: str) -> dict:
+    """Request body extras for Ollama: a context size that fits the prompt, and keep-alive."""
+    needed = (
+        token_counting.estimate_tokens(prompt_text, model) + OLLAMA_TEMPLATE_TOKENS + OLLAMA_RESPONSE_TOKENS
     )
+    length = await _ollama_context_length(base_url, model)
+    limit = min(length, OLLAMA_NUM_CTX) if length else OLLAMA_NUM_CTX
+    num_ctx = min(next((size for size in OLLAMA_CTX_BUCKETS if size >= needed), limit), limit)
+
+    key = (base_url, model)
+    now = time.monotonic()
+    loaded = _loaded_ctx.get(key)
+    if loaded and loaded[1] > now and loaded[0] >= num_ctx:
+        num_ctx = loaded[0]
+    _loaded_ctx[key] = (num_ctx, now + OLLAMA_KEEP_ALIVE_SECONDS)
+    return {"options": {"num_ctx": num_ctx}, "keep_alive": OLLAMA_KEEP_ALIVE_SECONDS}
+
+
+_residency_lock = threading.Lock()
+
+
+def _acquire_resident(base_url: str, model: str) -> None:
+    """Take a reference on a local Ollama model in the memory budget, making room first.
+
+    Blocking: making room can unload other models, so this runs in a worker thread.
+    """
+    from talekeeper.services.model_residency import residency
+
+    with _residency_lock:
+        if residency.touch("llm", model):
+            return
+        residency.prepare("llm", model)
+        residency.admit("llm", model, partial(unload_model_sync, base_url, model))
+
+
+def _release_resident(model: str) -> None:
+    from talekeeper.services.model_residency import residency
+
+    residency.release("llm", model)
+
+
+@dataclass
+class _Completion:
+    """A prepared chat completion request and its cache entry."""
+
+    messages: list[dict]
+    kwargs: dict
+    is_ollama: bool
+    cache_policy: llm_cache.CachePolicy
+    cache_key: str | None
+
+
+async def _prepare(base_url: str, model: str, prompt: str, system: str) -> _Completion:
     messages: list[dict] = []
     if system:
         messages.append({"role": "system", "content": system})
     messages.append({"role": "user", "content": prompt})
 
+    # Ollama's options are added once the cache has missed: num_ctx depends on what is loaded
     kwargs: dict = {}
-    if await _is_ollama(base_url):
-        kwargs["extra_body"] = {"options": {"num_ctx": 32768}}
+    is_ollama = await _is_ollama(base_url)
+
+    cache_policy = await llm_cache.resolve_policy()
+    key = llm_cache.cache_key(base_url, model, system, prompt, kwargs) if cache_policy.enabled else None
+    return _Completion(messages, kwargs, is_ollama, cache_policy, key)
+
+
+def _record_call(
+    model: str,
+    prompt_text: str,
+    content: str,
+    usage,
+    latency: float,
+    first_token: float | None = None,
+) -> None:
+    """Record a completion's metrics; token counts are estimated if the provider sent none."""
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    if isinstance(prompt_tokens, int):
+        token_counting.calibrate(model, prompt_text, prompt_tokens)
+    estimated = not (isinstance(prompt_tokens, int) and isinstance(completion_tokens, int))
+    if not isinstance(prompt_tokens, int):
+        prompt_tokens = token_counting.estimate_tokens(prompt_text, model)
+    if not isinstance(completion_tokens, int):
+        completion_tokens = token_counting.estimate_tokens(content, model)
+    llm_metrics.record_call(model, latency, prompt_tokens, completion_tokens, first_token, estimated)
+    logger.debug(
+        "LLM %s: %.1fs, %d prompt + %d completion tokens",
+        model, latency, prompt_tokens, completion_tokens,
+    )
+
+
+async def generate(base_url: str, api_key: str | None, model: str, prompt: str, system: str = "") -> str:
+    """Generate text using the OpenAI Chat Completions API."""
+    # Each LLM call is a cancellation checkpoint for the job that makes it
+    check_cancelled()
+    client = _make_client(base_url, api_key)
+    request = await _prepare(base_url, model, prompt, system)
+    if request.cache_key is not None:
+        cached = await llm_cache.lookup(request.cache_key, request.cache_policy)
+        if cached is not None:
+            return cached
+
+    if request.is_ollama:
+        await asyncio.to_thread(_acquire_resident, base_url, model)
+    try:
+        if request.is_ollama:
+            request.kwargs["extra_body"] = await _ollama_options(base_url, model, system + prompt)
 
-    response = await client.chat.completions.create(
-        model=model,
-        messages=messages,
-        **kwargs,
+        started = 0.0
+
+        async def _attempt():
+            nonlocal started
+            async with _provider_slot(base_url):
+                check_cancelled()
+                started = time.monotonic()
+                return await client.chat.completions.create(
+                    model=model,
+                    messages=request.messages,
+                    **request.kwargs,
+                )
+
+        response = await _with_retries(base_url, model, _attempt)
+    finally:
+        if request.is_ollama:
+            await asyncio.to_thread(_release_resident, model)
+    content = response.choices[0].message.content or ""
+    _record_call(
+        model, system + prompt, content, getattr(response, "usage", None), time.monotonic() - started,
     )
-    return response.choices[0].message.content or ""
+
+    if request.cache_key is not None and content:
+        await llm_cache.store(request.cache_key, base_url, model, content, request.cache_policy)
+    return content
+
+
+async def generate_stream(
+    base_url: str, api_key: str | None, model: str, prompt: str, system: str = ""
+) -> AsyncIterator[str]:
+    """Like generate(), but yield the response text in pieces as the provider writes it.
+
+    A cached response is yielded in one piece. Closing the iterator early
+    closes the provider stream, which stops generation on local servers.
+    Only opening the stream is retried; text already yielded is not repeated.
+    """
+    check_cancelled()
+    client = _make_client(base_url, api_key)
+    request = await _prepare(base_url, model, prompt, system)
+    if request.cache_key is not None:
+        cached = await llm_cache.lookup(request.cache_key, request.cache_policy)
+        if cached is not None:
+            yield cached
+            return
+
+    if request.is_ollama:
+        await asyncio.to_thread(_acquire_resident, base_url, model)
+    parts: list[str] = []
+    usage = None
+    first_token = None
+    try:
+        if request.is_ollama:
+            request.kwargs["extra_body"] = await _ollama_options(base_url, model, system + prompt)
+
+        async with _provider_slot(base_url):
+            started = time.monotonic()
+            stream = await _with_retries(base_url, model, lambda: client.chat.completions.create(
+                model=model,
+                messages=request.messages,
+                stream=True,
+                **request.kwargs,
+            ))
+            try:
+                async for chunk in stream:
+                    check_cancelled()
+                    if getattr(chunk, "usage", None) is not None:
+                        usage = chunk.usage
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        if first_token is None:
+                            first_token = time.monotonic() - started
+                        parts.append(delta)
+                        yield delta
+            finally:
+                await stream.close()
+    finally:
+        if request.is_ollama:
+            await asyncio.to_thread(_release_resident, model)
+
+    content = "".join(parts)
+    _record_call(model, system + prompt, content, usage, time.monotonic() - started, first_token)
+    if request.cache_key is not None and content:
+        await llm_cache.store(request.cache_key, base_url, model, content, request.cache_policy)
 
 
 async def unload_model(base_url: str, api_key: str | None, model: str) -> None:
     """Unload a model from Ollama by sending keep_alive: 0. No-op for non-Ollama providers."""
     if not await _is_ollama(base_url):
         return
+    _loaded_ctx.pop((base_url, model), None)
+
+    ollama_root = base_url.rstrip("/")
+    if ollama_root.endswith("/v1"):
+        ollama_root = ollama_root[:-3]
+
+    try:
+        await _http_client().post(
+            f"{ollama_root}/api/generate",
+            json={"model": model, "keep_alive": "0"},
+        )
+        logger.info("Sent keep_alive=0 to Ollama for model %s", model)
+    except Exception as e:
+        logger.warning("Failed to unload Ollama model %s: %s", model, e)
+
 
+def unload_model_sync(base_url: str, model: str) -> None:
+    """Blocking keep_alive: 0 for a known Ollama model, used by residency evictions."""
+    _loaded_ctx.pop((base_url, model), None)
     ollama_root = base_url.rstrip("/")
     if ollama_root.endswith("/v1"):
         ollama_root = ollama_root[:-3]
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            await client.post(
+        with httpx.Client(timeout=10.0) as client:
+            client.post(
                 f"{ollama_root}/api/generate",
                 json={"model": model, "keep_alive": "0"},
             )
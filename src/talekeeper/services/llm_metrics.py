@@ -0,0 +1,112 @@
+"""Latency and token metrics of LLM calls.
+
+``llm_client`` records every completion it makes: wall time, time to the
+first streamed token, prompt and completion tokens, and retries and
+failures. Token counts come from the provider's usage report and are
+estimated from the text when a provider does not send one. Metrics live in
+memory for the life of the process and are reported per model, together
+with the most recent calls and the tokens saved by transcript compaction.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+
+RECENT_CALLS = 50
+
+
+@dataclass
+class _ModelMetrics:
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    latency_seconds: float = 0.0
+    generation_seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_latency_seconds": round(self.latency_seconds / self.calls, 3) if self.calls else 0.0,
+            "tokens_per_second": (
+                round(self.completion_tokens / self.generation_seconds, 1)
+                if self.generation_seconds else 0.0
+            ),
+        }
+
+
+_by_model: dict[str, _ModelMetrics] = {}
+_recent: deque = deque(maxlen=RECENT_CALLS)
+_compaction = {"transcripts": 0, "original_tokens": 0, "tokens": 0}
+
+
+def _model(model: str) -> _ModelMetrics:
+    return _by_model.setdefault(model, _ModelMetrics())
+
+
+def record_call(
+    model: str,
+    latency: float,
+    prompt_tokens: int,
+    completion_tokens: int,
+    first_token: float | None = None,
+    estimated: bool = False,
+) -> None:
+    """Record a finished completion; *first_token* is the delay before a stream's first text."""
+    # Tokens per second measure generation, not the wait for the prompt to be read
+    generation = latency - first_token if first_token is not None else latency
+    metrics = _model(model)
+    metrics.calls += 1
+    metrics.latency_seconds += latency
+    metrics.generation_seconds += max(generation, 0.0)
+    metrics.prompt_tokens += prompt_tokens
+    metrics.completion_tokens += completion_tokens
+    _recent.append({
+        "model": model,
+        "at": time.time(),
+        "latency_seconds": round(latency, 3),
+        "first_token_seconds": round(first_token, 3) if first_token is not None else None,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "tokens_per_second": round(completion_tokens / generation, 1) if generation > 0 else 0.0,
+        "estimated_tokens": estimated,
+    })
+
+
+def record_retry(model: str) -> None:
+    _model(model).retries += 1
+
+
+def record_error(model: str) -> None:
+    _model(model).errors += 1
+
+
+def record_compaction(original_tokens: int, tokens: int) -> None:
+    """Record a transcript compacted from *original_tokens* to *tokens* (estimated)."""
+    _compaction["transcripts"] += 1
+    _compaction["original_tokens"] += original_tokens
+    _compaction["tokens"] += tokens
+
+
+def stats() -> dict:
+    original = _compaction["original_tokens"]
+    return {
+        "models": {model: metrics.to_dict() for model, metrics in _by_model.items()},
+        "recent": list(_recent),
+        "compaction": {
+            **_compaction,
+            "reduction": round(1 - _compaction["tokens"] / original, 3) if original else 0.0,
+        },
+    }
+
+
+def reset() -> None:
+    _by_model.clear()
+    _recent.clear()
+    for key in _compaction:
+        _compaction[key] = 0
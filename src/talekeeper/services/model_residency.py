@@ -0,0 +1,312 @@
+"""Memory-aware residency for the models used by session pipelines.
+
+Whisper, WeSpeaker, the local LLM and FLUX used to be unloaded after every
+phase, so processing several sessions back to back reloaded each model once
+per session. Loaders now register what they load here, and every call that
+gets a model from its loader holds a reference until it releases it, so
+concurrent users of one model do not unpin it for each other. A released
+model stays warm as long as the resident models fit in a RAM budget. When a
+new load would not fit, the least recently used idle models are evicted
+first. A model with references is never evicted.
+
+Sizes are measured from MLX's active memory where available and otherwise
+taken from per-model estimates. The budget resolves from the
+``model_memory_budget_gb`` setting, then ``TALEKEEPER_MODEL_MEMORY_BUDGET_GB``,
+then half of physical RAM.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+GB = 1024 ** 3
+DEFAULT_BUDGET_FRACTION = 0.5
+FALLBACK_RAM_BYTES = 16 * GB
+
+# Approximate resident footprint per model (GB), used when it cannot be measured
+MODEL_MEMORY_ESTIMATES_GB: dict[str, dict[str, float]] = {
+    "transcription": {
+        "tiny": 0.1,
+        "base": 0.2,
+        "small": 0.6,
+        "medium": 1.6,
+        "distil-small.en": 0.4,
+        "distil-medium.en": 0.9,
+        "distil-large-v2": 1.6,
+        "distil-large-v3": 1.6,
+        "large": 3.2,
+        "large-v2": 3.2,
+        "large-v3": 3.2,
+    },
+    "diarization": {},
+    "llm": {},
+    "image_generation": {},
+}
+DEFAULT_ESTIMATES_GB: dict[str, float] = {
+    "transcription": 3.2,
+    "diarization": 0.1,
+    "llm": 6.0,
+    "image_generation": 12.0,
+}
+
+
+def estimate_model_bytes(kind: str, name: str) -> int:
+    """Estimated resident size of a model, falling back to the kind's default."""
+    estimate = MODEL_MEMORY_ESTIMATES_GB.get(kind, {}).get(name)
+    if estimate is None:
+        estimate = DEFAULT_ESTIMATES_GB.get(kind, 1.0)
+    return int(estimate * GB)
+
+
+def _physical_ram_bytes() -> int:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return FALLBACK_RAM_BYTES
+
+
+def default_budget_bytes() -> int:
+    return int(_physical_ram_bytes() * DEFAULT_BUDGET_FRACTION)
+
+
+def _active_memory_bytes() -> int | None:
+    """Bytes currently held by MLX, or None when MLX is unavailable."""
+    try:
+        import mlx.core as mx
+    except Exception:
+        return None
+    getter = getattr(mx, "get_active_memory", None)
+    if getter is None:
+        getter = getattr(getattr(mx, "metal", None), "get_active_memory", None)
+    if getter is None:
+        return None
+    try:
+        return int(getter())
+    except Exception:
+        return None
+
+
+@dataclass
+class ResidentModel:
+    kind: str
+    name: str
+    size_bytes: int
+    unload: Callable[[], None]
+    # Callers holding the model; it can be evicted only at zero
+    users: int = 1
+    last_used: float = 0.0
+
+
+class ModelResidency:
+    """Tracks resident models, one per kind, in least-recently-used order."""
+
+    def __init__(self, budget_bytes: int | None = None) -> None:
+        self._lock = threading.RLock()
+        self._resident: OrderedDict[str, ResidentModel] = OrderedDict()
+        self._budget_bytes = budget_bytes
+        self.loads: Counter[str] = Counter()
+        self.hits: Counter[str] = Counter()
+        self.evictions: Counter[str] = Counter()
+
+    @property
+    def budget_bytes(self) -> int:
+        return self._budget_bytes if self._budget_bytes is not None else default_budget_bytes()
+
+    def set_budget(self, budget_bytes: int | None) -> None:
+        with self._lock:
+            self._budget_bytes = budget_bytes
+            victims = self._over_budget_victims(0)
+        self._unload_all(victims)
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(m.size_bytes for m in self._resident.values())
+
+    def is_resident(self, kind: str, name: str | None = None) -> bool:
+        with self._lock:
+            model = self._resident.get(kind)
+            return model is not None and (name is None or model.name == name)
+
+    def resident_kinds(self) -> list[str]:
+        """Kinds with a resident model, most recently used first."""
+        with self._lock:
+            return list(reversed(self._resident))
+
+    def touch(self, kind: str, name: str | None = None) -> bool:
+        """Take a reference on a resident model; reusing an idle one counts as a hit.
+
+        Returns False, taking nothing, when no model (named *name*) is resident.
+        """
+        with self._lock:
+            model = self._resident.get(kind)
+            if model is None or (name is not None and model.name != name):
+                return False
+            if not model.users:
+                self.hits[kind] += 1
+            model.users += 1
+            model.last_used = time.monotonic()
+            self._resident.move_to_end(kind)
+            return True
+
+    def prepare(self, kind: str, name: str, size_bytes: int | None = None) -> None:
+        """Make room for loading *name*, evicting the kind's previous model and LRU idle ones."""
+        needed = size_bytes if size_bytes is not None else estimate_model_bytes(kind, name)
+        with self._lock:
+            replaced = self._resident.pop(kind, None)
+            victims = [replaced] if replaced is not None else []
+            victims += self._over_budget_victims(needed)
+        self._unload_all(victims)
+
+    def admit(
+        self,
+        kind: str,
+        name: str,
+        unload: Callable[[], None],
+        size_bytes: int | None = None,
+    ) -> None:
+        """Record a freshly loaded model as resident, with one reference for its loader."""
+        size = size_bytes if size_bytes else estimate_model_bytes(kind, name)
+        with self._lock:
+            self._resident[kind] = ResidentModel(
+                kind=kind, name=name, size_bytes=size, unload=unload,
+                last_used=time.monotonic(),
+            )
+            self._resident.move_to_end(kind)
+            self.loads[kind] += 1
+        logger.info("Loaded %s model %s (%.1f GB resident of %.1f GB budget)",
+                    kind, name, self.resident_bytes() / GB, self.budget_bytes / GB)
+
+    @contextmanager
+    def loading(self, kind: str, name: str, unload: Callable[[], None]) -> Iterator[None]:
+        """Wrap a model load: make room first, then record its measured size."""
+        self.prepare(kind, name)
+        before = _active_memory_bytes()
+        yield
+        after = _active_memory_bytes()
+        measured = after - before if before is not None and after is not None else None
+        self.admit(kind, name, unload, measured if measured and measured > 0 else None)
+
+    def release(self, kind: str, name: str | None = None) -> None:
+        """Drop a reference taken by a loader; an idle model stays warm unless over budget."""
+        with self._lock:
+            model = self._resident.get(kind)
+            if model is not None and model.users and (name is None or model.name == name):
+                model.users -= 1
+                model.last_used = time.monotonic()
+            victims = self._over_budget_victims(0)
+        self._unload_all(victims)
+
+    def evict(self, kind: str) -> bool:
+        """Unload a kind's model now, whether or not it fits the budget."""
+        with self._lock:
+            model = self._resident.pop(kind, None)
+        if model is None:
+            return False
+        self._unload_all([model])
+        return True
+
+    def evict_all(self) -> None:
+        with self._lock:
+            victims = list(self._resident.values())
+            self._resident.clear()
+        self._unload_all(victims)
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            resident = [
+                {
+                    "kind": m.kind,
+                    "name": m.name,
+                    "size_bytes": m.size_bytes,
+                    "in_use": m.users > 0,
+                    "users": m.users,
+                    "idle_seconds": round(now - m.last_used, 1),
+                }
+                for m in reversed(self._resident.values())
+            ]
+            kinds = sorted(set(self.loads) | set(self.hits) | set(self.evictions))
+            return {
+                "budget_bytes": self.budget_bytes,
+                "resident_bytes": sum(m["size_bytes"] for m in resident),
+                "resident": resident,
+                "counters": {
+                    kind: {
+                        "loads": self.loads[kind],
+                        "hits": self.hits[kind],
+                        "evictions": self.evictions[kind],
+                    }
+                    for kind in kinds
+                },
+            }
+
+    def _over_budget_victims(self, needed: int) -> list[ResidentModel]:
+        """Pop idle models, oldest first, until *needed* more bytes fit. Caller holds the lock."""
+        victims: list[ResidentModel] = []
+        total = sum(m.size_bytes for m in self._resident.values())
+        for kind in list(self._resident):
+            if total + needed <= self.budget_bytes:
+                break
+            model = self._resident[kind]
+            if model.users:
+                continue
+            del self._resident[kind]
+            total -= model.size_bytes
+            victims.append(model)
+        if total + needed > self.budget_bytes:
+            logger.warning(
+                "Models in use exceed the memory budget (%.1f GB needed, %.1f GB budget)",
+                (total + needed) / GB, self.budget_bytes / GB,
+            )
+        return victims
+
+    def _unload_all(self, victims: list[ResidentModel]) -> None:
+        for model in victims:
+            logger.info("Evicting %s model %s (%.1f GB)", model.kind, model.name, model.size_bytes / GB)
+            try:
+                model.unload()
+            except Exception as e:
+                logger.warning("Failed to unload %s model %s: %s", model.kind, model.name, e)
+            with self._lock:
+                self.evictions[model.kind] += 1
+
+
+residency = ModelResidency()
+
+
+async def resolve_memory_budget() -> int:
+    """Resolve the model memory budget: settings > env var > half of physical RAM."""
+    from talekeeper.db import get_db
+
+    value = None
+    try:
+        async with get_db() as db:
+            rows = await db.execute_fetchall(
+                "SELECT value FROM settings WHERE key = 'model_memory_budget_gb'"
+            )
+            if rows and rows[0]["value"]:
+                value = rows[0]["value"]
+    except Exception:
+        pass
+    value = value or os.environ.get("TALEKEEPER_MODEL_MEMORY_BUDGET_GB")
+    try:
+        if value:
+            return int(float(value) * GB)
+    except ValueError:
+        logger.warning("Ignoring invalid model memory budget: %r", value)
+    return default_budget_bytes()
+
+
+async def refresh_memory_budget() -> None:
+    """Apply the configured budget; loaders run in threads and use the cached value."""
+    import asyncio
+
+    # A smaller budget can unload models, which blocks
+    await asyncio.to_thread(residency.set_budget, await resolve_memory_budget())
@@ -0,0 +1,334 @@
+"""Eager pre-processing of audio as soon as it is stored.
+
+Uploading a file, adding an audio part or stopping a recording used to only
+store the file; decoding, VAD and speaker embedding all waited until someone
+pressed Process. Now a background task starts as soon as audio lands: it
+decodes the file to 16 kHz mono PCM, probes its metadata, and extracts speech
+embeddings. Results are cached per source file and keyed by its size and
+modification time, so a replaced file is never matched with stale results.
+
+Processing pipelines pick up whatever is ready: Whisper reads the decoded WAV
+instead of the original container, and diarization uses the cached embeddings
+(waiting for a task that is still running rather than starting over). Audio
+parts also get their embeddings written to the per-part cache. A job preempted
+while extracting embeddings alongside ASR hands its extraction over in the
+same way, so the resumed job picks the embeddings up.
+
+One file is pre-processed at a time so uploads do not starve interactive work.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from talekeeper.db import get_db
+
+logger = logging.getLogger(__name__)
+
+_tasks: dict[str, asyncio.Task] = {}
+_lock: asyncio.Lock | None = None
+_lock_loop: asyncio.AbstractEventLoop | None = None
+
+
+@dataclass
+class PreprocessedAudio:
+    source_path: Path
+    wav_path: Path | None
+    duration: float | None
+    embeddings: np.ndarray | None
+    subsegments: list[tuple[float, float, int]] | None
+
+    @property
+    def speech_embeddings(self) -> tuple[np.ndarray, list[tuple[float, float, int]]] | None:
+        if self.embeddings is None or self.subsegments is None:
+            return None
+        return self.embeddings, self.subsegments
+
+
+def _key(source_path: Path) -> str:
+    return str(Path(source_path).resolve())
+
+
+def _fingerprint(source_path: Path) -> tuple[int, float]:
+    st = Path(source_path).stat()
+    return st.st_size, st.st_mtime
+
+
+def _get_lock() -> asyncio.Lock:
+    global _lock, _lock_loop
+    loop = asyncio.get_running_loop()
+    if _lock is None or _lock_loop is not loop:
+        _lock = asyncio.Lock()
+        _lock_loop = loop
+    return _lock
+
+
+async def eager_preprocessing_enabled() -> bool:
+    """Resolve eager pre-processing: settings > env var > enabled."""
+    value = None
+    try:
+        async with get_db() as db:
+            rows = await db.execute_fetchall(
+                "SELECT value FROM settings WHERE key = 'eager_preprocessing'"
+            )
+            if rows and rows[0]["value"]:
+                value = rows[0]["value"]
+    except Exception:
+        pass
+    value = value or os.environ.get("TALEKEEPER_EAGER_PREPROCESSING", "true")
+    return value.strip().lower() not in ("0", "false", "no", "off")
+
+
+async def schedule_preprocessing(
+    source_path: Path,
+    cache_dir: Path,
+    audio_file_id: int | None = None,
+) -> asyncio.Task | None:
+    """Start pre-processing *source_path* in the background unless disabled or cached.
+
+    *audio_file_id* marks the file as an audio part whose embeddings also go to
+    the per-part cache.
+    """
+    if not await eager_preprocessing_enabled():
+        return None
+    key = _key(source_path)
+    running = _tasks.get(key)
+    if running is not None and not running.done():
+        return running
+    if await load_preprocessed(source_path, wait=False) is not None:
+        return None
+
+    task = asyncio.create_task(_preprocess(Path(source_path), cache_dir, audio_file_id))
+    _tasks[key] = task
+    task.add_done_callback(lambda t: _tasks.pop(key, None) if _tasks.get(key) is t else None)
+    return task
+
+
+def preprocessing_pending(source_path: Path) -> bool:
+    task = _tasks.get(_key(source_path))
+    return task is not None and not task.done()
+
+
+async def _preprocess(source_path: Path, cache_dir: Path, audio_file_id: int | None) -> None:
+    from talekeeper.services.audio import probe_audio
+    from talekeeper.services.audio_merge import decode_to_processing_wav
+    from talekeeper.services.audio_parts import wav_duration
+    from talekeeper.services.diarization import extract_speech_embeddings
+
+    key = _key(source_path)
+    async with _get_lock():
+        try:
+            size, mtime = _fingerprint(source_path)
+        except OSError:
+            return
+        async with get_db() as db:
+            await db.execute(
+                """INSERT INTO audio_preprocessing (source_path, source_size, source_mtime, status)
+                   VALUES (?, ?, ?, 'running')
+                   ON CONFLICT(source_path) DO UPDATE SET
+                       source_size = excluded.source_size,
+                       source_mtime = excluded.source_mtime,
+                       wav_path = NULL, duration = NULL, codec = NULL,
+                       sample_rate = NULL, channels = NULL, embeddings_path = NULL,
+                       status = 'running', error = NULL,
+                       updated_at = datetime('now')""",
+                (key, size, mtime),
+            )
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"part_{audio_file_id}" if audio_file_id is not None else source_path.stem
+        wav_path = cache_dir / f"{stem}.16k.wav"
+        try:
+            info = await asyncio.to_thread(probe_audio, source_path)
+            await asyncio.to_thread(decode_to_processing_wav, source_path, wav_path)
+            duration = await asyncio.to_thread(wav_duration, wav_path)
+            async with get_db() as db:
+                await db.execute(
+                    """UPDATE audio_preprocessing
+                       SET wav_path = ?, duration = ?, codec = ?, sample_rate = ?, channels = ?,
+                           updated_at = datetime('now')
+                       WHERE source_path = ?""",
+                    (str(wav_path), duration, info.codec, info.sample_rate, info.channels, key),
+                )
+
+            # Extraction releases WeSpeaker when it returns, so it stays evictable outside jobs
+            embeddings, subsegments = await asyncio.to_thread(extract_speech_embeddings, wav_path)
+            if audio_file_id is not None:
+                from talekeeper.services.audio_parts import AudioPart, save_part_embeddings
+
+                part = AudioPart(
+                    audio_file_id=audio_file_id,
+                    file_path=source_path,
+                    duration=duration,
+                    embeddings=embeddings,
+                    subsegments=subsegments,
+                )
+                await save_part_embeddings(part, cache_dir)
+                embeddings_path = cache_dir / f"part_{audio_file_id}.npz"
+            else:
+                embeddings_path = cache_dir / f"{stem}.embeddings.npz"
+                await asyncio.to_thread(_save_embeddings, embeddings_path, embeddings, subsegments)
+
+            async with get_db() as db:
+                await db.execute(
+                    """UPDATE audio_preprocessing
+                       SET embeddings_path = ?, status = 'done', updated_at = datetime('now')
+                       WHERE source_path = ?""",
+                    (str(embeddings_path), key),
+                )
+            logger.info("Pre-processed %s (%.0fs of audio)", source_path.name, duration)
+        except Exception as e:
+            logger.warning("Pre-processing %s failed: %s", source_path.name, e)
+            async with get_db() as db:
+                await db.execute(
+                    """UPDATE audio_preprocessing SET status = 'failed', error = ?,
+                           updated_at = datetime('now')
+                       WHERE source_path = ?""",
+                    (str(e), key),
+                )
+
+
+def _save_embeddings(
+    path: Path, embeddings: np.ndarray, subsegments: list[tuple[float, float, int]]
+) -> None:
+    subsegment_array = np.array(subsegments, dtype=np.float64).reshape(-1, 3)
+    np.savez(path, embeddings=embeddings, subsegments=subsegment_array)
+
+
+def adopt_embedding_prefetch(source_path: Path, cache_dir: Path, prefetch) -> asyncio.Task:
+    """Cache the embeddings of a prefetch whose job was preempted before using them.
+
+    The task is tracked like eager pre-processing, so the resumed job waits
+    for it instead of decoding and extracting everything again.
+    """
+    key = _key(source_path)
+    task = asyncio.create_task(_store_prefetched(Path(source_path), cache_dir, prefetch))
+    _tasks[key] = task
+    task.add_done_callback(lambda t: _tasks.pop(key, None) if _tasks.get(key) is t else None)
+    return task
+
+
+async def _store_prefetched(source_path: Path, cache_dir: Path, prefetch) -> None:
+    from talekeeper.services.cancellation import OperationCancelled
+
+    key = _key(source_path)
+    try:
+        embeddings, subsegments = await prefetch
+        size, mtime = _fingerprint(source_path)
+    except asyncio.CancelledError:
+        # The file was replaced or deleted meanwhile
+        prefetch.cancel()
+        raise
+    except (Exception, OperationCancelled) as e:
+        logger.warning("Keeping prefetched embeddings for %s failed: %s", source_path.name, e)
+        return
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    embeddings_path = cache_dir / f"{source_path.stem}.embeddings.npz"
+    await asyncio.to_thread(_save_embeddings, embeddings_path, embeddings, subsegments)
+    async with get_db() as db:
+        await db.execute(
+            """INSERT INTO audio_preprocessing
+                   (source_path, source_size, source_mtime, embeddings_path, status)
+               VALUES (?, ?, ?, ?, 'done')
+               ON CONFLICT(source_path) DO UPDATE SET
+                   wav_path = CASE
+                       WHEN source_size = excluded.source_size AND source_mtime = excluded.source_mtime
+                       THEN wav_path END,
+                   source_size = excluded.source_size,
+                   source_mtime = excluded.source_mtime,
+                   embeddings_path = excluded.embeddings_path,
+                   status = 'done', error = NULL,
+                   updated_at = datetime('now')""",
+            (key, size, mtime, str(embeddings_path)),
+        )
+    logger.info("Kept prefetched embeddings for %s", source_path.name)
+
+
+async def load_preprocessed(source_path: Path, wait: bool = True) -> PreprocessedAudio | None:
+    """Cached results for *source_path* if they still match the file on disk.
+
+    With *wait*, a pre-processing task still running for the file is awaited first.
+    A result may be partial: the WAV is stored before embeddings are extracted.
+    """
+    key = _key(source_path)
+    task = _tasks.get(key)
+    if wait and task is not None and not task.done():
+        await asyncio.shield(task)
+
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT * FROM audio_preprocessing WHERE source_path = ?", (key,)
+        )
+    if not rows:
+        return None
+    row = rows[0]
+    try:
+        if (row["source_size"], row["source_mtime"]) != _fingerprint(source_path):
+            return None
+    except OSError:
+        return None
+
+    wav_path = Path(row["wav_path"]) if row["wav_path"] else None
+    if wav_path is not None and not wav_path.exists():
+        wav_path = None
+    result = PreprocessedAudio(
+        source_path=Path(source_path),
+        wav_path=wav_path,
+        duration=row["duration"],
+        embeddings=None,
+        subsegments=None,
+    )
+    if row["embeddings_path"] and Path(row["embeddings_path"]).exists():
+        with np.load(row["embeddings_path"]) as data:
+            result.embeddings = data["embeddings"]
+            result.subsegments = [
+                (float(s), float(e), int(i)) for s, e, i in data["subsegments"]
+            ]
+    if result.wav_path is None and result.embeddings is None:
+        return None
+    return result
+
+
+async def preprocessed_embeddings(
+    source_path: Path,
+) -> tuple[np.ndarray, list[tuple[float, float, int]]] | None:
+    """Speech embeddings for *source_path*, waiting for a running pre-processing task."""
+    preprocessed = await load_preprocessed(source_path)
+    return preprocessed.speech_embeddings if preprocessed is not None else None
+
+
+async def discard_preprocessed_wav(source_path: Path) -> None:
+    """Delete the decoded WAV once processing no longer needs it; embeddings stay cached."""
+    key = _key(source_path)
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT wav_path FROM audio_preprocessing WHERE source_path = ?", (key,)
+        )
+        if rows and rows[0]["wav_path"]:
+            Path(rows[0]["wav_path"]).unlink(missing_ok=True)
+            await db.execute(
+                "UPDATE audio_preprocessing SET wav_path = NULL WHERE source_path = ?", (key,)
+            )
+
+
+async def invalidate_preprocessing(source_path: Path) -> None:
+    """Drop cached results for a file that was deleted or replaced."""
+    key = _key(source_path)
+    task = _tasks.pop(key, None)
+    if task is not None and not task.done():
+        task.cancel()
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT wav_path, embeddings_path FROM audio_preprocessing WHERE source_path = ?",
+            (key,),
+        )
+        for row in rows:
+            for path in (row["wav_path"], row["embeddings_path"]):
+                if path:
+                    Path(path).unlink(missing_ok=True)
+        await db.execute("DELETE FROM audio_preprocessing WHERE source_path = ?", (key,))
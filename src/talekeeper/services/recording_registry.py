@@ -0,0 +1,128 @@
+"""In-process registry of active recordings, one independent writer per session."""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from talekeeper.db import get_db
+
+DEFAULT_MAX_CONCURRENT_RECORDINGS = 4
+
+
+class RecordingLimitError(Exception):
+    """Raised when starting a recording would exceed the concurrency limit."""
+
+
+class RecordingInProgressError(Exception):
+    """Raised when a session already has an active recording."""
+
+
+@dataclass
+class ActiveRecording:
+    """Chunk writer and resource accounting for a single recording session."""
+
+    session_id: int
+    campaign_id: int
+    chunk_dir: Path
+    started_at: float = field(default_factory=time.time)
+    chunks_received: int = 0
+    bytes_received: int = 0
+
+    async def write_chunk(self, data: bytes) -> Path:
+        """Persist one audio chunk without blocking other recordings' streams."""
+        chunk_file = self.chunk_dir / f"chunk_{self.chunks_received:03d}.webm"
+        self.chunks_received += 1
+        self.bytes_received += len(data)
+        await asyncio.to_thread(chunk_file.write_bytes, data)
+        return chunk_file
+
+    def to_dict(self) -> dict:
+        elapsed = max(time.time() - self.started_at, 1e-6)
+        return {
+            "session_id": self.session_id,
+            "campaign_id": self.campaign_id,
+            "started_at": self.started_at,
+            "chunks_received": self.chunks_received,
+            "bytes_received": self.bytes_received,
+            "bytes_per_second": self.bytes_received / elapsed,
+        }
+
+
+class RecordingRegistry:
+    """Track active recordings keyed by session ID and enforce a concurrency limit.
+
+    All mutations happen on the event loop without awaiting in between, so
+    check-and-register is atomic with respect to other WebSocket handlers.
+    """
+
+    def __init__(self) -> None:
+        self._active: dict[int, ActiveRecording] = {}
+
+    def start(
+        self,
+        session_id: int,
+        campaign_id: int,
+        chunk_dir: Path,
+        max_concurrent: int,
+    ) -> ActiveRecording:
+        """Register a new recording; raise if the session is busy or the limit is reached."""
+        if session_id in self._active:
+            raise RecordingInProgressError("Session is already recording")
+        if len(self._active) >= max_concurrent:
+            raise RecordingLimitError(
+                f"Maximum of {max_concurrent} concurrent recordings reached"
+            )
+        recording = ActiveRecording(
+            session_id=session_id,
+            campaign_id=campaign_id,
+            chunk_dir=chunk_dir,
+        )
+        self._active[session_id] = recording
+        return recording
+
+    def stop(self, session_id: int) -> ActiveRecording | None:
+        """Remove a recording from the registry, returning it if it was active."""
+        return self._active.pop(session_id, None)
+
+    def get(self, session_id: int) -> ActiveRecording | None:
+        return self._active.get(session_id)
+
+    def is_recording(self, session_id: int) -> bool:
+        return session_id in self._active
+
+    def active(self) -> list[ActiveRecording]:
+        return list(self._active.values())
+
+    def stats(self) -> dict:
+        recordings = [r.to_dict() for r in self._active.values()]
+        return {
+            "active_count": len(recordings),
+            "total_bytes_received": sum(r["bytes_received"] for r in recordings),
+            "recordings": recordings,
+        }
+
+
+registry = RecordingRegistry()
+
+
+async def resolve_max_concurrent_recordings() -> int:
+    """Resolve the recording limit: settings > TALEKEEPER_MAX_CONCURRENT_RECORDINGS env > default."""
+    value: str | None = None
+    try:
+        async with get_db() as db:
+            rows = await db.execute_fetchall(
+                "SELECT value FROM settings WHERE key = 'max_concurrent_recordings'"
+            )
+            if rows and rows[0]["value"]:
+                value = rows[0]["value"]
+    except Exception:
+        pass
+
+    value = value or os.environ.get("TALEKEEPER_MAX_CONCURRENT_RECORDINGS")
+    try:
+        limit = int(value) if value else DEFAULT_MAX_CONCURRENT_RECORDINGS
+    except ValueError:
+        limit = DEFAULT_MAX_CONCURRENT_RECORDINGS
+    return max(1, limit)
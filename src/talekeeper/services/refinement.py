@@ -0,0 +1,194 @@
+"""Two-pass transcription: a fast draft model first, background refinement later.
+
+The draft transcript is diarized and marked usable straight away. A refinement
+job then re-transcribes the recording window by window with the final model
+and swaps each window's draft segments for refined ones, bumping their
+revision. The job is queued at idle priority: it runs only when no other job
+is queued, yields after any window once other work arrives, and resumes from
+the first unrefined window after a restart. Queuing another job for the
+session, or replacing its audio, cancels it.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator
+
+from talekeeper.db import get_db
+from talekeeper.services.cancellation import check_cancelled
+from talekeeper.services.jobs import PRIORITY_IDLE, Job
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DRAFT_MODEL = "small"
+REFINE_WINDOW_SECONDS = 300.0
+REFINE_JOB_KIND = "refine_transcript"
+
+
+@dataclass
+class TwoPassConfig:
+    enabled: bool
+    draft_model: str
+
+
+async def resolve_two_pass_config() -> TwoPassConfig:
+    """Resolve transcription mode: settings > env var > default (single pass)."""
+    values: dict[str, str] = {}
+    try:
+        async with get_db() as db:
+            rows = await db.execute_fetchall(
+                "SELECT key, value FROM settings WHERE key IN ('transcription_mode', 'draft_whisper_model')"
+            )
+            values = {r["key"]: r["value"] for r in rows if r["value"]}
+    except Exception:
+        pass
+
+    mode = values.get("transcription_mode") or os.environ.get("TALEKEEPER_TRANSCRIPTION_MODE", "single")
+    draft_model = (
+        values.get("draft_whisper_model")
+        or os.environ.get("TALEKEEPER_DRAFT_MODEL")
+        or DEFAULT_DRAFT_MODEL
+    )
+    return TwoPassConfig(enabled=mode == "two_pass", draft_model=draft_model)
+
+
+async def record_draft_ready(session_id: int, seconds: float, final: bool) -> None:
+    """Store time to the first usable transcript (and to final, for single-pass runs)."""
+    async with get_db() as db:
+        await db.execute(
+            "UPDATE sessions SET time_to_draft_seconds = ?, time_to_final_seconds = ? WHERE id = ?",
+            (seconds, seconds if final else None, session_id),
+        )
+
+
+async def _audio_duration(session_id: int, audio_path: Path) -> float:
+    from talekeeper.services.audio import probe_audio
+    from talekeeper.services.audio_catalog import session_audio_metadata
+
+    metadata = await session_audio_metadata(session_id)
+    if metadata is not None and metadata.duration:
+        return metadata.duration
+    try:
+        info = await asyncio.to_thread(probe_audio, audio_path)
+        if info.duration > 0:
+            return info.duration
+    except Exception:
+        logger.debug("probe failed for %s, using transcript extent", audio_path, exc_info=True)
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT MAX(end_time) AS last_end FROM transcript_segments WHERE session_id = ?",
+            (session_id,),
+        )
+    return float(rows[0]["last_end"] or 0.0) if rows else 0.0
+
+
+async def refine_session_transcript(job: Job) -> AsyncIterator[tuple[str, dict]]:
+    """Replace draft segments window by window with the final model's output.
+
+    Windows are contiguous and end on segment boundaries, so every draft
+    segment is replaced exactly once. The end of each window is a checkpoint,
+    so a preempted or restarted job goes on from the next window.
+    """
+    from talekeeper.services.resource_orchestration import cleanup_transcription
+    from talekeeper.services.thread_utils import iterate_in_thread
+    from talekeeper.services.transcription import TranscriptSegment, transcribe_range
+    from talekeeper.services.transcript_ranges import (
+        expand_range_to_segments,
+        replace_transcript_range,
+    )
+
+    session_id = job.session_id
+    model_name = job.params["model_name"]
+    language = job.params["language"]
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT audio_path FROM sessions WHERE id = ?", (session_id,)
+        )
+    if not rows or not rows[0]["audio_path"]:
+        raise RuntimeError("No audio recorded for this session")
+    audio_path = Path(rows[0]["audio_path"])
+
+    duration = await _audio_duration(session_id, audio_path)
+    windows_total = max(1, int(-(-duration // REFINE_WINDOW_SECONDS)))
+    cursor = job.checkpoint.get("cursor", 0.0)
+    windows_done = job.checkpoint.get("windows_done", 0)
+
+    while cursor < duration:
+        _, window_end = await expand_range_to_segments(
+            session_id, cursor, min(cursor + REFINE_WINDOW_SECONDS, duration)
+        )
+        window_end = min(max(window_end, cursor + 1.0), duration)
+
+        segments: list[TranscriptSegment] = []
+        async for item in iterate_in_thread(
+            transcribe_range(audio_path, cursor, window_end, model_name=model_name, language=language),
+            on_cancel=cleanup_transcription,
+        ):
+            # A cancelled job gives up the window; the draft stays in place
+            check_cancelled()
+            if isinstance(item, TranscriptSegment):
+                segments.append(item)
+        await replace_transcript_range(
+            session_id, cursor, window_end, segments, model_name=model_name,
+        )
+        windows_done += 1
+        cursor = window_end
+        await job.save_checkpoint(cursor=cursor, windows_done=windows_done, windows_total=windows_total)
+        yield ("progress", {"windows_done": windows_done, "windows_total": windows_total})
+
+    cleanup_transcription()
+    elapsed = time.time() - job.params["started_at"]
+    async with get_db() as db:
+        await db.execute(
+            "UPDATE sessions SET time_to_final_seconds = ? WHERE id = ?",
+            (elapsed, session_id),
+        )
+    logger.info("Refined transcript for session %d in %.1fs", session_id, elapsed)
+    yield ("done", {"windows_done": windows_done, "time_to_final_seconds": elapsed})
+
+
+async def keep_refined_windows(job: Job) -> None:
+    """Rollback of a cancelled refinement: refined windows stay, the rest remains draft."""
+
+
+def queue_refinement(job: Job, model_name: str, language: str, started_at: float) -> None:
+    """Queue refinement of *job*'s session for once the job has finished.
+
+    *started_at* is the time.monotonic() value at which the pipeline began;
+    it is stored as wall-clock time so time to final survives a restart.
+    """
+    job.follow_up = (
+        REFINE_JOB_KIND,
+        {
+            "model_name": model_name,
+            "language": language,
+            "started_at": time.time() - (time.monotonic() - started_at),
+        },
+        PRIORITY_IDLE,
+    )
+
+
+async def get_refinement_status(session_id: int) -> dict | None:
+    """Progress of the session's latest refinement job, or None if it never had one."""
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            """SELECT id, status, params, checkpoint, error FROM jobs
+               WHERE session_id = ? AND kind = ? ORDER BY id DESC LIMIT 1""",
+            (session_id, REFINE_JOB_KIND),
+        )
+    if not rows:
+        return None
+    params = json.loads(rows[0]["params"] or "{}")
+    checkpoint = json.loads(rows[0]["checkpoint"] or "{}")
+    return {
+        "state": rows[0]["status"],
+        "job_id": rows[0]["id"],
+        "model_name": params.get("model_name"),
+        "windows_done": checkpoint.get("windows_done", 0),
+        "windows_total": checkpoint.get("windows_total", 0),
+        "error": rows[0]["error"],
+    }
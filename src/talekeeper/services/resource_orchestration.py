@@ -1,47 +1,60 @@
-"""Memory management and cleanup between ML pipeline phases."""
+"""Memory management and cleanup between ML pipeline phases.
+
+Each call that uses a model releases it to the residency scheduler when it
+returns, and the scheduler keeps it warm while it fits the memory budget. A
+phase's cleanup therefore only frees caches; pass ``force=True`` to unload
+its model now.
+"""
 
 import gc
 import logging
 
 from talekeeper.services import transcription, diarization, image_generation, llm_client
+from talekeeper.services.model_residency import residency
 
 logger = logging.getLogger(__name__)
 
 
-def cleanup_transcription() -> None:
-    """Unload transcription model and clear MLX cache."""
-    logger.info("Cleaning up transcription resources")
-    transcription.unload_model()
+def _clear_mlx_cache() -> None:
     try:
         import mlx.core
         mlx.core.metal.clear_cache()
     except Exception:
         pass
+
+
+def cleanup_transcription(force: bool = False) -> None:
+    """Clear MLX's buffer cache, unloading the transcription model if forced."""
+    logger.info("Cleaning up transcription resources")
+    if force and not residency.evict("transcription"):
+        transcription.unload_model()
+    _clear_mlx_cache()
     gc.collect()
 
 
-def cleanup_diarization() -> None:
-    """Clean up after diarization (no models to unload, just gc)."""
+def cleanup_diarization(force: bool = False) -> None:
+    """Run gc, unloading the speaker embedding model if forced."""
     logger.info("Cleaning up diarization resources")
+    if force and not residency.evict("diarization"):
+        diarization.unload_models()
     gc.collect()
 
 
-async def cleanup_llm(base_url: str, api_key: str | None, model: str) -> None:
-    """Unload LLM from Ollama (no-op for non-Ollama providers)."""
+async def cleanup_llm(base_url: str, api_key: str | None, model: str, force: bool = False) -> None:
+    """Run gc; a forced cleanup unloads the LLM from Ollama (no-op for other providers)."""
     logger.info("Cleaning up LLM resources")
-    await llm_client.unload_model(base_url, api_key, model)
+    if force:
+        residency.evict("llm")
+        await llm_client.unload_model(base_url, api_key, model)
     gc.collect()
 
 
-def cleanup_image_generation() -> None:
-    """Unload image generation model and clear MLX cache."""
+def cleanup_image_generation(force: bool = False) -> None:
+    """Clear MLX's buffer cache, unloading the image generation model if forced."""
     logger.info("Cleaning up image generation resources")
-    image_generation.unload_model()
-    try:
-        import mlx.core
-        mlx.core.metal.clear_cache()
-    except Exception:
-        pass
+    if force and not residency.evict("image_generation"):
+        image_generation.unload_model()
+    _clear_mlx_cache()
     gc.collect()
 
 
@@ -50,9 +63,9 @@ async def cleanup_all(
     llm_api_key: str | None = None,
     llm_model: str | None = None,
 ) -> None:
-    """Run all cleanup functions."""
-    cleanup_transcription()
-    cleanup_diarization()
+    """Unload every model, regardless of the memory budget."""
+    cleanup_transcription(force=True)
+    cleanup_diarization(force=True)
     if llm_base_url and llm_model:
-        await cleanup_llm(llm_base_url, llm_api_key, llm_model)
-    cleanup_image_generation()
+        await cleanup_llm(llm_base_url, llm_api_key, llm_model, force=True)
+    cleanup_image_generation(force=True)
@@ -5,7 +5,7 @@ import re
 
 from talekeeper.db import get_db
 from talekeeper.services import llm_client
-from talekeeper.services.summarization import format_transcript
+from talekeeper.services.transcript_compaction import compact_transcript
 
 logger = logging.getLogger(__name__)
 
@@ -150,7 +150,7 @@ async def maybe_generate_and_update_name(session_id: int) -> None:
         if summary_text:
             title = await generate_session_name(summary_text, from_summary=True)
         else:
-            transcript_text = format_transcript([dict(s) for s in segments])
+            transcript_text = await compact_transcript([dict(s) for s in segments], session_id)
             title = await generate_session_name(transcript_text)
 
         if not title:
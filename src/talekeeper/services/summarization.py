@@ -1,82 +1,419 @@
-"""Summary generation service using OpenAI-compatible LLM provider."""
-
-from talekeeper.services import llm_client
-
-FULL_SUMMARY_SYSTEM = """You are a summarizer for tabletop RPG session transcripts.
-Your job is to summarize ONLY what is actually said in the transcript.
-Do NOT invent, fabricate, or hallucinate any content that is not in the transcript.
-Do NOT create fictional characters, events, or plot points.
-If the transcript contains no meaningful RPG content, say so plainly.
-Use third person, past tense. Be specific about names and events mentioned in the transcript.
-Output ONLY the summary text itself. Do NOT include any preamble, introduction, or meta-commentary
-such as "Here is the summary" or "Based on the transcript". Just write the narrative directly.
-Write the story from an in-world perspective. Do not reference the game mechanics, the DM,
-dice rolls, or out-of-character table talk. Treat everything as events that happened in the world.
-IMPORTANT: Write the summary in the same language as the transcript. If the transcript is in
-Hebrew, write in Hebrew. If in English, write in English. Match the language of the source material."""
-
-FULL_SUMMARY_PROMPT = """Summarize the following session transcript into a narrative recap.
-IMPORTANT: Only include information that is actually present in the transcript below.
-Do NOT make up any names, events, or details that are not in the transcript.
+"""Summary generation service using OpenAI-compatible LLM provider.
+
+Summaries are produced map-reduce style. The map phase is one structured
+notes pass per transcript chunk: events, decisions, and what each character
+did and said. The full recap and every POV journal are then reduced from
+those notes, so the transcript is sent to the LLM once, however many
+characters there are. Their prompts share one system prompt and open with
+the same notes, so a server that caches prompt prefixes (Ollama, llama.cpp)
+reads the notes once per session. Notes of a session are stored in
+``summary_notes`` with a hash of their input and reused while that input is
+unchanged.
+
+Chunks are whole speaker turns packed up to the model's context window,
+measured with ``token_counting`` estimates. Once a chunk is mostly full it
+ends at the next "anchor" turn, picked by a hash of the turn's timestamp,
+so editing, reassigning or merging speakers moves only the chunk boundaries
+near the edit. Stored notes also record where their chunk ended, and the
+next run ends chunks there again, so a recalibrated token estimate only
+splits the chunks that no longer fit. Regenerating after an edit re-sends
+only the chunks whose text changed, plus the reduce step.
+
+Chunk notes and the POV journals of different characters are requested
+concurrently. ``llm_client`` caps how many requests reach one provider at a
+time; results are always combined in chunk and speaker order.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import zlib
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator, Collection
+
+from talekeeper.db import get_db
+from talekeeper.services import llm_client, token_counting
+from talekeeper.services.async_utils import gather_ordered
+
+logger = logging.getLogger(__name__)
+
+# Shared by the full recap and the POV journals; only their closing instructions differ
+SUMMARY_SYSTEM = """You write recaps of tabletop RPG sessions from notes taken, section by section,
+on the session transcript.
+Only include what is actually present in the notes. Do NOT invent, fabricate, or hallucinate
+any names, events, or details, and do NOT create fictional characters or plot points.
+If the notes contain no meaningful RPG content, say so plainly.
 Always refer to characters by their character names, never by player names.
-If the transcript is empty, repetitive, or contains no meaningful content, state that clearly.
+Output ONLY the text you are asked for. Do NOT include any preamble, introduction, or
+meta-commentary such as "Here is the summary" or "Based on the notes".
+Write from an in-world perspective. Do not reference the game mechanics, the DM, dice rolls,
+or out-of-character table talk. Treat everything as events that happened in the world.
+IMPORTANT: Write in the same language as the notes. If the notes are in Hebrew, write in
+Hebrew. If in English, write in English. Match the language of the source material."""
 
-TRANSCRIPT:
-{transcript}
+SESSION_NOTES_PREFIX = """SESSION NOTES:
+{notes}
 
-Write a summary based strictly on the transcript above."""
+"""
 
-POV_SUMMARY_SYSTEM = """You are writing a personal journal entry from the perspective of a
-specific character in a tabletop RPG session. Focus on what this character experienced,
-learned, decided, and how they interacted with other characters and the world.
-Write in first person as the character.
-IMPORTANT: Only reference events, dialogue, and details that actually appear in the transcript.
-Do NOT invent or fabricate any content.
-Output ONLY the journal entry itself. Do NOT include any preamble, introduction, or meta-commentary
-such as "Here is the recap" or "Based on the transcript". Just write the entry directly.
-Write from an in-world perspective. Do not reference the game mechanics, the DM, dice rolls,
-or out-of-character table talk. Treat everything as events that actually happened to the character.
-IMPORTANT: Write the journal entry in the same language as the transcript. If the transcript is in
-Hebrew, write in Hebrew. If in English, write in English. Match the language of the source material."""
+FULL_SUMMARY_PROMPT = """Write a narrative recap of the session in third person, past tense, based
+strictly on the notes above. Be specific about names and events."""
 
-POV_SUMMARY_PROMPT = """Write a session recap from the perspective of {character_name}.
-Focus on their personal experience of the session.
-IMPORTANT: Only include information actually present in the transcript below.
-Always refer to characters by their character names, never by player names.
-If the transcript has no meaningful content, say so.
+POV_SUMMARY_PROMPT = """Write a personal journal entry about the session, in first person
+as {character_name}, based strictly on the notes above. Focus on what {character_name}
+experienced, learned and decided, and how they interacted with other characters and the world.
+
+NOTES ABOUT {character_name}:
+{character_notes}"""
+
+NOTES_SYSTEM = """You take notes on one section of a tabletop RPG session transcript.
+Record ONLY what is actually said in the section. Do NOT invent anything.
+Respond with a single JSON object and nothing else, shaped like:
+{"events": ["..."], "decisions": ["..."], "characters": {"Character Name": ["..."]}}
+- events: what happened in the world, in order, one short sentence each
+- decisions: choices and plans the party made
+- characters: for each character who appears, what they did, said, learned and felt,
+  and how they interacted with the other characters
+Refer to characters by their character names, never by player names.
+Ignore out-of-character table talk, game mechanics, dice rolls, and DM instructions.
+Write the notes in the same language as the transcript."""
+
+NOTES_PROMPT = """Take notes on section {index}/{total} of the session transcript.
+Characters to track: {characters}
 
-TRANSCRIPT:
-{transcript}
+TRANSCRIPT SECTION:
+{chunk}"""
 
-Write a first-person recap as {character_name}, based strictly on the transcript above."""
+# Bump when the notes prompt or format changes so stored notes are redone
+NOTES_VERSION = 1
 
-# Rough token estimation: ~4 chars per token
-CHARS_PER_TOKEN = 4
-MAX_CONTEXT_TOKENS = 6000  # Conservative default for 8B models
+# Latin-script characters per token, for sizing test and benchmark transcripts
+CHARS_PER_TOKEN = int(token_counting.DEFAULT_CHARS_PER_TOKEN)
+MAX_CONTEXT_TOKENS = 6000  # Chunk size when the model's context is not known
 CHUNK_OVERLAP_TOKENS = 500
+# Room left in the context for the notes the model writes back
+NOTES_RESPONSE_TOKENS = 1024
+MIN_CHUNK_TOKENS = 1000
+# Chunks end at an anchor turn once they are this full, or when the next turn does not fit
+MIN_CHUNK_FILL = 0.75
+
+# A formatted transcript turn starts with "[hh:mm:ss]"
+_TURN_START = re.compile(r"^\[\d{2}:\d{2}:\d{2}\]")
+
+
+def _transcript_turns(transcript: str) -> list[str]:
+    """Split a formatted transcript into speaker turns; continuation lines stay with their turn."""
+    turns: list[str] = []
+    for line in transcript.split("\n"):
+        if turns and not _TURN_START.match(line):
+            turns[-1] += "\n" + line
+        else:
+            turns.append(line)
+    return turns
+
+
+def _anchor_every(sizes: list[int], max_tokens: int) -> int:
+    """One turn in how many is an anchor: about two anchors past each chunk's minimum fill.
+
+    A power of two, so it does not change with small edits to the turn sizes
+    and the anchors of a larger spacing are a subset of a smaller one's.
+    """
+    mean_turn = sum(sizes) / len(sizes)
+    every = max_tokens * (1 - MIN_CHUNK_FILL) / 2 / mean_turn
+    return 1 << max(0, int(every).bit_length() - 1)
+
+
+def _stamp(turn: str) -> str | None:
+    match = _TURN_START.match(turn)
+    return match.group() if match else None
+
+
+def _is_anchor(turn: str, every: int) -> bool:
+    """Whether a chunk may end after *turn*.
+
+    Decided by the turn's timestamp alone, which text edits and speaker
+    changes leave alone, so boundaries do not drift with the chunk contents.
+    """
+    stamp = _stamp(turn)
+    return stamp is not None and zlib.crc32(stamp.encode()) % every == 0
+
+
+def _split_oversized(turn: str, max_tokens: int, tokens: int) -> list[str]:
+    """Break a turn of *tokens* tokens that exceeds a whole chunk, at word boundaries if it has any."""
+    max_chars = max(1, len(turn) * max_tokens // tokens)
+    pieces: list[str] = []
+    while len(turn) > max_chars:
+        cut = turn.rfind(" ", 0, max_chars + 1)
+        cut = cut + 1 if cut > 0 else max_chars
+        pieces.append(turn[:cut])
+        turn = turn[cut:]
+    return pieces + [turn] if turn else pieces
+
+
+def _chunk_transcript(
+    transcript: str,
+    max_tokens: int = MAX_CONTEXT_TOKENS,
+    model: str | None = None,
+) -> list[str]:
+    """Pack whole speaker turns into chunks of at most *max_tokens* tokens.
+
+    Chunks break only between ``[hh:mm:ss] Speaker:`` turns, at the first
+    anchor turn (see ``_is_anchor``) after ``MIN_CHUNK_FILL`` of the chunk,
+    and repeat up to ``CHUNK_OVERLAP_TOKENS`` of the previous chunk's last
+    turns for context. Tokens are estimated for *model* (see
+    ``token_counting``).
+    """
+    return _chunk_turns(transcript, max_tokens, model)[0]
+
+
+def _chunk_turns(
+    transcript: str,
+    max_tokens: int,
+    model: str | None = None,
+    breaks: Collection[str] = (),
+) -> tuple[list[str], list[str | None]]:
+    """``_chunk_transcript``, also returning the timestamp of each chunk's last turn.
+
+    Where chunks end is decided with uncalibrated token estimates, so it
+    does not move when ``token_counting`` recalibrates *model*; the
+    calibrated estimate only caps how much a chunk holds. *breaks* are the
+    end timestamps of a previous run's chunks: a chunk ends at one whenever
+    it reaches it, and anchors only apply past the last one, so a chunk
+    that had to be split does not shift the chunks after it. The last
+    chunk's end is None, since it is not a boundary.
+    """
+    def fits(text: str) -> bool:
+        return max(token_counting.estimate_tokens(text), token_counting.estimate_tokens(text, model)) <= max_tokens
+
+    stamps = [_stamp(turn) for turn in _transcript_turns(transcript)]
+    if fits(transcript) and not any(stamp in breaks for stamp in stamps):
+        return [transcript], [None]
+
+    turns = []
+    for turn in _transcript_turns(transcript):
+        tokens = max(token_counting.estimate_tokens(turn), token_counting.estimate_tokens(turn, model))
+        turns.extend(_split_oversized(turn, max_tokens, tokens) if tokens > max_tokens else [turn])
+    # +1 for the joining newline
+    sizes = [token_counting.estimate_tokens(turn) + 1 for turn in turns]
+    calibrated = [token_counting.estimate_tokens(turn, model) + 1 for turn in turns]
+    every = _anchor_every(sizes, max_tokens)
+    anchors = [_is_anchor(turn, every) for turn in turns]
+    is_break = [_stamp(turn) in breaks for turn in turns]
+    last_break = max((i for i, b in enumerate(is_break) if b), default=-1)
+    min_fill = int(max_tokens * MIN_CHUNK_FILL)
+
+    chunks: list[str] = []
+    ends: list[str | None] = []
+    start = fresh = 0
+    while start < len(turns):
+        end, used, used_calibrated = start, 0, 0
+        while end < len(turns) and (end == start or (
+            used + sizes[end] <= max_tokens and used_calibrated + calibrated[end] <= max_tokens
+        )):
+            used += sizes[end]
+            used_calibrated += calibrated[end]
+            end += 1
+            # Turns carried over from the previous chunk never end this one
+            if end <= fresh:
+                continue
+            if is_break[end - 1] or (end - 1 > last_break and used >= min_fill and anchors[end - 1]):
+                break
+        chunks.append("\n".join(turns[start:end]))
+        if end == len(turns):
+            ends.append(None)
+            break
+        ends.append(_stamp(turns[end - 1]))
+        # Carry trailing turns into the next chunk, always moving forward
+        overlap_start, overlap = end, 0
+        while overlap_start - 1 > start and overlap + sizes[overlap_start - 1] <= CHUNK_OVERLAP_TOKENS:
+            overlap_start -= 1
+            overlap += sizes[overlap_start]
+        start, fresh = overlap_start, end
+
+    return chunks, ends
+
+
+async def _notes_chunk_tokens(base_url: str, model: str, character_names: list[str]) -> int:
+    """How much transcript fits in one notes request to *model*."""
+    context = await llm_client.context_window(base_url, model)
+    # Uncalibrated, so the chunk size does not move with calibration; the response room absorbs the error
+    overhead = token_counting.estimate_tokens(NOTES_SYSTEM + NOTES_PROMPT + ", ".join(character_names))
+    return max(MIN_CHUNK_TOKENS, context - overhead - NOTES_RESPONSE_TOKENS)
+
+
+@dataclass
+class ChunkNotes:
+    """Structured notes on one transcript chunk (the map phase output)."""
+
+    events: list[str] = field(default_factory=list)
+    decisions: list[str] = field(default_factory=list)
+    characters: dict[str, list[str]] = field(default_factory=dict)
+
+    @classmethod
+    def parse(cls, response: str) -> "ChunkNotes":
+        """Read the model's JSON notes; output that is not JSON is kept as a single event."""
+        text = response.strip()
+        start, end = text.find("{"), text.rfind("}")
+        try:
+            data = json.loads(text[start:end + 1]) if start != -1 and end > start else None
+        except json.JSONDecodeError:
+            data = None
+        if not isinstance(data, dict):
+            logger.warning("Chunk notes were not valid JSON; keeping them as plain text")
+            return cls(events=[text] if text else [])
+
+        def _strings(value) -> list[str]:
+            if isinstance(value, str):
+                value = [value]
+            return [str(v).strip() for v in value or [] if str(v).strip()] if isinstance(value, list) else []
+
+        characters = data.get("characters")
+        return cls(
+            events=_strings(data.get("events")),
+            decisions=_strings(data.get("decisions")),
+            characters={
+                str(name): _strings(notes)
+                for name, notes in (characters.items() if isinstance(characters, dict) else [])
+                if _strings(notes)
+            },
+        )
 
+    def character_notes(self, character_name: str) -> list[str]:
+        """This character's own notes plus other characters' notes that mention them."""
+        wanted = character_name.casefold()
+        own = [
+            note for name, notes in self.characters.items()
+            if name.casefold() == wanted for note in notes
+        ]
+        mentioned = [
+            f"{name}: {note}" for name, notes in self.characters.items()
+            if name.casefold() != wanted for note in notes if wanted in note.casefold()
+        ]
+        return own + mentioned
+
+
+def _format_notes(notes: list[ChunkNotes]) -> str:
+    """Render chunk notes as text for the reduce prompts."""
+    sections = []
+    for i, chunk in enumerate(notes, start=1):
+        lines = [f"Section {i}/{len(notes)}"]
+        lines += [f"- Event: {e}" for e in chunk.events]
+        lines += [f"- Decision: {d}" for d in chunk.decisions]
+        lines += [
+            f"- {name}: {note}" for name, entries in chunk.characters.items() for note in entries
+        ]
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections)
+
+
+def _full_summary_prompt(notes: list[ChunkNotes]) -> str:
+    return SESSION_NOTES_PREFIX.format(notes=_format_notes(notes)) + FULL_SUMMARY_PROMPT
+
+
+def _pov_summary_prompt(notes: list[ChunkNotes], character_name: str) -> str:
+    """The shared notes prefix, then the journal instructions with this character's notes."""
+    character_notes = [
+        f"- {note}" for chunk in notes for note in chunk.character_notes(character_name)
+    ]
+    return SESSION_NOTES_PREFIX.format(notes=_format_notes(notes)) + POV_SUMMARY_PROMPT.format(
+        character_name=character_name,
+        character_notes="\n".join(character_notes) or "(none)",
+    )
 
-def _estimate_tokens(text: str) -> int:
-    return len(text) // CHARS_PER_TOKEN
 
+def _notes_hash(chunk: str, character_names: list[str], model: str) -> str:
+    key = json.dumps([NOTES_VERSION, model, sorted(character_names), chunk])
+    return hashlib.sha256(key.encode()).hexdigest()
 
-def _chunk_transcript(transcript: str, max_tokens: int = MAX_CONTEXT_TOKENS) -> list[str]:
-    """Split transcript into overlapping chunks that fit the context window."""
-    chunk_size = max_tokens * CHARS_PER_TOKEN
-    overlap_size = CHUNK_OVERLAP_TOKENS * CHARS_PER_TOKEN
 
-    if len(transcript) <= chunk_size:
-        return [transcript]
+async def _load_stored_notes(session_id: int) -> dict[str, ChunkNotes]:
+    """Stored notes of a session by input hash, wherever their chunk now sits."""
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT input_hash, notes FROM summary_notes WHERE session_id = ?",
+            (session_id,),
+        )
+    return {r["input_hash"]: ChunkNotes(**json.loads(r["notes"])) for r in rows}
 
-    chunks = []
-    start = 0
-    while start < len(transcript):
-        end = start + chunk_size
-        chunk = transcript[start:end]
-        chunks.append(chunk)
-        start = end - overlap_size
 
-    return chunks
+async def _load_chunk_breaks(session_id: int, model: str) -> set[str]:
+    """Where the session's chunks for *model* ended last time (see ``_chunk_turns``)."""
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            """SELECT end_stamp FROM summary_notes
+               WHERE session_id = ? AND model = ? AND end_stamp IS NOT NULL""",
+            (session_id, model),
+        )
+    return {r["end_stamp"] for r in rows}
+
+
+async def _store_notes(
+    session_id: int,
+    hashes: list[str],
+    notes: list[ChunkNotes],
+    ends: list[str | None],
+    model: str,
+) -> None:
+    async with get_db() as db:
+        await db.executemany(
+            """INSERT INTO summary_notes (session_id, chunk_index, input_hash, model, notes, end_stamp)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT (session_id, chunk_index) DO UPDATE SET
+                 input_hash = excluded.input_hash, model = excluded.model,
+                 notes = excluded.notes, end_stamp = excluded.end_stamp,
+                 created_at = datetime('now')""",
+            [
+                (session_id, index, input_hash, model, json.dumps(asdict(chunk_notes)), end)
+                for index, (input_hash, chunk_notes, end) in enumerate(zip(hashes, notes, ends))
+            ],
+        )
+        await db.execute(
+            "DELETE FROM summary_notes WHERE session_id = ? AND chunk_index >= ?",
+            (session_id, len(hashes)),
+        )
+
+
+async def extract_notes(
+    transcript_text: str,
+    character_names: list[str],
+    base_url: str,
+    api_key: str | None,
+    model: str,
+    session_id: int | None = None,
+) -> list[ChunkNotes]:
+    """Run the notes pass over every chunk of a transcript, concurrently.
+
+    With a *session_id* the notes are stored, and chunks whose text,
+    character list and model are unchanged since the last run are not sent
+    to the LLM again, even if edits earlier in the transcript moved them.
+    Chunks end where they ended last time unless they no longer fit.
+    """
+    max_tokens = await _notes_chunk_tokens(base_url, model, character_names)
+    breaks = await _load_chunk_breaks(session_id, model) if session_id is not None else set()
+    chunks, ends = _chunk_turns(transcript_text, max_tokens, model, breaks)
+    hashes = [_notes_hash(chunk, character_names, model) for chunk in chunks]
+    stored = await _load_stored_notes(session_id) if session_id is not None else {}
+
+    pending = [i for i, h in enumerate(hashes) if h not in stored]
+    if session_id is not None:
+        logger.info(
+            "Session %d notes: %d of %d chunks changed", session_id, len(pending), len(chunks)
+        )
+    characters = ", ".join(character_names) or "everyone who appears"
+    responses = await gather_ordered([
+        llm_client.generate(
+            base_url, api_key, model,
+            NOTES_PROMPT.format(index=i + 1, total=len(chunks), characters=characters, chunk=chunks[i]),
+            system=NOTES_SYSTEM,
+        )
+        for i in pending
+    ])
+    fresh = {i: ChunkNotes.parse(r) for i, r in zip(pending, responses)}
+    notes = [fresh[i] if i in fresh else stored[h] for i, h in enumerate(hashes)]
+    if session_id is not None:
+        await _store_notes(session_id, hashes, notes, ends, model)
+    return notes
 
 
 def format_transcript(segments: list[dict]) -> str:
@@ -91,7 +428,7 @@ def format_transcript(segments: list[dict]) -> str:
         elif seg.get("diarization_label"):
             speaker = seg["diarization_label"]
 
-        time_str = _format_time(seg["start_time"])
+        time_str = format_time(seg["start_time"])
         if speaker:
             lines.append(f"[{time_str}] {speaker}: {seg['text']}")
         else:
@@ -99,7 +436,8 @@ def format_transcript(segments: list[dict]) -> str:
     return "\n".join(lines)
 
 
-def _format_time(seconds: float) -> str:
+def format_time(seconds: float) -> str:
+    """Format seconds as ``hh:mm:ss``, the timestamp used in transcripts."""
     h = int(seconds // 3600)
     m = int((seconds % 3600) // 60)
     s = int(seconds % 60)
@@ -111,25 +449,25 @@ async def generate_full_summary(
     base_url: str,
     api_key: str | None,
     model: str,
+    notes: list[ChunkNotes] | None = None,
 ) -> str:
-    """Generate a full session narrative summary."""
-    chunks = _chunk_transcript(transcript_text)
+    """Generate a full session narrative summary, reduced from the chunk notes."""
+    if notes is None:
+        notes = await extract_notes(transcript_text, [], base_url, api_key, model)
+    prompt = _full_summary_prompt(notes)
+    return await llm_client.generate(base_url, api_key, model, prompt, system=SUMMARY_SYSTEM)
 
-    if len(chunks) == 1:
-        prompt = FULL_SUMMARY_PROMPT.format(transcript=transcript_text)
-        return await llm_client.generate(base_url, api_key, model, prompt, system=FULL_SUMMARY_SYSTEM)
 
-    # Chunked summarization
-    chunk_summaries = []
-    for i, chunk in enumerate(chunks):
-        prompt = f"Summarize this section ({i + 1}/{len(chunks)}) of a session transcript. Only include what is actually said:\n\n{chunk}"
-        summary = await llm_client.generate(base_url, api_key, model, prompt, system=FULL_SUMMARY_SYSTEM)
-        chunk_summaries.append(summary)
-
-    # Meta-summary
-    combined = "\n\n---\n\n".join(chunk_summaries)
-    meta_prompt = f"Combine these section summaries into one coherent session recap:\n\n{combined}"
-    return await llm_client.generate(base_url, api_key, model, meta_prompt, system=FULL_SUMMARY_SYSTEM)
+async def stream_full_summary(
+    notes: list[ChunkNotes],
+    base_url: str,
+    api_key: str | None,
+    model: str,
+) -> AsyncIterator[str]:
+    """Stream the full session summary from the chunk notes, piece by piece."""
+    prompt = _full_summary_prompt(notes)
+    async for piece in llm_client.generate_stream(base_url, api_key, model, prompt, system=SUMMARY_SYSTEM):
+        yield piece
 
 
 async def generate_pov_summary(
@@ -138,29 +476,50 @@ async def generate_pov_summary(
     base_url: str,
     api_key: str | None,
     model: str,
+    notes: list[ChunkNotes] | None = None,
 ) -> str:
-    """Generate a POV summary from a specific character's perspective."""
-    chunks = _chunk_transcript(transcript_text)
+    """Generate a POV summary from a specific character's perspective, reduced from the chunk notes."""
+    if notes is None:
+        notes = await extract_notes(transcript_text, [character_name], base_url, api_key, model)
+    prompt = _pov_summary_prompt(notes, character_name)
+    return await llm_client.generate(base_url, api_key, model, prompt, system=SUMMARY_SYSTEM)
 
-    if len(chunks) == 1:
-        prompt = POV_SUMMARY_PROMPT.format(
-            transcript=transcript_text,
-            character_name=character_name,
-        )
-        return await llm_client.generate(base_url, api_key, model, prompt, system=POV_SUMMARY_SYSTEM)
 
-    # Chunked POV summarization
-    chunk_summaries = []
-    for i, chunk in enumerate(chunks):
-        prompt = (
-            f"Summarize this section ({i + 1}/{len(chunks)}) from {character_name}'s perspective:\n\n{chunk}"
-        )
-        summary = await llm_client.generate(base_url, api_key, model, prompt, system=POV_SUMMARY_SYSTEM)
-        chunk_summaries.append(summary)
+async def stream_pov_summary(
+    notes: list[ChunkNotes],
+    character_name: str,
+    base_url: str,
+    api_key: str | None,
+    model: str,
+) -> AsyncIterator[str]:
+    """Stream one character's POV summary from the chunk notes, piece by piece."""
+    prompt = _pov_summary_prompt(notes, character_name)
+    async for piece in llm_client.generate_stream(base_url, api_key, model, prompt, system=SUMMARY_SYSTEM):
+        yield piece
 
-    combined = "\n\n---\n\n".join(chunk_summaries)
-    meta_prompt = (
-        f"Combine these section recaps into one coherent first-person session "
-        f"journal entry for {character_name}:\n\n{combined}"
-    )
-    return await llm_client.generate(base_url, api_key, model, meta_prompt, system=POV_SUMMARY_SYSTEM)
+
+async def generate_pov_summaries(
+    transcript_text: str,
+    character_names: list[str],
+    base_url: str,
+    api_key: str | None,
+    model: str,
+    notes: list[ChunkNotes] | None = None,
+) -> list[str]:
+    """Generate the POV summaries of several characters concurrently, in the given order.
+
+    The transcript goes through the notes pass once for all of them.
+    """
+    if notes is None:
+        notes = await extract_notes(transcript_text, character_names, base_url, api_key, model)
+    return await gather_ordered([
+        generate_pov_summary(
+            transcript_text,
+            character_name=name,
+            base_url=base_url,
+            api_key=api_key,
+            model=model,
+            notes=notes,
+        )
+        for name in character_names
+    ])
@@ -0,0 +1,106 @@
+"""Drive blocking generators from async code.
+
+Transcription is a synchronous generator (``transcribe_chunked``) that can run
+for hours. ``iterate_in_thread`` runs it in a worker thread and hands its
+items to the event loop:
+
+- **Backpressure**: at most ``max_buffered`` items wait in the queue; when
+  the consumer falls behind (slow SSE client, slow DB writes) the worker
+  blocks instead of transcribing ahead into memory.
+- **Errors**: an exception raised by the generator is re-raised in the
+  consumer, with its original traceback.
+- **Cancellation**: when the consumer stops early (SSE client disconnected,
+  job preempted or cancelled), the worker stops at the next item, the
+  generator is closed so its cleanup runs, and ``on_cancel`` is called once
+  the thread has let go, typically to release the model.
+- **Context**: the worker runs in a copy of the caller's ``contextvars``
+  context (as ``asyncio.to_thread`` does), so context-scoped state such as
+  the job's cancel token or an LLM cache bypass is seen by the generator.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+from typing import AsyncIterator, Callable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_BUFFERED = 8
+# How often a blocked worker checks whether the consumer has gone away
+_POLL_SECONDS = 0.1
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+async def iterate_in_thread(
+    gen: Iterator[T],
+    max_buffered: int = DEFAULT_MAX_BUFFERED,
+    on_cancel: Callable[[], None] | None = None,
+) -> AsyncIterator[T]:
+    """Iterate a blocking generator in a worker thread, yielding its items asynchronously."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    slots = threading.Semaphore(max(1, max_buffered))
+    stop = threading.Event()
+
+    def _emit(item: object) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # The event loop is gone; nobody is left to consume
+            stop.set()
+
+    def _produce() -> None:
+        try:
+            for item in gen:
+                while not slots.acquire(timeout=_POLL_SECONDS):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                _emit(item)
+            _emit(_DONE)
+        except BaseException as exc:
+            _emit(_Failure(exc))
+        finally:
+            close = getattr(gen, "close", None)
+            if close is not None:
+                close()
+
+    worker = loop.run_in_executor(None, contextvars.copy_context().run, _produce)
+    finished = False
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                finished = True
+                break
+            if isinstance(item, _Failure):
+                finished = True
+                raise item.exc
+            slots.release()
+            yield item
+    finally:
+        stop.set()
+        cancelled = False
+        try:
+            # The thread stops at its next item; wait so nothing is still using the model
+            await asyncio.shield(worker)
+        except asyncio.CancelledError:
+            cancelled = True
+        except Exception:
+            logger.debug("Worker thread failed while stopping", exc_info=True)
+        if not finished and worker.done():
+            logger.info("Consumer went away; stopped the worker thread")
+            if on_cancel is not None:
+                on_cancel()
+        if cancelled:
+            raise asyncio.CancelledError
@@ -0,0 +1,63 @@
+"""Token estimates for sizing LLM prompts.
+
+Local providers do not expose their tokenizer, so text is measured with a
+per-script characters-per-token estimate: English and other Latin-script
+text averages about four characters per token, while Hebrew, Arabic or
+Cyrillic text takes two to three times as many tokens per character.
+
+Every completion reports how many prompt tokens the provider actually
+counted. ``llm_client`` feeds that back through ``calibrate()``, and later
+estimates for the same model are scaled by the observed ratio.
+"""
+
+import re
+
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+# Characters per token for scripts that tokenize much denser than Latin text
+_SCRIPT_CHARS_PER_TOKEN: list[tuple[re.Pattern, float]] = [
+    (re.compile(r"[\u0590-\u05ff\ufb1d-\ufb4f]+"), 2.0),  # Hebrew
+    (re.compile(r"[\u0600-\u06ff\u0750-\u077f]+"), 2.0),  # Arabic
+    (re.compile(r"[\u0370-\u03ff\u0400-\u04ff]+"), 2.5),  # Greek, Cyrillic
+    (re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]+"), 1.0),  # CJK, kana, hangul
+]
+
+# Prompts shorter than this are dominated by the chat template, not the text
+_MIN_CALIBRATION_TOKENS = 200
+_CALIBRATION_WEIGHT = 0.3
+_SCALE_LIMITS = (0.5, 2.0)
+# Estimates use the scale rounded to this step, so chunk boundaries do not
+# shift (and invalidate stored chunk notes) with every calibration update
+_SCALE_STEP = 0.25
+
+# Observed provider tokens / estimated tokens, per model
+_scales: dict[str, float] = {}
+
+
+def _raw_estimate(text: str) -> float:
+    remaining = len(text)
+    tokens = 0.0
+    for pattern, chars_per_token in _SCRIPT_CHARS_PER_TOKEN:
+        count = sum(len(run) for run in pattern.findall(text))
+        tokens += count / chars_per_token
+        remaining -= count
+    return tokens + remaining / DEFAULT_CHARS_PER_TOKEN
+
+
+def estimate_tokens(text: str, model: str | None = None) -> int:
+    """Estimated token count of *text*, calibrated for *model* when known."""
+    scale = _scales.get(model, 1.0) if model else 1.0
+    scale = round(scale / _SCALE_STEP) * _SCALE_STEP
+    return int(_raw_estimate(text) * scale + 0.5)
+
+
+def calibrate(model: str, text: str, prompt_tokens: int) -> None:
+    """Fold a provider-reported prompt token count into the estimate for *model*."""
+    estimated = _raw_estimate(text)
+    if estimated < _MIN_CALIBRATION_TOKENS or prompt_tokens <= 0:
+        return
+    observed = min(max(prompt_tokens / estimated, _SCALE_LIMITS[0]), _SCALE_LIMITS[1])
+    previous = _scales.get(model)
+    _scales[model] = observed if previous is None else (
+        previous + _CALIBRATION_WEIGHT * (observed - previous)
+    )
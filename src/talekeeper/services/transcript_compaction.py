@@ -0,0 +1,136 @@
+"""Compact transcripts before they are sent to the LLM.
+
+``format_transcript`` writes one ``[hh:mm:ss] Speaker: text`` line per
+Whisper segment, so a speaker talking for a minute repeats their name and a
+timestamp every few words. The compact form used for summaries, session
+names and scene descriptions:
+
+- merges consecutive segments of the same speaker into one line;
+- writes a timestamp only on the first line of every
+  ``TIMESTAMP_INTERVAL_SECONDS`` window; the windows depend on segment times
+  alone, so speaker edits do not move them (summary chunks break at
+  timestamped lines);
+- optionally drops filler words ("um", "uh"), stuttered fragments ("I I I",
+  "th- the") and non-speech annotations such as ``[crosstalk]`` or ``(laughs)``. This
+  is on unless the ``transcript_strip_fillers`` setting (then
+  ``TALEKEEPER_TRANSCRIPT_STRIP_FILLERS``) turns it off. Repeated whole
+  words ("no no no", "very very", "had had") are speech, not stutters, and
+  are kept.
+
+Every compaction is logged and counted in ``llm_metrics`` with its estimated
+token counts before and after.
+"""
+
+import logging
+import os
+import re
+from dataclasses import dataclass
+
+from talekeeper.db import get_db
+from talekeeper.services import llm_metrics, token_counting
+from talekeeper.services.summarization import format_time, format_transcript
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_INTERVAL_SECONDS = 60
+
+_FALSE_VALUES = ("0", "false", "no", "off")
+
+# Whisper's markers for sounds and overlapping speech: [crosstalk], (laughs), *sighs*
+_ANNOTATION = re.compile(r"\[[^\[\]]{1,40}\]|\([^()]{1,40}\)|\*[^*]{1,40}\*")
+_FILLER = re.compile(r"(?<![\w-])(?:u+m+|u+h+|e+r+m+|e+r+|h+m+|m+h?m+)(?![\w-])[,.]?", re.IGNORECASE)
+# Stutters: a repeated single letter ("I I I") or a cut-off start of the next word ("th- the")
+_LETTER_STUTTER = re.compile(r"(?<![\w-])([^\W\d_])(?:[\s,]+\1)+(?![\w-])", re.IGNORECASE)
+_FRAGMENT_STUTTER = re.compile(r"(?<![\w-])([^\W\d_]{1,3})-\s+(?:\1-\s+)*(?=\1)", re.IGNORECASE)
+_SPACES = re.compile(r"\s{2,}")
+_SPACE_BEFORE_PUNCTUATION = re.compile(r"\s+([,.!?;:])")
+
+
+@dataclass
+class CompactTranscript:
+    text: str
+    original_tokens: int
+    tokens: int
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of the formatted transcript's tokens saved."""
+        return 1 - self.tokens / self.original_tokens if self.original_tokens else 0.0
+
+
+def _speaker(segment: dict) -> str:
+    return segment.get("character_name") or segment.get("player_name") or segment.get("diarization_label") or ""
+
+
+def _strip_disfluencies(text: str) -> str:
+    text = _ANNOTATION.sub(" ", text)
+    text = _FILLER.sub(" ", text)
+    text = _LETTER_STUTTER.sub(r"\1", text)
+    text = _FRAGMENT_STUTTER.sub("", text)
+    text = _SPACE_BEFORE_PUNCTUATION.sub(r"\1", text)
+    text = _SPACES.sub(" ", text).strip(" ,")
+    # Nothing but punctuation left, e.g. "Um..."
+    return text if any(c.isalnum() for c in text) else ""
+
+
+def compact(
+    segments: list[dict],
+    strip_fillers: bool = True,
+    interval: float = TIMESTAMP_INTERVAL_SECONDS,
+) -> CompactTranscript:
+    """Compact transcript segments (as passed to ``format_transcript``)."""
+    lines: list[str] = []
+    current_speaker: str | None = None
+    last_window: int | None = None
+    for seg in segments:
+        text = seg["text"].strip()
+        if strip_fillers:
+            text = _strip_disfluencies(text)
+        if not text:
+            continue
+        speaker = _speaker(seg)
+        window = int(seg["start_time"] // interval)
+        if window != last_window:
+            last_window = window
+            prefix = f"[{format_time(seg['start_time'])}] " + (f"{speaker}: " if speaker else "")
+            lines.append(prefix + text)
+        elif speaker != current_speaker:
+            lines.append(f"{speaker}: {text}" if speaker else text)
+        else:
+            lines[-1] += " " + text
+        current_speaker = speaker
+
+    text = "\n".join(lines)
+    return CompactTranscript(
+        text=text,
+        original_tokens=token_counting.estimate_tokens(format_transcript(segments)),
+        tokens=token_counting.estimate_tokens(text),
+    )
+
+
+async def _strip_fillers_enabled() -> bool:
+    """Resolve the filler stripping option: settings table > env var > on."""
+    value = None
+    try:
+        async with get_db() as db:
+            rows = await db.execute_fetchall(
+                "SELECT value FROM settings WHERE key = 'transcript_strip_fillers'"
+            )
+            if rows and rows[0]["value"]:
+                value = rows[0]["value"]
+    except Exception:
+        pass
+    value = value or os.environ.get("TALEKEEPER_TRANSCRIPT_STRIP_FILLERS") or ""
+    return value.strip().lower() not in _FALSE_VALUES
+
+
+async def compact_transcript(segments: list[dict], session_id: int | None = None) -> str:
+    """Compact a session's transcript for an LLM prompt and report the saving."""
+    result = compact(segments, strip_fillers=await _strip_fillers_enabled())
+    llm_metrics.record_compaction(result.original_tokens, result.tokens)
+    logger.info(
+        "Compacted transcript%s: %d -> %d tokens (%.0f%% fewer)",
+        f" of session {session_id}" if session_id is not None else "",
+        result.original_tokens, result.tokens, result.reduction * 100,
+    )
+    return result.text
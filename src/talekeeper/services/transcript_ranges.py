@@ -0,0 +1,119 @@
+"""Range-scoped transcript replacement.
+
+Swaps the transcript segments inside one time window for freshly
+transcribed ones, leaving the rest of the session untouched. Speakers for
+the new segments are taken from the segments they replace, so no
+re-diarization of the whole recording is needed.
+"""
+
+from talekeeper.db import get_db
+from talekeeper.services.diarization import SpeakerSegment, align_speakers_with_transcript
+from talekeeper.services.transcription import TranscriptSegment
+
+CROSSTALK_LABEL = "[crosstalk]"
+
+
+async def expand_range_to_segments(
+    session_id: int, start_time: float, end_time: float
+) -> tuple[float, float]:
+    """Widen [start_time, end_time) so it fully covers every segment it touches.
+
+    Segments partly inside the window are replaced as a whole, so their text
+    outside the window has to be re-transcribed too.
+    """
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            """SELECT MIN(start_time) AS first_start, MAX(end_time) AS last_end
+               FROM transcript_segments
+               WHERE session_id = ? AND start_time < ? AND end_time > ?""",
+            (session_id, end_time, start_time),
+        )
+    if rows and rows[0]["first_start"] is not None:
+        start_time = min(start_time, rows[0]["first_start"])
+        end_time = max(end_time, rows[0]["last_end"])
+    return start_time, end_time
+
+
+async def replace_transcript_range(
+    session_id: int,
+    start_time: float,
+    end_time: float,
+    segments: list[TranscriptSegment],
+    model_name: str | None = None,
+) -> dict:
+    """Replace all transcript segments overlapping [start_time, end_time).
+
+    The visible segments being replaced act as the speaker timeline for the
+    new ones: each new segment gets the speaker it overlaps most, or is
+    flagged as crosstalk if that stretch was crosstalk. New segments get a
+    revision one higher than the highest revision they replace.
+
+    Returns a dict with ``replaced``, ``inserted`` and ``revision``.
+    """
+    async with get_db() as db:
+        old_rows = await db.execute_fetchall(
+            """SELECT ts.id, ts.speaker_id, ts.start_time, ts.end_time, ts.is_overlap, ts.revision
+               FROM transcript_segments ts
+               WHERE ts.session_id = ? AND ts.start_time < ? AND ts.end_time > ?
+                 AND (
+                   ts.parent_segment_id IS NOT NULL
+                   OR NOT EXISTS (
+                     SELECT 1 FROM transcript_segments c
+                     WHERE c.parent_segment_id = ts.id
+                   )
+                 )""",
+            (session_id, end_time, start_time),
+        )
+
+        speaker_timeline = []
+        for row in old_rows:
+            if row["is_overlap"]:
+                label = CROSSTALK_LABEL
+            elif row["speaker_id"] is not None:
+                label = str(row["speaker_id"])
+            else:
+                continue
+            speaker_timeline.append(SpeakerSegment(
+                speaker_label=label,
+                start_time=row["start_time"],
+                end_time=row["end_time"],
+            ))
+
+        revision = max((row["revision"] for row in old_rows), default=-1) + 1
+
+        aligned = align_speakers_with_transcript(
+            speaker_timeline,
+            [
+                {"text": s.text, "start_time": s.start_time, "end_time": s.end_time}
+                for s in segments
+            ],
+        )
+
+        # Children of split segments are removed via parent_segment_id ON DELETE CASCADE
+        cursor = await db.execute(
+            """DELETE FROM transcript_segments
+               WHERE session_id = ? AND start_time < ? AND end_time > ?""",
+            (session_id, end_time, start_time),
+        )
+        replaced = cursor.rowcount
+
+        await db.executemany(
+            """INSERT INTO transcript_segments
+               (session_id, speaker_id, text, start_time, end_time, is_overlap, revision, model_name)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            [
+                (
+                    session_id,
+                    int(seg["speaker_label"]) if seg.get("speaker_label") else None,
+                    seg["text"],
+                    seg["start_time"],
+                    seg["end_time"],
+                    seg.get("is_overlap", 0),
+                    revision,
+                    model_name,
+                )
+                for seg in aligned
+            ],
+        )
+
+    return {"replaced": replaced, "inserted": len(aligned), "revision": revision}
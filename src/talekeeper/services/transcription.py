@@ -78,13 +78,16 @@ def get_model(model_name: str = DEFAULT_MODEL, batch_size: int = 12):
     """Load and cache the lightning-whisper-mlx model."""
     global _model, _model_name
     from lightning_whisper_mlx import LightningWhisperMLX
+    from talekeeper.services.model_residency import residency
 
     if _model is not None and _model_name == model_name:
+        residency.touch("transcription")
         return _model
 
     logger.info("Loading lightning-whisper-mlx model: %s (batch_size=%d)", model_name, batch_size)
-    _model = LightningWhisperMLX(model=model_name, batch_size=batch_size)
-    _model_name = model_name
+    with residency.loading("transcription", model_name, unload_model):
+        _model = LightningWhisperMLX(model=model_name, batch_size=batch_size)
+        _model_name = model_name
     return _model
 
 
@@ -228,6 +231,10 @@ def transcribe(
         return segments
     finally:
         tmp_path.unlink(missing_ok=True)
+        from talekeeper.services.model_residency import residency
+
+        # get_model() took a reference on the model for this call
+        residency.release("transcription")
 
 
 def transcribe_chunked(
@@ -235,40 +242,34 @@ def transcribe_chunked(
     model_name: str = DEFAULT_MODEL,
     language: str = "en",
     batch_size: int = 12,
+    duration: float | None = None,
+    start_chunk: int = 0,
 ) -> Iterator[Union[TranscriptSegment, ChunkProgress]]:
     """Split a stored audio file into chunks and transcribe each.
 
     Yields ChunkProgress between chunks and TranscriptSegment objects
     with absolute timestamps (adjusted for chunk offsets). Overlapping
     segments are deduplicated using the primary-zone strategy.
+
+    Chunks are planned from *duration* (seconds, usually the value stored at
+    ingest); without it the file's headers are probed. *start_chunk* (0-based)
+    resumes a run whose earlier chunks were already transcribed: each segment
+    belongs to exactly one chunk's primary zone, so nothing is lost or repeated.
     """
-    from pydub import AudioSegment
     from talekeeper.services.audio import (
-        split_audio_to_chunks,
+        audio_duration_ms,
         compute_primary_zone,
-        DEFAULT_CHUNK_DURATION_MS,
-        DEFAULT_OVERLAP_MS,
+        plan_chunks,
+        split_audio_to_chunks,
     )
 
-    # Compute total chunks from audio duration to avoid an extra pass
-    audio = AudioSegment.from_file(str(audio_path))
-    total_ms = len(audio)
-    del audio  # free memory before transcription
+    total_ms = int(duration * 1000) if duration else audio_duration_ms(audio_path)
+    plan = plan_chunks(total_ms)
+    total_chunks = len(plan)
 
-    if total_ms <= DEFAULT_CHUNK_DURATION_MS:
-        total_chunks = 1
-    else:
-        # Simulate the split loop to match split_audio_to_chunks exactly
-        total_chunks = 0
-        start = 0
-        step = DEFAULT_CHUNK_DURATION_MS - DEFAULT_OVERLAP_MS
-        while start < total_ms:
-            total_chunks += 1
-            start += step
-            if start < total_ms and (total_ms - start) < DEFAULT_OVERLAP_MS:
-                break
-
-    for chunk_index, wav_path, start_ms, end_ms in split_audio_to_chunks(audio_path):
+    for chunk_index, wav_path, start_ms, end_ms in split_audio_to_chunks(
+        audio_path, plan=plan, start_index=start_chunk,
+    ):
         yield ChunkProgress(chunk=chunk_index + 1, total_chunks=total_chunks)
 
         offset_sec = start_ms / 1000.0
@@ -287,3 +288,36 @@ def transcribe_chunked(
                     start_time=abs_start,
                     end_time=abs_end,
                 )
+
+
+def transcribe_range(
+    audio_path: Path,
+    start_time: float,
+    end_time: float,
+    model_name: str = DEFAULT_MODEL,
+    language: str = "en",
+    batch_size: int = 12,
+) -> Iterator[Union[TranscriptSegment, ChunkProgress]]:
+    """Transcribe only the [start_time, end_time) window of a stored audio file.
+
+    Yields the same items as transcribe_chunked(), with TranscriptSegment
+    timestamps relative to the start of the full recording.
+    """
+    from talekeeper.services.audio import extract_wav_window
+
+    window_path = extract_wav_window(audio_path, start_time, end_time)
+    try:
+        for item in transcribe_chunked(
+            window_path, model_name=model_name, language=language, batch_size=batch_size,
+            duration=end_time - start_time,
+        ):
+            if isinstance(item, TranscriptSegment):
+                yield TranscriptSegment(
+                    text=item.text,
+                    start_time=item.start_time + start_time,
+                    end_time=item.end_time + start_time,
+                )
+            else:
+                yield item
+    finally:
+        window_path.unlink(missing_ok=True)
@@ -0,0 +1,302 @@
+"""Resumable chunked uploads for large session recordings.
+
+A multi-hour WAV can be several gigabytes, and a single multipart request has
+to start over when the connection drops. Instead a client creates an upload,
+sends the file in chunks tagged with the byte offset they start at, and after
+an interruption asks for the offset the server has and continues from there.
+
+The partial file lives under the campaign's audio directory and the received
+offset in the ``uploads`` table, so an upload survives a server restart. The
+SHA-256 content hash is updated as chunks arrive; after a restart it is rebuilt
+once from the bytes already on disk. A client can send the hash it expects,
+which is verified when the upload completes.
+
+Chunk bytes are buffered into blocks that are written, hashed and fsynced in
+a worker thread, so a multi-GB upload does not block the event loop. Uploads
+left untouched for ``UPLOAD_EXPIRY_HOURS`` are abandoned: their rows and
+partial files are removed at startup and whenever a new upload is created.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator
+
+from talekeeper.db import get_db
+from talekeeper.paths import get_audio_dir, get_campaign_audio_dir
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_TARGETS = ("audio", "part")
+HASH_BLOCK_SIZE = 1024 * 1024
+# Request bytes gathered before each threaded write
+WRITE_BLOCK_SIZE = 4 * 1024 * 1024
+UPLOAD_EXPIRY_HOURS = 24
+
+
+class UploadOffsetError(Exception):
+    """A chunk did not start where the previous one ended."""
+
+    def __init__(self, offset: int) -> None:
+        super().__init__(f"Upload is at offset {offset}")
+        self.offset = offset
+
+
+class UploadIncompleteError(Exception):
+    pass
+
+
+class UploadHashMismatchError(Exception):
+    pass
+
+
+@dataclass
+class Upload:
+    id: str
+    session_id: int
+    target: str  # "audio" replaces the session audio, "part" adds an audio part
+    filename: str
+    content_type: str
+    size: int
+    received: int
+    temp_path: Path
+    expected_hash: str | None
+    status: str
+
+    @property
+    def complete(self) -> bool:
+        return self.received >= self.size
+
+    def to_dict(self) -> dict:
+        return {
+            "upload_id": self.id,
+            "session_id": self.session_id,
+            "target": self.target,
+            "filename": self.filename,
+            "size": self.size,
+            "offset": self.received,
+            "status": self.status,
+        }
+
+
+# In-memory hash state per upload: (hasher, number of bytes it has seen)
+_hashers: dict[str, tuple["hashlib._Hash", int]] = {}
+_locks: dict[str, asyncio.Lock] = {}
+
+
+def _row_to_upload(row) -> Upload:
+    return Upload(
+        id=row["id"],
+        session_id=row["session_id"],
+        target=row["target"],
+        filename=row["filename"],
+        content_type=row["content_type"],
+        size=row["size"],
+        received=row["received"],
+        temp_path=Path(row["temp_path"]),
+        expected_hash=row["expected_hash"],
+        status=row["status"],
+    )
+
+
+async def create_upload(
+    session_id: int,
+    campaign_id: int,
+    target: str,
+    filename: str,
+    content_type: str,
+    size: int,
+    expected_hash: str | None = None,
+) -> Upload:
+    """Register a new upload and create its empty partial file."""
+    if target not in UPLOAD_TARGETS:
+        raise ValueError(f"Unknown upload target: {target}")
+    await expire_stale_uploads()
+    upload_id = uuid.uuid4().hex
+    upload_dir = get_campaign_audio_dir(campaign_id) / "uploads"
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    temp_path = upload_dir / f"{upload_id}.part"
+    temp_path.touch()
+
+    async with get_db() as db:
+        await db.execute(
+            """INSERT INTO uploads
+               (id, session_id, target, filename, content_type, size, temp_path, expected_hash)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                upload_id, session_id, target, filename, content_type, size,
+                str(temp_path), expected_hash.lower() if expected_hash else None,
+            ),
+        )
+    _hashers[upload_id] = (hashlib.sha256(), 0)
+    return await get_upload(upload_id)
+
+
+async def get_upload(upload_id: str) -> Upload | None:
+    async with get_db() as db:
+        rows = await db.execute_fetchall("SELECT * FROM uploads WHERE id = ?", (upload_id,))
+    return _row_to_upload(rows[0]) if rows else None
+
+
+def _hasher_at(upload: Upload) -> "hashlib._Hash":
+    """Hash state covering exactly the bytes received so far."""
+    cached = _hashers.get(upload.id)
+    if cached is not None and cached[1] == upload.received:
+        return cached[0]
+    # After a restart (or a lost chunk) rebuild from what is on disk
+    hasher = hashlib.sha256()
+    remaining = upload.received
+    with open(upload.temp_path, "rb") as f:
+        while remaining > 0:
+            block = f.read(min(HASH_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            remaining -= len(block)
+    return hasher
+
+
+def _open_at(path: Path, offset: int):
+    f = open(path, "r+b")
+    # Drop bytes a failed request wrote after the last recorded offset
+    f.truncate(offset)
+    f.seek(offset)
+    return f
+
+
+def _write_block(f, hasher: "hashlib._Hash", block: bytes) -> None:
+    f.write(block)
+    hasher.update(block)
+
+
+def _sync(f) -> None:
+    f.flush()
+    os.fsync(f.fileno())
+
+
+async def append_chunk(upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> Upload:
+    """Append one chunk of an upload, starting at *offset*.
+
+    Raises LookupError if the upload does not exist, UploadOffsetError if
+    *offset* is not where the upload currently ends, and ValueError if the
+    chunk would run past the declared size.
+    """
+    lock = _locks.setdefault(upload_id, asyncio.Lock())
+    async with lock:
+        upload = await get_upload(upload_id)
+        if upload is None or upload.status != "uploading":
+            raise LookupError(upload_id)
+        if offset != upload.received:
+            raise UploadOffsetError(upload.received)
+
+        hasher = await asyncio.to_thread(_hasher_at, upload)
+        received = upload.received
+        f = await asyncio.to_thread(_open_at, upload.temp_path, received)
+        try:
+            buffer = bytearray()
+            async for chunk in chunks:
+                if received + len(buffer) + len(chunk) > upload.size:
+                    raise ValueError("Chunk exceeds the declared upload size")
+                buffer += chunk
+                if len(buffer) >= WRITE_BLOCK_SIZE:
+                    await asyncio.to_thread(_write_block, f, hasher, bytes(buffer))
+                    received += len(buffer)
+                    buffer.clear()
+            if buffer:
+                await asyncio.to_thread(_write_block, f, hasher, bytes(buffer))
+                received += len(buffer)
+            await asyncio.to_thread(_sync, f)
+        except ValueError:
+            # Nothing from a rejected chunk is kept; the next chunk truncates it away
+            _hashers.pop(upload_id, None)
+            raise
+        except Exception:
+            # A dropped connection keeps the bytes that reached the disk
+            await _record_progress(upload_id, hasher, received)
+            raise
+        finally:
+            await asyncio.to_thread(f.close)
+
+        await _record_progress(upload_id, hasher, received)
+        upload.received = received
+        return upload
+
+
+async def _record_progress(upload_id: str, hasher: "hashlib._Hash", received: int) -> None:
+    _hashers[upload_id] = (hasher, received)
+    async with get_db() as db:
+        await db.execute(
+            "UPDATE uploads SET received = ?, updated_at = datetime('now') WHERE id = ?",
+            (received, upload_id),
+        )
+
+
+async def complete_upload(upload_id: str) -> tuple[Upload, str]:
+    """Verify a fully received upload and return it with its SHA-256 hash.
+
+    The partial file stays in place for the caller to move; call
+    discard_upload() once it has been stored (or rejected).
+    """
+    lock = _locks.setdefault(upload_id, asyncio.Lock())
+    async with lock:
+        upload = await get_upload(upload_id)
+        if upload is None or upload.status != "uploading":
+            raise LookupError(upload_id)
+        if not upload.complete:
+            raise UploadIncompleteError(
+                f"Received {upload.received} of {upload.size} bytes"
+            )
+        content_hash = (await asyncio.to_thread(_hasher_at, upload)).hexdigest()
+        if upload.expected_hash and upload.expected_hash != content_hash:
+            raise UploadHashMismatchError(
+                f"Content hash {content_hash} does not match the expected {upload.expected_hash}"
+            )
+        async with get_db() as db:
+            await db.execute(
+                "UPDATE uploads SET status = 'complete', updated_at = datetime('now') WHERE id = ?",
+                (upload_id,),
+            )
+        upload.status = "complete"
+        return upload, content_hash
+
+
+async def discard_upload(upload_id: str) -> None:
+    """Forget an upload and delete whatever is left of its partial file."""
+    upload = await get_upload(upload_id)
+    if upload is not None:
+        upload.temp_path.unlink(missing_ok=True)
+    async with get_db() as db:
+        await db.execute("DELETE FROM uploads WHERE id = ?", (upload_id,))
+    _hashers.pop(upload_id, None)
+    _locks.pop(upload_id, None)
+
+
+async def expire_stale_uploads(max_age_hours: float = UPLOAD_EXPIRY_HOURS) -> int:
+    """Discard uploads not written to for *max_age_hours*; return how many."""
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT id FROM uploads WHERE status = 'uploading' AND updated_at < datetime('now', ?)",
+            (f"-{max_age_hours} hours",),
+        )
+    for row in rows:
+        await discard_upload(row["id"])
+    if rows:
+        logger.info("Discarded %d abandoned upload(s)", len(rows))
+    return len(rows)
+
+
+async def cleanup_orphaned_upload_files() -> None:
+    """Delete partial files that no upload row refers to (e.g. the session was deleted)."""
+    async with get_db() as db:
+        rows = await db.execute_fetchall("SELECT temp_path FROM uploads")
+    known = {Path(row["temp_path"]) for row in rows}
+    audio_root = get_audio_dir()
+    if not audio_root.exists():
+        return
+    for part_file in audio_root.glob("*/uploads/*.part"):
+        if part_file not in known:
+            part_file.unlink(missing_ok=True)
@@ -21,6 +21,17 @@ def _tmp_db(tmp_path: Path):
         yield
 
 
+@pytest.fixture(autouse=True)
+def _reset_llm_clients():
+    """Drop pooled LLM clients and cached health checks between tests."""
+    from talekeeper.services import llm_client
+
+    llm_client._clients.clear()
+    llm_client._health_cache.clear()
+    llm_client._loaded_ctx.clear()
+    yield
+
+
 @pytest_asyncio.fixture
 async def client(tmp_path: Path):
     """Provide an httpx AsyncClient wired to the FastAPI app."""
@@ -51,6 +51,13 @@ EXPECTED_TABLES: dict[str, list[tuple[str, str]]] = {
         ("audio_path", "TEXT"),
         ("created_at", "TEXT"),
         ("updated_at", "TEXT"),
+        ("time_to_draft_seconds", "REAL"),
+        ("time_to_final_seconds", "REAL"),
+        ("audio_duration", "REAL"),
+        ("audio_codec", "TEXT"),
+        ("audio_sample_rate", "INTEGER"),
+        ("audio_channels", "INTEGER"),
+        ("audio_hash", "TEXT"),
     ],
     "speakers": [
         ("id", "INTEGER"),
@@ -68,6 +75,8 @@ EXPECTED_TABLES: dict[str, list[tuple[str, str]]] = {
         ("end_time", "REAL"),
         ("is_overlap", "INTEGER"),
         ("parent_segment_id", "INTEGER"),
+        ("revision", "INTEGER"),
+        ("model_name", "TEXT"),
     ],
     "summaries": [
         ("id", "INTEGER"),
@@ -77,6 +86,7 @@ EXPECTED_TABLES: dict[str, list[tuple[str, str]]] = {
         ("content", "TEXT"),
         ("model_used", "TEXT"),
         ("generated_at", "TEXT"),
+        ("is_partial", "INTEGER"),
     ],
     "roster_entries": [
         ("id", "INTEGER"),
@@ -126,3 +126,43 @@ async def test_campaign_dashboard(client: AsyncClient) -> None:
     assert "total_recorded_time" in data
     assert "most_recent_session_date" in data
     assert data["session_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_story_so_far(client: AsyncClient) -> None:
+    from unittest.mock import AsyncMock, patch
+
+    from talekeeper.db import get_db
+
+    campaign = (await client.post("/api/campaigns", json={"name": "Story"})).json()
+    resp = await client.get(f"/api/campaigns/{campaign['id']}/story-so-far")
+    assert resp.status_code == 200
+    assert resp.json() == {"summary": None, "stale": False, "sessions_covered": 0, "sessions_summarized": 0}
+
+    session = (await client.post(
+        f"/api/campaigns/{campaign['id']}/sessions", json={"name": "Session 1", "date": "2025-01-01"}
+    )).json()
+    async with get_db() as db:
+        await db.execute(
+            "INSERT INTO summaries (session_id, type, content) VALUES (?, 'full', 'The party met.')",
+            (session["id"],),
+        )
+    assert (await client.get(f"/api/campaigns/{campaign['id']}/story-so-far")).json()["stale"] is True
+
+    with patch(
+        "talekeeper.services.llm_client.resolve_config",
+        new_callable=AsyncMock,
+        return_value={"base_url": "http://test", "api_key": None, "model": "test"},
+    ), patch(
+        "talekeeper.services.llm_client.generate", new_callable=AsyncMock, return_value="The story so far."
+    ):
+        resp = await client.post(f"/api/campaigns/{campaign['id']}/story-so-far")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["stale"] is False
+    assert data["summary"]["content"] == "The story so far."
+
+    versions = (await client.get(f"/api/campaigns/{campaign['id']}/story-so-far/versions")).json()
+    assert [v["version"] for v in versions] == [1]
+
+    assert (await client.get("/api/campaigns/9999/story-so-far")).status_code == 404
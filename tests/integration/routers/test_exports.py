@@ -90,6 +90,19 @@ async def test_export_text(client: AsyncClient) -> None:
     body = resp.text
     assert "Session Chronicle" in body
     assert "The heroes fought bravely." in body
+    assert "Incomplete" not in body
+
+
+@pytest.mark.asyncio
+async def test_export_text_marks_incomplete_summary(client: AsyncClient) -> None:
+    """A summary cut off mid-generation is labelled as incomplete."""
+    async with get_db() as db:
+        ids = await _seed(db)
+        await db.execute("UPDATE summaries SET is_partial = 1 WHERE id = ?", (ids["summary_id"],))
+
+    resp = await client.get(f"/api/summaries/{ids['summary_id']}/export/text")
+    assert resp.status_code == 200
+    assert "Incomplete" in resp.text.splitlines()[2]
 
 
 @pytest.mark.asyncio
@@ -187,6 +187,39 @@ async def test_craft_scene(
     mock_generate.assert_called_once()
 
 
+@pytest.mark.asyncio
+@patch(
+    "talekeeper.services.llm_client.resolve_config",
+    new_callable=AsyncMock,
+    return_value={"base_url": "http://test", "api_key": None, "model": "test"},
+)
+@patch(
+    "talekeeper.services.llm_client.health_check",
+    new_callable=AsyncMock,
+    return_value={"status": "ok"},
+)
+async def test_craft_scene_stream(
+    mock_health: AsyncMock,
+    mock_config: AsyncMock,
+    client: AsyncClient,
+) -> None:
+    """POST /api/sessions/{id}/craft-scene/stream sends the description as it is written."""
+    async with get_db() as db:
+        ids = await _seed_with_transcript(db)
+
+    async def stream(base_url, api_key, model, prompt, system=""):
+        for piece in ("A dragon looms ", "over a burning village."):
+            yield piece
+
+    with patch("talekeeper.services.llm_client.generate_stream", side_effect=stream):
+        resp = await client.post(f"/api/sessions/{ids['session_id']}/craft-scene/stream")
+    assert resp.status_code == 200
+
+    events = parse_sse_events(resp.text)
+    assert [e["event"] for e in events] == ["delta", "delta", "done"]
+    assert events[-1]["data"]["scene_description"] == "A dragon looms over a burning village."
+
+
 # ---------------------------------------------------------------------------
 # Generate-image SSE tests
 # ---------------------------------------------------------------------------
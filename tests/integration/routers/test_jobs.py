@@ -0,0 +1,136 @@
+"""Integration tests for background job endpoints."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from conftest import parse_sse_events
+from talekeeper.db import get_db
+
+
+async def _seed_completed_session(tmp_path: Path) -> int:
+    audio_file = tmp_path / "session.webm"
+    audio_file.write_bytes(b"fake-audio")
+    async with get_db() as db:
+        cursor = await db.execute("INSERT INTO campaigns (name) VALUES ('C')")
+        cursor = await db.execute(
+            "INSERT INTO sessions (campaign_id, name, date, audio_path, status) "
+            "VALUES (?, 'S', '2025-01-01', ?, 'completed')",
+            (cursor.lastrowid, str(audio_file)),
+        )
+        return cursor.lastrowid
+
+
+@pytest.mark.asyncio
+@patch("talekeeper.services.diarization.run_final_diarization", new_callable=AsyncMock)
+@patch("talekeeper.services.audio.audio_to_wav")
+async def test_job_stream_can_be_resubscribed(
+    mock_audio_to_wav: MagicMock,
+    mock_diarize: AsyncMock,
+    client: AsyncClient,
+    tmp_path: Path,
+) -> None:
+    """Pipeline endpoints run as jobs whose events can be replayed later."""
+    session_id = await _seed_completed_session(tmp_path)
+    wav_file = tmp_path / "session.wav"
+    wav_file.write_bytes(b"fake-wav")
+    mock_audio_to_wav.return_value = wav_file
+
+    resp = await client.post(f"/api/sessions/{session_id}/re-diarize", json={"num_speakers": 2})
+    assert resp.status_code == 200
+    job_id = int(resp.headers["x-job-id"])
+    assert [e["event"] for e in parse_sse_events(resp.text)] == ["phase", "done"]
+
+    job = (await client.get(f"/api/jobs/{job_id}")).json()
+    assert job["status"] == "done"
+    assert job["kind"] == "re_diarize"
+    assert job["params"] == {"num_speakers": 2}
+
+    # Full replay, then replay after the first event via query or Last-Event-ID
+    resp = await client.get(f"/api/jobs/{job_id}/events")
+    ids = [int(line[len("id: "):]) for line in resp.text.splitlines() if line.startswith("id: ")]
+    assert len(ids) == 2
+    resp = await client.get(f"/api/jobs/{job_id}/events", params={"after": ids[0]})
+    assert [e["event"] for e in parse_sse_events(resp.text)] == ["done"]
+    resp = await client.get(f"/api/jobs/{job_id}/events", headers={"Last-Event-ID": str(ids[1])})
+    assert parse_sse_events(resp.text) == []
+
+    jobs = (await client.get(f"/api/sessions/{session_id}/jobs")).json()
+    assert [j["id"] for j in jobs] == [job_id]
+
+
+@pytest.mark.asyncio
+async def test_active_job_blocks_new_pipeline(client: AsyncClient, tmp_path: Path) -> None:
+    session_id = await _seed_completed_session(tmp_path)
+    async with get_db() as db:
+        await db.execute(
+            "INSERT INTO jobs (session_id, kind, status) VALUES (?, 're_diarize', 'running')",
+            (session_id,),
+        )
+
+    resp = await client.post(f"/api/sessions/{session_id}/re-diarize", json={"num_speakers": 2})
+    assert resp.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_job_not_found(client: AsyncClient) -> None:
+    assert (await client.get("/api/jobs/99999")).status_code == 404
+    assert (await client.get("/api/jobs/99999/events")).status_code == 404
+    assert (await client.get("/api/sessions/99999/jobs")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_campaign_backlog_queues_unprocessed_sessions(client: AsyncClient) -> None:
+    async with get_db() as db:
+        cursor = await db.execute("INSERT INTO campaigns (name) VALUES ('C')")
+        campaign_id = cursor.lastrowid
+        # No audio yet: nothing to process
+        await db.execute(
+            "INSERT INTO sessions (campaign_id, name, date) VALUES (?, 'S', '2025-01-01')",
+            (campaign_id,),
+        )
+
+    resp = await client.post(f"/api/campaigns/{campaign_id}/backlog", json={})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["queued"] == [] and data["skipped"] == []
+
+    batch = (await client.get(f"/api/batches/{data['batch_id']}")).json()
+    assert batch["kind"] == "process_all"
+    assert batch["total"] == 0
+    assert batch["audio_hours_per_wall_hour"] is None
+
+
+@pytest.mark.asyncio
+async def test_campaign_backlog_not_found(client: AsyncClient) -> None:
+    assert (await client.post("/api/campaigns/99999/backlog", json={})).status_code == 404
+    assert (await client.get("/api/batches/99999")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_campaign_backlog_rejects_interactive_priority(client: AsyncClient) -> None:
+    """Backlog jobs must stay preemptible, so their priority stays below interactive."""
+    async with get_db() as db:
+        cursor = await db.execute("INSERT INTO campaigns (name) VALUES ('C')")
+        campaign_id = cursor.lastrowid
+
+    for priority in (-1, 10):
+        resp = await client.post(f"/api/campaigns/{campaign_id}/backlog", json={"priority": priority})
+        assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_cancel_job_endpoints(client: AsyncClient, tmp_path: Path) -> None:
+    session_id = await _seed_completed_session(tmp_path)
+    async with get_db() as db:
+        cursor = await db.execute(
+            "INSERT INTO jobs (session_id, kind, status) VALUES (?, 'retranscribe', 'done')",
+            (session_id,),
+        )
+        job_id = cursor.lastrowid
+
+    assert (await client.post("/api/jobs/99999/cancel")).status_code == 404
+    assert (await client.post(f"/api/jobs/{job_id}/cancel")).status_code == 409
+    assert (await client.post(f"/api/sessions/{session_id}/cancel")).status_code == 404
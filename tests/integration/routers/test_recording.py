@@ -1,18 +1,31 @@
 """Tests for recording and audio upload API endpoints."""
 
+import hashlib
 import io
 import json
 from pathlib import Path
 
 import pytest
 from httpx import AsyncClient
-from unittest.mock import patch, AsyncMock, MagicMock
+from unittest.mock import ANY, patch, AsyncMock, MagicMock
+
+import numpy as np
 
 from talekeeper.db import get_db
 from talekeeper.services.transcription import TranscriptSegment, ChunkProgress
 from conftest import parse_sse_events
 
 
+@pytest.fixture(autouse=True)
+def _sequential_pipeline(monkeypatch):
+    """Run diarization after ASR unless a test opts into concurrent mode.
+
+    Eager pre-processing is off too, so uploads do not start background ffmpeg work.
+    """
+    monkeypatch.setenv("TALEKEEPER_PIPELINE_MODE", "sequential")
+    monkeypatch.setenv("TALEKEEPER_EAGER_PREPROCESSING", "false")
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -166,6 +179,50 @@ async def test_process_audio_sse_happy_path(
     mock_cleanup_diar.assert_called_once()
 
 
+@pytest.mark.asyncio
+@patch("talekeeper.services.audio.audio_to_wav")
+@patch("talekeeper.services.diarization.extract_speech_embeddings")
+@patch("talekeeper.services.diarization.run_final_diarization", new_callable=AsyncMock)
+@patch("talekeeper.services.transcription.transcribe_chunked")
+@patch("talekeeper.services.resource_orchestration.cleanup_transcription")
+@patch("talekeeper.services.resource_orchestration.cleanup_diarization")
+async def test_process_audio_concurrent_mode_extracts_embeddings_alongside_asr(
+    mock_cleanup_diar: MagicMock,
+    mock_cleanup_trans: MagicMock,
+    mock_transcribe: MagicMock,
+    mock_diarize: AsyncMock,
+    mock_extract: MagicMock,
+    mock_audio_to_wav: MagicMock,
+    client: AsyncClient,
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    """In concurrent mode diarization only clusters the embeddings extracted during ASR."""
+    monkeypatch.setenv("TALEKEEPER_PIPELINE_MODE", "concurrent")
+    async with get_db() as db:
+        ids = await _seed_with_audio(db, tmp_path)
+
+    def fake_transcribe_chunked(audio_path, **kwargs):
+        yield TranscriptSegment(text="The dragon attacked.", start_time=0.0, end_time=3.0)
+
+    mock_transcribe.side_effect = fake_transcribe_chunked
+    fake_wav = tmp_path / "fake.wav"
+    fake_wav.write_bytes(b"fake-wav")
+    mock_audio_to_wav.return_value = fake_wav
+    part = (np.zeros((1, 256), dtype=np.float32), [(0.0, 3.0, 0)])
+    mock_extract.return_value = part
+
+    resp = await client.post(f"/api/sessions/{ids['session_id']}/process-audio")
+    assert [e["event"] for e in parse_sse_events(resp.text)][-1] == "done"
+
+    mock_extract.assert_called_once_with(fake_wav, ANY)
+    args, kwargs = mock_diarize.call_args
+    assert args == (ids["session_id"], None)
+    assert kwargs["part_embeddings"] == [part]
+    # The prefetch's decoded WAV is removed once embeddings are extracted
+    assert not fake_wav.exists()
+
+
 # ---------------------------------------------------------------------------
 # Task 4: process-audio error cases
 # ---------------------------------------------------------------------------
@@ -249,6 +306,50 @@ async def test_upload_audio(client: AsyncClient, tmp_path) -> None:
     assert "audio_path" in data
 
 
+@pytest.mark.asyncio
+async def test_upload_audio_starts_preprocessing(client: AsyncClient) -> None:
+    """Uploaded audio is handed to eager pre-processing right away."""
+    async with get_db() as db:
+        ids = await _seed(db)
+
+    with patch("talekeeper.routers.recording.schedule_preprocessing", new_callable=AsyncMock) as mock_schedule:
+        resp = await client.post(
+            f"/api/sessions/{ids['session_id']}/upload-audio",
+            files={"file": ("test.mp3", io.BytesIO(b"fake-audio-data"), "audio/mpeg")},
+        )
+    assert resp.status_code == 200
+    mock_schedule.assert_awaited_once()
+    assert str(mock_schedule.await_args.args[0]) == resp.json()["audio_path"]
+
+
+@pytest.mark.asyncio
+async def test_upload_audio_cancels_pending_refinement(client: AsyncClient) -> None:
+    """Replacing a session's audio cancels the refinement of the old recording."""
+    async with get_db() as db:
+        ids = await _seed(db)
+
+    session_id = ids["session_id"]
+    resp = await client.post(
+        f"/api/sessions/{session_id}/upload-audio",
+        files={"file": ("first.mp3", io.BytesIO(b"audio-data-1"), "audio/mpeg")},
+    )
+    assert resp.status_code == 200
+    async with get_db() as db:
+        cursor = await db.execute(
+            "INSERT INTO jobs (session_id, kind, priority) VALUES (?, 'refine_transcript', -10)",
+            (session_id,),
+        )
+        job_id = cursor.lastrowid
+
+    resp = await client.post(
+        f"/api/sessions/{session_id}/upload-audio",
+        files={"file": ("second.mp3", io.BytesIO(b"audio-data-2"), "audio/mpeg")},
+    )
+    assert resp.status_code == 200
+    job = (await client.get(f"/api/jobs/{job_id}")).json()
+    assert job["status"] == "cancelled"
+
+
 @pytest.mark.asyncio
 async def test_upload_audio_invalid_mime(client: AsyncClient) -> None:
     """POST /api/sessions/{id}/upload-audio returns 400 for non-audio MIME type."""
@@ -347,7 +448,11 @@ async def test_upload_audio_replaces_existing(client: AsyncClient) -> None:
 @patch("talekeeper.services.summarization.generate_full_summary", new_callable=AsyncMock)
 @patch("talekeeper.services.image_generation.craft_scene_description", new_callable=AsyncMock)
 @patch("talekeeper.services.image_generation.generate_session_image", new_callable=AsyncMock)
+@patch("talekeeper.services.summarization.extract_notes", new_callable=AsyncMock, return_value=[])
+@patch("talekeeper.services.campaign_summary.update_for_session", new_callable=AsyncMock)
 async def test_process_all_pipeline(
+    mock_campaign_summary: AsyncMock,
+    mock_extract_notes: AsyncMock,
     mock_gen_image: AsyncMock,
     mock_craft_scene: AsyncMock,
     mock_full_summary: AsyncMock,
@@ -399,11 +504,13 @@ async def test_process_all_pipeline(
     assert done_events[0]["data"]["summaries_count"] >= 1
     assert done_events[0]["data"]["image"] is not None
 
-    # Verify cleanup was called between phases
+    # Verify cleanup was called between phases; the LLM is released, not unloaded
     mock_cleanup_trans.assert_called_once()
     mock_cleanup_diar.assert_called_once()
-    mock_unload_llm.assert_awaited_once()
+    mock_unload_llm.assert_not_awaited()
     mock_cleanup_img.assert_called_once()
+    # The new full summary is folded into the campaign's story so far
+    mock_campaign_summary.assert_awaited_once_with(session_id, "http://llm", None, "test-model")
 
 
 @pytest.mark.asyncio
@@ -443,6 +550,8 @@ async def test_upload_two_audio_parts(client: AsyncClient, tmp_path: Path) -> No
         part1 = resp1.json()
         assert part1["sort_order"] == 1
         assert part1["original_name"] == "part1.mp3"
+        # Hashed at ingest even when the bytes cannot be probed
+        assert part1["content_hash"] == hashlib.sha256(b"audio-bytes-1").hexdigest()
 
         resp2 = await client.post(
             f"/api/sessions/{session_id}/audio-parts",
@@ -560,3 +669,395 @@ async def test_merge_audio_no_parts_returns_400(client: AsyncClient) -> None:
     resp = await client.post(f"/api/sessions/{ids['session_id']}/merge-audio")
     assert resp.status_code == 400
     assert "parts" in resp.json()["detail"].lower()
+
+
+# ---------------------------------------------------------------------------
+# Concurrent recordings over WebSocket
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def ws_client(tmp_path: Path):
+    """Synchronous TestClient for WebSocket endpoints, with audio written under tmp_path."""
+    import asyncio
+    from starlette.testclient import TestClient
+    from talekeeper.app import app
+    from talekeeper.db.connection import init_db
+
+    asyncio.run(init_db())
+    with patch("talekeeper.routers.recording.get_campaign_audio_dir", return_value=tmp_path / "audio"):
+        yield TestClient(app)
+
+
+def _seed_sessions_sync(count: int) -> list[int]:
+    import asyncio
+
+    async def _inner() -> list[int]:
+        async with get_db() as db:
+            ids = await _seed(db)
+            session_ids = [ids["session_id"]]
+            for i in range(count - 1):
+                cursor = await db.execute(
+                    "INSERT INTO sessions (campaign_id, name, date) VALUES (?, ?, '2025-01-01')",
+                    (ids["campaign_id"], f"Session {i + 2}"),
+                )
+                session_ids.append(cursor.lastrowid)
+        return session_ids
+
+    return asyncio.run(_inner())
+
+
+def _session_row_sync(session_id: int) -> dict:
+    import asyncio
+
+    async def _inner() -> dict:
+        async with get_db() as db:
+            rows = await db.execute_fetchall("SELECT * FROM sessions WHERE id = ?", (session_id,))
+        return dict(rows[0])
+
+    return asyncio.run(_inner())
+
+
+def _wait_for_status_sync(session_id: int, status: str, timeout: float = 5.0) -> None:
+    """Poll the session row until the recording handler has finalized it."""
+    import time
+
+    deadline = time.monotonic() + timeout
+    while _session_row_sync(session_id)["status"] != status:
+        assert time.monotonic() < deadline, f"session {session_id} never reached {status}"
+        time.sleep(0.02)
+
+
+def test_concurrent_recordings_ingest_independently(ws_client, tmp_path: Path) -> None:
+    """N simultaneous WebSocket streams each produce their own complete audio file."""
+    import time
+    from contextlib import ExitStack
+
+    num_streams = 4
+    chunks_per_stream = 25
+    chunk_size = 64 * 1024
+    session_ids = _seed_sessions_sync(num_streams)
+
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        sockets = [
+            stack.enter_context(ws_client.websocket_connect(f"/ws/recording/{sid}"))
+            for sid in session_ids
+        ]
+        # Interleave chunks across all streams
+        for i in range(chunks_per_stream):
+            for n, ws in enumerate(sockets):
+                ws.send_bytes(bytes([n]) * chunk_size)
+
+        active = ws_client.get("/api/recordings/active").json()
+        assert active["active_count"] == num_streams
+
+        for ws in sockets:
+            ws.send_text(json.dumps({"type": "stop"}))
+        for sid in session_ids:
+            _wait_for_status_sync(sid, "audio_ready")
+    elapsed = time.perf_counter() - start
+
+    total_bytes = num_streams * chunks_per_stream * chunk_size
+    throughput_mb_s = total_bytes / elapsed / (1024 * 1024)
+    print(f"ingested {total_bytes} bytes over {num_streams} streams at {throughput_mb_s:.1f} MB/s")
+
+    for n, sid in enumerate(session_ids):
+        session = _session_row_sync(sid)
+        assert session["status"] == "audio_ready"
+        data = Path(session["audio_path"]).read_bytes()
+        assert len(data) == chunks_per_stream * chunk_size
+        assert set(data) == {n}
+
+    assert ws_client.get("/api/recordings/active").json()["active_count"] == 0
+
+
+def test_recording_limit_rejects_extra_stream(ws_client, monkeypatch) -> None:
+    """A stream beyond the configured limit is refused while others keep recording."""
+    monkeypatch.setenv("TALEKEEPER_MAX_CONCURRENT_RECORDINGS", "1")
+    first, second = _seed_sessions_sync(2)
+
+    with ws_client.websocket_connect(f"/ws/recording/{first}") as ws1:
+        ws1.send_bytes(b"audio")
+        with ws_client.websocket_connect(f"/ws/recording/{second}") as ws2:
+            msg = ws2.receive_json()
+            assert msg["type"] == "error"
+            assert "concurrent" in msg["message"]
+        ws1.send_text(json.dumps({"type": "stop"}))
+        _wait_for_status_sync(first, "audio_ready")
+
+    assert _session_row_sync(first)["status"] == "audio_ready"
+    assert _session_row_sync(second)["status"] == "draft"
+
+
+def test_recording_rejects_duplicate_session(ws_client) -> None:
+    """A second stream for the same session is refused."""
+    (sid,) = _seed_sessions_sync(1)
+
+    with ws_client.websocket_connect(f"/ws/recording/{sid}") as ws1:
+        ws1.send_bytes(b"audio")
+        with ws_client.websocket_connect(f"/ws/recording/{sid}") as ws2:
+            msg = ws2.receive_json()
+            assert msg == {"type": "error", "message": "Session is already recording"}
+        ws1.send_text(json.dumps({"type": "stop"}))
+        _wait_for_status_sync(sid, "audio_ready")
+
+
+# ---------------------------------------------------------------------------
+# Resumable uploads
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_resumable_part_upload_resumes_and_dedups(client: AsyncClient, tmp_path: Path) -> None:
+    """A part sent in chunks resumes from the server's offset and is stored once."""
+    async with get_db() as db:
+        ids = await _seed(db)
+    session_id = ids["session_id"]
+    data = b"0123456789" * 100
+    sha = hashlib.sha256(data).hexdigest()
+
+    with patch("talekeeper.routers.recording.get_session_audio_parts_dir", return_value=tmp_path / "parts"), \
+            patch("talekeeper.services.uploads.get_campaign_audio_dir", return_value=tmp_path / "audio"):
+        resp = await client.post(f"/api/sessions/{session_id}/uploads", json={
+            "filename": "part1.wav", "content_type": "audio/wav", "size": len(data), "sha256": sha,
+        })
+        assert resp.status_code == 200
+        upload_id = resp.json()["upload_id"]
+
+        resp = await client.patch(f"/api/uploads/{upload_id}", content=data[:400], headers={"Upload-Offset": "0"})
+        assert resp.json()["offset"] == 400
+
+        # A retried chunk at a stale offset is rejected with the offset to resume from
+        resp = await client.patch(f"/api/uploads/{upload_id}", content=data[:400], headers={"Upload-Offset": "0"})
+        assert resp.status_code == 409
+        assert resp.json()["detail"]["offset"] == 400
+
+        # Completing early is refused
+        assert (await client.post(f"/api/uploads/{upload_id}/complete")).status_code == 409
+
+        offset = (await client.get(f"/api/uploads/{upload_id}")).json()["offset"]
+        resp = await client.patch(
+            f"/api/uploads/{upload_id}", content=data[offset:], headers={"Upload-Offset": str(offset)}
+        )
+        assert resp.json()["offset"] == len(data)
+
+        resp = await client.post(f"/api/uploads/{upload_id}/complete")
+        assert resp.status_code == 200
+        result = resp.json()
+        assert result["duplicate"] is False
+        assert result["part"]["content_hash"] == sha
+        assert Path(result["part"]["file_path"]).read_bytes() == data
+        assert (await client.get(f"/api/uploads/{upload_id}")).status_code == 404
+
+        # The same content again needs no upload at all
+        resp = await client.post(f"/api/sessions/{session_id}/uploads", json={
+            "filename": "copy.wav", "content_type": "audio/wav", "size": len(data), "sha256": sha,
+        })
+        assert resp.json() == {"duplicate": True, "part": result["part"]}
+
+        # Nor is it stored twice when sent as a plain multipart upload
+        resp = await client.post(
+            f"/api/sessions/{session_id}/audio-parts",
+            files={"file": ("copy.wav", io.BytesIO(data), "audio/wav")},
+        )
+        assert resp.json()["id"] == result["part"]["id"]
+
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT id FROM session_audio_files WHERE session_id = ?", (session_id,)
+        )
+    assert len(rows) == 1
+
+
+@pytest.mark.asyncio
+async def test_resumable_upload_rejects_hash_mismatch(client: AsyncClient, tmp_path: Path) -> None:
+    async with get_db() as db:
+        ids = await _seed(db)
+
+    with patch("talekeeper.services.uploads.get_campaign_audio_dir", return_value=tmp_path / "audio"):
+        resp = await client.post(f"/api/sessions/{ids['session_id']}/uploads", json={
+            "filename": "session.wav", "content_type": "audio/wav", "size": 4,
+            "target": "audio", "sha256": "0" * 64,
+        })
+        upload_id = resp.json()["upload_id"]
+        await client.patch(f"/api/uploads/{upload_id}", content=b"abcd", headers={"Upload-Offset": "0"})
+
+        resp = await client.post(f"/api/uploads/{upload_id}/complete")
+    assert resp.status_code == 422
+    assert list((tmp_path / "audio" / "uploads").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_abandoned_uploads_expire(client: AsyncClient, tmp_path: Path) -> None:
+    """An upload nobody has written to for a day is discarded with its partial file."""
+    async with get_db() as db:
+        ids = await _seed(db)
+
+    with patch("talekeeper.services.uploads.get_campaign_audio_dir", return_value=tmp_path / "audio"):
+        resp = await client.post(f"/api/sessions/{ids['session_id']}/uploads", json={
+            "filename": "part1.wav", "content_type": "audio/wav", "size": 10,
+        })
+        stale_id = resp.json()["upload_id"]
+        await client.patch(f"/api/uploads/{stale_id}", content=b"abcd", headers={"Upload-Offset": "0"})
+        async with get_db() as db:
+            await db.execute(
+                "UPDATE uploads SET updated_at = datetime('now', '-2 days') WHERE id = ?", (stale_id,)
+            )
+
+        # Creating another upload sweeps the abandoned one
+        resp = await client.post(f"/api/sessions/{ids['session_id']}/uploads", json={
+            "filename": "part2.wav", "content_type": "audio/wav", "size": 10,
+        })
+        fresh_id = resp.json()["upload_id"]
+
+    assert (await client.get(f"/api/uploads/{stale_id}")).status_code == 404
+    assert [p.name for p in (tmp_path / "audio" / "uploads").iterdir()] == [f"{fresh_id}.part"]
+
+
+@pytest.mark.asyncio
+async def test_unused_prefetch_is_kept_on_preemption_and_stopped_otherwise(tmp_path: Path) -> None:
+    from talekeeper.routers.recording import _PrefetchGuard
+    from talekeeper.services.jobs import Job
+
+    def run(status: str) -> MagicMock:
+        job = Job(id=1, session_id=1, kind="process_audio", status="running")
+        prefetch = MagicMock()
+        prefetch.done.return_value = False
+        with _PrefetchGuard(job, tmp_path / "1.webm", tmp_path / "pre") as guard:
+            guard.prefetch = prefetch
+            job.status = status
+        return prefetch
+
+    with patch("talekeeper.services.preprocessing.adopt_embedding_prefetch") as adopt:
+        # Preempted jobs go back to the queue and resume from their checkpoint
+        kept = run("queued")
+        adopt.assert_called_once_with(tmp_path / "1.webm", tmp_path / "pre", kept)
+        kept.cancel.assert_not_called()
+
+        adopt.reset_mock()
+        stopped = run("running")
+        adopt.assert_not_called()
+        stopped.cancel.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch("talekeeper.services.audio.audio_to_wav")
+@patch("talekeeper.services.diarization.run_final_diarization", new_callable=AsyncMock)
+@patch("talekeeper.services.transcription.transcribe_chunked")
+@patch("talekeeper.services.resource_orchestration.cleanup_transcription")
+@patch("talekeeper.services.resource_orchestration.cleanup_diarization")
+async def test_process_audio_resumes_from_chunk_checkpoint(
+    mock_cleanup_diar: MagicMock,
+    mock_cleanup_trans: MagicMock,
+    mock_transcribe: MagicMock,
+    mock_diarize: AsyncMock,
+    mock_audio_to_wav: MagicMock,
+    client: AsyncClient,
+    tmp_path: Path,
+) -> None:
+    """A resumed job transcribes from its last chunk checkpoint and drops the partial chunk."""
+    from talekeeper.routers.recording import _run_process_audio
+    from talekeeper.services.jobs import Job
+
+    async with get_db() as db:
+        ids = await _seed_with_audio(db, tmp_path)
+        for text, start in (("Chunk one.", 0.0), ("Half of chunk two.", 40.0)):
+            await db.execute(
+                "INSERT INTO transcript_segments (session_id, text, start_time, end_time) VALUES (?, ?, ?, ?)",
+                (ids["session_id"], text, start, start + 2.0),
+            )
+    fake_wav = tmp_path / "fake.wav"
+    fake_wav.write_bytes(b"fake-wav")
+    mock_audio_to_wav.return_value = fake_wav
+
+    def fake_transcribe_chunked(audio_path, **kwargs):
+        assert kwargs["start_chunk"] == 1
+        assert kwargs["model_name"] == "small"
+        yield ChunkProgress(chunk=2, total_chunks=3)
+        yield TranscriptSegment(text="Chunk two.", start_time=40.0, end_time=42.0)
+        yield ChunkProgress(chunk=3, total_chunks=3)
+        yield TranscriptSegment(text="Chunk three.", start_time=70.0, end_time=72.0)
+
+    mock_transcribe.side_effect = fake_transcribe_chunked
+
+    job = Job(id=1, session_id=ids["session_id"], kind="process_audio", checkpoint={
+        "phase": "transcription", "chunk": 1, "segments_count": 1, "model_name": "small",
+    })
+    events = [event async for event in _run_process_audio(job)]
+
+    assert events[-1] == ("done", {"segments_count": 3, "time_to_first_seconds": ANY, "refining": False})
+    assert job.checkpoint["phase"] == "diarization"
+    assert job.checkpoint["chunk"] == 2
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT text FROM transcript_segments WHERE session_id = ? ORDER BY start_time",
+            (ids["session_id"],),
+        )
+    assert [r["text"] for r in rows] == ["Chunk one.", "Chunk two.", "Chunk three."]
+
+
+@pytest.mark.asyncio
+@patch("talekeeper.services.resource_orchestration.cleanup_image_generation")
+@patch("talekeeper.services.llm_client.resolve_config", new_callable=AsyncMock)
+@patch("talekeeper.services.llm_client.unload_model", new_callable=AsyncMock)
+@patch("talekeeper.services.summarization.generate_full_summary", new_callable=AsyncMock)
+@patch("talekeeper.services.summarization.generate_pov_summaries", new_callable=AsyncMock)
+@patch("talekeeper.services.image_generation.craft_scene_description", new_callable=AsyncMock)
+@patch("talekeeper.services.image_generation.generate_session_image", new_callable=AsyncMock)
+@patch("talekeeper.services.summarization.extract_notes", new_callable=AsyncMock, return_value=[])
+@patch("talekeeper.services.campaign_summary.update_for_session", new_callable=AsyncMock)
+async def test_process_all_resumes_after_stored_full_summary(
+    mock_campaign_summary: AsyncMock,
+    mock_extract_notes: AsyncMock,
+    mock_gen_image: AsyncMock,
+    mock_craft_scene: AsyncMock,
+    mock_pov_summaries: AsyncMock,
+    mock_full_summary: AsyncMock,
+    mock_unload_llm: AsyncMock,
+    mock_llm_config: AsyncMock,
+    mock_cleanup_img: MagicMock,
+    client: AsyncClient,
+    tmp_path: Path,
+) -> None:
+    """A job resumed after its full summary was stored goes on with the POV summaries."""
+    from talekeeper.routers.recording import _run_process_all
+    from talekeeper.services.jobs import Job
+
+    async with get_db() as db:
+        ids = await _seed_with_audio(db, tmp_path)
+        session_id = ids["session_id"]
+        cursor = await db.execute(
+            "INSERT INTO speakers (session_id, diarization_label, character_name) VALUES (?, 'SPEAKER_00', 'Thorin')",
+            (session_id,),
+        )
+        await db.execute(
+            "INSERT INTO transcript_segments (session_id, speaker_id, text, start_time, end_time) VALUES (?, ?, 'The dragon attacked.', 0.0, 3.0)",
+            (session_id, cursor.lastrowid),
+        )
+        cursor = await db.execute(
+            "INSERT INTO summaries (session_id, type, content) VALUES (?, 'full', 'The party fought a dragon.')",
+            (session_id,),
+        )
+        full_summary_id = cursor.lastrowid
+
+    mock_llm_config.return_value = {"base_url": "http://llm", "api_key": None, "model": "test-model"}
+    mock_pov_summaries.return_value = ["Thorin fought a dragon."]
+    mock_craft_scene.return_value = "A dragon in a dark cave."
+    mock_gen_image.return_value = {"id": 1, "file_path": "/tmp/gen.png", "prompt": "A dragon in a dark cave."}
+
+    job = Job(id=1, session_id=session_id, kind="process_all", checkpoint={
+        "phase": "summaries", "segments_count": 1, "full_summary_id": full_summary_id, "summaries_count": 1,
+    })
+    events = [event async for event in _run_process_all(job)]
+
+    phases = [data["phase"] for event, data in events if event == "phase"]
+    assert phases == ["summaries", "image_generation"]
+    assert events[-1][1]["summaries_count"] == 2
+    mock_full_summary.assert_not_awaited()
+    assert mock_craft_scene.await_args.args[0] == "The party fought a dragon."
+    assert job.checkpoint["phase"] == "image_generation"
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT type FROM summaries WHERE session_id = ? ORDER BY id", (session_id,)
+        )
+    assert [r["type"] for r in rows] == ["full", "pov"]
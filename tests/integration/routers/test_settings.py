@@ -83,3 +83,47 @@ async def test_reset_with_no_settings(client: AsyncClient) -> None:
     resp = await client.post("/api/settings/reset")
     assert resp.status_code == 200
     assert resp.json()["reset"] is True
+
+
+@pytest.mark.asyncio
+async def test_model_residency_uses_budget_setting(client: AsyncClient) -> None:
+    await client.put("/api/settings", json={"settings": {"model_memory_budget_gb": "8"}})
+
+    resp = await client.get("/api/settings/models")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["budget_bytes"] == 8 * 1024 ** 3
+    assert isinstance(data["resident"], list)
+    assert isinstance(data["counters"], dict)
+
+
+@pytest.mark.asyncio
+async def test_llm_cache_stats_and_clear(client: AsyncClient) -> None:
+    await client.put("/api/settings", json={"settings": {"llm_cache_enabled": "true"}})
+
+    resp = await client.get("/api/settings/llm-cache")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["enabled"] is True
+    assert data["entries"] == 0
+    assert {"hits", "misses", "bypassed", "evicted", "hit_rate"} <= data.keys()
+
+    resp = await client.delete("/api/settings/llm-cache")
+    assert resp.status_code == 200
+    assert resp.json() == {"deleted": 0}
+
+
+async def test_llm_metrics(client: AsyncClient) -> None:
+    from talekeeper.services import llm_metrics
+
+    llm_metrics.reset()
+    llm_metrics.record_call("llama3.1:8b", 2.0, 100, 40, first_token=1.0)
+
+    resp = await client.get("/api/settings/llm-metrics")
+    assert resp.status_code == 200
+    data = resp.json()
+    model = data["models"]["llama3.1:8b"]
+    assert model["calls"] == 1
+    assert model["avg_latency_seconds"] == 2.0
+    assert model["tokens_per_second"] == 40.0
+    assert data["recent"][0]["first_token_seconds"] == 1.0
@@ -1,10 +1,14 @@
 """Tests for summary generation and management API endpoints."""
 
+import asyncio
+
 import pytest
 from httpx import AsyncClient
 from unittest.mock import patch, AsyncMock
 
 from talekeeper.db import get_db
+from talekeeper.services import campaign_summary
+from conftest import parse_sse_events
 
 
 # ---------------------------------------------------------------------------
@@ -132,7 +136,14 @@ async def test_generate_summary(
     assert data["type"] == "full"
     assert data["content"] == "A summary of the session."
     assert data["session_id"] == ids["session_id"]
-    mock_generate.assert_called_once()
+    # Notes pass over the transcript and the recap; the story so far follows in the background
+    await asyncio.gather(*campaign_summary._tasks)
+    assert mock_generate.await_count == 3
+
+    resp = await client.get(f"/api/campaigns/{ids['campaign_id']}/story-so-far")
+    story = resp.json()
+    assert story["stale"] is False
+    assert story["summary"]["version"] == 1
 
 
 @pytest.mark.asyncio
@@ -193,3 +204,111 @@ async def test_llm_status(
     assert data["status"] == "ok"
     mock_config.assert_called_once()
     mock_health.assert_called_once()
+
+
+def _fake_stream(*pieces: str, fail: bool = False):
+    async def stream(base_url, api_key, model, prompt, system=""):
+        for piece in pieces:
+            yield piece
+        if fail:
+            raise RuntimeError("provider went away")
+    return stream
+
+
+@pytest.mark.asyncio
+@patch(
+    "talekeeper.services.llm_client.resolve_config",
+    new_callable=AsyncMock,
+    return_value={"base_url": "http://test", "api_key": None, "model": "test"},
+)
+@patch(
+    "talekeeper.services.llm_client.health_check",
+    new_callable=AsyncMock,
+    return_value={"status": "ok"},
+)
+@patch(
+    "talekeeper.services.llm_client.generate",
+    new_callable=AsyncMock,
+    return_value='{"events": ["The party headed north."]}',
+)
+async def test_generate_summary_stream(
+    mock_generate: AsyncMock,
+    mock_health: AsyncMock,
+    mock_config: AsyncMock,
+    client: AsyncClient,
+) -> None:
+    """The streaming endpoint sends text deltas and saves the finished summary."""
+    async with get_db() as db:
+        ids = await _seed_with_transcript(db)
+
+    with patch(
+        "talekeeper.services.llm_client.generate_stream",
+        side_effect=_fake_stream("The party ", "headed north."),
+    ):
+        resp = await client.post(
+            f"/api/sessions/{ids['session_id']}/generate-summary/stream",
+            json={"type": "full"},
+        )
+    assert resp.status_code == 200
+    assert "text/event-stream" in resp.headers["content-type"]
+
+    events = parse_sse_events(resp.text)
+    names = [e["event"] for e in events]
+    assert names[:2] == ["phase", "phase"]
+    assert names[-1] == "done"
+    deltas = [e["data"]["text"] for e in events if e["event"] == "delta"]
+    assert deltas == ["The party ", "headed north."]
+
+    summaries = (await client.get(f"/api/sessions/{ids['session_id']}/summaries")).json()
+    assert len(summaries) == 1
+    assert summaries[0]["content"] == "The party headed north."
+    assert summaries[0]["is_partial"] == 0
+    assert events[-1]["data"]["summary_ids"] == [summaries[0]["id"]]
+    await asyncio.gather(*campaign_summary._tasks)
+
+
+@pytest.mark.asyncio
+@patch(
+    "talekeeper.services.llm_client.resolve_config",
+    new_callable=AsyncMock,
+    return_value={"base_url": "http://test", "api_key": None, "model": "test"},
+)
+@patch(
+    "talekeeper.services.llm_client.health_check",
+    new_callable=AsyncMock,
+    return_value={"status": "ok"},
+)
+@patch(
+    "talekeeper.services.llm_client.generate",
+    new_callable=AsyncMock,
+    return_value='{"events": ["The party headed north."]}',
+)
+async def test_generate_summary_stream_keeps_partial_text(
+    mock_generate: AsyncMock,
+    mock_health: AsyncMock,
+    mock_config: AsyncMock,
+    client: AsyncClient,
+) -> None:
+    """Text streamed before a failure is saved and flagged as partial."""
+    async with get_db() as db:
+        ids = await _seed_with_transcript(db)
+
+    with patch(
+        "talekeeper.services.llm_client.generate_stream",
+        side_effect=_fake_stream("I walked ", "north with", fail=True),
+    ):
+        resp = await client.post(
+            f"/api/sessions/{ids['session_id']}/generate-summary/stream",
+            json={"type": "pov"},
+        )
+
+    events = parse_sse_events(resp.text)
+    assert events[-1]["event"] == "error"
+    assert "provider went away" in events[-1]["data"]["message"]
+
+    summaries = (await client.get(f"/api/sessions/{ids['session_id']}/summaries")).json()
+    assert len(summaries) == 1
+    assert summaries[0]["type"] == "pov"
+    assert summaries[0]["speaker_id"] == ids["speaker_id"]
+    assert summaries[0]["content"] == "I walked north with"
+    assert summaries[0]["is_partial"] == 1
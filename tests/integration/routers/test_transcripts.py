@@ -280,6 +280,29 @@ async def test_retranscribe_session_not_found(client: AsyncClient) -> None:
     assert "Session not found" in resp.json()["detail"]
 
 
+@pytest.mark.asyncio
+async def test_retranscribe_range_rejects_empty_range(client: AsyncClient, tmp_path: Path) -> None:
+    """POST /api/sessions/{id}/retranscribe-range returns 422 when end <= start."""
+    async with get_db() as db:
+        ids = await _seed_session_with_audio(db, tmp_path)
+
+    resp = await client.post(
+        f"/api/sessions/{ids['session_id']}/retranscribe-range",
+        json={"start_time": 60.0, "end_time": 30.0},
+    )
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_retranscribe_range_session_not_found(client: AsyncClient) -> None:
+    """POST /api/sessions/{id}/retranscribe-range returns 404 for non-existent session."""
+    resp = await client.post(
+        "/api/sessions/99999/retranscribe-range",
+        json={"start_time": 0.0, "end_time": 30.0},
+    )
+    assert resp.status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_split_transcript_segments_db_insert(db) -> None:
     """_split_transcript_segments: split segments are correctly inserted into the DB.
@@ -362,3 +385,78 @@ async def test_split_transcript_segments_db_insert(db) -> None:
     )
     assert len(remaining) == 1
     assert remaining[0]["id"] == original_id
+
+
+@pytest.mark.asyncio
+async def test_refinement_status_reports_timings_and_revisions(client: AsyncClient) -> None:
+    async with get_db() as db:
+        cursor = await db.execute("INSERT INTO campaigns (name) VALUES ('C')")
+        campaign_id = cursor.lastrowid
+        cursor = await db.execute(
+            "INSERT INTO sessions (campaign_id, name, date, time_to_draft_seconds) VALUES (?, 'S', '2025-01-01', 42.0)",
+            (campaign_id,),
+        )
+        session_id = cursor.lastrowid
+        await db.execute(
+            "INSERT INTO transcript_segments (session_id, text, start_time, end_time, model_name) VALUES (?, 'hi', 0, 1, 'small')",
+            (session_id,),
+        )
+
+    res = await client.get(f"/api/sessions/{session_id}/refinement")
+    assert res.status_code == 200
+    data = res.json()
+    assert data["state"] == "idle"
+    assert data["time_to_draft_seconds"] == 42.0
+    assert data["time_to_final_seconds"] is None
+    assert data["revisions"] == [{"revision": 0, "model_name": "small", "segments": 1}]
+
+    res = await client.get("/api/sessions/99999/refinement")
+    assert res.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_retranscribe_range_conflicts_with_active_job(client: AsyncClient, tmp_path: Path) -> None:
+    """POST /api/sessions/{id}/retranscribe-range returns 409 while the session is being processed."""
+    async with get_db() as db:
+        ids = await _seed_session_with_audio(db, tmp_path)
+        await db.execute(
+            "INSERT INTO jobs (session_id, kind, status) VALUES (?, 'retranscribe', 'running')",
+            (ids["session_id"],),
+        )
+
+    resp = await client.post(
+        f"/api/sessions/{ids['session_id']}/retranscribe-range",
+        json={"start_time": 0.0, "end_time": 30.0},
+    )
+    assert resp.status_code == 409
+
+
+@pytest.mark.asyncio
+@patch("talekeeper.services.transcription.transcribe_range")
+async def test_retranscribe_range_runs_as_job(
+    mock_transcribe: MagicMock, client: AsyncClient, tmp_path: Path
+) -> None:
+    """POST /api/sessions/{id}/retranscribe-range streams the range job's events."""
+    async with get_db() as db:
+        ids = await _seed_session_with_audio(db, tmp_path)
+    mock_transcribe.return_value = iter([
+        ChunkProgress(chunk=1, total_chunks=1),
+        TranscriptSegment(text="Roll again", start_time=0.5, end_time=2.0),
+    ])
+
+    resp = await client.post(
+        f"/api/sessions/{ids['session_id']}/retranscribe-range",
+        json={"start_time": 0.0, "end_time": 30.0},
+    )
+    assert resp.status_code == 200
+    assert "X-Job-Id" in resp.headers
+
+    events = parse_sse_events(resp.text)
+    assert [e["event"] for e in events] == ["range", "progress", "segment", "done"]
+    assert events[-1]["data"]["segments_count"] == 1
+
+    async with get_db() as db:
+        rows = await db.execute_fetchall(
+            "SELECT kind, status FROM jobs WHERE session_id = ?", (ids["session_id"],)
+        )
+    assert [(r["kind"], r["status"]) for r in rows] == [("retranscribe_range", "done")]
@@ -7,6 +7,7 @@ from pathlib import Path
 from talekeeper.services.audio import (
     audio_to_wav,
     webm_to_wav,
+    plan_chunks,
     split_audio_to_chunks,
     compute_primary_zone,
     DEFAULT_CHUNK_DURATION_MS,
@@ -78,6 +79,18 @@ def test_split_audio_to_chunks_short_file(mock_audio_segment_cls, tmp_path):
     assert end_ms == 60_000
 
 
+def test_plan_chunks_matches_split_windows():
+    """plan_chunks computes the same windows the splitter cuts, without any audio."""
+    assert plan_chunks(60_000) == [(0, 60_000)]
+    assert plan_chunks(180_000, chunk_duration_ms=60_000, overlap_ms=5_000) == [
+        (0, 60_000), (55_000, 115_000), (110_000, 170_000), (165_000, 180_000),
+    ]
+    # No tiny trailing chunk: the last 2s are already covered by the overlap
+    assert plan_chunks(112_000, chunk_duration_ms=60_000, overlap_ms=5_000) == [
+        (0, 60_000), (55_000, 112_000),
+    ]
+
+
 def test_compute_primary_zone():
     """compute_primary_zone returns correct zones for first, middle, and last chunks."""
     overlap_ms = 30_000  # 30 seconds
@@ -0,0 +1,74 @@
+"""Unit tests for the ingest-time audio metadata catalog."""
+
+import hashlib
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from talekeeper.services.audio import AudioInfo
+from talekeeper.services.audio_catalog import (
+    catalog_audio_part,
+    catalog_session_audio,
+    hash_file,
+    read_audio_metadata,
+    session_audio_metadata,
+)
+from conftest import create_campaign, create_session
+
+INFO = AudioInfo(duration=5400.0, codec="opus", sample_rate=48000, channels=2, format_name="webm")
+
+
+def test_hash_file_streams_whole_content(tmp_path: Path) -> None:
+    path = tmp_path / "a.webm"
+    path.write_bytes(b"x" * (3 * 1024 * 1024 + 7))
+    assert hash_file(path) == hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def test_unreadable_audio_still_gets_a_hash(tmp_path: Path) -> None:
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"not audio")
+    with patch("talekeeper.services.audio_catalog.probe_audio", side_effect=RuntimeError("bad")):
+        metadata = read_audio_metadata(path)
+    assert metadata.duration is None and metadata.codec is None
+    assert metadata.content_hash == hashlib.sha256(b"not audio").hexdigest()
+    assert metadata.info is None
+
+
+@pytest.mark.asyncio
+async def test_session_metadata_round_trip(db, tmp_path: Path) -> None:
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+    path = tmp_path / "1.webm"
+    path.write_bytes(b"audio")
+
+    assert await session_audio_metadata(session_id) is None
+    with patch("talekeeper.services.audio_catalog.probe_audio", return_value=INFO):
+        await catalog_session_audio(session_id, path)
+
+    metadata = await session_audio_metadata(session_id)
+    assert metadata.duration == 5400.0
+    assert (metadata.codec, metadata.sample_rate, metadata.channels) == ("opus", 48000, 2)
+    assert metadata.content_hash == hashlib.sha256(b"audio").hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_audio_part_metadata_is_stored_on_the_part(db, tmp_path: Path) -> None:
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+    path = tmp_path / "1_a.webm"
+    path.write_bytes(b"audio")
+    cursor = await db.execute(
+        "INSERT INTO session_audio_files (session_id, file_path, original_name) VALUES (?, ?, 'a.webm')",
+        (session_id, str(path)),
+    )
+    await db.commit()
+
+    with patch("talekeeper.services.audio_catalog.probe_audio", return_value=INFO):
+        await catalog_audio_part(cursor.lastrowid, path, content_hash="known")
+
+    rows = await db.execute_fetchall(
+        "SELECT duration, codec, content_hash FROM session_audio_files WHERE id = ?",
+        (cursor.lastrowid,),
+    )
+    assert dict(rows[0]) == {"duration": 5400.0, "codec": "opus", "content_hash": "known"}
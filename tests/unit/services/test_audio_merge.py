@@ -5,21 +5,46 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from talekeeper.db import get_db
-from talekeeper.services.audio_merge import merge_audio_parts
+from talekeeper.services.audio import AudioInfo
+from talekeeper.services.audio_merge import merge_audio_parts, schedule_session_archive
 from conftest import create_campaign, create_session
 
 
+async def _add_parts(db, session_id: int, paths: list[Path]) -> None:
+    for i, path in enumerate(paths, start=1):
+        await db.execute(
+            "INSERT INTO session_audio_files (session_id, file_path, original_name, sort_order) VALUES (?, ?, ?, ?)",
+            (session_id, str(path), path.name, i),
+        )
+    await db.commit()
+
+
+def _fake_ffmpeg(calls: list[list[str]], fail_first: bool = False):
+    """Record ffmpeg invocations and create their output file."""
+
+    def _run(cmd, **kwargs):
+        calls.append(cmd)
+        result = MagicMock()
+        if fail_first and len(calls) == 1:
+            result.returncode = 1
+            result.stderr = "Non-monotonic DTS"
+            return result
+        Path(cmd[-1]).write_bytes(b"ffmpeg-output")
+        result.returncode = 0
+        result.stderr = ""
+        return result
+
+    return _run
+
+
 # ---------------------------------------------------------------------------
 # Task 5.4: Unit test — merge_audio_parts with mocked ffmpeg
 # ---------------------------------------------------------------------------
 
 
 @pytest.mark.asyncio
-@patch("subprocess.run")
-async def test_merge_audio_parts_multi_part(mock_run: MagicMock, db, tmp_path: Path) -> None:
-    """merge_audio_parts writes correct concat filelist and calls ffmpeg."""
-    # Arrange: create campaign, session, and two fake audio files
+async def test_merge_audio_parts_multi_part(db, tmp_path: Path) -> None:
+    """Parts with matching codec parameters are stream-copied without decoding."""
     campaign_id = await create_campaign(db)
     session_id = await create_session(db, campaign_id)
 
@@ -27,73 +52,135 @@ async def test_merge_audio_parts_multi_part(mock_run: MagicMock, db, tmp_path: P
     audio2 = tmp_path / "part2.mp3"
     audio1.write_bytes(b"fake-audio-1")
     audio2.write_bytes(b"fake-audio-2")
+    await _add_parts(db, session_id, [audio1, audio2])
 
-    await db.execute(
-        "INSERT INTO session_audio_files (session_id, file_path, original_name, sort_order) VALUES (?, ?, ?, ?)",
-        (session_id, str(audio1), "part1.mp3", 1),
-    )
-    await db.execute(
-        "INSERT INTO session_audio_files (session_id, file_path, original_name, sort_order) VALUES (?, ?, ?, ?)",
-        (session_id, str(audio2), "part2.mp3", 2),
-    )
-    await db.commit()
+    info = AudioInfo(duration=60.0, codec="mp3", sample_rate=44100, channels=2, format_name="mp3")
+    calls: list[list[str]] = []
 
-    # Mock subprocess.run to succeed and create a fake output file
-    output_path = tmp_path / "merged.wav"
+    with patch("talekeeper.services.audio_merge.probe_audio", return_value=info), \
+         patch("subprocess.run", side_effect=_fake_ffmpeg(calls)):
+        result = await merge_audio_parts(session_id, tmp_path / "merged")
+
+    assert result.archive_path == tmp_path / "merged.mp3"
+
+    # A single concat with -c copy, no re-encode
+    assert len(calls) == 1
+    cmd = calls[0]
+    assert cmd[0] == "ffmpeg"
+    assert "concat" in cmd
+    assert cmd[cmd.index("-c") + 1] == "copy"
+    filelist = Path(cmd[cmd.index("-i") + 1])
+    assert not filelist.exists()
+    # Built aside and moved into place
+    assert result.archive_path.read_bytes() == b"ffmpeg-output"
+    assert list(tmp_path.glob("_merge_*")) == []
+
+
+@pytest.mark.asyncio
+async def test_merge_audio_parts_mixed_formats_decode_to_16k(db, tmp_path: Path) -> None:
+    """Mixed formats are decoded in parallel to 16 kHz mono and archived as FLAC."""
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+
+    audio1 = tmp_path / "part1.m4a"
+    audio2 = tmp_path / "part2.webm"
+    audio1.write_bytes(b"fake-audio-1")
+    audio2.write_bytes(b"fake-audio-2")
+    await _add_parts(db, session_id, [audio1, audio2])
+
+    infos = {
+        audio1: AudioInfo(duration=30.0, codec="aac", sample_rate=48000, channels=2, format_name="mov"),
+        audio2: AudioInfo(duration=30.0, codec="opus", sample_rate=48000, channels=1, format_name="webm"),
+    }
+    calls: list[list[str]] = []
+
+    with patch("talekeeper.services.audio_merge.probe_audio", side_effect=lambda p: infos[p]), \
+         patch("subprocess.run", side_effect=_fake_ffmpeg(calls)):
+        result = await merge_audio_parts(session_id, tmp_path / "merged")
+
+    assert result.archive_path == tmp_path / "merged.flac"
+
+    decodes = [c for c in calls if "pcm_s16le" in c]
+    assert len(decodes) == 2
+    for cmd in decodes:
+        assert cmd[cmd.index("-ar") + 1] == "16000"
+        assert cmd[cmd.index("-ac") + 1] == "1"
+    # Decoded parts are concatenated straight into the FLAC archive
+    assert any("concat" in c and "flac" in c for c in calls)
+    assert result.archive_path.read_bytes() == b"ffmpeg-output"
+    # Scratch directory is removed
+    assert list(tmp_path.glob("_merge_*")) == []
 
-    def _fake_ffmpeg(cmd, **kwargs):
-        output_path.write_bytes(b"merged-audio")
-        result = MagicMock()
-        result.returncode = 0
-        result.stderr = ""
-        return result
 
-    mock_run.side_effect = _fake_ffmpeg
+@pytest.mark.asyncio
+async def test_merge_audio_parts_reuses_decoded_parts(db, tmp_path: Path) -> None:
+    """Parts already decoded for processing are not decoded again for the archive."""
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+
+    audio1 = tmp_path / "part1.m4a"
+    audio2 = tmp_path / "part2.webm"
+    audio1.write_bytes(b"fake-audio-1")
+    audio2.write_bytes(b"fake-audio-2")
+    await _add_parts(db, session_id, [audio1, audio2])
+    decoded2 = tmp_path / "part2.16k.wav"
+    decoded2.write_bytes(b"pcm")
+
+    infos = {
+        audio1: AudioInfo(duration=30.0, codec="aac", sample_rate=48000, channels=2, format_name="mov"),
+        audio2: AudioInfo(duration=30.0, codec="opus", sample_rate=48000, channels=1, format_name="webm"),
+    }
+    calls: list[list[str]] = []
+
+    with patch("talekeeper.services.audio_merge.probe_audio", side_effect=lambda p: infos[p]), \
+         patch("subprocess.run", side_effect=_fake_ffmpeg(calls)):
+        await merge_audio_parts(session_id, tmp_path / "merged", decoded={audio2: decoded2})
 
-    # Act
-    result = await merge_audio_parts(session_id, output_path)
+    decodes = [c for c in calls if "pcm_s16le" in c]
+    assert [c[c.index("-i") + 1] for c in decodes] == [str(audio1)]
+    # The caller's decode is used and left in place
+    assert decoded2.exists()
+
+
+@pytest.mark.asyncio
+async def test_merge_audio_parts_stream_copy_failure_falls_back(db, tmp_path: Path) -> None:
+    """A failed stream copy falls back to decoding instead of erroring out."""
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+
+    audio1 = tmp_path / "part1.webm"
+    audio2 = tmp_path / "part2.webm"
+    audio1.write_bytes(b"fake-audio-1")
+    audio2.write_bytes(b"fake-audio-2")
+    await _add_parts(db, session_id, [audio1, audio2])
 
-    # Assert: returned path is correct
-    assert result == output_path
+    info = AudioInfo(duration=10.0, codec="opus", sample_rate=48000, channels=1, format_name="webm")
+    calls: list[list[str]] = []
 
-    # Assert: ffmpeg was called once
-    mock_run.assert_called_once()
-    call_args = mock_run.call_args[0][0]  # first positional arg (the command list)
-    assert "ffmpeg" in call_args
-    assert "-f" in call_args
-    assert "concat" in call_args
+    with patch("talekeeper.services.audio_merge.probe_audio", return_value=info), \
+         patch("subprocess.run", side_effect=_fake_ffmpeg(calls, fail_first=True)):
+        result = await merge_audio_parts(session_id, tmp_path / "merged")
 
-    # Assert: the concat filelist contained both parts in sort order
-    filelist_path_idx = call_args.index("-i") + 1
-    filelist_path = Path(call_args[filelist_path_idx])
-    # By the time we check, the filelist is cleaned up — but ffmpeg was called with it,
-    # so we verify via the call args that it pointed to a valid .txt file location
-    assert filelist_path.suffix == ".txt" or "_concat_" in filelist_path.name
+    assert result.archive_path.suffix == ".flac"
+    assert not (tmp_path / "merged.webm").exists()
 
 
 @pytest.mark.asyncio
 async def test_merge_audio_parts_single_part(db, tmp_path: Path) -> None:
-    """merge_audio_parts with one part copies file directly without calling ffmpeg."""
+    """merge_audio_parts with one part links the file directly without calling ffmpeg."""
     campaign_id = await create_campaign(db)
     session_id = await create_session(db, campaign_id)
 
     audio1 = tmp_path / "only.mp3"
     audio1.write_bytes(b"single-audio-bytes")
-
-    await db.execute(
-        "INSERT INTO session_audio_files (session_id, file_path, original_name, sort_order) VALUES (?, ?, ?, ?)",
-        (session_id, str(audio1), "only.mp3", 1),
-    )
-    await db.commit()
-
-    output_path = tmp_path / "output.wav"
+    await _add_parts(db, session_id, [audio1])
 
     with patch("subprocess.run") as mock_run:
-        result = await merge_audio_parts(session_id, output_path)
+        result = await merge_audio_parts(session_id, tmp_path / "output")
         mock_run.assert_not_called()
 
-    assert result == output_path
-    assert output_path.read_bytes() == b"single-audio-bytes"
+    assert result.archive_path == tmp_path / "output.mp3"
+    assert result.archive_path.read_bytes() == b"single-audio-bytes"
 
 
 @pytest.mark.asyncio
@@ -106,3 +193,25 @@ async def test_merge_audio_parts_no_parts_raises(db, tmp_path: Path) -> None:
 
     with pytest.raises(ValueError, match="No audio parts"):
         await merge_audio_parts(session_id, output_path)
+
+
+@pytest.mark.asyncio
+async def test_background_archive_updates_the_session_then_cleans_up(db, tmp_path: Path) -> None:
+    """The archive is built off the job's path; the session points at it once it exists."""
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+    audio1 = tmp_path / "only.mp3"
+    audio1.write_bytes(b"single-audio-bytes")
+    await _add_parts(db, session_id, [audio1])
+    cleaned = []
+
+    async def cleanup() -> None:
+        cleaned.append(True)
+
+    with patch("talekeeper.services.audio_catalog.catalog_session_audio") as catalog:
+        await schedule_session_archive(session_id, tmp_path / "merged", cleanup=cleanup)
+
+    rows = await db.execute_fetchall("SELECT audio_path FROM sessions WHERE id = ?", (session_id,))
+    assert rows[0]["audio_path"] == str(tmp_path / "merged.mp3")
+    catalog.assert_called_once_with(session_id, tmp_path / "merged.mp3")
+    assert cleaned == [True]
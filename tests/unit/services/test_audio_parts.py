@@ -0,0 +1,129 @@
+"""Unit tests for the per-part processing cache."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from talekeeper.services.audio_parts import (
+    AudioPart,
+    invalidate_part_cache,
+    load_session_parts,
+    part_offsets,
+    save_part_embeddings,
+    save_part_transcript,
+    shift_segments,
+    shifted_part_embeddings,
+)
+from talekeeper.services.transcription import TranscriptSegment
+from conftest import create_campaign, create_session
+
+
+async def _add_part(db, session_id: int, path: Path, sort_order: int) -> int:
+    cursor = await db.execute(
+        "INSERT INTO session_audio_files (session_id, file_path, original_name, sort_order) VALUES (?, ?, ?, ?)",
+        (session_id, str(path), path.name, sort_order),
+    )
+    await db.commit()
+    return cursor.lastrowid
+
+
+@pytest.mark.asyncio
+async def test_cached_results_round_trip(db, tmp_path: Path) -> None:
+    """Saved transcripts and embeddings are returned on the next load."""
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+    part_id = await _add_part(db, session_id, tmp_path / "a.mp3", 1)
+
+    part = AudioPart(
+        audio_file_id=part_id,
+        file_path=tmp_path / "a.mp3",
+        duration=12.5,
+        segments=[TranscriptSegment(text="Roll initiative", start_time=1.0, end_time=2.0)],
+        embeddings=np.ones((2, 256), dtype=np.float32),
+        subsegments=[(0.0, 1.2, 0), (0.6, 1.8, 0)],
+    )
+    await save_part_transcript(part, "large-v3", "en")
+    await save_part_embeddings(part, tmp_path / "cache")
+
+    [loaded] = await load_session_parts(session_id, "large-v3", "en")
+    assert not loaded.needs_processing
+    assert loaded.duration == 12.5
+    assert loaded.segments == part.segments
+    assert loaded.embeddings.shape == (2, 256)
+    assert loaded.subsegments == part.subsegments
+
+
+@pytest.mark.asyncio
+async def test_transcript_cache_keyed_on_model_and_language(db, tmp_path: Path) -> None:
+    """Changing the Whisper model re-transcribes but keeps cached embeddings."""
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+    part_id = await _add_part(db, session_id, tmp_path / "a.mp3", 1)
+
+    part = AudioPart(
+        audio_file_id=part_id,
+        file_path=tmp_path / "a.mp3",
+        duration=5.0,
+        segments=[],
+        embeddings=np.zeros((0, 256), dtype=np.float32),
+        subsegments=[],
+    )
+    await save_part_transcript(part, "large-v3", "en")
+    await save_part_embeddings(part, tmp_path / "cache")
+
+    [loaded] = await load_session_parts(session_id, "medium", "en")
+    assert loaded.needs_transcription
+    assert not loaded.needs_embeddings
+
+    await invalidate_part_cache(part_id)
+    [cleared] = await load_session_parts(session_id, "large-v3", "en")
+    assert cleared.duration is None and cleared.needs_processing
+    assert not (tmp_path / "cache" / f"part_{part_id}.npz").exists()
+
+
+@pytest.mark.asyncio
+async def test_new_part_is_the_only_one_needing_work(db, tmp_path: Path) -> None:
+    """Appending a part leaves previously processed parts cached."""
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+    first_id = await _add_part(db, session_id, tmp_path / "a.mp3", 1)
+
+    first = AudioPart(
+        audio_file_id=first_id,
+        file_path=tmp_path / "a.mp3",
+        duration=60.0,
+        segments=[],
+        embeddings=np.zeros((0, 256), dtype=np.float32),
+        subsegments=[],
+    )
+    await save_part_transcript(first, "large-v3", "en")
+    await save_part_embeddings(first, tmp_path / "cache")
+
+    await _add_part(db, session_id, tmp_path / "b.mp3", 2)
+
+    parts = await load_session_parts(session_id, "large-v3", "en")
+    assert [p.needs_processing for p in parts] == [False, True]
+
+
+def test_offsets_shift_segments_and_embeddings() -> None:
+    """Per-part timestamps are shifted by the durations of preceding parts."""
+    a = AudioPart(
+        audio_file_id=1, file_path=Path("a"), duration=100.0,
+        embeddings=np.full((1, 256), 1.0), subsegments=[(10.0, 11.2, 0)],
+    )
+    b = AudioPart(
+        audio_file_id=2, file_path=Path("b"), duration=50.0,
+        embeddings=np.full((2, 256), 2.0), subsegments=[(1.0, 2.2, 0), (5.0, 6.2, 1)],
+    )
+
+    assert part_offsets([a, b]) == [0.0, 100.0]
+    assert part_offsets([b, a]) == [0.0, 50.0]
+
+    shifted = shift_segments([TranscriptSegment("hi", 1.0, 2.0)], 100.0)
+    assert (shifted[0].start_time, shifted[0].end_time) == (101.0, 102.0)
+
+    [(emb_a, subs_a), (emb_b, subs_b)] = shifted_part_embeddings([a, b])
+    assert emb_a.shape == (1, 256) and emb_b.shape == (2, 256)
+    assert subs_a == [(10.0, 11.2, 0)]
+    assert subs_b == [(101.0, 102.2, 1), (105.0, 106.2, 2)]
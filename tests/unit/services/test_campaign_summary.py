@@ -0,0 +1,99 @@
+"""Tests for the campaign story-so-far summary."""
+
+from unittest.mock import AsyncMock, patch
+
+from conftest import create_campaign, create_session
+
+from talekeeper.services import campaign_summary
+from talekeeper.services.campaign_summary import story_so_far, update_campaign_summary
+
+
+async def _add_session(db, campaign_id: int, number: int, recap: str) -> int:
+    session_id = await create_session(db, campaign_id, name=f"Session {number}")
+    await db.execute("UPDATE sessions SET session_number = ? WHERE id = ?", (number, session_id))
+    await db.execute(
+        "INSERT INTO summaries (session_id, type, content) VALUES (?, 'full', ?)",
+        (session_id, recap),
+    )
+    await db.commit()
+    return session_id
+
+
+async def _update(campaign_id: int):
+    return await update_campaign_summary(campaign_id, "http://test", None, "model")
+
+
+@patch("talekeeper.services.campaign_summary.llm_client.generate", new_callable=AsyncMock)
+async def test_new_sessions_are_folded_in(mock_gen, db):
+    """Each session appended after the covered ones costs one call and adds a version."""
+    cid = await create_campaign(db)
+    await _add_session(db, cid, 1, "The party met in Waterdeep.")
+    mock_gen.return_value = "Story through session 1."
+    first = await _update(cid)
+    assert first["version"] == 1
+    assert mock_gen.await_count == 1
+
+    await _add_session(db, cid, 2, "They fought a dragon.")
+    await _add_session(db, cid, 3, "They rested in town.")
+    mock_gen.reset_mock()
+    mock_gen.return_value = "Story through session 3."
+    latest = await _update(cid)
+
+    assert mock_gen.await_count == 2
+    # The first fold builds on the stored story
+    assert "Story through session 1." in mock_gen.await_args_list[0].args[3]
+    assert "They fought a dragon." in mock_gen.await_args_list[0].args[3]
+    assert latest["version"] == 3
+    assert latest["method"] == "incremental"
+    assert latest["content"] == "Story through session 3."
+
+    # Up to date: nothing to do
+    mock_gen.reset_mock()
+    assert (await _update(cid))["version"] == 3
+    mock_gen.assert_not_awaited()
+
+
+@patch("talekeeper.services.campaign_summary.llm_client.generate", new_callable=AsyncMock)
+async def test_changed_old_session_rebuilds_hierarchically(mock_gen, db, monkeypatch):
+    """Editing an earlier session's summary rebuilds the story from merged groups of recaps."""
+    monkeypatch.setattr(campaign_summary, "ROLLUP_FANIN", 2)
+    mock_gen.return_value = "Merged story."
+    cid = await create_campaign(db)
+    sids = [await _add_session(db, cid, n, f"Recap {n}.") for n in range(1, 6)]
+    await _update(cid)
+    # 5 recaps -> 3 merges -> 2 merges -> 1
+    assert mock_gen.await_count == 6
+
+    await db.execute(
+        "UPDATE summaries SET content = 'Recap 2, corrected.' WHERE session_id = ?", (sids[1],)
+    )
+    await db.commit()
+    assert (await story_so_far(cid))["stale"] is True
+
+    mock_gen.reset_mock()
+    latest = await _update(cid)
+
+    assert mock_gen.await_count == 6
+    assert latest["method"] == "rebuild"
+    assert latest["version"] == 2
+    assert [s[0] for s in latest["sessions"]] == sids
+    assert (await story_so_far(cid))["stale"] is False
+
+
+@patch("talekeeper.services.campaign_summary.llm_client.generate", new_callable=AsyncMock)
+async def test_partial_summaries_are_not_covered(mock_gen, db):
+    """A summary still streaming (or cut off) is left out of the story."""
+    mock_gen.return_value = "Story."
+    cid = await create_campaign(db)
+    await _add_session(db, cid, 1, "The party met.")
+    sid = await create_session(db, cid)
+    await db.execute(
+        "INSERT INTO summaries (session_id, type, content, is_partial) VALUES (?, 'full', 'Half a', 1)",
+        (sid,),
+    )
+    await db.commit()
+
+    latest = await _update(cid)
+
+    assert len(latest["sessions"]) == 1
+    assert (await story_so_far(cid))["sessions_summarized"] == 1
@@ -1,5 +1,9 @@
 """Tests for the speaker diarization service (diarize library)."""
 
+import asyncio
+import threading
+import time
+
 import pytest
 import soundfile as sf
 import tempfile
@@ -8,6 +12,8 @@ from pathlib import Path
 
 import numpy as np
 
+import talekeeper.services.diarization as diarization_mod
+from talekeeper.services.cancellation import OperationCancelled, check_cancelled
 from talekeeper.services.diarization import (
     _merge_segments,
     _build_segments_from_labels,
@@ -22,9 +28,13 @@ from talekeeper.services.diarization import (
     _split_transcript_segments,
     _detect_speaker_changes,
     align_speakers_with_transcript,
+    cluster_part_embeddings,
+    link_part_clusters,
     diarize,
     diarize_with_signatures,
     _resolve_hf_token,
+    resolve_pipeline_mode,
+    start_embedding_prefetch,
     unload_models,
     SpeakerSegment,
     CHANGE_DETECTION_WINDOW,
@@ -33,6 +43,12 @@ from talekeeper.services.diarization import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_speaker_model(monkeypatch):
+    """Each test gets its own (mocked) WeSpeaker model instead of a cached one."""
+    monkeypatch.setattr(diarization_mod, "_speaker_model", None)
+
+
 # ---- _compress_dynamic_range tests ----
 
 
@@ -617,6 +633,34 @@ def test_extract_fine_stride_embeddings(mock_wespeaker_module, mock_sf):
         assert ts <= 5.0
 
 
+@patch("talekeeper.services.diarization.sf")
+def test_speaker_model_is_released_after_extraction(mock_sf, monkeypatch):
+    """Extraction outside a job (eager preprocessing) does not leave WeSpeaker pinned."""
+    from talekeeper.services import model_residency
+
+    residency = model_residency.ModelResidency(budget_bytes=10 * model_residency.GB)
+    monkeypatch.setattr(model_residency, "residency", residency)
+    speaker = MagicMock()
+    speaker.extract_embedding.return_value = np.random.randn(1, 256).astype(np.float32)
+
+    def _get_speaker_model():
+        if not residency.touch("diarization"):
+            residency.admit("diarization", "wespeaker-en", MagicMock())
+        return speaker
+
+    monkeypatch.setattr(diarization_mod, "_get_speaker_model", _get_speaker_model)
+    mock_sf.read.return_value = (np.zeros(48000, dtype=np.float32), 16000)
+    segments = [MagicMock(start=0.0, end=3.0)]
+
+    _extract_embeddings_with_progress(Path("part.wav"), segments)
+    _extract_fine_stride_embeddings(np.zeros(48000, dtype=np.float32), 16000, 0.0, 3.0)
+    mock_sf.read.side_effect = OSError("unreadable")
+    with pytest.raises(OSError):
+        _extract_embeddings_with_progress(Path("part.wav"), segments)
+
+    assert residency.stats()["resident"][0]["users"] == 0
+
+
 def test_find_speaker_change_points_detects_transitions():
     """_find_speaker_change_points detects change points at speaker transitions."""
     # Create embeddings: 5 from speaker A (dim 0), 5 from speaker B (dim 1)
@@ -901,3 +945,104 @@ def test_split_transcript_segments_crosstalk_split_then_align():
     assert speaker_sub.get("is_overlap", 0) == 0
     assert crosstalk_sub.get("is_overlap") == 1
     assert crosstalk_sub.get("speaker_label") is None
+
+
+# ---- Cross-part linking tests ----
+
+
+def _unit(dim: int, noise: float = 0.0) -> np.ndarray:
+    v = np.zeros(256, dtype=np.float32)
+    v[dim] = 1.0
+    v[255] = noise
+    return v / np.linalg.norm(v)
+
+
+def test_link_part_clusters_consistent_labels():
+    """The same voice gets the same session label in every part, even if local ids differ."""
+    part1 = np.stack([_unit(0), _unit(0, 0.1), _unit(1), _unit(1, 0.1)])
+    part2 = np.stack([_unit(1, 0.05), _unit(0, 0.05), _unit(2)])
+    # Part 2's local cluster ids are swapped relative to part 1 and add a new speaker
+    linked = link_part_clusters([part1, part2], [np.array([0, 0, 1, 1]), np.array([0, 1, 2])])
+
+    assert linked[0].tolist() == [0, 0, 1, 1]
+    assert linked[1].tolist() == [1, 0, 2]
+
+
+def test_link_part_clusters_enforces_num_speakers():
+    """Extra session speakers are merged down to the requested count."""
+    part1 = np.stack([_unit(0), _unit(1)])
+    part2 = np.stack([_unit(2), _unit(0, 0.2)])
+    linked = link_part_clusters(
+        [part1, part2], [np.array([0, 1]), np.array([0, 1])], num_speakers=2,
+    )
+
+    assert len(set(np.concatenate(linked).tolist())) == 2
+    # Speaker 0 stays consistent across parts
+    assert linked[0][0] == linked[1][1]
+
+
+def test_cluster_part_embeddings_clusters_each_part_separately():
+    """Each part is clustered on its own, never the concatenated matrix."""
+    part1 = (np.stack([_unit(0)] * 4 + [_unit(1)] * 4), [(float(i), i + 1.0, i) for i in range(8)])
+    part2 = (np.stack([_unit(1)] * 4 + [_unit(0)] * 4), [(100.0 + i, 101.0 + i, 8 + i) for i in range(8)])
+
+    def _fake_cluster(emb, **kwargs):
+        return (emb[:, 1] > 0.5).astype(int), None
+
+    mock_cluster = MagicMock(side_effect=_fake_cluster)
+    with patch.dict("sys.modules", {"diarize.clustering": MagicMock(cluster_speakers=mock_cluster)}):
+        embeddings, subsegments, labels = cluster_part_embeddings([part1, part2])
+
+    assert [call.args[0].shape[0] for call in mock_cluster.call_args_list] == [8, 8]
+    assert embeddings.shape == (16, 256)
+    assert len(subsegments) == 16
+    assert labels[:4].tolist() == labels[12:].tolist()
+    assert labels[4:8].tolist() == labels[8:12].tolist()
+    assert labels[0] != labels[4]
+
+
+# ---- Pipeline mode resolution tests ----
+
+
+async def test_resolve_pipeline_mode_settings_override_env(db):
+    """The pipeline_mode setting wins over TALEKEEPER_PIPELINE_MODE."""
+    await db.execute(
+        "INSERT OR REPLACE INTO settings (key, value) VALUES ('pipeline_mode', 'sequential')"
+    )
+    await db.commit()
+
+    with patch.dict("os.environ", {"TALEKEEPER_PIPELINE_MODE": "concurrent"}):
+        assert await resolve_pipeline_mode() == "sequential"
+
+
+async def test_resolve_pipeline_mode_defaults_by_core_count(db):
+    """Without configuration, concurrent mode is used only on multi-core hosts."""
+    with patch.dict("os.environ", {}, clear=True):
+        with patch("talekeeper.services.diarization.os.cpu_count", return_value=8):
+            assert await resolve_pipeline_mode() == "concurrent"
+        with patch("talekeeper.services.diarization.os.cpu_count", return_value=2):
+            assert await resolve_pipeline_mode() == "sequential"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_prefetch_stops_extracting(tmp_path):
+    """A job that stops waiting for its prefetch stops the worker thread too."""
+    wav = tmp_path / "prefetch.wav"
+    wav.write_bytes(b"RIFF")
+    started = threading.Event()
+
+    def slow_extract(wav_path, progress_callback=None):
+        started.set()
+        while True:
+            check_cancelled()
+            time.sleep(0.01)
+
+    with patch("talekeeper.services.audio.audio_to_wav", return_value=wav), \
+            patch("talekeeper.services.diarization.extract_speech_embeddings", side_effect=slow_extract):
+        prefetch = start_embedding_prefetch(tmp_path / "session.webm")
+        await asyncio.to_thread(started.wait, 5)
+        prefetch.cancel()
+        with pytest.raises(OperationCancelled):
+            await prefetch
+
+    assert not wav.exists()
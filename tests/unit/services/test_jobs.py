@@ -0,0 +1,352 @@
+"""Unit tests for the durable job queue."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+import talekeeper.services.jobs as mod
+from talekeeper.services.cancellation import (
+    CancelToken,
+    OperationCancelled,
+    cancellation_scope,
+    check_cancelled,
+)
+from talekeeper.services.jobs import (
+    JobConflictError,
+    enqueue_job,
+    get_job,
+    iter_job_events,
+    requeue_interrupted_jobs,
+)
+from conftest import create_campaign, create_session
+
+
+async def _collect(job_id: int, after: int = 0) -> list[tuple[str, dict]]:
+    return [(e.event, e.data) async for e in iter_job_events(job_id, after)]
+
+
+@pytest.mark.asyncio
+async def test_job_events_persist_and_replay_from_cursor(db, monkeypatch) -> None:
+    async def runner(job):
+        yield "phase", {"phase": "one"}
+        yield "done", {"value": job.params["value"]}
+
+    monkeypatch.setitem(mod._runners, "test", runner)
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+
+    job_id = await enqueue_job(session_id, "test", {"value": 7})
+    assert await _collect(job_id) == [("phase", {"phase": "one"}), ("done", {"value": 7})]
+    assert (await get_job(job_id))["status"] == "done"
+
+    # A late subscriber replays only what it has not seen yet
+    rows = await db.execute_fetchall(
+        "SELECT id FROM job_events WHERE job_id = ? ORDER BY id", (job_id,)
+    )
+    assert await _collect(job_id, after=rows[0]["id"]) == [("done", {"value": 7})]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_restores_previous_session_status(db, monkeypatch) -> None:
+    async def runner(job):
+        async with mod.get_db() as conn:
+            await conn.execute(
+                "UPDATE sessions SET status = 'transcribing' WHERE id = ?", (job.session_id,)
+            )
+        yield "phase", {"phase": "transcription"}
+        raise RuntimeError("model crashed")
+
+    monkeypatch.setitem(mod._runners, "test", runner)
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id, status="audio_ready")
+
+    job_id = await enqueue_job(session_id, "test")
+    events = await _collect(job_id)
+
+    assert events[-1] == ("error", {"message": "model crashed"})
+    job = await get_job(job_id)
+    assert job["status"] == "failed" and job["error"] == "model crashed"
+    rows = await db.execute_fetchall("SELECT status FROM sessions WHERE id = ?", (session_id,))
+    assert rows[0]["status"] == "audio_ready"
+
+
+@pytest.mark.asyncio
+async def test_second_job_for_session_conflicts(db, monkeypatch) -> None:
+    async def runner(job):
+        yield "done", {}
+
+    monkeypatch.setitem(mod._runners, "test", runner)
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+
+    job_id = await enqueue_job(session_id, "test")
+    with pytest.raises(JobConflictError) as exc_info:
+        await enqueue_job(session_id, "test")
+    assert exc_info.value.job_id == job_id
+
+    await _collect(job_id)
+    # Once finished, the session can be processed again
+    await _collect(await enqueue_job(session_id, "test"))
+
+
+@pytest.mark.asyncio
+async def test_interrupted_job_resumes_from_checkpoint(db, monkeypatch) -> None:
+    seen: list[dict] = []
+
+    async def runner(job):
+        seen.append(dict(job.checkpoint))
+        yield "done", {"attempts": job.attempts}
+
+    monkeypatch.setitem(mod._runners, "test", runner)
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+    # Simulate a job that was running when the process died
+    cursor = await db.execute(
+        "INSERT INTO jobs (session_id, kind, status, checkpoint, attempts) "
+        "VALUES (?, 'test', 'running', '{\"phase\": \"diarization\"}', 1)",
+        (session_id,),
+    )
+    await db.commit()
+    job_id = cursor.lastrowid
+
+    assert await requeue_interrupted_jobs() == 1
+    events = await _collect(job_id)
+
+    assert seen == [{"phase": "diarization"}]
+    assert events == [
+        ("resumed", {"checkpoint": {"phase": "diarization"}}),
+        ("done", {"attempts": 2}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_worker_prefers_jobs_that_reuse_a_resident_model(db, monkeypatch) -> None:
+    order: list[str] = []
+
+    async def runner(job):
+        order.append(job.kind)
+        yield "done", {}
+
+    for kind, model in (("summarize", "llm"), ("transcribe", "transcription")):
+        monkeypatch.setitem(mod._runners, kind, runner)
+        monkeypatch.setitem(mod._runner_models, kind, model)
+    monkeypatch.setattr(mod.residency, "resident_kinds", lambda: ["transcription"])
+    campaign_id = await create_campaign(db)
+    for kind in ("summarize", "transcribe"):
+        session_id = await create_session(db, campaign_id)
+        await db.execute(
+            "INSERT INTO jobs (session_id, kind) VALUES (?, ?)", (session_id, kind)
+        )
+    await db.commit()
+
+    await mod._worker()
+
+    # The warm Whisper model is reused before switching to the LLM job
+    assert order == ["transcribe", "summarize"]
+
+
+@pytest.mark.asyncio
+async def test_backlog_job_yields_to_interactive_work_at_checkpoint(db, monkeypatch) -> None:
+    order: list[str] = []
+
+    async def backlog_runner(job):
+        if job.checkpoint.get("phase") != "second":
+            order.append("backlog:first")
+            await job.save_checkpoint(phase="second")
+            # Interactive work arrives while the backlog job is running
+            await mod.enqueue_job(interactive_session, "interactive")
+            yield "phase", {"phase": "second"}
+        order.append("backlog:second")
+        yield "done", {}
+
+    async def interactive_runner(job):
+        order.append("interactive")
+        yield "done", {}
+
+    monkeypatch.setitem(mod._runners, "backlog", backlog_runner)
+    monkeypatch.setitem(mod._runners, "interactive", interactive_runner)
+    campaign_id = await create_campaign(db)
+    backlog_session = await create_session(db, campaign_id)
+    interactive_session = await create_session(db, campaign_id)
+
+    job_id = await enqueue_job(backlog_session, "backlog", priority=mod.PRIORITY_BACKLOG)
+    events = [event for event, _ in await _collect(job_id)]
+
+    assert order == ["backlog:first", "interactive", "backlog:second"]
+    assert events == ["phase", "preempted", "resumed", "done"]
+
+
+@pytest.mark.asyncio
+async def test_campaign_backlog_reports_throughput(db, monkeypatch) -> None:
+    async def transcribe(job):
+        async with mod.get_db() as conn:
+            await conn.execute(
+                "INSERT INTO transcript_segments (session_id, text, start_time, end_time) "
+                "VALUES (?, 'hi', 0, 1800)",
+                (job.session_id,),
+            )
+        yield "done", {}
+
+    monkeypatch.setitem(mod._runners, "process_all", transcribe)
+    campaign_id = await create_campaign(db)
+    pending = [await create_session(db, campaign_id, status="audio_ready") for _ in range(2)]
+    no_audio = await create_session(db, campaign_id)
+    for session_id in pending:
+        await db.execute("UPDATE sessions SET audio_path = 'x.wav' WHERE id = ?", (session_id,))
+    await db.commit()
+
+    result = await mod.enqueue_campaign_backlog(campaign_id)
+    assert [q["session_id"] for q in result["queued"]] == pending
+    assert no_audio not in [q["session_id"] for q in result["queued"]]
+    for queued in result["queued"]:
+        await _collect(queued["job_id"])
+
+    batch = await mod.get_batch(result["batch_id"])
+    assert batch["jobs"] == {"done": 2}
+    assert batch["finished"] is True
+    assert batch["audio_hours"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_job_rolls_back_and_frees_models(db, monkeypatch) -> None:
+    resume = asyncio.Event()
+
+    async def runner(job):
+        async with mod.get_db() as conn:
+            await conn.execute(
+                "UPDATE sessions SET status = 'transcribing' WHERE id = ?", (job.session_id,)
+            )
+            await conn.execute(
+                "INSERT INTO transcript_segments (session_id, text, start_time, end_time) "
+                "VALUES (?, 'partial', 0, 1)",
+                (job.session_id,),
+            )
+        yield "progress", {"chunk": 1}
+        await resume.wait()
+        yield "progress", {"chunk": 2}
+        yield "done", {}
+
+    free_models = AsyncMock()
+    monkeypatch.setattr(mod, "_free_models", free_models)
+    monkeypatch.setitem(mod._runners, "test", runner)
+    monkeypatch.setitem(mod._rollbacks, "test", mod.rollback_transcript)
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id, status="completed")
+    await db.execute("UPDATE sessions SET audio_path = 'x.wav' WHERE id = ?", (session_id,))
+    await db.commit()
+
+    job_id = await enqueue_job(session_id, "test")
+    events = iter_job_events(job_id)
+    assert (await events.__anext__()).data == {"chunk": 1}
+    assert (await mod.cancel_session_job(session_id))["status"] == "running"
+    resume.set()
+    remaining = [e.event async for e in events]
+
+    # The job stops at the next event instead of running to completion
+    assert remaining == ["progress", "cancelled"]
+    assert (await get_job(job_id))["status"] == "cancelled"
+    rows = await db.execute_fetchall("SELECT status FROM sessions WHERE id = ?", (session_id,))
+    assert rows[0]["status"] == "audio_ready"
+    assert await db.execute_fetchall(
+        "SELECT 1 FROM transcript_segments WHERE session_id = ?", (session_id,)
+    ) == []
+    free_models.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_cancelling_a_queued_job_never_runs_it(db, monkeypatch) -> None:
+    ran: list[int] = []
+
+    async def runner(job):
+        ran.append(job.id)
+        yield "done", {}
+
+    monkeypatch.setitem(mod._runners, "test", runner)
+    monkeypatch.setattr(mod, "ensure_worker", lambda: None)
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id, status="audio_ready")
+
+    job_id = await enqueue_job(session_id, "test")
+    assert (await mod.cancel_job(job_id))["status"] == "cancelled"
+    await mod._worker()
+
+    assert ran == []
+    assert await _collect(job_id) == [("cancelled", {"checkpoint": {}})]
+
+
+@pytest.mark.asyncio
+async def test_cancellation_is_visible_in_worker_threads() -> None:
+    token = CancelToken()
+    with cancellation_scope(token):
+        await asyncio.to_thread(check_cancelled)
+        token.cancel()
+        with pytest.raises(OperationCancelled):
+            await asyncio.to_thread(check_cancelled)
+    # Outside a scope there is nothing to cancel
+    check_cancelled()
+
+
+@pytest.mark.asyncio
+async def test_idle_job_yields_to_backlog_work_and_follows_its_parent(db, monkeypatch) -> None:
+    order: list[str] = []
+
+    async def pipeline(job):
+        if job.session_id == first_session:
+            order.append("pipeline:first")
+            job.follow_up = ("idle", {}, mod.PRIORITY_IDLE)
+        else:
+            order.append("pipeline:second")
+        yield "done", {}
+
+    async def idle_runner(job):
+        if not job.checkpoint:
+            order.append("idle:first")
+            await job.save_checkpoint(window=1)
+            # Backlog work arrives while the idle job is running
+            await mod.enqueue_job(second_session, "pipeline", priority=mod.PRIORITY_BACKLOG)
+            yield "progress", {"window": 1}
+        order.append("idle:second")
+        yield "done", {}
+
+    monkeypatch.setitem(mod._runners, "pipeline", pipeline)
+    monkeypatch.setitem(mod._runners, "idle", idle_runner)
+    campaign_id = await create_campaign(db)
+    first_session = await create_session(db, campaign_id)
+    second_session = await create_session(db, campaign_id)
+
+    await enqueue_job(first_session, "pipeline", priority=mod.PRIORITY_BACKLOG)
+    await mod._worker_task
+    rows = await db.execute_fetchall("SELECT id FROM jobs WHERE kind = 'idle'")
+    events = [event for event, _ in await _collect(rows[0]["id"])]
+
+    # The follow-up is queued once its parent is done, then yields to backlog work
+    assert order == ["pipeline:first", "idle:first", "pipeline:second", "idle:second"]
+    assert events == ["progress", "preempted", "resumed", "done"]
+
+
+@pytest.mark.asyncio
+async def test_supersedable_job_is_cancelled_by_new_session_job(db, monkeypatch) -> None:
+    ran: list[str] = []
+
+    async def runner(job):
+        ran.append(job.kind)
+        yield "done", {}
+
+    monkeypatch.setitem(mod._runners, "refine", runner)
+    monkeypatch.setitem(mod._runners, "retranscribe", runner)
+    monkeypatch.setattr(mod, "_supersedable", {"refine"})
+    monkeypatch.setattr(mod, "ensure_worker", lambda: None)
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+
+    refine_id = await enqueue_job(session_id, "refine", priority=mod.PRIORITY_IDLE)
+    # Queuing other work for the session replaces the refinement instead of conflicting
+    job_id = await enqueue_job(session_id, "retranscribe")
+    assert (await get_job(refine_id))["status"] == "cancelled"
+    with pytest.raises(JobConflictError):
+        await enqueue_job(session_id, "refine", priority=mod.PRIORITY_IDLE)
+
+    await mod._worker()
+    assert ran == ["retranscribe"]
+    assert (await get_job(job_id))["status"] == "done"
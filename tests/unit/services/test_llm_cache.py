@@ -0,0 +1,97 @@
+"""Tests for the persistent LLM response cache."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from talekeeper.services import llm_cache
+from talekeeper.services.llm_client import generate
+
+
+def _completion(text: str) -> MagicMock:
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=text))]
+    return response
+
+
+@pytest.fixture
+def provider():
+    """A stand-in OpenAI client whose completions are counted."""
+    client = AsyncMock()
+    client.chat.completions.create = AsyncMock(
+        side_effect=lambda **kwargs: _completion(f"answer {client.chat.completions.create.await_count}")
+    )
+    with (
+        patch("talekeeper.services.llm_client._is_ollama", new_callable=AsyncMock, return_value=False),
+        patch("talekeeper.services.llm_client.AsyncOpenAI", return_value=client),
+    ):
+        yield client.chat.completions.create
+
+
+async def _enable(db, **settings: str) -> None:
+    for key, value in {"llm_cache_enabled": "true", **settings}.items():
+        await db.execute("INSERT INTO settings (key, value) VALUES (?, ?)", (key, value))
+    await db.commit()
+
+
+async def test_cache_is_off_by_default(db, provider):
+    """Without opting in every call reaches the provider."""
+    await generate("http://test", None, "model", "prompt")
+    await generate("http://test", None, "model", "prompt")
+
+    assert provider.await_count == 2
+
+
+async def test_repeated_prompt_is_served_from_cache(db, provider):
+    """An identical request is answered from the cache; any change to the key is a miss."""
+    await _enable(db)
+    hits = llm_cache._counters["hits"]
+
+    first = await generate("http://test", None, "model", "prompt", system="sys")
+    second = await generate("http://test", None, "model", "prompt", system="sys")
+    assert first == second == "answer 1"
+    assert provider.await_count == 1
+    assert llm_cache._counters["hits"] == hits + 1
+
+    await generate("http://test", None, "model", "prompt", system="other")
+    await generate("http://test", None, "other-model", "prompt", system="sys")
+    assert provider.await_count == 3
+
+
+async def test_bypass_refreshes_the_cached_response(db, provider):
+    """Regenerating asks the provider again and later calls see the new answer."""
+    await _enable(db)
+
+    await generate("http://test", None, "model", "prompt")
+    with llm_cache.bypass():
+        fresh = await generate("http://test", None, "model", "prompt")
+    again = await generate("http://test", None, "model", "prompt")
+
+    assert fresh == "answer 2"
+    assert again == "answer 2"
+    assert provider.await_count == 2
+
+
+async def test_expired_entries_are_not_used(db, provider):
+    """Entries older than the TTL count as misses."""
+    await _enable(db, llm_cache_ttl_hours="1")
+
+    await generate("http://test", None, "model", "prompt")
+    await db.execute("UPDATE llm_cache SET created_at = datetime('now', '-2 hours')")
+    await db.commit()
+    await generate("http://test", None, "model", "prompt")
+
+    assert provider.await_count == 2
+
+
+async def test_least_recently_used_entries_are_evicted(db, provider):
+    """The cache keeps at most max_entries responses, dropping the least recently used."""
+    await _enable(db, llm_cache_max_entries="2")
+
+    for prompt in ("one", "two", "three"):
+        await generate("http://test", None, "model", prompt)
+
+    stats = await llm_cache.stats()
+    assert stats["entries"] == 2
+    await generate("http://test", None, "model", "one")
+    assert provider.await_count == 4
@@ -1,12 +1,14 @@
 """Tests for the LLM client service."""
 
+import asyncio
+
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 
 import httpx
 from openai import APIConnectionError
 
-from talekeeper.services import llm_client
+from talekeeper.services import llm_client, llm_metrics
 from talekeeper.services.llm_client import (
     health_check, generate, resolve_config, _is_ollama, unload_model, _ollama_cache,
 )
@@ -93,16 +95,14 @@ async def test_is_ollama_detects_ollama_endpoint():
         json={"models": [{"name": "llama3.1:8b"}]},
         request=httpx.Request("GET", "http://localhost:11434/api/tags"),
     )
-    with patch("talekeeper.services.llm_client.httpx.AsyncClient") as MockClient:
-        mock_client = AsyncMock()
-        MockClient.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-        MockClient.return_value.__aexit__ = AsyncMock(return_value=False)
+    mock_client = AsyncMock()
+    with patch("talekeeper.services.llm_client._http_client", return_value=mock_client):
         mock_client.get = AsyncMock(return_value=mock_response)
 
         result = await _is_ollama("http://localhost:11434/v1")
 
         assert result is True
-        mock_client.get.assert_awaited_once_with("http://localhost:11434/api/tags")
+        mock_client.get.assert_awaited_once_with("http://localhost:11434/api/tags", timeout=5.0)
 
 
 async def test_is_ollama_returns_false_for_non_ollama():
@@ -112,10 +112,8 @@ async def test_is_ollama_returns_false_for_non_ollama():
         text="Not Found",
         request=httpx.Request("GET", "http://openai.example.com/api/tags"),
     )
-    with patch("talekeeper.services.llm_client.httpx.AsyncClient") as MockClient:
-        mock_client = AsyncMock()
-        MockClient.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-        MockClient.return_value.__aexit__ = AsyncMock(return_value=False)
+    mock_client = AsyncMock()
+    with patch("talekeeper.services.llm_client._http_client", return_value=mock_client):
         mock_client.get = AsyncMock(return_value=mock_response)
 
         result = await _is_ollama("http://openai.example.com/v1")
@@ -125,10 +123,8 @@ async def test_is_ollama_returns_false_for_non_ollama():
 
 async def test_is_ollama_returns_false_on_connection_error():
     """_is_ollama returns False when the endpoint is unreachable."""
-    with patch("talekeeper.services.llm_client.httpx.AsyncClient") as MockClient:
-        mock_client = AsyncMock()
-        MockClient.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-        MockClient.return_value.__aexit__ = AsyncMock(return_value=False)
+    mock_client = AsyncMock()
+    with patch("talekeeper.services.llm_client._http_client", return_value=mock_client):
         mock_client.get = AsyncMock(side_effect=httpx.ConnectError("refused"))
 
         result = await _is_ollama("http://unreachable:11434/v1")
@@ -146,9 +142,10 @@ async def test_is_ollama_caches_result():
 # ---- generate() Ollama extra_body tests (3.5) ----
 
 
+@patch("talekeeper.services.llm_client._ollama_context_length", new_callable=AsyncMock, return_value=None)
 @patch("talekeeper.services.llm_client._is_ollama", new_callable=AsyncMock, return_value=True)
 @patch("talekeeper.services.llm_client.AsyncOpenAI")
-async def test_generate_injects_num_ctx_for_ollama(MockOpenAI, mock_is_ollama):
+async def test_generate_injects_num_ctx_for_ollama(MockOpenAI, mock_is_ollama, mock_length):
     """generate() injects extra_body with num_ctx when Ollama is detected."""
     mock_client = AsyncMock()
     MockOpenAI.return_value = mock_client
@@ -160,7 +157,46 @@ async def test_generate_injects_num_ctx_for_ollama(MockOpenAI, mock_is_ollama):
     await generate("http://localhost:11434/v1", None, "llama3.1:8b", "prompt")
 
     call_kwargs = mock_client.chat.completions.create.call_args
-    assert call_kwargs.kwargs["extra_body"] == {"options": {"num_ctx": 32768}}
+    # A short prompt gets the smallest context size
+    assert call_kwargs.kwargs["extra_body"] == {
+        "options": {"num_ctx": 4096},
+        "keep_alive": llm_client.OLLAMA_KEEP_ALIVE_SECONDS,
+    }
+
+
+@patch("talekeeper.services.llm_client._ollama_context_length", new_callable=AsyncMock, return_value=16384)
+@patch("talekeeper.services.llm_client._is_ollama", new_callable=AsyncMock, return_value=True)
+@patch("talekeeper.services.llm_client.AsyncOpenAI")
+async def test_num_ctx_fits_prompt_and_sticks_while_loaded(MockOpenAI, mock_is_ollama, mock_length, monkeypatch):
+    """num_ctx grows with the prompt up to the model's limit, and is not shrunk while loaded."""
+    from talekeeper.services import model_residency
+
+    # Released calls leave the model warm within the budget
+    residency = model_residency.ModelResidency(budget_bytes=100 * model_residency.GB)
+    monkeypatch.setattr(model_residency, "residency", residency)
+    mock_client = AsyncMock()
+    MockOpenAI.return_value = mock_client
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="response"))]
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+    base_url = "http://localhost:11434/v1"
+
+    def num_ctx():
+        return mock_client.chat.completions.create.call_args.kwargs["extra_body"]["options"]["num_ctx"]
+
+    await generate(base_url, None, "llama3.1:8b", "word " * 3000)
+    assert num_ctx() == 8192
+    # Capped at the model's context length
+    await generate(base_url, None, "llama3.1:8b", "word " * 50000)
+    assert num_ctx() == 16384
+    # A short prompt reuses the loaded size rather than reloading the model
+    await generate(base_url, None, "llama3.1:8b", "short")
+    assert num_ctx() == 16384
+
+    with patch("talekeeper.services.llm_client._http_client", return_value=AsyncMock()):
+        await llm_client.unload_model(base_url, None, "llama3.1:8b")
+    await generate(base_url, None, "llama3.1:8b", "short")
+    assert num_ctx() == 4096
 
 
 @patch("talekeeper.services.llm_client._is_ollama", new_callable=AsyncMock, return_value=False)
@@ -191,10 +227,8 @@ async def test_unload_model_sends_keep_alive_zero(mock_is_ollama):
         json={},
         request=httpx.Request("POST", "http://localhost:11434/api/generate"),
     )
-    with patch("talekeeper.services.llm_client.httpx.AsyncClient") as MockClient:
-        mock_client = AsyncMock()
-        MockClient.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-        MockClient.return_value.__aexit__ = AsyncMock(return_value=False)
+    mock_client = AsyncMock()
+    with patch("talekeeper.services.llm_client._http_client", return_value=mock_client):
         mock_client.post = AsyncMock(return_value=mock_response)
 
         await unload_model("http://localhost:11434/v1", None, "llama3.1:8b")
@@ -208,6 +242,194 @@ async def test_unload_model_sends_keep_alive_zero(mock_is_ollama):
 @patch("talekeeper.services.llm_client._is_ollama", new_callable=AsyncMock, return_value=False)
 async def test_unload_model_noop_for_non_ollama(mock_is_ollama):
     """unload_model is a no-op for non-Ollama providers."""
-    with patch("talekeeper.services.llm_client.httpx.AsyncClient") as MockClient:
+    with patch("talekeeper.services.llm_client._http_client") as mock_http:
         await unload_model("http://openai.example.com/v1", "key", "gpt-4")
-        MockClient.assert_not_called()
+        mock_http.assert_not_called()
+
+
+async def test_provider_concurrency_limit(db, monkeypatch):
+    """generate() never has more requests in flight to one provider than its limit."""
+    monkeypatch.setenv("TALEKEEPER_LLM_MAX_CONCURRENCY", "2")
+    config = await resolve_config()
+    assert config["max_concurrency"] == 2
+
+    in_flight = 0
+    peak = 0
+
+    async def create(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return MagicMock(choices=[MagicMock(message=MagicMock(content="ok"))])
+
+    _ollama_cache[config["base_url"]] = False
+    with patch("talekeeper.services.llm_client.AsyncOpenAI") as MockOpenAI:
+        MockOpenAI.return_value.chat.completions.create = create
+        results = await asyncio.gather(*(
+            generate(config["base_url"], None, config["model"], f"prompt {i}") for i in range(6)
+        ))
+
+    assert results == ["ok"] * 6
+    assert peak == 2
+
+
+@patch("talekeeper.services.llm_client._is_ollama", new_callable=AsyncMock, return_value=True)
+async def test_context_window_from_ollama(mock_is_ollama, monkeypatch):
+    """context_window reads the model's context length from Ollama, capped at the requested num_ctx."""
+    monkeypatch.setattr(llm_client, "_context_cache", {})
+    show = httpx.Response(
+        200,
+        json={"model_info": {"llama.context_length": 8192, "llama.embedding_length": 4096}},
+        request=httpx.Request("POST", "http://localhost:11434/api/show"),
+    )
+    mock_client = AsyncMock()
+    with patch("talekeeper.services.llm_client._http_client", return_value=mock_client):
+        mock_client.post = AsyncMock(return_value=show)
+
+        assert await llm_client.context_window("http://localhost:11434/v1", "llama3.1:8b") == 8192
+        # Cached per model
+        assert await llm_client.context_window("http://localhost:11434/v1", "llama3.1:8b") == 8192
+        mock_client.post.assert_awaited_once_with(
+            "http://localhost:11434/api/show", json={"model": "llama3.1:8b"}, timeout=5.0
+        )
+
+
+@patch("talekeeper.services.llm_client._is_ollama", new_callable=AsyncMock, return_value=False)
+async def test_context_window_setting_and_default(mock_is_ollama, db):
+    """Other providers use the configured context size, or the default."""
+    assert await llm_client.context_window("http://test", "model") == llm_client.DEFAULT_CONTEXT_TOKENS
+
+    await db.execute("INSERT INTO settings (key, value) VALUES ('llm_context_tokens', '16000')")
+    await db.commit()
+
+    assert await llm_client.context_window("http://test", "model") == 16000
+
+
+def _stream_chunk(text: str | None) -> MagicMock:
+    return MagicMock(choices=[MagicMock(delta=MagicMock(content=text))], usage=None)
+
+
+@patch("talekeeper.services.llm_client._is_ollama", new_callable=AsyncMock, return_value=False)
+@patch("talekeeper.services.llm_client.AsyncOpenAI")
+async def test_generate_stream_yields_deltas(MockOpenAI, mock_is_ollama):
+    """generate_stream yields each content delta and closes the provider stream."""
+    stream = MagicMock()
+    stream.__aiter__.return_value = [_stream_chunk("Once "), _stream_chunk(None), _stream_chunk("upon")]
+    stream.close = AsyncMock()
+    mock_client = AsyncMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=stream)
+    MockOpenAI.return_value = mock_client
+
+    pieces = [p async for p in llm_client.generate_stream("http://test", None, "model", "prompt")]
+
+    assert pieces == ["Once ", "upon"]
+    assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+    stream.close.assert_awaited_once()
+
+
+@patch("talekeeper.services.llm_client._make_client")
+async def test_health_check_is_cached(mock_make):
+    """A successful health check is reused until it expires, unless a fresh one is asked for."""
+    mock_client = AsyncMock()
+    mock_make.return_value = mock_client
+    mock_client.chat.completions.create = AsyncMock()
+
+    assert await health_check("http://test", None, "test-model") == {"status": "ok"}
+    assert await health_check("http://test", None, "test-model") == {"status": "ok"}
+    assert mock_client.chat.completions.create.await_count == 1
+
+    await health_check("http://test", None, "test-model", fresh=True)
+    assert mock_client.chat.completions.create.await_count == 2
+
+
+@patch("talekeeper.services.llm_client._is_ollama", new_callable=AsyncMock, return_value=False)
+@patch("talekeeper.services.llm_client.AsyncOpenAI")
+async def test_generate_retries_transient_errors(MockOpenAI, mock_is_ollama, monkeypatch):
+    """generate() retries connection errors and records the retry and the call."""
+    monkeypatch.setattr(llm_client, "RETRY_BASE_DELAY", 0.0)
+    llm_metrics.reset()
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="Generated text"))]
+    mock_response.usage = MagicMock(prompt_tokens=12, completion_tokens=3)
+    MockOpenAI.return_value.chat.completions.create = AsyncMock(
+        side_effect=[APIConnectionError(request=MagicMock()), mock_response]
+    )
+
+    assert await generate("http://test", None, "model", "prompt") == "Generated text"
+
+    metrics = llm_metrics.stats()["models"]["model"]
+    assert metrics["calls"] == 1
+    assert metrics["retries"] == 1
+    assert metrics["errors"] == 0
+    assert metrics["prompt_tokens"] == 12
+    assert metrics["completion_tokens"] == 3
+
+
+@patch("talekeeper.services.llm_client._is_ollama", new_callable=AsyncMock, return_value=False)
+@patch("talekeeper.services.llm_client.AsyncOpenAI")
+async def test_generate_gives_up_after_max_retries(MockOpenAI, mock_is_ollama, monkeypatch):
+    """generate() raises once the retries are used up and does not retry other errors."""
+    monkeypatch.setattr(llm_client, "RETRY_BASE_DELAY", 0.0)
+    llm_metrics.reset()
+    create = AsyncMock(side_effect=APIConnectionError(request=MagicMock()))
+    MockOpenAI.return_value.chat.completions.create = create
+
+    with pytest.raises(APIConnectionError):
+        await generate("http://test", None, "model", "prompt")
+    assert create.await_count == llm_client.MAX_RETRIES + 1
+
+    create.reset_mock(side_effect=True)
+    create.side_effect = ValueError("bad request")
+    with pytest.raises(ValueError):
+        await generate("http://test", None, "model", "prompt")
+    assert create.await_count == 1
+    assert llm_metrics.stats()["models"]["model"]["errors"] == 2
+
+
+@patch("talekeeper.services.llm_client.AsyncOpenAI")
+async def test_clients_are_pooled(MockOpenAI):
+    """One client is kept per base URL and API key."""
+    MockOpenAI.side_effect = lambda **kwargs: MagicMock()
+
+    first = llm_client._make_client("http://test", None)
+    assert llm_client._make_client("http://test", None) is first
+    assert llm_client._make_client("http://test", "key") is not first
+    assert MockOpenAI.call_args.kwargs["max_retries"] == 0
+
+
+@patch("talekeeper.services.llm_client._ollama_context_length", new_callable=AsyncMock, return_value=None)
+@patch("talekeeper.services.llm_client._is_ollama", new_callable=AsyncMock, return_value=True)
+@patch("talekeeper.services.llm_client.AsyncOpenAI")
+async def test_ollama_calls_release_the_model(MockOpenAI, mock_is_ollama, mock_length, monkeypatch):
+    """The model is in use only while calls are running, including ones that fail."""
+    from talekeeper.services import model_residency
+
+    residency = model_residency.ModelResidency(budget_bytes=100 * model_residency.GB)
+    monkeypatch.setattr(model_residency, "residency", residency)
+    monkeypatch.setattr(llm_client, "RETRY_BASE_DELAY", 0.0)
+    started, finish = asyncio.Event(), asyncio.Event()
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="response"))]
+
+    async def _create(**kwargs):
+        started.set()
+        await finish.wait()
+        return mock_response
+
+    MockOpenAI.return_value.chat.completions.create = _create
+    base_url = "http://localhost:11434/v1"
+    calls = [asyncio.create_task(generate(base_url, None, "llama3", f"prompt {i}")) for i in range(2)]
+    await started.wait()
+    await asyncio.sleep(0.05)
+    assert residency.stats()["resident"][0]["users"] == 2
+
+    finish.set()
+    await asyncio.gather(*calls)
+    assert residency.stats()["resident"][0]["users"] == 0
+
+    MockOpenAI.return_value.chat.completions.create = AsyncMock(side_effect=ValueError("bad request"))
+    with pytest.raises(ValueError):
+        await generate(base_url, None, "llama3", "prompt")
+    assert residency.stats()["resident"][0]["users"] == 0
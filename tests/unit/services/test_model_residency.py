@@ -0,0 +1,85 @@
+"""Tests for the model residency scheduler."""
+
+from unittest.mock import MagicMock
+
+from talekeeper.services.model_residency import GB, ModelResidency
+
+
+def _load(residency: ModelResidency, kind: str, name: str, size_gb: float) -> MagicMock:
+    unload = MagicMock()
+    residency.prepare(kind, name, int(size_gb * GB))
+    residency.admit(kind, name, unload, int(size_gb * GB))
+    return unload
+
+
+def test_released_models_stay_warm_within_budget() -> None:
+    residency = ModelResidency(budget_bytes=10 * GB)
+    unload_whisper = _load(residency, "transcription", "large-v3", 3)
+    residency.release("transcription")
+
+    assert residency.is_resident("transcription", "large-v3")
+    unload_whisper.assert_not_called()
+
+    residency.touch("transcription")
+    stats = residency.stats()
+    assert stats["counters"]["transcription"] == {"loads": 1, "hits": 1, "evictions": 0}
+    assert stats["resident_bytes"] == 3 * GB
+
+
+def test_load_evicts_least_recently_used_idle_model() -> None:
+    residency = ModelResidency(budget_bytes=12 * GB)
+    unload_whisper = _load(residency, "transcription", "large-v3", 3)
+    residency.release("transcription")
+    unload_llm = _load(residency, "llm", "llama3", 5)
+    residency.release("llm")
+
+    # FLUX needs 6 GB: dropping Whisper (older) alone makes it fit
+    _load(residency, "image_generation", "flux", 6)
+
+    unload_whisper.assert_called_once()
+    unload_llm.assert_not_called()
+    assert residency.resident_kinds() == ["image_generation", "llm"]
+    assert residency.stats()["counters"]["transcription"]["evictions"] == 1
+
+
+def test_models_in_use_are_never_evicted() -> None:
+    residency = ModelResidency(budget_bytes=4 * GB)
+    unload_whisper = _load(residency, "transcription", "large-v3", 3)
+
+    _load(residency, "diarization", "wespeaker-en", 2)
+
+    unload_whisper.assert_not_called()
+    assert residency.resident_kinds() == ["diarization", "transcription"]
+
+    # Once released, the over-budget model goes
+    residency.release("transcription")
+    unload_whisper.assert_called_once()
+    assert not residency.is_resident("transcription")
+
+
+def test_loading_another_model_of_the_same_kind_replaces_it() -> None:
+    residency = ModelResidency(budget_bytes=10 * GB)
+    unload_small = _load(residency, "transcription", "small", 0.5)
+
+    with residency.loading("transcription", "large-v3", MagicMock()):
+        pass
+
+    unload_small.assert_called_once()
+    assert residency.is_resident("transcription", "large-v3")
+    assert residency.stats()["counters"]["transcription"]["loads"] == 2
+
+
+def test_model_stays_in_use_until_every_user_releases() -> None:
+    residency = ModelResidency(budget_bytes=4 * GB)
+    unload_llm = _load(residency, "llm", "llama3", 3)
+    assert residency.touch("llm", "llama3")
+    assert not residency.touch("llm", "mistral")
+
+    # One of two concurrent callers finishing does not unpin the model
+    residency.release("llm")
+    _load(residency, "diarization", "wespeaker-en", 2)
+    unload_llm.assert_not_called()
+
+    residency.release("llm")
+    unload_llm.assert_called_once()
+    assert residency.stats()["resident"][0]["users"] == 1
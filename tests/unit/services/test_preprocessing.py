@@ -0,0 +1,130 @@
+"""Unit tests for eager audio pre-processing."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from talekeeper.services.audio import AudioInfo
+from talekeeper.services.preprocessing import (
+    adopt_embedding_prefetch,
+    discard_preprocessed_wav,
+    invalidate_preprocessing,
+    load_preprocessed,
+    preprocessed_embeddings,
+    preprocessing_pending,
+    schedule_preprocessing,
+)
+
+EMBEDDINGS = np.ones((2, 4), dtype=np.float32)
+SUBSEGMENTS = [(0.0, 1.5, 0), (1.5, 3.0, 0)]
+
+
+def _decode(src: Path, dst: Path) -> None:
+    dst.write_bytes(b"RIFF")
+
+
+@pytest.fixture
+def mock_pipeline():
+    info = AudioInfo(duration=3.0, codec="opus", sample_rate=48000, channels=2, format_name="webm")
+    with (
+        patch("talekeeper.services.audio.probe_audio", return_value=info),
+        patch("talekeeper.services.audio_merge.decode_to_processing_wav", side_effect=_decode) as decode,
+        patch("talekeeper.services.audio_parts.wav_duration", return_value=3.0),
+        patch(
+            "talekeeper.services.diarization.extract_speech_embeddings",
+            return_value=(EMBEDDINGS, SUBSEGMENTS),
+        ) as extract,
+    ):
+        yield decode, extract
+
+
+@pytest.mark.asyncio
+async def test_results_are_reused_until_the_source_changes(db, tmp_path: Path, mock_pipeline) -> None:
+    decode, _ = mock_pipeline
+    source = tmp_path / "1.webm"
+    source.write_bytes(b"audio")
+    cache_dir = tmp_path / "preprocessed"
+
+    await (await schedule_preprocessing(source, cache_dir))
+    preprocessed = await load_preprocessed(source)
+    assert preprocessed.wav_path.exists() and preprocessed.duration == 3.0
+    embeddings, subsegments = await preprocessed_embeddings(source)
+    np.testing.assert_array_equal(embeddings, EMBEDDINGS)
+    assert subsegments == SUBSEGMENTS
+    rows = await db.execute_fetchall("SELECT codec, channels, status FROM audio_preprocessing")
+    assert dict(rows[0]) == {"codec": "opus", "channels": 2, "status": "done"}
+
+    # Already cached: nothing new is scheduled
+    assert await schedule_preprocessing(source, cache_dir) is None
+    assert decode.call_count == 1
+
+    # A replaced file never matches the old results
+    source.write_bytes(b"other audio")
+    assert await load_preprocessed(source) is None
+
+
+@pytest.mark.asyncio
+async def test_discarding_the_wav_keeps_embeddings(db, tmp_path: Path, mock_pipeline) -> None:
+    source = tmp_path / "1.webm"
+    source.write_bytes(b"audio")
+
+    await (await schedule_preprocessing(source, tmp_path / "preprocessed"))
+    wav_path = (await load_preprocessed(source)).wav_path
+    await discard_preprocessed_wav(source)
+
+    assert not wav_path.exists()
+    preprocessed = await load_preprocessed(source)
+    assert preprocessed.wav_path is None
+    assert preprocessed.speech_embeddings is not None
+
+    await invalidate_preprocessing(source)
+    assert await load_preprocessed(source) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_embedding_leaves_only_the_decoded_wav(db, tmp_path: Path, mock_pipeline) -> None:
+    _, extract = mock_pipeline
+    extract.side_effect = RuntimeError("no speech model")
+    source = tmp_path / "1.webm"
+    source.write_bytes(b"audio")
+
+    await (await schedule_preprocessing(source, tmp_path / "preprocessed"))
+
+    assert await preprocessed_embeddings(source) is None
+    assert (await load_preprocessed(source)).wav_path is not None
+    rows = await db.execute_fetchall("SELECT status, error FROM audio_preprocessing")
+    assert dict(rows[0]) == {"status": "failed", "error": "no speech model"}
+
+
+@pytest.mark.asyncio
+async def test_disabled_by_env(db, tmp_path: Path, monkeypatch, mock_pipeline) -> None:
+    monkeypatch.setenv("TALEKEEPER_EAGER_PREPROCESSING", "false")
+    source = tmp_path / "1.webm"
+    source.write_bytes(b"audio")
+
+    assert await schedule_preprocessing(source, tmp_path / "preprocessed") is None
+    assert await load_preprocessed(source) is None
+
+
+@pytest.mark.asyncio
+async def test_adopted_prefetch_is_cached_for_the_resumed_job(db, tmp_path: Path) -> None:
+    """A preempted job's embedding extraction is waited for instead of redone."""
+    source = tmp_path / "1.webm"
+    source.write_bytes(b"audio")
+    release = asyncio.Event()
+
+    async def prefetch():
+        await release.wait()
+        return EMBEDDINGS, SUBSEGMENTS
+
+    adopt_embedding_prefetch(source, tmp_path / "preprocessed", prefetch())
+    assert preprocessing_pending(source)
+
+    release.set()
+    embeddings, subsegments = await preprocessed_embeddings(source)
+    np.testing.assert_array_equal(embeddings, EMBEDDINGS)
+    assert subsegments == SUBSEGMENTS
+    assert not preprocessing_pending(source)
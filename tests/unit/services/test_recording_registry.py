@@ -0,0 +1,78 @@
+"""Tests for the per-session recording registry."""
+
+from pathlib import Path
+
+import pytest
+
+from talekeeper.services.recording_registry import (
+    DEFAULT_MAX_CONCURRENT_RECORDINGS,
+    RecordingInProgressError,
+    RecordingLimitError,
+    RecordingRegistry,
+    resolve_max_concurrent_recordings,
+)
+
+
+def test_start_registers_independent_recordings(tmp_path: Path) -> None:
+    """Each session gets its own recording entry and chunk directory."""
+    reg = RecordingRegistry()
+    a = reg.start(1, 10, tmp_path / "a", max_concurrent=4)
+    b = reg.start(2, 10, tmp_path / "b", max_concurrent=4)
+
+    assert reg.is_recording(1) and reg.is_recording(2)
+    assert a.chunk_dir != b.chunk_dir
+    assert {r.session_id for r in reg.active()} == {1, 2}
+
+
+def test_start_rejects_duplicate_session(tmp_path: Path) -> None:
+    reg = RecordingRegistry()
+    reg.start(1, 10, tmp_path / "a", max_concurrent=4)
+
+    with pytest.raises(RecordingInProgressError):
+        reg.start(1, 10, tmp_path / "a", max_concurrent=4)
+
+
+def test_start_enforces_limit(tmp_path: Path) -> None:
+    reg = RecordingRegistry()
+    reg.start(1, 10, tmp_path / "a", max_concurrent=2)
+    reg.start(2, 10, tmp_path / "b", max_concurrent=2)
+
+    with pytest.raises(RecordingLimitError, match="2 concurrent"):
+        reg.start(3, 10, tmp_path / "c", max_concurrent=2)
+
+    # Stopping one frees a slot
+    assert reg.stop(1) is not None
+    reg.start(3, 10, tmp_path / "c", max_concurrent=2)
+    assert reg.stop(99) is None
+
+
+async def test_write_chunk_accounts_bytes(tmp_path: Path) -> None:
+    """write_chunk numbers chunk files sequentially and tracks byte counts."""
+    reg = RecordingRegistry()
+    chunk_dir = tmp_path / "tmp_1"
+    chunk_dir.mkdir()
+    rec = reg.start(1, 10, chunk_dir, max_concurrent=1)
+
+    await rec.write_chunk(b"abc")
+    await rec.write_chunk(b"defgh")
+
+    assert sorted(p.name for p in chunk_dir.iterdir()) == ["chunk_000.webm", "chunk_001.webm"]
+    stats = reg.stats()
+    assert stats["active_count"] == 1
+    assert stats["total_bytes_received"] == 8
+    assert stats["recordings"][0]["chunks_received"] == 2
+
+
+async def test_resolve_max_concurrent_recordings(db, monkeypatch) -> None:
+    """Limit resolves from settings, then env var, then the default."""
+    monkeypatch.delenv("TALEKEEPER_MAX_CONCURRENT_RECORDINGS", raising=False)
+    assert await resolve_max_concurrent_recordings() == DEFAULT_MAX_CONCURRENT_RECORDINGS
+
+    monkeypatch.setenv("TALEKEEPER_MAX_CONCURRENT_RECORDINGS", "7")
+    assert await resolve_max_concurrent_recordings() == 7
+
+    await db.execute(
+        "INSERT INTO settings (key, value) VALUES ('max_concurrent_recordings', '2')"
+    )
+    await db.commit()
+    assert await resolve_max_concurrent_recordings() == 2
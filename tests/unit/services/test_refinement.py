@@ -0,0 +1,133 @@
+"""Unit tests for two-pass transcription refinement."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+import talekeeper.services.refinement as mod
+from talekeeper.services.jobs import Job
+from talekeeper.services.refinement import (
+    DEFAULT_DRAFT_MODEL,
+    record_draft_ready,
+    refine_session_transcript,
+    resolve_two_pass_config,
+)
+from talekeeper.services.transcription import TranscriptSegment
+from conftest import create_campaign, create_session, create_segment
+
+
+@pytest.mark.asyncio
+async def test_config_defaults_to_single_pass(db, monkeypatch) -> None:
+    monkeypatch.delenv("TALEKEEPER_TRANSCRIPTION_MODE", raising=False)
+    monkeypatch.delenv("TALEKEEPER_DRAFT_MODEL", raising=False)
+
+    config = await resolve_two_pass_config()
+    assert not config.enabled
+    assert config.draft_model == DEFAULT_DRAFT_MODEL
+
+
+@pytest.mark.asyncio
+async def test_config_settings_override_env(db, monkeypatch) -> None:
+    monkeypatch.setenv("TALEKEEPER_TRANSCRIPTION_MODE", "single")
+    monkeypatch.setenv("TALEKEEPER_DRAFT_MODEL", "base")
+    await db.execute(
+        "INSERT INTO settings (key, value) VALUES ('transcription_mode', 'two_pass')"
+    )
+    await db.commit()
+
+    config = await resolve_two_pass_config()
+    assert config.enabled
+    assert config.draft_model == "base"
+
+
+@pytest.mark.asyncio
+async def test_refine_replaces_draft_window_by_window(db, monkeypatch) -> None:
+    """Each window is transcribed once; draft segments get a higher revision."""
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+    await create_segment(db, session_id, text="draft one", start_time=0.0, end_time=4.0)
+    await create_segment(db, session_id, text="draft two", start_time=4.0, end_time=9.0)
+    await create_segment(db, session_id, text="draft three", start_time=9.0, end_time=12.0)
+    await record_draft_ready(session_id, 3.0, final=False)
+
+    windows: list[tuple[float, float]] = []
+
+    def fake_transcribe_range(audio_path, start_time, end_time, **kwargs):
+        windows.append((start_time, end_time))
+        yield TranscriptSegment(text=f"refined {start_time:g}", start_time=start_time, end_time=end_time)
+
+    async def fake_duration(session_id, audio_path):
+        return 12.0
+
+    monkeypatch.setattr(mod, "REFINE_WINDOW_SECONDS", 5.0)
+    monkeypatch.setattr(mod, "_audio_duration", fake_duration)
+    await db.execute("UPDATE sessions SET audio_path = '/tmp/fake.wav' WHERE id = ?", (session_id,))
+    await db.commit()
+    job = Job(id=1, session_id=session_id, kind=mod.REFINE_JOB_KIND, params={
+        "model_name": "large-v3", "language": "en", "started_at": time.time(),
+    })
+
+    with patch("talekeeper.services.transcription.transcribe_range", fake_transcribe_range), \
+         patch("talekeeper.services.resource_orchestration.cleanup_transcription"):
+        events = [event async for event in refine_session_transcript(job)]
+
+    # Windows snap to segment boundaries: [0, 9) covers the second segment in full
+    assert windows == [(0.0, 9.0), (9.0, 12.0)]
+    assert [event for event, _ in events] == ["progress", "progress", "done"]
+    assert job.checkpoint == {"cursor": 12.0, "windows_done": 2, "windows_total": 3}
+
+    rows = await db.execute_fetchall(
+        "SELECT text, revision, model_name FROM transcript_segments WHERE session_id = ? ORDER BY start_time",
+        (session_id,),
+    )
+    assert [dict(r) for r in rows] == [
+        {"text": "refined 0", "revision": 1, "model_name": "large-v3"},
+        {"text": "refined 9", "revision": 1, "model_name": "large-v3"},
+    ]
+    timing = await db.execute_fetchall(
+        "SELECT time_to_draft_seconds, time_to_final_seconds FROM sessions WHERE id = ?",
+        (session_id,),
+    )
+    assert timing[0]["time_to_draft_seconds"] == 3.0
+    assert timing[0]["time_to_final_seconds"] is not None
+
+
+@pytest.mark.asyncio
+async def test_refine_resumes_after_last_refined_window(db, monkeypatch) -> None:
+    """A resumed job only transcribes the windows after its checkpoint."""
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+    await create_segment(db, session_id, text="refined one", start_time=0.0, end_time=4.0)
+    await create_segment(db, session_id, text="draft two", start_time=4.0, end_time=8.0)
+    await db.execute("UPDATE sessions SET audio_path = '/tmp/fake.wav' WHERE id = ?", (session_id,))
+    await db.commit()
+
+    windows: list[tuple[float, float]] = []
+
+    def fake_transcribe_range(audio_path, start_time, end_time, **kwargs):
+        windows.append((start_time, end_time))
+        yield TranscriptSegment(text="refined two", start_time=start_time, end_time=end_time)
+
+    async def fake_duration(session_id, audio_path):
+        return 8.0
+
+    monkeypatch.setattr(mod, "REFINE_WINDOW_SECONDS", 4.0)
+    monkeypatch.setattr(mod, "_audio_duration", fake_duration)
+    job = Job(
+        id=1, session_id=session_id, kind=mod.REFINE_JOB_KIND,
+        params={"model_name": "large-v3", "language": "en", "started_at": time.time()},
+        checkpoint={"cursor": 4.0, "windows_done": 1, "windows_total": 2},
+    )
+
+    with patch("talekeeper.services.transcription.transcribe_range", fake_transcribe_range), \
+         patch("talekeeper.services.resource_orchestration.cleanup_transcription"):
+        events = [event async for event in refine_session_transcript(job)]
+
+    assert windows == [(4.0, 8.0)]
+    assert events[-1][1]["windows_done"] == 2
+    rows = await db.execute_fetchall(
+        "SELECT text FROM transcript_segments WHERE session_id = ? ORDER BY start_time",
+        (session_id,),
+    )
+    assert [r["text"] for r in rows] == ["refined one", "refined two"]
@@ -12,48 +12,82 @@ from talekeeper.services.resource_orchestration import (
 
 
 @patch("talekeeper.services.resource_orchestration.gc")
+@patch("talekeeper.services.resource_orchestration.residency")
 @patch("talekeeper.services.resource_orchestration.transcription")
-def test_cleanup_transcription(mock_transcription, mock_gc):
-    """cleanup_transcription unloads model, clears MLX cache, runs gc."""
+def test_cleanup_transcription(mock_transcription, mock_residency, mock_gc):
+    """cleanup_transcription keeps the model resident, clears MLX cache, runs gc."""
     mock_mlx_core = MagicMock()
     with patch.dict("sys.modules", {"mlx": MagicMock(), "mlx.core": mock_mlx_core}):
         cleanup_transcription()
 
-    mock_transcription.unload_model.assert_called_once()
+    mock_residency.release.assert_not_called()
+    mock_transcription.unload_model.assert_not_called()
     mock_gc.collect.assert_called_once()
 
 
 @patch("talekeeper.services.resource_orchestration.gc")
-def test_cleanup_diarization(mock_gc):
-    """cleanup_diarization runs gc (no models to unload with diarize library)."""
+@patch("talekeeper.services.resource_orchestration.residency")
+@patch("talekeeper.services.resource_orchestration.transcription")
+def test_cleanup_transcription_force_unloads(mock_transcription, mock_residency, mock_gc):
+    """A forced cleanup unloads the model even when residency is not tracking it."""
+    mock_residency.evict.return_value = False
+    with patch.dict("sys.modules", {"mlx": MagicMock(), "mlx.core": MagicMock()}):
+        cleanup_transcription(force=True)
+
+    mock_residency.evict.assert_called_once_with("transcription")
+    mock_transcription.unload_model.assert_called_once()
+
+
+@patch("talekeeper.services.resource_orchestration.gc")
+@patch("talekeeper.services.resource_orchestration.residency")
+def test_cleanup_diarization(mock_residency, mock_gc):
+    """cleanup_diarization keeps the embedding model resident and runs gc."""
     cleanup_diarization()
 
+    mock_residency.release.assert_not_called()
     mock_gc.collect.assert_called_once()
 
 
 @patch("talekeeper.services.resource_orchestration.gc")
+@patch("talekeeper.services.resource_orchestration.residency")
 @patch("talekeeper.services.resource_orchestration.llm_client")
-async def test_cleanup_llm(mock_llm_client, mock_gc):
-    """cleanup_llm calls llm_client.unload_model and runs gc."""
+async def test_cleanup_llm(mock_llm_client, mock_residency, mock_gc):
+    """cleanup_llm keeps the model loaded and runs gc."""
     mock_llm_client.unload_model = AsyncMock()
 
     await cleanup_llm("http://localhost:11434/v1", None, "llama3")
 
+    mock_residency.release.assert_not_called()
+    mock_llm_client.unload_model.assert_not_awaited()
+    mock_gc.collect.assert_called_once()
+
+
+@patch("talekeeper.services.resource_orchestration.gc")
+@patch("talekeeper.services.resource_orchestration.residency")
+@patch("talekeeper.services.resource_orchestration.llm_client")
+async def test_cleanup_llm_force(mock_llm_client, mock_residency, mock_gc):
+    """A forced cleanup_llm calls llm_client.unload_model."""
+    mock_llm_client.unload_model = AsyncMock()
+
+    await cleanup_llm("http://localhost:11434/v1", None, "llama3", force=True)
+
+    mock_residency.evict.assert_called_once_with("llm")
     mock_llm_client.unload_model.assert_awaited_once_with(
         "http://localhost:11434/v1", None, "llama3"
     )
-    mock_gc.collect.assert_called_once()
 
 
 @patch("talekeeper.services.resource_orchestration.gc")
+@patch("talekeeper.services.resource_orchestration.residency")
 @patch("talekeeper.services.resource_orchestration.image_generation")
-def test_cleanup_image_generation(mock_image_gen, mock_gc):
-    """cleanup_image_generation unloads model, clears MLX cache, runs gc."""
+def test_cleanup_image_generation(mock_image_gen, mock_residency, mock_gc):
+    """cleanup_image_generation keeps the model resident, clears MLX cache, runs gc."""
     mock_mlx_core = MagicMock()
     with patch.dict("sys.modules", {"mlx": MagicMock(), "mlx.core": mock_mlx_core}):
         cleanup_image_generation()
 
-    mock_image_gen.unload_model.assert_called_once()
+    mock_residency.release.assert_not_called()
+    mock_image_gen.unload_model.assert_not_called()
     mock_gc.collect.assert_called_once()
 
 
@@ -62,13 +96,13 @@ def test_cleanup_image_generation(mock_image_gen, mock_gc):
 @patch("talekeeper.services.resource_orchestration.cleanup_diarization")
 @patch("talekeeper.services.resource_orchestration.cleanup_transcription")
 async def test_cleanup_all_with_llm(mock_trans, mock_diar, mock_llm, mock_img):
-    """cleanup_all calls all cleanup functions when LLM config is provided."""
+    """cleanup_all force-unloads every model when LLM config is provided."""
     await cleanup_all("http://localhost:11434/v1", None, "llama3")
 
-    mock_trans.assert_called_once()
-    mock_diar.assert_called_once()
-    mock_llm.assert_awaited_once_with("http://localhost:11434/v1", None, "llama3")
-    mock_img.assert_called_once()
+    mock_trans.assert_called_once_with(force=True)
+    mock_diar.assert_called_once_with(force=True)
+    mock_llm.assert_awaited_once_with("http://localhost:11434/v1", None, "llama3", force=True)
+    mock_img.assert_called_once_with(force=True)
 
 
 @patch("talekeeper.services.resource_orchestration.cleanup_image_generation")
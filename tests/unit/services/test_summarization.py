@@ -1,17 +1,40 @@
 """Tests for the summarization service."""
 
+import asyncio
+
 import pytest
 from unittest.mock import patch, AsyncMock
 
+from conftest import create_campaign, create_session
+
 from talekeeper.services.summarization import (
     generate_full_summary,
     generate_pov_summary,
+    generate_pov_summaries,
     format_transcript,
+    extract_notes,
+    ChunkNotes,
     _chunk_transcript,
+    _chunk_turns,
+    _notes_chunk_tokens,
     CHARS_PER_TOKEN,
     MAX_CONTEXT_TOKENS,
-    CHUNK_OVERLAP_TOKENS,
+    MIN_CHUNK_FILL,
+    NOTES_RESPONSE_TOKENS,
 )
+from talekeeper.services import token_counting
+from talekeeper.services.token_counting import estimate_tokens
+
+
+@pytest.fixture(autouse=True)
+def _default_chunk_size():
+    """Size notes chunks like _chunk_transcript's default instead of asking the provider."""
+    with patch(
+        "talekeeper.services.summarization._notes_chunk_tokens",
+        new_callable=AsyncMock,
+        return_value=MAX_CONTEXT_TOKENS,
+    ):
+        yield
 
 
 @patch(
@@ -26,7 +49,8 @@ async def test_generate_full_summary(mock_gen):
     )
 
     assert result == "The party entered the dungeon."
-    mock_gen.assert_awaited_once()
+    # One notes pass over the transcript, then the recap
+    assert mock_gen.await_count == 2
 
 
 @patch(
@@ -45,7 +69,7 @@ async def test_generate_pov_summary(mock_gen):
     )
 
     assert result == "I watched as we descended into the dark cavern."
-    mock_gen.assert_awaited_once()
+    assert mock_gen.await_count == 2
 
 
 def test_format_transcript():
@@ -86,22 +110,242 @@ def test_format_transcript():
     assert "[00:02:10] Unknown speaker line" == lines[2]
 
 
-def test_chunk_transcript():
-    """_chunk_transcript splits long text into overlapping chunks."""
-    chunk_size = MAX_CONTEXT_TOKENS * CHARS_PER_TOKEN
-    overlap_size = CHUNK_OVERLAP_TOKENS * CHARS_PER_TOKEN
+def _turns(count: int, text: str = "We follow the tunnel down into the dark and listen.") -> str:
+    return "\n".join(f"[00:{i // 60 % 60:02d}:{i % 60:02d}] Eldrin: {text}" for i in range(count))
+
 
+def test_chunk_transcript():
+    """_chunk_transcript packs whole speaker turns into overlapping chunks."""
     # Short text fits in a single chunk
     short_text = "Hello world"
     assert _chunk_transcript(short_text) == [short_text]
 
-    # Long text is split into overlapping chunks
-    long_text = "A" * (chunk_size + 1000)
-    chunks = _chunk_transcript(long_text)
+    transcript = _turns(2000)
+    turns = set(transcript.split("\n"))
+    chunks = _chunk_transcript(transcript, max_tokens=3000)
 
     assert len(chunks) >= 2
-    # Each chunk should be at most chunk_size characters
     for chunk in chunks:
-        assert len(chunk) <= chunk_size
-    # Chunks should overlap
-    assert len(chunks[0]) == chunk_size
+        assert estimate_tokens(chunk) <= 3000
+        # Chunks break only between turns
+        assert set(chunk.split("\n")) <= turns
+    # The next chunk repeats the last turns of the previous one
+    first_tail = chunks[0].split("\n")[-1]
+    assert first_tail in chunks[1].split("\n")
+    assert estimate_tokens(chunks[0]) >= 3000 * MIN_CHUNK_FILL
+
+
+def test_chunk_boundaries_survive_edits():
+    """Editing or reassigning one turn changes only the chunks around it."""
+    transcript = _turns(2000)
+    lines = transcript.split("\n")
+    lines[1000] = lines[1000].replace("Eldrin: We follow", "Mira: We all follow the long")
+    edited = "\n".join(lines)
+
+    before = _chunk_transcript(transcript, max_tokens=3000)
+    after = _chunk_transcript(edited, max_tokens=3000)
+
+    assert len(before) > 5
+    changed = set(after) - set(before)
+    assert 1 <= len(changed) <= 2
+
+
+def test_chunk_boundaries_survive_recalibration(monkeypatch):
+    """A new token scale for the model keeps the previous run's chunks wherever they still fit."""
+    transcript = _turns(2000)
+    before, ends = _chunk_turns(transcript, 3000, "model")
+    breaks = {end for end in ends if end}
+    assert ends[-1] is None and len(breaks) == len(before) - 1
+
+    monkeypatch.setitem(token_counting._scales, "model", 0.75)
+    assert _chunk_turns(transcript, 3000, "model", breaks)[0] == before
+
+    monkeypatch.setitem(token_counting._scales, "model", 1.25)
+    after, _ = _chunk_turns(transcript, 3000, "model", breaks)
+    assert all(estimate_tokens(chunk, "model") <= 3000 for chunk in after)
+    # Chunks that no longer fit are split; the ones after them are unchanged
+    kept = [chunk for chunk in before if estimate_tokens(chunk, "model") <= 3000]
+    assert kept and set(kept) <= set(after)
+
+
+def test_chunk_transcript_keeps_continuation_lines():
+    """Lines without a timestamp belong to the turn before them."""
+    transcript = _turns(400) + "\nand then the torch went out."
+    chunks = _chunk_transcript(transcript, max_tokens=1000)
+
+    assert chunks[-1].endswith("listen.\nand then the torch went out.")
+
+
+def test_chunk_transcript_sizes_by_script():
+    """Hebrew text takes more tokens per character, so it is cut into more chunks."""
+    english = _turns(1000)
+    hebrew = _turns(1000, "אנחנו הולכים במנהרה אל תוך החושך ומקשיבים היטב.")
+
+    assert len(_chunk_transcript(hebrew, 3000)) > len(_chunk_transcript(english, 3000))
+
+
+def test_chunk_transcript_splits_oversized_turn():
+    """A single turn longer than a chunk is broken at word boundaries."""
+    turn = "[00:00:00] DM: " + "word " * (MAX_CONTEXT_TOKENS * 2)
+    chunks = _chunk_transcript(turn.strip())
+
+    assert len(chunks) >= 2
+    assert all(estimate_tokens(chunk) <= MAX_CONTEXT_TOKENS for chunk in chunks)
+    assert "".join(chunks).replace(" ", "") == turn.strip().replace(" ", "")
+
+
+async def test_notes_chunks_fill_the_context_window():
+    """Notes chunks are sized to the provider's context, less the prompt and response."""
+    with patch(
+        "talekeeper.services.summarization.llm_client.context_window",
+        new_callable=AsyncMock,
+        return_value=32768,
+    ):
+        tokens = await _notes_chunk_tokens("http://test", "model", ["Eldrin"])
+
+    assert 32768 - 2000 < tokens < 32768 - NOTES_RESPONSE_TOKENS
+
+
+async def test_chunk_notes_run_concurrently_in_order():
+    """Chunk notes are requested concurrently but combined in chunk order."""
+    in_flight = 0
+    peak = 0
+
+    async def fake_generate(base_url, api_key, model, prompt, system=""):
+        nonlocal in_flight, peak
+        if not prompt.startswith("Take notes"):
+            return prompt
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later sections finish first
+        section = int(prompt.split("section ", 1)[1].split("/", 1)[0])
+        await asyncio.sleep(0.01 * (10 - section))
+        in_flight -= 1
+        return f'{{"events": ["event {section}"]}}'
+
+    long_text = "A" * (MAX_CONTEXT_TOKENS * CHARS_PER_TOKEN * 3)
+    with patch("talekeeper.services.summarization.llm_client.generate", side_effect=fake_generate):
+        result = await generate_full_summary(long_text, "http://test", None, "model")
+
+    assert peak > 1
+    events = [line for line in result.split("\n") if line.startswith("- Event:")]
+    assert len(events) > 1
+    assert events == [f"- Event: event {i}" for i in range(1, len(events) + 1)]
+
+
+@patch(
+    "talekeeper.services.summarization.llm_client.generate",
+    new_callable=AsyncMock,
+    side_effect=lambda base_url, api_key, model, prompt, system="": prompt,
+)
+async def test_pov_summaries_keep_speaker_order(mock_gen):
+    """generate_pov_summaries returns one summary per character, in the given order."""
+    names = ["Eldrin", "Mira", "Thorn"]
+    result = await generate_pov_summaries("Player 1: Hi.", names, "http://test", None, "model")
+
+    assert len(result) == 3
+    assert all(f"as {name}," in prompt for name, prompt in zip(names, result))
+    # One shared notes pass, then one reduce per character
+    assert mock_gen.await_count == 4
+
+
+@patch("talekeeper.services.summarization.llm_client.generate", new_callable=AsyncMock, return_value="Recap.")
+async def test_full_and_pov_prompts_share_a_prefix(mock_gen):
+    """The notes open every reduce prompt under one system prompt; the character comes after."""
+    notes = [ChunkNotes(events=["The bridge fell."], characters={"Mira": ["Jumped the gap."]})]
+    await generate_full_summary("", "http://test", None, "model", notes=notes)
+    await generate_pov_summaries("", ["Mira", "Thorn"], "http://test", None, "model", notes=notes)
+
+    calls = mock_gen.await_args_list
+    assert len({call.kwargs["system"] for call in calls}) == 1
+    prompts = [call.args[3] for call in calls]
+    prefix = prompts[0][:prompts[0].index("Write a narrative recap")]
+    assert "The bridge fell." in prefix
+    assert all(prompt.startswith(prefix) for prompt in prompts)
+    assert prompts[1].endswith("- Jumped the gap.")
+
+
+def test_chunk_notes_parse_fenced_json():
+    """Notes wrapped in a code fence are still read as JSON."""
+    notes = ChunkNotes.parse(
+        '```json\n{"events": ["The bridge collapsed."], "decisions": "Go around", '
+        '"characters": {"Mira": ["Caught Thorn."], "Thorn": []}}\n```'
+    )
+
+    assert notes.events == ["The bridge collapsed."]
+    assert notes.decisions == ["Go around"]
+    assert notes.characters == {"Mira": ["Caught Thorn."]}
+    assert notes.character_notes("thorn") == ["Mira: Caught Thorn."]
+
+
+def test_chunk_notes_parse_plain_text_fallback():
+    """A response that is not JSON is kept as a single event."""
+    notes = ChunkNotes.parse("The party rested at the inn.")
+
+    assert notes.events == ["The party rested at the inn."]
+    assert notes.characters == {}
+
+
+async def test_notes_shared_by_full_and_pov_summaries():
+    """The transcript is sent once per chunk, not once per character."""
+    long_text = "A" * (MAX_CONTEXT_TOKENS * CHARS_PER_TOKEN * 3)
+    chunk_count = len(_chunk_transcript(long_text))
+    names = ["Eldrin", "Mira", "Thorn"]
+
+    with patch(
+        "talekeeper.services.summarization.llm_client.generate",
+        new_callable=AsyncMock,
+        return_value='{"events": ["Something happened."]}',
+    ) as mock_gen:
+        notes = await extract_notes(long_text, names, "http://test", None, "model")
+        await generate_full_summary(long_text, "http://test", None, "model", notes=notes)
+        await generate_pov_summaries(long_text, names, "http://test", None, "model", notes=notes)
+
+    assert mock_gen.await_count == chunk_count + 1 + len(names)
+
+
+async def test_stored_notes_are_reused(db):
+    """A second run over an unchanged transcript does not re-send any chunk."""
+    cid = await create_campaign(db)
+    sid = await create_session(db, cid)
+    long_text = "A" * (MAX_CONTEXT_TOKENS * CHARS_PER_TOKEN * 2)
+
+    with patch(
+        "talekeeper.services.summarization.llm_client.generate",
+        new_callable=AsyncMock,
+        return_value='{"events": ["The door opened."]}',
+    ) as mock_gen:
+        first = await extract_notes(long_text, ["Mira"], "http://test", None, "model", session_id=sid)
+        sent = mock_gen.await_count
+        second = await extract_notes(long_text, ["Mira"], "http://test", None, "model", session_id=sid)
+        assert mock_gen.await_count == sent
+
+        # A changed tail only re-sends the chunks it touches
+        await extract_notes(long_text + "B" * 100, ["Mira"], "http://test", None, "model", session_id=sid)
+        assert mock_gen.await_count == sent + 1
+
+    assert second == first
+    assert second[0].events == ["The door opened."]
+
+
+async def test_edit_resends_only_affected_chunks(db):
+    """After a speaker is reassigned mid-session only the chunks around the edit are re-sent."""
+    cid = await create_campaign(db)
+    sid = await create_session(db, cid)
+    lines = _turns(1500).split("\n")
+    transcript = "\n".join(lines)
+    lines[700] = lines[700].replace("Eldrin:", "Mira:")
+
+    with patch(
+        "talekeeper.services.summarization.llm_client.generate",
+        new_callable=AsyncMock,
+        return_value='{"events": ["The door opened."]}',
+    ) as mock_gen:
+        first = await extract_notes(transcript, ["Mira"], "http://test", None, "model", session_id=sid)
+        assert mock_gen.await_count == len(first) > 5
+
+        mock_gen.reset_mock()
+        second = await extract_notes("\n".join(lines), ["Mira"], "http://test", None, "model", session_id=sid)
+
+    assert 1 <= mock_gen.await_count <= 2
+    assert len(second) == len(first)
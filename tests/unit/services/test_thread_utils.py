@@ -0,0 +1,90 @@
+"""Unit tests for the bounded thread bridge used by transcription pipelines."""
+
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from talekeeper.services.thread_utils import iterate_in_thread
+
+
+@pytest.mark.asyncio
+async def test_items_arrive_in_order() -> None:
+    items = [item async for item in iterate_in_thread(iter(range(50)), max_buffered=3)]
+    assert items == list(range(50))
+
+
+@pytest.mark.asyncio
+async def test_generator_errors_reach_the_consumer() -> None:
+    def failing():
+        yield 1
+        raise ValueError("decoder crashed")
+
+    received = []
+    with pytest.raises(ValueError, match="decoder crashed"):
+        async for item in iterate_in_thread(failing()):
+            received.append(item)
+    assert received == [1]
+
+
+@pytest.mark.asyncio
+async def test_generator_sees_the_callers_context_vars() -> None:
+    request_id = contextvars.ContextVar("request_id", default=None)
+
+    def reading():
+        yield request_id.get()
+
+    request_id.set("job-7")
+    assert [item async for item in iterate_in_thread(reading())] == ["job-7"]
+
+
+@pytest.mark.asyncio
+async def test_producer_stays_within_the_buffer() -> None:
+    produced = []
+
+    def counting():
+        for i in range(20):
+            produced.append(i)
+            yield i
+
+    bridge = iterate_in_thread(counting(), max_buffered=2)
+    assert await bridge.__anext__() == 0
+    await asyncio.sleep(0.3)
+    # One item consumed, two buffered, one more held while waiting for a slot
+    assert len(produced) <= 4
+    await bridge.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stopping_early_closes_the_generator() -> None:
+    closed = threading.Event()
+    cancelled = []
+
+    def endless():
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+        finally:
+            closed.set()
+
+    bridge = iterate_in_thread(endless(), on_cancel=lambda: cancelled.append(True))
+    async for item in bridge:
+        if item == 3:
+            break
+    await bridge.aclose()
+
+    assert closed.is_set()
+    assert cancelled == [True]
+
+
+@pytest.mark.asyncio
+async def test_on_cancel_is_not_called_after_completion() -> None:
+    cancelled = []
+    items = [
+        item async for item in iterate_in_thread(iter([1, 2]), on_cancel=lambda: cancelled.append(True))
+    ]
+    assert items == [1, 2]
+    assert cancelled == []
@@ -0,0 +1,38 @@
+"""Tests for prompt token estimates."""
+
+import pytest
+
+from talekeeper.services import token_counting
+from talekeeper.services.token_counting import calibrate, estimate_tokens
+
+
+@pytest.fixture(autouse=True)
+def _fresh_scales(monkeypatch):
+    monkeypatch.setattr(token_counting, "_scales", {})
+
+
+def test_estimate_by_script():
+    """Hebrew and Cyrillic text count more tokens per character than English."""
+    assert estimate_tokens("a" * 400) == 100
+    assert estimate_tokens("ש" * 400) == 200
+    assert estimate_tokens("д" * 400) == 160
+    assert estimate_tokens("a" * 40 + "ש" * 40) == 30
+
+
+def test_calibration_scales_estimates_per_model():
+    """Provider-reported prompt tokens adjust later estimates for that model only."""
+    text = "The party crossed the river. " * 100
+    base = estimate_tokens(text)
+
+    calibrate("llama", text, int(base * 1.5))
+
+    assert estimate_tokens(text, "llama") == pytest.approx(base * 1.5, abs=1)
+    assert estimate_tokens(text, "other") == base
+    assert estimate_tokens(text) == base
+
+
+def test_short_prompts_do_not_calibrate():
+    """Template overhead dominates short prompts, so they are ignored."""
+    calibrate("llama", "hi", 40)
+
+    assert estimate_tokens("hello " * 100, "llama") == estimate_tokens("hello " * 100)
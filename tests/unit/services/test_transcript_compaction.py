@@ -0,0 +1,75 @@
+"""Tests for transcript compaction."""
+
+from talekeeper.services import llm_metrics
+from talekeeper.services.transcript_compaction import compact, compact_transcript
+
+
+def _seg(start: float, text: str, speaker: str | None = "Eldrin") -> dict:
+    return {"text": text, "start_time": start, "end_time": start + 2, "character_name": speaker}
+
+
+def test_merges_same_speaker_and_stamps_each_interval():
+    """Consecutive segments of one speaker share a line; timestamps start each minute."""
+    segments = [
+        _seg(0, "We enter the cave."),
+        _seg(3, "It is dark."),
+        _seg(6, "Roll for perception.", "DM"),
+        _seg(61, "I light a torch."),
+        _seg(64, "It flickers."),
+        _seg(70, "Something moves.", None),
+    ]
+
+    result = compact(segments, strip_fillers=False)
+
+    assert result.text.split("\n") == [
+        "[00:00:00] Eldrin: We enter the cave. It is dark.",
+        "DM: Roll for perception.",
+        "[00:01:01] Eldrin: I light a torch. It flickers.",
+        "Something moves.",
+    ]
+    assert result.tokens < result.original_tokens
+
+
+def test_timestamps_do_not_depend_on_speakers():
+    """Reassigning a speaker changes only the names, not where timestamps fall."""
+    segments = [_seg(t, "We walk on.", "DM" if t % 20 else "Mira") for t in range(0, 300, 5)]
+    reassigned = [dict(s, character_name="Eldrin") for s in segments]
+
+    def stamps(text: str) -> list[str]:
+        return [line[:10] for line in text.split("\n") if line.startswith("[")]
+
+    assert stamps(compact(segments).text) == stamps(compact(reassigned).text)
+
+
+def test_strips_fillers_stutters_and_annotations():
+    segments = [
+        _seg(0, "Well, um, I I I think [crosstalk] we go (laughs) north."),
+        _seg(2, "Uh..."),
+        _seg(4, "Uh-huh, hmm."),
+    ]
+
+    assert compact(segments).text == "[00:00:00] Eldrin: Well, I think we go north. Uh-huh"
+    assert "um" in compact(segments, strip_fillers=False).text
+
+
+def test_keeps_repeated_words():
+    """Only stuttered fragments collapse; deliberate repeats are part of what was said."""
+    segments = [_seg(0, "No no no, he had had very very bad luck. Th- th- the door, I- I mean.")]
+
+    assert compact(segments).text == "[00:00:00] Eldrin: No no no, he had had very very bad luck. the door, I mean."
+
+
+async def test_compact_transcript_reports_reduction(db, monkeypatch):
+    """The saving is recorded in the LLM metrics; fillers are kept when the setting says so."""
+    llm_metrics.reset()
+    segments = [_seg(i * 2, f"Um, we take step {i}.") for i in range(50)]
+
+    text = await compact_transcript(segments, session_id=1)
+
+    compaction = llm_metrics.stats()["compaction"]
+    assert compaction["transcripts"] == 1
+    assert 0.2 < compaction["reduction"] < 0.9
+    assert "Um" not in text
+
+    monkeypatch.setenv("TALEKEEPER_TRANSCRIPT_STRIP_FILLERS", "0")
+    assert "Um" in await compact_transcript(segments)
@@ -0,0 +1,55 @@
+"""Unit tests for range-scoped transcript replacement."""
+
+import pytest
+
+from talekeeper.services.transcript_ranges import (
+    expand_range_to_segments,
+    replace_transcript_range,
+)
+from talekeeper.services.transcription import TranscriptSegment
+from conftest import create_campaign, create_session, create_speaker, create_segment
+
+
+async def _segments(db, session_id: int) -> list[dict]:
+    rows = await db.execute_fetchall(
+        "SELECT text, speaker_id, start_time, end_time, is_overlap FROM transcript_segments "
+        "WHERE session_id = ? ORDER BY start_time",
+        (session_id,),
+    )
+    return [dict(r) for r in rows]
+
+
+@pytest.mark.asyncio
+async def test_expand_range_covers_partially_overlapping_segments(db) -> None:
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+    await create_segment(db, session_id, text="a", start_time=0.0, end_time=10.0)
+    await create_segment(db, session_id, text="b", start_time=10.0, end_time=20.0)
+    await create_segment(db, session_id, text="c", start_time=20.0, end_time=30.0)
+
+    assert await expand_range_to_segments(session_id, 12.0, 22.0) == (10.0, 30.0)
+    # A window in a gap is left as is
+    assert await expand_range_to_segments(session_id, 40.0, 50.0) == (40.0, 50.0)
+
+
+@pytest.mark.asyncio
+async def test_replace_range_keeps_outside_segments_and_speakers(db) -> None:
+    """Only overlapping segments are replaced; new ones inherit the old speakers."""
+    campaign_id = await create_campaign(db)
+    session_id = await create_session(db, campaign_id)
+    alice = await create_speaker(db, session_id, diarization_label="SPEAKER_00")
+    bob = await create_speaker(db, session_id, diarization_label="SPEAKER_01")
+    await create_segment(db, session_id, speaker_id=alice, text="before", start_time=0.0, end_time=10.0)
+    await create_segment(db, session_id, speaker_id=alice, text="grbld", start_time=10.0, end_time=15.0)
+    await create_segment(db, session_id, speaker_id=bob, text="mmph", start_time=15.0, end_time=20.0)
+    await create_segment(db, session_id, speaker_id=bob, text="after", start_time=20.0, end_time=30.0)
+
+    result = await replace_transcript_range(session_id, 10.0, 20.0, [
+        TranscriptSegment(text="I cast fireball", start_time=10.2, end_time=14.0),
+        TranscriptSegment(text="Roll for damage", start_time=15.5, end_time=19.0),
+    ])
+
+    assert result == {"replaced": 2, "inserted": 2, "revision": 1}
+    segments = await _segments(db, session_id)
+    assert [s["text"] for s in segments] == ["before", "I cast fireball", "Roll for damage", "after"]
+    assert [s["speaker_id"] for s in segments] == [alice, alice, bob, bob]
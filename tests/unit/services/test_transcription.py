@@ -10,6 +10,7 @@ import talekeeper.services.transcription as mod
 from talekeeper.services.transcription import (
     transcribe,
     transcribe_chunked,
+    transcribe_range,
     TranscriptSegment,
     ChunkProgress,
     _run_vad,
@@ -197,30 +198,26 @@ def test_detect_batch_size_fallback_on_error(mock_run):
 
 def test_transcribe_chunked():
     """transcribe_chunked yields ChunkProgress first, then TranscriptSegments."""
-    import pydub
     import talekeeper.services.audio as audio_mod
 
-    mock_audio = MagicMock()
-    mock_audio.__len__ = MagicMock(return_value=60_000)
-
-    orig_as = pydub.AudioSegment
     orig_split = audio_mod.split_audio_to_chunks
 
     try:
-        pydub.AudioSegment = MagicMock()
-        pydub.AudioSegment.from_file.return_value = mock_audio
-
         audio_mod.split_audio_to_chunks = MagicMock(
             return_value=iter([(0, Path("chunk.wav"), 0, 60_000)])
         )
 
-        with patch("talekeeper.services.transcription.transcribe") as mock_transcribe:
+        with patch("talekeeper.services.transcription.transcribe") as mock_transcribe, \
+                patch("talekeeper.services.audio.audio_duration_ms") as mock_duration:
             mock_transcribe.return_value = [
                 TranscriptSegment(text="Hello", start_time=0.0, end_time=1.0),
                 TranscriptSegment(text="World", start_time=1.0, end_time=2.0),
             ]
 
-            results = list(transcribe_chunked(Path("test.wav")))
+            # The stored duration plans the chunks; the file is never probed or decoded
+            results = list(transcribe_chunked(Path("test.wav"), duration=60.0))
+            mock_duration.assert_not_called()
+            assert audio_mod.split_audio_to_chunks.call_args.kwargs["plan"] == [(0, 60_000)]
 
         assert isinstance(results[0], ChunkProgress)
         assert results[0].chunk == 1
@@ -231,5 +228,38 @@ def test_transcribe_chunked():
         assert transcript_results[0].text == "Hello"
         assert transcript_results[1].text == "World"
     finally:
-        pydub.AudioSegment = orig_as
         audio_mod.split_audio_to_chunks = orig_split
+
+
+@patch("talekeeper.services.transcription.transcribe_chunked")
+@patch("talekeeper.services.audio.extract_wav_window")
+def test_transcribe_range_offsets_timestamps(mock_window, mock_chunked, tmp_path):
+    """transcribe_range decodes only the window and shifts segments to session time."""
+    window = tmp_path / "window.wav"
+    window.write_bytes(b"wav")
+    mock_window.return_value = window
+    mock_chunked.return_value = iter([
+        ChunkProgress(chunk=1, total_chunks=1),
+        TranscriptSegment(text="Nat 20!", start_time=1.0, end_time=2.5),
+    ])
+
+    items = list(transcribe_range(Path("session.flac"), 300.0, 360.0, language="en"))
+
+    mock_window.assert_called_once_with(Path("session.flac"), 300.0, 360.0)
+    assert items[0] == ChunkProgress(chunk=1, total_chunks=1)
+    assert items[1] == TranscriptSegment(text="Nat 20!", start_time=301.0, end_time=302.5)
+    assert not window.exists()
+
+
+def test_transcribe_chunked_resumes_at_chunk():
+    """start_chunk skips the chunks a resumed run already transcribed."""
+    with patch("talekeeper.services.audio.split_audio_to_chunks") as mock_split, \
+            patch("talekeeper.services.transcription.transcribe") as mock_transcribe:
+        mock_split.return_value = iter([(2, Path("chunk.wav"), 58_000, 120_000)])
+        mock_transcribe.return_value = [TranscriptSegment(text="Later", start_time=30.0, end_time=31.0)]
+
+        results = list(transcribe_chunked(Path("test.wav"), duration=120.0, start_chunk=2))
+
+    assert mock_split.call_args.kwargs["start_index"] == 2
+    assert results[0] == ChunkProgress(chunk=3, total_chunks=len(mock_split.call_args.kwargs["plan"]))
+    assert [r.start_time for r in results[1:]] == [88.0]